@@ -21,6 +21,7 @@ from typing import Dict, Any
 
 # Import core components
 from .dag_engine import DAGEngine, DAGNode, NodeStatus
+from .result_cache import ResultCache
 from .state_machine import (
     StateMachine,
     ExecutionState,
@@ -78,6 +79,7 @@ __all__ = [
     "DAGEngine",
     "DAGNode",
     "NodeStatus",
+    "ResultCache",
     # State Machine
     "StateMachine",
     "ExecutionState",
@@ -3,14 +3,24 @@ DAG Engine - Directed Acyclic Graph Orchestration Engine
 
 This module implements the core DAG orchestration logic with topological sorting,
 dependency resolution, and parallel execution capabilities.
+
+Execution uses a ready-queue (Kahn) scheduler: each node starts as soon as its
+own dependencies complete, bounded by an optional concurrency cap, rather than
+waiting for every node in its topological level.
+
+With a ResultCache attached, nodes that declare a fingerprint are memoized on
+their inputs, and invalidate() plus execute(incremental=True) reruns only the
+downstream subgraph of the nodes that changed.
 """
 
-from typing import Dict, List, Set, Any, Optional, Callable
+from typing import Dict, List, Set, Any, Optional, Callable, Iterable
 from enum import Enum
 from dataclasses import dataclass, field
 import asyncio
 from collections import defaultdict, deque
 
+from .result_cache import ResultCache, cache_key, hash_result
+
 
 class NodeStatus(Enum):
     """Status of a DAG node"""
@@ -34,6 +44,12 @@ class DAGNode:
         result: Execution result
         error: Error if execution failed
         metadata: Additional metadata
+        timeout: Per-attempt timeout in seconds (engine default if None)
+        retries: Extra attempts after a failure (engine default if None)
+        attempts: Attempts made in the last execution
+        fingerprint: Digest of the task's code and configuration; nodes
+            without one are never cached
+        cached: Whether the last result came from the result cache
     """
     node_id: str
     task: Callable
@@ -42,6 +58,11 @@ class DAGNode:
     result: Any = None
     error: Optional[Exception] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
+    timeout: Optional[float] = None
+    retries: Optional[int] = None
+    attempts: int = 0
+    fingerprint: Optional[str] = None
+    cached: bool = False
 
 
 class DAGEngine:
@@ -52,10 +73,33 @@ class DAGEngine:
     of directed acyclic graph workflows.
     """
     
-    def __init__(self):
-        """Initialize the DAG engine"""
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        default_timeout: Optional[float] = None,
+        default_retries: int = 0,
+        retry_delay: float = 0.0,
+        result_cache: Optional[ResultCache] = None,
+    ):
+        """
+        Initialize the DAG engine
+        
+        Args:
+            max_concurrency: Maximum nodes running at once (unbounded if None)
+            default_timeout: Per-attempt timeout for nodes that set none
+            default_retries: Retries for nodes that set none
+            retry_delay: Base delay before a retry, doubled per attempt
+            result_cache: Cache for results of fingerprinted nodes
+        """
         self.nodes: Dict[str, DAGNode] = {}
         self.execution_order: List[List[str]] = []
+        self.max_concurrency = max_concurrency
+        self.default_timeout = default_timeout
+        self.default_retries = default_retries
+        self.retry_delay = retry_delay
+        self.result_cache = result_cache
+        self.result_hashes: Dict[str, str] = {}
+        self._cache_keys: Dict[str, str] = {}
         
     def add_node(self, node: DAGNode) -> None:
         """
@@ -78,82 +122,141 @@ class DAGEngine:
         Returns:
             bool: True if cycle detected, False otherwise
         """
-        visited = set()
-        rec_stack = set()
-        
-        def visit(node_id: str) -> bool:
-            visited.add(node_id)
-            rec_stack.add(node_id)
-            
-            node = self.nodes.get(node_id)
-            if node:
-                for dep in node.dependencies:
-                    if dep not in visited:
-                        if visit(dep):
-                            return True
-                    elif dep in rec_stack:
-                        return True
-                        
-            rec_stack.remove(node_id)
-            return False
-            
-        for node_id in self.nodes:
-            if node_id not in visited:
-                if visit(node_id):
-                    return True
+        try:
+            self.topological_sort()
+        except ValueError:
+            return True
         return False
         
+    def _build_graph(self) -> tuple:
+        """
+        Build the reverse-dependency adjacency map and in-degrees
+        
+        Dependencies on unknown nodes are ignored here; such nodes are
+        skipped at execution time.
+        
+        Returns:
+            (dependents, in_degree) where dependents maps a node_id to the
+            node_ids that depend on it
+        """
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        in_degree: Dict[str, int] = {node_id: 0 for node_id in self.nodes}
+        
+        for node in self.nodes.values():
+            for dep in set(node.dependencies):
+                if dep in self.nodes:
+                    dependents[dep].append(node.node_id)
+                    in_degree[node.node_id] += 1
+                    
+        return dependents, in_degree
+        
     def topological_sort(self) -> List[List[str]]:
         """
         Perform topological sort with level-based grouping for parallel execution
         
+        Kahn's algorithm over the reverse-dependency map: O(V + E). A cycle
+        leaves nodes unprocessed.
+        
         Returns:
             List of levels, where each level contains node_ids that can run in parallel
             
         Raises:
             ValueError: If cycle is detected
         """
-        if self._detect_cycle():
-            raise ValueError("Cycle detected in DAG")
-            
-        # Calculate in-degree for each node
-        in_degree = {node_id: 0 for node_id in self.nodes}
-        for node in self.nodes.values():
-            for dep in node.dependencies:
-                if dep in in_degree:
-                    in_degree[dep] += 1
-                    
-        # Find all nodes with in-degree 0
-        queue = deque([node_id for node_id, degree in in_degree.items() if degree == 0])
+        dependents, in_degree = self._build_graph()
+        
+        level = [node_id for node_id, degree in in_degree.items() if degree == 0]
         levels = []
+        processed = 0
         
-        while queue:
-            # Current level - all nodes that can run in parallel
-            current_level = list(queue)
-            levels.append(current_level)
-            
-            # Process current level
-            next_queue = []
-            for node_id in current_level:
-                queue.popleft()
-                node = self.nodes[node_id]
-                
-                # Decrease in-degree for dependent nodes
-                for dependent_id in self.nodes:
-                    dependent = self.nodes[dependent_id]
-                    if node_id in dependent.dependencies:
-                        in_degree[dependent_id] -= 1
-                        if in_degree[dependent_id] == 0:
-                            next_queue.append(dependent_id)
-                            
-            queue.extend(next_queue)
+        while level:
+            levels.append(level)
+            processed += len(level)
+            
+            next_level = []
+            for node_id in level:
+                for dependent_id in dependents.get(node_id, ()):
+                    in_degree[dependent_id] -= 1
+                    if in_degree[dependent_id] == 0:
+                        next_level.append(dependent_id)
+                        
+            level = next_level
+            
+        if processed != len(self.nodes):
+            raise ValueError("Cycle detected in DAG")
             
         self.execution_order = levels
         return levels
         
+    def _cache_key(self, node: DAGNode) -> Optional[str]:
+        """
+        Compute the result cache key for a node from its dependencies' results
+        
+        Returns:
+            Cache key, or None if the node is not cacheable
+        """
+        if self.result_cache is None or node.fingerprint is None:
+            return None
+            
+        dependency_hashes = {}
+        for dep in node.dependencies:
+            if dep not in self.result_hashes:
+                return None
+            dependency_hashes[dep] = self.result_hashes[dep]
+            
+        key = cache_key(node.fingerprint, dependency_hashes)
+        self._cache_keys[node.node_id] = key
+        return key
+        
+    def invalidate(self, node_ids: Iterable[str]) -> List[str]:
+        """
+        Invalidate nodes whose inputs changed, along with everything downstream
+        
+        Cached results of the given nodes are dropped so they rerun. Their
+        dependents are only reset: if a rerun reproduces the same result, the
+        dependents still hit the cache on the next incremental execute().
+        
+        Args:
+            node_ids: Nodes to invalidate
+            
+        Returns:
+            All node_ids that will rerun
+            
+        Raises:
+            ValueError: If a node_id is unknown
+        """
+        dependents, _ = self._build_graph()
+        queue = deque()
+        
+        for node_id in node_ids:
+            if node_id not in self.nodes:
+                raise ValueError(f"Node {node_id} not found")
+            key = self._cache_keys.pop(node_id, None)
+            if key is not None and self.result_cache is not None:
+                self.result_cache.invalidate(key)
+            queue.append(node_id)
+            
+        affected = []
+        seen: Set[str] = set()
+        while queue:
+            node_id = queue.popleft()
+            if node_id in seen:
+                continue
+            seen.add(node_id)
+            affected.append(node_id)
+            
+            node = self.nodes[node_id]
+            node.status = NodeStatus.PENDING
+            node.result = None
+            node.error = None
+            self.result_hashes.pop(node_id, None)
+            queue.extend(dependents.get(node_id, ()))
+            
+        return affected
+        
     async def _execute_node(self, node: DAGNode) -> Any:
         """
-        Execute a single node
+        Execute a single node, honouring its timeout and retries
         
         Args:
             node: Node to execute
@@ -161,67 +264,149 @@ class DAGEngine:
         Returns:
             Execution result
         """
-        try:
-            node.status = NodeStatus.RUNNING
-            
-            # Execute the task
-            if asyncio.iscoroutinefunction(node.task):
-                result = await node.task()
-            else:
-                result = node.task()
+        timeout = node.timeout if node.timeout is not None else self.default_timeout
+        retries = node.retries if node.retries is not None else self.default_retries
+        
+        node.status = NodeStatus.RUNNING
+        node.attempts = 0
+        node.cached = False
+        
+        key = self._cache_key(node)
+        if key is not None:
+            hit, result = self.result_cache.get(key)
+            if hit:
+                node.status = NodeStatus.COMPLETED
+                node.result = result
+                node.error = None
+                node.cached = True
+                self.result_hashes[node.node_id] = hash_result(result)
+                return result
                 
-            node.status = NodeStatus.COMPLETED
-            node.result = result
-            return result
-            
-        except Exception as e:
-            node.status = NodeStatus.FAILED
-            node.error = e
-            raise
+        while True:
+            node.attempts += 1
+            try:
+                # Execute the task
+                if asyncio.iscoroutinefunction(node.task):
+                    result = await asyncio.wait_for(node.task(), timeout)
+                else:
+                    result = node.task()
+                    
+                node.status = NodeStatus.COMPLETED
+                node.result = result
+                node.error = None
+                if self.result_cache is not None:
+                    self.result_hashes[node.node_id] = hash_result(result)
+                if key is not None:
+                    self.result_cache.put(key, result)
+                return result
+                
+            except Exception as e:
+                if node.attempts <= retries:
+                    if self.retry_delay:
+                        await asyncio.sleep(self.retry_delay * (2 ** (node.attempts - 1)))
+                    continue
+                    
+                node.status = NodeStatus.FAILED
+                node.error = e
+                raise
+                
+    def _skip_downstream(
+        self,
+        node_id: str,
+        dependents: Dict[str, List[str]],
+    ) -> List[str]:
+        """
+        Mark every pending node downstream of node_id as skipped
+        
+        Returns:
+            The node_ids that were skipped
+        """
+        skipped = []
+        queue = deque(dependents.get(node_id, ()))
+        
+        while queue:
+            dependent_id = queue.popleft()
+            dependent = self.nodes[dependent_id]
+            if dependent.status != NodeStatus.PENDING:
+                continue
+            dependent.status = NodeStatus.SKIPPED
+            skipped.append(dependent_id)
+            queue.extend(dependents.get(dependent_id, ()))
             
-    async def execute(self) -> Dict[str, Any]:
+        return skipped
+        
+    async def execute(self, incremental: bool = False) -> Dict[str, Any]:
         """
-        Execute the DAG with parallel execution where possible
+        Execute the DAG, starting each node as soon as its dependencies finish
         
+        A failed node skips only its downstream nodes; independent branches
+        keep running.
+        
+        Args:
+            incremental: Keep results of nodes completed by a previous run and
+                only run the rest (typically those reset by invalidate())
+                
         Returns:
-            Dict mapping node_id to execution result
+            Dict mapping node_id to execution result (the exception for failed nodes)
             
         Raises:
             ValueError: If DAG has cycles or dependencies are invalid
         """
-        # Perform topological sort
-        levels = self.topological_sort()
+        # Validates acyclicity and records levels for the summary
+        self.topological_sort()
+        dependents, in_degree = self._build_graph()
         
-        results = {}
+        results: Dict[str, Any] = {}
+        ready: deque = deque()
         
-        # Execute level by level
-        for level in levels:
-            # Execute all nodes in this level in parallel
-            tasks = []
-            for node_id in level:
-                node = self.nodes[node_id]
+        for node in self.nodes.values():
+            if incremental and node.status == NodeStatus.COMPLETED:
+                results[node.node_id] = node.result
+                for dependent_id in dependents.get(node.node_id, ()):
+                    in_degree[dependent_id] -= 1
+            else:
+                node.status = NodeStatus.PENDING
                 
-                # Check if all dependencies completed successfully
-                dependencies_ok = True
-                for dep_id in node.dependencies:
-                    dep_node = self.nodes.get(dep_id)
-                    if not dep_node or dep_node.status != NodeStatus.COMPLETED:
-                        dependencies_ok = False
-                        break
-                        
-                if dependencies_ok:
-                    tasks.append(self._execute_node(node))
-                else:
-                    node.status = NodeStatus.SKIPPED
-                    
-            # Wait for all tasks in this level to complete
-            if tasks:
-                level_results = await asyncio.gather(*tasks, return_exceptions=True)
+        for node_id, degree in in_degree.items():
+            node = self.nodes[node_id]
+            if node_id in results:
+                continue
+            if any(dep not in self.nodes for dep in node.dependencies):
+                # Unsatisfiable dependency
+                node.status = NodeStatus.SKIPPED
+                self._skip_downstream(node_id, dependents)
+            elif degree == 0:
+                ready.append(node_id)
+                
+        running: Dict[asyncio.Task, str] = {}
+        
+        while ready or running:
+            while ready and (self.max_concurrency is None or len(running) < self.max_concurrency):
+                node_id = ready.popleft()
+                if self.nodes[node_id].status != NodeStatus.PENDING:
+                    continue
+                task = asyncio.create_task(self._execute_node(self.nodes[node_id]))
+                running[task] = node_id
+                
+            if not running:
+                continue
                 
-                # Store results
-                for i, node_id in enumerate([nid for nid in level if self.nodes[nid].status == NodeStatus.RUNNING or self.nodes[nid].status == NodeStatus.COMPLETED]):
-                    results[node_id] = level_results[i] if i < len(level_results) else None
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            
+            for task in done:
+                node_id = running.pop(task)
+                
+                if task.exception() is not None:
+                    results[node_id] = task.exception()
+                    self._skip_downstream(node_id, dependents)
+                    continue
                     
+                results[node_id] = task.result()
+                for dependent_id in dependents.get(node_id, ()):
+                    in_degree[dependent_id] -= 1
+                    if in_degree[dependent_id] == 0 and self.nodes[dependent_id].status == NodeStatus.PENDING:
+                        ready.append(dependent_id)
+                        
         return results
         
     def get_execution_summary(self) -> Dict[str, Any]:
@@ -240,4 +425,5 @@ class DAGEngine:
             "status_counts": dict(status_counts),
             "execution_levels": len(self.execution_order),
             "nodes_by_level": [len(level) for level in self.execution_order],
+            "cached_nodes": sum(1 for node in self.nodes.values() if node.cached),
         }
@@ -0,0 +1,266 @@
+"""
+Result Cache - Content-Addressed Memoization for DAG Nodes
+
+This module implements the result cache used by the DAG engine to skip nodes
+whose inputs have not changed since a previous run.
+
+A cache key is derived from a node's fingerprint (a caller-supplied digest of
+the node's own code and configuration) and the result hashes of its
+dependencies, so any upstream change produces a new key while an upstream
+rerun that yields an identical result still hits.
+
+Entries live in a bounded in-memory LRU and, optionally, an on-disk store
+with its own size-bounded LRU eviction. The on-disk store uses pickle and
+must only point at a directory the pipeline itself owns.
+"""
+
+from typing import Dict, Any, Optional, Tuple
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+
+def _canonical(value: Any) -> Any:
+    """json.dumps hook encoding sets in a fixed order"""
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": sorted(_canonical_json(item) for item in value)}
+    raise TypeError(f"{type(value).__name__} has no canonical encoding")
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=_canonical)
+
+
+def hash_result(value: Any) -> str:
+    """
+    Hash a node result for use in downstream cache keys
+    
+    JSON-compatible results (sets included) hash by a canonical encoding,
+    so equal results hash equally regardless of dict or set ordering.
+    
+    Args:
+        value: Node result
+        
+    Returns:
+        Hex digest; other results hash by pickle, or by repr if unpicklable
+    """
+    try:
+        data = b"json:" + _canonical_json(value).encode()
+    except (TypeError, ValueError):
+        try:
+            data = b"pickle:" + pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            data = b"repr:" + repr(value).encode()
+    return hashlib.sha256(data).hexdigest()
+
+
+def cache_key(fingerprint: str, dependency_hashes: Dict[str, str]) -> str:
+    """
+    Derive a cache key from a node fingerprint and its inputs
+    
+    Args:
+        fingerprint: Digest of the node's own code and configuration
+        dependency_hashes: Result hash of each dependency by node_id
+        
+    Returns:
+        Hex digest identifying this node invocation
+    """
+    digest = hashlib.sha256(fingerprint.encode())
+    for node_id in sorted(dependency_hashes):
+        digest.update(b"\0")
+        digest.update(node_id.encode())
+        digest.update(b"=")
+        digest.update(dependency_hashes[node_id].encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-tier LRU cache of node results
+    
+    The memory tier holds up to max_entries results. When cache_dir is set,
+    picklable results are also written to disk, and the disk tier evicts its
+    least recently used entries once it exceeds max_disk_bytes.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_entries: int = 1024,
+        max_disk_bytes: int = 1024 * 1024 * 1024,
+    ):
+        """
+        Initialize the result cache
+        
+        Args:
+            cache_dir: Directory for the on-disk store (memory only if None)
+            max_entries: Maximum results held in memory
+            max_disk_bytes: Maximum total size of the on-disk store
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_entries = max_entries
+        self.max_disk_bytes = max_disk_bytes
+        
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._disk: "OrderedDict[str, int]" = OrderedDict()  # key -> size, LRU first
+        self._disk_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._load_disk_index()
+            
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.pkl"
+        
+    def _load_disk_index(self) -> None:
+        """Rebuild the disk LRU order from file modification times"""
+        entries = []
+        for path in self.cache_dir.glob("*/*.pkl"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+            
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+            
+        self._evict_disk()
+        
+    def _remember(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            
+    def _evict_disk(self) -> None:
+        while self._disk_bytes > self.max_disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+                
+    def _drop_disk(self, key: str) -> None:
+        size = self._disk.pop(key, None)
+        if size is not None:
+            self._disk_bytes -= size
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+            
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached result
+        
+        Args:
+            key: Cache key from cache_key()
+            
+        Returns:
+            (hit, value); value is None on a miss
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            if key in self._disk:
+                self._disk.move_to_end(key)
+            self.hits += 1
+            return True, self._memory[key]
+            
+        if key in self._disk:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    value = pickle.load(f)
+                os.utime(path)
+            except Exception:
+                # Missing or corrupt entry
+                self._drop_disk(key)
+            else:
+                self._disk.move_to_end(key)
+                self._remember(key, value)
+                self.hits += 1
+                return True, value
+                
+        self.misses += 1
+        return False, None
+        
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a result
+        
+        Args:
+            key: Cache key from cache_key()
+            value: Node result
+        """
+        self._remember(key, value)
+        
+        if not self.cache_dir or key in self._disk:
+            return
+            
+        try:
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Unpicklable results stay memory-only
+            return
+            
+        if len(data) > self.max_disk_bytes:
+            return
+            
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            raise
+            
+        self._disk[key] = len(data)
+        self._disk_bytes += len(data)
+        self._evict_disk()
+        
+    def invalidate(self, key: str) -> None:
+        """
+        Remove a result from both tiers
+        
+        Args:
+            key: Cache key from cache_key()
+        """
+        self._memory.pop(key, None)
+        if key in self._disk:
+            self._drop_disk(key)
+            
+    def clear(self) -> None:
+        """Remove every cached result"""
+        self._memory.clear()
+        for key in list(self._disk):
+            self._drop_disk(key)
+            
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics
+        
+        Returns:
+            Dict with hit counts and tier sizes
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+        }
@@ -9,11 +9,16 @@ Reference: AI-enhanced observability with automatic anomaly detection [4]
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 import uuid
 import statistics
 import math
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class AnomalyDetectionStrategy(Enum):
     """Strategies for detecting anomalies"""
@@ -45,6 +50,33 @@ class AnomalySeverity(Enum):
     CRITICAL = "critical"
 
 
+# Batch detection methods, in tie-break order
+BATCH_METHODS = ("zscore", "ewma", "threshold", "rate", "seasonal")
+
+_STRATEGY_BATCH_METHODS = {
+    AnomalyDetectionStrategy.STATISTICAL: ("zscore", "ewma"),
+    AnomalyDetectionStrategy.THRESHOLD: ("threshold",),
+    AnomalyDetectionStrategy.RATE_LIMIT: ("rate",),
+    AnomalyDetectionStrategy.PATTERN: ("seasonal",),
+    AnomalyDetectionStrategy.HYBRID: BATCH_METHODS,
+}
+
+_METHOD_STRATEGIES = {
+    "zscore": AnomalyDetectionStrategy.STATISTICAL,
+    "ewma": AnomalyDetectionStrategy.STATISTICAL,
+    "threshold": AnomalyDetectionStrategy.THRESHOLD,
+    "rate": AnomalyDetectionStrategy.RATE_LIMIT,
+    "seasonal": AnomalyDetectionStrategy.PATTERN,
+}
+
+# Seasonal spreads at or below this fraction of max(1, |expected|) are
+# rounding error from a flat phase and are treated as zero
+_FLAT_SPREAD_TOLERANCE = 1e-9
+
+# (series index, time index, method, value, expected value, deviation, confidence)
+_Cell = Tuple[int, int, str, float, float, float, float]
+
+
 @dataclass
 class DetectedAnomaly:
     """A detected anomaly"""
@@ -333,6 +365,354 @@ class SmartAnomalyDetector:
         
         return None
     
+    def detect_batch(
+        self,
+        metric_names: Sequence[str],
+        samples: Any,
+        timestamps: Optional[Sequence[datetime]] = None,
+        strategy: Optional[AnomalyDetectionStrategy] = None,
+        ewma_alpha: float = 0.3,
+        max_rate_change: float = 0.5,
+        season_length: Optional[int] = None,
+        learn: bool = True
+    ) -> List[DetectedAnomaly]:
+        """
+        Detect anomalies across many series at once
+        
+        samples is a (series x time) matrix, one row per entry of
+        metric_names, oldest sample first. Each cell is scored by z-score
+        against the series baseline, deviation from the EWMA of earlier
+        samples, threshold violation, rate of change from the previous
+        sample and deviation from the same phase in other seasons (when
+        season_length is given). With NumPy installed the scoring is
+        vectorised across all series.
+        
+        Only flagged cells are returned, one anomaly per cell using the
+        most confident method. Series without a learned baseline use their
+        own row statistics once the row has min_samples values.
+        
+        Args:
+            metric_names: Metric name of each row
+            samples: Matrix of values, shape (len(metric_names), T)
+            timestamps: Optional timestamp of each column
+            strategy: Strategy selecting the methods (default strategy if None)
+            ewma_alpha: Smoothing factor of the EWMA
+            max_rate_change: Relative change flagged by the rate method
+            season_length: Samples per season for the seasonal method
+            learn: Append the samples to history and relearn baselines
+        
+        Returns:
+            Detected anomalies for the flagged cells
+        """
+        strategy = strategy or self._default_strategy
+        methods = _STRATEGY_BATCH_METHODS.get(strategy, ())
+        if season_length is None or season_length < 1:
+            methods = tuple(m for m in methods if m != "seasonal")
+        
+        if np is not None:
+            matrix = np.asarray(samples, dtype=np.float64)
+            if matrix.ndim != 2 or matrix.shape[0] != len(metric_names):
+                raise ValueError("samples must have one row per metric name")
+            cells = self._batch_cells_numpy(
+                metric_names, matrix, methods, ewma_alpha, max_rate_change, season_length
+            ) if matrix.size and methods else []
+            rows = matrix.tolist() if learn else None
+        else:
+            rows = [[float(v) for v in row] for row in samples]
+            if len(rows) != len(metric_names) or len({len(row) for row in rows}) > 1:
+                raise ValueError("samples must have one row per metric name")
+            cells = self._batch_cells_python(
+                metric_names, rows, methods, ewma_alpha, max_rate_change, season_length
+            ) if rows and rows[0] and methods else []
+        
+        categories: Dict[str, AnomalyCategory] = {}
+        anomalies = [
+            self._batch_anomaly(metric_names, timestamps, categories, *cell) for cell in cells
+        ]
+        
+        if learn:
+            self._learn_rows(metric_names, rows)
+        
+        return anomalies
+    
+    def _series_baseline(self, metric_name: str, row: Sequence[float]) -> Dict[str, Optional[float]]:
+        """Baseline for a batch row: learned if present, else row statistics"""
+        baseline = self._baselines.get(metric_name)
+        if baseline:
+            return baseline
+        if len(row) >= max(self._min_samples, 2):
+            mean = math.fsum(row) / len(row)
+            stdev = math.sqrt(math.fsum((v - mean) ** 2 for v in row) / (len(row) - 1))
+            return {'mean': mean, 'stdev': stdev, 'min': None, 'max': None}
+        return {'mean': None, 'stdev': None, 'min': None, 'max': None}
+    
+    def _batch_cells_numpy(
+        self,
+        metric_names: Sequence[str],
+        matrix: Any,
+        methods: Sequence[str],
+        ewma_alpha: float,
+        max_rate_change: float,
+        season_length: Optional[int]
+    ) -> List[_Cell]:
+        """Score every cell with vectorised NumPy and return the flagged ones"""
+        n_series, n_times = matrix.shape
+        nan = np.nan
+        
+        mean = np.full(n_series, nan)
+        stdev = np.full(n_series, nan)
+        lower = np.full(n_series, nan)
+        upper = np.full(n_series, nan)
+        last = np.full(n_series, nan)
+        unlearned = np.zeros(n_series, dtype=bool)
+        
+        for i, name in enumerate(metric_names):
+            baseline = self._baselines.get(name)
+            if baseline:
+                mean[i] = baseline['mean']
+                stdev[i] = baseline['stdev']
+                if baseline.get('min') is not None:
+                    lower[i] = baseline['min']
+                if baseline.get('max') is not None:
+                    upper[i] = baseline['max']
+            else:
+                unlearned[i] = True
+            history = self._history.get(name)
+            if history:
+                last[i] = history[-1]
+        
+        if n_times >= max(self._min_samples, 2) and unlearned.any():
+            mean[unlearned] = matrix[unlearned].mean(axis=1)
+            stdev[unlearned] = matrix[unlearned].std(axis=1, ddof=1)
+        stdev[stdev == 0] = nan
+        
+        confidence = np.full((len(methods), n_series, n_times), -1.0)
+        deviation = np.zeros_like(confidence)
+        expected = np.zeros_like(confidence)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for k, method in enumerate(methods):
+                if method == "zscore":
+                    exp = np.broadcast_to(mean[:, None], matrix.shape)
+                    dev = np.abs(matrix - exp) / stdev[:, None]
+                    flag = dev > self._sensitivity
+                    conf = np.minimum(1.0, dev / 5.0)
+                
+                elif method == "ewma":
+                    exp = np.empty_like(matrix)
+                    level = np.where(np.isnan(mean), matrix[:, 0], mean)
+                    for t in range(n_times):
+                        exp[:, t] = level
+                        level = ewma_alpha * matrix[:, t] + (1 - ewma_alpha) * level
+                    dev = np.abs(matrix - exp) / stdev[:, None]
+                    flag = dev > self._sensitivity
+                    conf = np.minimum(1.0, dev / 5.0)
+                
+                elif method == "threshold":
+                    below = matrix < lower[:, None]
+                    above = matrix > upper[:, None]
+                    exp = np.where(below, lower[:, None], upper[:, None])
+                    dev = np.abs(matrix - exp) / np.maximum(np.abs(exp), 1.0)
+                    flag = below | above
+                    conf = np.full(matrix.shape, 0.9)
+                
+                elif method == "rate":
+                    exp = np.empty_like(matrix)
+                    exp[:, 0] = last
+                    exp[:, 1:] = matrix[:, :-1]
+                    exp[exp == 0] = nan
+                    dev = np.abs(matrix - exp) / np.abs(exp)
+                    flag = dev > max_rate_change
+                    conf = np.full(matrix.shape, 0.8)
+                
+                else:  # seasonal: predict from the same phase in the other seasons
+                    exp = np.full_like(matrix, nan)
+                    spread = np.full_like(matrix, nan)
+                    for phase in range(min(season_length, n_times)):
+                        cols = matrix[:, phase::season_length]
+                        others = cols.shape[1] - 1
+                        if others < 3:
+                            continue
+                        # Leave-one-out mean and variance over the other seasons,
+                        # computed directly so a flat phase gives exactly zero
+                        keep = ~np.eye(others + 1, dtype=bool)
+                        rest = cols[:, None, :].repeat(others + 1, axis=1)[:, keep]
+                        rest = rest.reshape(n_series, others + 1, others)
+                        exp[:, phase::season_length] = rest.mean(axis=2)
+                        spread[:, phase::season_length] = np.sqrt(
+                            rest.var(axis=2, ddof=1) * (1 + 1 / others)
+                        )
+                    spread[spread <= _FLAT_SPREAD_TOLERANCE * np.maximum(1.0, np.abs(exp))] = nan
+                    dev = np.abs(matrix - exp) / spread
+                    flag = dev > self._sensitivity
+                    conf = np.minimum(1.0, dev / 5.0)
+                
+                confidence[k] = np.where(flag, conf, -1.0)
+                deviation[k] = dev
+                expected[k] = exp
+        
+        best = confidence.argmax(axis=0)
+        best_conf = np.take_along_axis(confidence, best[None], axis=0)[0]
+        series_idx, time_idx = np.nonzero(best_conf >= 0)
+        picks = best[series_idx, time_idx]
+        
+        return list(zip(
+            series_idx.tolist(),
+            time_idx.tolist(),
+            [methods[k] for k in picks.tolist()],
+            matrix[series_idx, time_idx].tolist(),
+            expected[picks, series_idx, time_idx].tolist(),
+            deviation[picks, series_idx, time_idx].tolist(),
+            best_conf[series_idx, time_idx].tolist(),
+            strict=True,
+        ))
+    
+    def _batch_cells_python(
+        self,
+        metric_names: Sequence[str],
+        rows: List[List[float]],
+        methods: Sequence[str],
+        ewma_alpha: float,
+        max_rate_change: float,
+        season_length: Optional[int]
+    ) -> List[_Cell]:
+        """Pure-Python equivalent of _batch_cells_numpy"""
+        cells: List[_Cell] = []
+        
+        for i, (name, row) in enumerate(zip(metric_names, rows, strict=True)):
+            baseline = self._series_baseline(name, row)
+            mean = baseline.get('mean')
+            stdev = baseline.get('stdev') or None
+            lower = baseline.get('min')
+            upper = baseline.get('max')
+            history = self._history.get(name)
+            
+            seasonal = None
+            if "seasonal" in methods:
+                seasonal = []
+                for t, _value in enumerate(row):
+                    others = [row[u] for u in range(t % season_length, len(row), season_length) if u != t]
+                    if len(others) < 3:
+                        seasonal.append((None, None))
+                        continue
+                    loo_mean = math.fsum(others) / len(others)
+                    loo_var = math.fsum((v - loo_mean) ** 2 for v in others) / (len(others) - 1)
+                    spread = math.sqrt(loo_var * (1 + 1 / len(others)))
+                    if spread <= _FLAT_SPREAD_TOLERANCE * max(1.0, abs(loo_mean)):
+                        spread = None
+                    seasonal.append((loo_mean, spread))
+            
+            level = mean if mean is not None else row[0]
+            for t, value in enumerate(row):
+                best = None
+                for method in methods:
+                    exp = dev = conf = None
+                    
+                    if method == "zscore" and stdev and mean is not None:
+                        exp = mean
+                        dev = abs(value - mean) / stdev
+                        conf = min(1.0, dev / 5.0) if dev > self._sensitivity else None
+                    elif method == "ewma" and stdev:
+                        exp = level
+                        dev = abs(value - level) / stdev
+                        conf = min(1.0, dev / 5.0) if dev > self._sensitivity else None
+                    elif method == "threshold":
+                        if lower is not None and value < lower:
+                            exp = lower
+                        elif upper is not None and value > upper:
+                            exp = upper
+                        if exp is not None:
+                            dev = abs(value - exp) / max(abs(exp), 1.0)
+                            conf = 0.9
+                    elif method == "rate":
+                        prev = row[t - 1] if t else (history[-1] if history else None)
+                        if prev:
+                            exp = prev
+                            dev = abs(value - prev) / abs(prev)
+                            conf = 0.8 if dev > max_rate_change else None
+                    elif method == "seasonal":
+                        exp, spread = seasonal[t]
+                        if spread:
+                            dev = abs(value - exp) / spread
+                            conf = min(1.0, dev / 5.0) if dev > self._sensitivity else None
+                    
+                    if conf is not None and (best is None or conf > best[6]):
+                        best = (i, t, method, value, exp, dev, conf)
+                
+                if best:
+                    cells.append(best)
+                level = ewma_alpha * value + (1 - ewma_alpha) * level
+        
+        return cells
+    
+    def _batch_anomaly(
+        self,
+        metric_names: Sequence[str],
+        timestamps: Optional[Sequence[datetime]],
+        categories: Dict[str, AnomalyCategory],
+        series: int,
+        time: int,
+        method: str,
+        value: float,
+        expected: float,
+        deviation: float,
+        confidence: float
+    ) -> DetectedAnomaly:
+        """Build the anomaly for one flagged batch cell"""
+        metric_name = metric_names[series]
+        if metric_name not in categories:
+            categories[metric_name] = self._get_category(metric_name)
+        
+        if method == "threshold":
+            direction = 'below' if value < expected else 'above'
+            description = f"Threshold violation: {metric_name} = {value:.2f} is {direction} threshold {expected:.2f}"
+        elif method == "rate":
+            description = f"Rate change anomaly: {metric_name} changed {deviation*100:.1f}% from {expected:.2f} to {value:.2f}"
+        elif method == "seasonal":
+            description = f"Seasonal anomaly: {metric_name} = {value:.2f} (expected {expected:.2f} for this phase, {deviation:.2f} std devs)"
+        elif method == "ewma":
+            description = f"EWMA anomaly: {metric_name} = {value:.2f} (smoothed {expected:.2f}, {deviation:.2f} std devs)"
+        else:
+            description = f"Statistical anomaly: {metric_name} = {value:.2f} (expected {expected:.2f}, z-score {deviation:.2f})"
+        
+        severity_deviation = deviation * 2 if method == "rate" else deviation
+        
+        anomaly = DetectedAnomaly(
+            metric_name=metric_name,
+            category=categories[metric_name],
+            severity=self._calculate_severity(severity_deviation, confidence),
+            strategy_used=_METHOD_STRATEGIES[method],
+            current_value=value,
+            expected_value=expected,
+            deviation=deviation,
+            confidence=confidence,
+            description=description,
+            context={'method': method, 'series_index': series, 'time_index': time}
+        )
+        if timestamps is not None:
+            anomaly.timestamp = timestamps[time]
+        return anomaly
+    
+    def _learn_rows(self, metric_names: Sequence[str], rows: List[List[float]]) -> None:
+        """Append batch rows to history and relearn baselines once per series"""
+        max_samples = 1000
+        for name, row in zip(metric_names, rows, strict=True):
+            history = self._history.setdefault(name, [])
+            history.extend(row)
+            if len(history) > max_samples:
+                del history[:-max_samples]
+            if len(history) < self._min_samples:
+                continue
+            
+            n = len(history)
+            mean = math.fsum(history) / n
+            self._baselines[name] = {
+                'mean': mean,
+                'stdev': math.sqrt(math.fsum((v - mean) ** 2 for v in history) / (n - 1)) if n > 1 else 0.0,
+                'min': min(history),
+                'max': max(history)
+            }
+    
     def get_anomalies(self) -> List[DetectedAnomaly]:
         """Get all detected anomalies"""
         return self._anomalies.copy()
@@ -9,11 +9,18 @@ detect anomalies, neutralize risks, and learn from each incident [5]
 
 from enum import Enum, auto
 from typing import Any, Callable, Dict, List, Optional, Tuple
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from array import array
+import math
 import statistics
 import asyncio
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class AnomalyType(Enum):
     """Types of anomalies"""
@@ -61,38 +68,182 @@ class AnomalyAlert:
 
 @dataclass
 class MetricWindow:
-    """Sliding window of metric values"""
-    values: List[float] = field(default_factory=list)
-    timestamps: List[datetime] = field(default_factory=list)
+    """
+    Sliding window of metric values
+    
+    A fixed-capacity ring buffer of float values and epoch-second timestamps.
+    Mean and variance are maintained incrementally (Welford, with removal of
+    evicted values), so add() and the statistics are O(1). get_recent() binary
+    searches the timestamps, which are assumed non-decreasing; an out-of-order
+    timestamp switches the window to linear scans.
+    """
     max_size: int = 1000
     
+    def __post_init__(self):
+        self._values = array("d", bytes(8 * self.max_size))
+        self._times = array("d", bytes(8 * self.max_size))
+        self._start = 0
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._ordered = True
+        self._evictions = 0
+    
+    def __len__(self) -> int:
+        return self._count
+    
+    def _index(self, i: int) -> int:
+        """Physical index of the i-th oldest entry"""
+        return (self._start + i) % self.max_size
+    
+    def _recompute(self) -> None:
+        """Recompute statistics exactly to shed accumulated rounding error"""
+        values = self.values
+        self._mean = statistics.fmean(values) if values else 0.0
+        self._m2 = sum((v - self._mean) ** 2 for v in values)
+        self._evictions = 0
+    
     def add(self, value: float, timestamp: Optional[datetime] = None) -> None:
         """Add a value to the window"""
-        self.values.append(value)
-        self.timestamps.append(timestamp or datetime.now())
+        value = float(value)
+        ts = (timestamp or datetime.now()).timestamp()
+        
+        if self._count and ts < self._times[self._index(self._count - 1)]:
+            self._ordered = False
         
-        # Trim if needed
-        if len(self.values) > self.max_size:
-            self.values = self.values[-self.max_size:]
-            self.timestamps = self.timestamps[-self.max_size:]
+        if self._count == self.max_size:
+            # Overwrite the oldest entry and remove it from the statistics
+            old = self._values[self._start]
+            self._values[self._start] = value
+            self._times[self._start] = ts
+            self._start = (self._start + 1) % self.max_size
+            
+            n = self._count
+            if n == 1:
+                self._mean, self._m2 = value, 0.0
+                return
+            mean_without = self._mean - (old - self._mean) / (n - 1)
+            self._m2 -= (old - self._mean) * (old - mean_without)
+            delta = value - mean_without
+            self._mean = mean_without + delta / n
+            self._m2 += delta * (value - self._mean)
+            
+            self._evictions += 1
+            if self._evictions >= self.max_size:
+                self._recompute()
+            return
+        
+        i = self._index(self._count)
+        self._values[i] = value
+        self._times[i] = ts
+        self._count += 1
+        
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+    
+    def extend(
+        self,
+        values: List[float],
+        timestamps: Optional[List[datetime]] = None,
+    ) -> None:
+        """Add many values at once, vectorised when NumPy is available"""
+        if np is None or len(values) < 2:
+            now = datetime.now()
+            for i, value in enumerate(values):
+                self.add(value, timestamps[i] if timestamps else now)
+            return
+        
+        new_values = np.asarray(values, dtype=np.float64)[-self.max_size:]
+        if timestamps:
+            new_times = np.fromiter(
+                (t.timestamp() for t in timestamps), dtype=np.float64, count=len(timestamps)
+            )[-self.max_size:]
+        else:
+            new_times = np.full(len(new_values), datetime.now().timestamp())
+        
+        last = self._times[self._index(self._count - 1)] if self._count else -np.inf
+        if new_times[0] < last or np.any(np.diff(new_times) < 0):
+            self._ordered = False
+        
+        # Write at most two contiguous slices of the ring
+        ring_values = np.frombuffer(self._values, dtype=np.float64)
+        ring_times = np.frombuffer(self._times, dtype=np.float64)
+        n = len(new_values)
+        pos = self._index(self._count)
+        first = min(n, self.max_size - pos)
+        ring_values[pos:pos + first] = new_values[:first]
+        ring_times[pos:pos + first] = new_times[:first]
+        ring_values[:n - first] = new_values[first:]
+        ring_times[:n - first] = new_times[first:]
+        
+        overflow = max(0, self._count + n - self.max_size)
+        self._start = (self._start + overflow) % self.max_size
+        self._count = min(self._count + n, self.max_size)
+        
+        ordered = np.roll(ring_values, -self._start)[:self._count]
+        self._mean = float(ordered.mean())
+        self._m2 = float(((ordered - self._mean) ** 2).sum())
+        self._evictions = 0
+    
+    def _first_at_or_after(self, ts: float) -> int:
+        """Logical index of the first entry with timestamp >= ts"""
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._times[self._index(mid)] < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
     
     def get_recent(self, seconds: float) -> List[float]:
         """Get values from the last N seconds"""
-        cutoff = datetime.now() - timedelta(seconds=seconds)
+        cutoff = (datetime.now() - timedelta(seconds=seconds)).timestamp()
+        if not self._ordered:
+            return [
+                self._values[self._index(i)] for i in range(self._count)
+                if self._times[self._index(i)] >= cutoff
+            ]
+        first = self._first_at_or_after(cutoff)
+        return [self._values[self._index(i)] for i in range(first, self._count)]
+    
+    def count_recent(self, seconds: float) -> int:
+        """Count values from the last N seconds without copying them"""
+        if not self._ordered:
+            return len(self.get_recent(seconds))
+        cutoff = (datetime.now() - timedelta(seconds=seconds)).timestamp()
+        return self._count - self._first_at_or_after(cutoff)
+    
+    @property
+    def values(self) -> List[float]:
+        """Values in the window, oldest first"""
+        return [self._values[self._index(i)] for i in range(self._count)]
+    
+    @property
+    def timestamps(self) -> List[datetime]:
+        """Timestamps in the window, oldest first"""
         return [
-            v for v, t in zip(self.values, self.timestamps)
-            if t >= cutoff
+            datetime.fromtimestamp(self._times[self._index(i)])
+            for i in range(self._count)
         ]
     
+    @property
+    def latest(self) -> Optional[float]:
+        """Most recently added value"""
+        return self._values[self._index(self._count - 1)] if self._count else None
+    
     @property
     def mean(self) -> float:
         """Calculate mean of values"""
-        return statistics.mean(self.values) if self.values else 0.0
+        return self._mean if self._count else 0.0
     
     @property
     def std_dev(self) -> float:
         """Calculate standard deviation"""
-        return statistics.stdev(self.values) if len(self.values) > 1 else 0.0
+        if self._count < 2:
+            return 0.0
+        return math.sqrt(max(self._m2, 0.0) / (self._count - 1))
 
 
 class AnomalyDetector:
@@ -214,16 +365,118 @@ class AnomalyDetector:
         
         return anomaly
     
+    async def record_many(
+        self,
+        metric_name: str,
+        values: List[float],
+        timestamps: Optional[List[datetime]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[AnomalyAlert]:
+        """
+        Record a batch of metric values and check them for anomalies
+        
+        Every value is compared against the window statistics as they stood
+        before the batch, which lets the checks run as one vectorised pass
+        (with NumPy installed) instead of once per value. Rate limits are
+        checked once, after the whole batch has been added.
+        
+        Args:
+            metric_name: Name of the metric
+            values: Values to record, oldest first
+            timestamps: Optional timestamp per value
+            metadata: Optional metadata
+        
+        Returns:
+            Alerts for the anomalous values
+        """
+        if not len(values):
+            return []
+        
+        if metric_name not in self._metrics:
+            self._metrics[metric_name] = MetricWindow()
+            self._thresholds[metric_name] = {
+                "strategy": DetectionStrategy.STATISTICAL,
+                "std_dev_factor": 2.0
+            }
+        
+        window = self._metrics[metric_name]
+        config = self._thresholds[metric_name]
+        baseline = (len(window), window.mean, window.std_dev)
+        
+        flagged = self._batch_candidates(values, config, baseline)
+        window.extend(values, timestamps)
+        
+        last = len(values) - 1
+        rate_limit = config.get("rate_limit")
+        if rate_limit and window.count_recent(rate_limit[1]) > rate_limit[0]:
+            if not flagged or flagged[-1] != last:
+                flagged.append(last)
+        
+        alerts = []
+        for i in flagged:
+            anomaly = await self._detect_anomaly(
+                metric_name, float(values[i]), config, metadata,
+                baseline=baseline, check_rate=(i == last),
+            )
+            if anomaly:
+                self._alerts.append(anomaly)
+                await self._notify_handlers(anomaly)
+                alerts.append(anomaly)
+        
+        return alerts
+    
+    def _batch_candidates(
+        self,
+        values: List[float],
+        config: Dict[str, Any],
+        baseline: Tuple[int, float, float]
+    ) -> List[int]:
+        """Indices of values failing a threshold or statistical check"""
+        threshold = config.get("threshold")
+        min_val = config.get("min")
+        max_val = config.get("max")
+        count, mean, std_dev = baseline
+        factor = config.get("std_dev_factor", 2.0)
+        statistical = (
+            config.get("strategy", DetectionStrategy.STATISTICAL)
+            in [DetectionStrategy.STATISTICAL, DetectionStrategy.HYBRID]
+            and count >= 10 and std_dev > 0
+        )
+        
+        if np is not None:
+            batch = np.asarray(values, dtype=np.float64)
+            mask = np.zeros(len(batch), dtype=bool)
+            if threshold is not None:
+                mask |= batch > threshold
+            if min_val is not None:
+                mask |= batch < min_val
+            if max_val is not None:
+                mask |= batch > max_val
+            if statistical:
+                mask |= np.abs(batch - mean) / std_dev > factor
+            return np.flatnonzero(mask).tolist()
+        
+        return [
+            i for i, value in enumerate(values)
+            if (threshold is not None and value > threshold)
+            or (min_val is not None and value < min_val)
+            or (max_val is not None and value > max_val)
+            or (statistical and abs(value - mean) / std_dev > factor)
+        ]
+    
     async def _detect_anomaly(
         self,
         metric_name: str,
         value: float,
         config: Dict[str, Any],
-        metadata: Optional[Dict[str, Any]]
+        metadata: Optional[Dict[str, Any]],
+        baseline: Optional[Tuple[int, float, float]] = None,
+        check_rate: bool = True
     ) -> Optional[AnomalyAlert]:
         """Detect if value is anomalous"""
         strategy = config.get("strategy", DetectionStrategy.STATISTICAL)
         window = self._metrics[metric_name]
+        count, mean, std_dev = baseline or (len(window), window.mean, window.std_dev)
         
         is_anomaly = False
         anomaly_type = AnomalyType.VALUE_ANOMALY
@@ -251,9 +504,7 @@ class AnomalyDetector:
         
         # Statistical check
         if strategy in [DetectionStrategy.STATISTICAL, DetectionStrategy.HYBRID]:
-            if len(window.values) >= 10:
-                mean = window.mean
-                std_dev = window.std_dev
+            if count >= 10:
                 factor = config.get("std_dev_factor", 2.0)
                 
                 if std_dev > 0:
@@ -267,15 +518,15 @@ class AnomalyDetector:
         
         # Rate limit check
         rate_limit = config.get("rate_limit")
-        if rate_limit:
-            count, seconds = rate_limit
-            recent = window.get_recent(seconds)
-            if len(recent) > count:
+        if rate_limit and check_rate:
+            limit, seconds = rate_limit
+            recent = window.count_recent(seconds)
+            if recent > limit:
                 is_anomaly = True
                 anomaly_type = AnomalyType.RATE_ANOMALY
-                description = f"Rate limit exceeded: {len(recent)} events in {seconds}s (limit: {count})"
-                details["rate_count"] = len(recent)
-                details["rate_limit"] = count
+                description = f"Rate limit exceeded: {recent} events in {seconds}s (limit: {limit})"
+                details["rate_count"] = recent
+                details["rate_limit"] = limit
                 details["rate_window"] = seconds
         
         if not is_anomaly:
@@ -403,14 +654,15 @@ class AnomalyDetector:
         """Get summary of all monitored metrics"""
         summary = {}
         for name, window in self._metrics.items():
-            if window.values:
+            if len(window):
+                values = window.values
                 summary[name] = {
-                    "count": len(window.values),
+                    "count": len(window),
                     "mean": window.mean,
                     "std_dev": window.std_dev,
-                    "min": min(window.values),
-                    "max": max(window.values),
-                    "latest": window.values[-1] if window.values else None
+                    "min": min(values),
+                    "max": max(values),
+                    "latest": window.latest
                 }
         return summary
     
@@ -2,16 +2,25 @@
 Checkpoint Manager for HLP Executor Core
 
 Implements checkpoint creation, compression, restoration, and cleanup
-functionality with copy-on-write strategy and retention policies.
+functionality with structural sharing and retention policies.
 
 This module provides checkpoint management for safe state restoration
 in case of failures during execution.
+
+Checkpoints do not keep their state resident. Each top-level state entry is
+serialized once and stored as a content-addressed, reference-counted blob
+(gzip-compressed when compression is enabled), so entries unchanged between
+successive checkpoints are stored only once. With a storage_path the blobs
+are spilled to disk and read back through memory maps. State is only
+decompressed and rebuilt when a checkpoint is restored.
 """
 
 import gzip
 import hashlib
 import json
 import logging
+import mmap
+import zlib
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -32,35 +41,132 @@ class CheckpointStatus(Enum):
 
 @dataclass
 class Checkpoint:
-    """Represents a checkpoint for state restoration."""
+    """
+    Represents a checkpoint for state restoration.
+    
+    Checkpoints created by CheckpointManager carry no state; manifest maps
+    each top-level state key to the digest of its stored value.
+    """
     checkpoint_id: str
     execution_id: str
     phase_id: str
     timestamp: datetime
-    state: dict[str, Any]
+    state: dict[str, Any] | None
     status: CheckpointStatus = CheckpointStatus.CREATED
     compressed: bool = False
     compressed_size: int | None = None
     original_size: int = 0
     checksum: str = ""
     metadata: dict[str, Any] = field(default_factory=dict)
+    manifest: dict[str, str] = field(default_factory=dict)
 
     def __post_init__(self):
         """Calculate checksum after initialization."""
-        if not self.checksum:
+        if not self.checksum and self.state is not None:
             state_str = json.dumps(self.state, sort_keys=True)
             self.checksum = hashlib.sha256(state_str.encode()).hexdigest()
             self.original_size = len(state_str.encode())
 
 
+class _BlobStore:
+    """
+    Reference-counted, content-addressed store of serialized state entries.
+    
+    Blobs are kept in memory, or written under a directory and read back
+    through memory maps when one is given.
+    """
+    
+    def __init__(self, directory: Path | None = None):
+        self.directory = directory
+        self._blobs: dict[str, bytes] = {}
+        self._compressed: dict[str, bool] = {}
+        self._sizes: dict[str, int] = {}
+        self._refs: dict[str, int] = {}
+        
+        if directory is not None:
+            directory.mkdir(parents=True, exist_ok=True)
+    
+    def _path(self, digest: str) -> Path:
+        suffix = ".json.gz" if self._compressed[digest] else ".json"
+        return self.directory / f"{digest}{suffix}"
+    
+    def _write(self, digest: str, data: bytes, compress: bool) -> None:
+        if compress:
+            data = gzip.compress(data, compresslevel=6, mtime=0)
+        self._compressed[digest] = compress
+        self._sizes[digest] = len(data)
+        
+        if self.directory is None:
+            self._blobs[digest] = data
+            return
+        
+        path = self._path(digest)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_bytes(data)
+        tmp.replace(path)
+    
+    def put(self, digest: str, data: bytes, compress: bool) -> None:
+        """Store a blob, or add a reference if it already exists."""
+        if digest in self._refs:
+            self._refs[digest] += 1
+            return
+        self._write(digest, data, compress)
+        self._refs[digest] = 1
+    
+    def get(self, digest: str) -> bytes:
+        """Read and decompress a blob, verifying its digest."""
+        compressed = self._compressed[digest]
+        
+        if self.directory is None:
+            data = self._blobs[digest]
+            data = zlib.decompress(data, wbits=31) if compressed else data
+        else:
+            with open(self._path(digest), "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                data = zlib.decompress(mapped, wbits=31) if compressed else bytes(mapped)
+        
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Corrupt checkpoint blob: {digest}")
+        return data
+    
+    def compress(self, digest: str) -> None:
+        """Compress a blob stored uncompressed."""
+        if self._compressed[digest]:
+            return
+        data = self.get(digest)
+        old_path = self._path(digest) if self.directory is not None else None
+        self._write(digest, data, compress=True)
+        if old_path is not None:
+            old_path.unlink(missing_ok=True)
+    
+    def release(self, digest: str) -> None:
+        """Drop a reference, deleting the blob when none remain."""
+        refs = self._refs.get(digest, 0) - 1
+        if refs > 0:
+            self._refs[digest] = refs
+            return
+        
+        if self.directory is not None and digest in self._compressed:
+            self._path(digest).unlink(missing_ok=True)
+        self._refs.pop(digest, None)
+        self._blobs.pop(digest, None)
+        self._compressed.pop(digest, None)
+        self._sizes.pop(digest, None)
+    
+    def size(self, digest: str) -> int:
+        """Stored size of a blob in bytes."""
+        return self._sizes.get(digest, 0)
+
+
 class CheckpointManager:
     """
     Manages checkpoint lifecycle including creation, compression, restoration,
     and cleanup with configurable retention policies.
     
     Features:
-    - Copy-on-Write strategy for efficient storage
+    - Structural sharing of unchanged state entries between checkpoints
     - Automatic compression with gzip
+    - Optional spill to storage_path with memory-mapped reads
     - Retention policy (keep last N checkpoints)
     - Checksum verification
     - Automatic cleanup of old checkpoints
@@ -77,7 +183,7 @@ class CheckpointManager:
         Initialize the CheckpointManager.
         
         Args:
-            storage_path: Path to store checkpoints (optional, uses in-memory if None)
+            storage_path: Path to spill checkpoint data to (optional, uses in-memory if None)
             retention_count: Number of recent checkpoints to retain per execution
             compression_enabled: Whether to compress checkpoints automatically
             auto_cleanup: Whether to automatically clean up old checkpoints
@@ -87,8 +193,10 @@ class CheckpointManager:
         self.compression_enabled = compression_enabled
         self.auto_cleanup = auto_cleanup
         
-        # In-memory storage
+        # Checkpoint metadata; state lives in the blob store
         self._checkpoints: dict[str, list[Checkpoint]] = {}
+        self._index: dict[str, Checkpoint] = {}
+        self._blobs = _BlobStore(Path(storage_path) / "blobs" if storage_path else None)
         
         logger.info(
             "CheckpointManager initialized: storage_path=%s, retention=%d, compression=%s",
@@ -106,29 +214,40 @@ class CheckpointManager:
         """
         Create a checkpoint for the current state.
         
-        Uses copy-on-write strategy to avoid unnecessary data duplication.
+        The state is serialized once per top-level entry; entries identical
+        to ones already stored are shared rather than stored again.
         Automatically compresses if enabled.
         
         Args:
             execution_id: Unique execution identifier
             phase_id: Phase identifier
-            state: Current state to checkpoint (will be deep copied)
+            state: Current state to checkpoint (must be JSON-serializable)
         
         Returns:
             Checkpoint ID
         """
         checkpoint_id = self._generate_checkpoint_id(execution_id, phase_id)
         
-        # Deep copy state using copy-on-write strategy
-        state_copy = self._copy_on_write(state)
+        entries = self._serialize_entries(state)
+        manifest = {}
+        for key, value_json in entries.items():
+            data = value_json.encode('utf-8')
+            digest = hashlib.sha256(data).hexdigest()
+            self._blobs.put(digest, data, compress=self.compression_enabled)
+            manifest[key] = digest
+        
+        state_bytes = self._join_entries(entries).encode('utf-8')
         
         checkpoint = Checkpoint(
             checkpoint_id=checkpoint_id,
             execution_id=execution_id,
             phase_id=phase_id,
             timestamp=datetime.utcnow(),
-            state=state_copy,
-            status=CheckpointStatus.CREATED
+            state=None,
+            status=CheckpointStatus.CREATED,
+            original_size=len(state_bytes),
+            checksum=hashlib.sha256(state_bytes).hexdigest(),
+            manifest=manifest
         )
         
         # Store checkpoint
@@ -136,6 +255,7 @@ class CheckpointManager:
             self._checkpoints[execution_id] = []
         
         self._checkpoints[execution_id].append(checkpoint)
+        self._index[checkpoint_id] = checkpoint
         
         # Compress if enabled
         if self.compression_enabled:
@@ -172,7 +292,8 @@ class CheckpointManager:
         """
         Restore state from a checkpoint.
         
-        Verifies checksum before restoration.
+        Decompresses the checkpoint's entries and verifies the checksum
+        before restoration. Each call returns a fresh copy of the state.
         
         Args:
             checkpoint_id: Checkpoint identifier
@@ -188,12 +309,14 @@ class CheckpointManager:
         if not checkpoint:
             raise ValueError(f"Checkpoint not found: {checkpoint_id}")
         
-        # Decompress if compressed
-        if checkpoint.compressed:
-            self._decompress_checkpoint(checkpoint)
+        # Decompress lazily, only the entries of this checkpoint
+        state_json = self._join_entries({
+            key: self._blobs.get(digest).decode('utf-8')
+            for key, digest in checkpoint.manifest.items()
+        })
         
         # Verify checksum
-        if not self._verify_checksum(checkpoint):
+        if not self._verify_checksum(checkpoint, state_json):
             raise ValueError(f"Checksum verification failed for checkpoint: {checkpoint_id}")
         
         # Update status
@@ -206,8 +329,7 @@ class CheckpointManager:
             checkpoint.phase_id
         )
         
-        # Return deep copy to prevent modification
-        return self._copy_on_write(checkpoint.state)
+        return json.loads(state_json)
     
     def cleanup_old_checkpoints(
         self,
@@ -245,6 +367,7 @@ class CheckpointManager:
         
         # Mark removed checkpoints as deleted
         for checkpoint in to_remove:
+            self._discard(checkpoint)
             checkpoint.status = CheckpointStatus.DELETED
         
         removed_count = len(to_remove)
@@ -262,6 +385,8 @@ class CheckpointManager:
         """
         Compress a checkpoint using gzip.
         
+        Entries shared with other checkpoints are compressed for all of them.
+        
         Args:
             checkpoint_id: Checkpoint identifier
         
@@ -280,20 +405,20 @@ class CheckpointManager:
             logger.debug("Checkpoint already compressed: %s", checkpoint_id)
             return checkpoint.compressed_size or 0
         
-        # Serialize state
-        state_json = json.dumps(checkpoint.state, sort_keys=True)
-        state_bytes = state_json.encode('utf-8')
+        for digest in checkpoint.manifest.values():
+            self._blobs.compress(digest)
         
-        # Compress
-        compressed_data = gzip.compress(state_bytes, compresslevel=6)
-        compressed_size = len(compressed_data)
+        compressed_size = sum(self._blobs.size(digest) for digest in checkpoint.manifest.values())
         
         # Update checkpoint
         checkpoint.compressed = True
         checkpoint.compressed_size = compressed_size
         checkpoint.status = CheckpointStatus.COMPRESSED
         
-        compression_ratio = (1 - compressed_size / checkpoint.original_size) * 100
+        compression_ratio = (
+            (1 - compressed_size / checkpoint.original_size) * 100
+            if checkpoint.original_size else 0
+        )
         
         logger.info(
             "Compressed checkpoint: %s (original=%d bytes, compressed=%d bytes, ratio=%.1f%%)",
@@ -309,6 +434,9 @@ class CheckpointManager:
         """
         Get statistics about checkpoints for an execution.
         
+        stored_size counts each shared entry once, so it is the actual
+        storage used by the execution's checkpoints.
+        
         Args:
             execution_id: Execution identifier
         
@@ -322,12 +450,15 @@ class CheckpointManager:
                 "execution_id": execution_id,
                 "total_checkpoints": 0,
                 "total_size": 0,
-                "compressed_size": 0
+                "compressed_size": 0,
+                "stored_size": 0
             }
         
         total_size = sum(cp.original_size for cp in checkpoints)
         compressed_size = sum(cp.compressed_size or 0 for cp in checkpoints if cp.compressed)
         compressed_count = sum(1 for cp in checkpoints if cp.compressed)
+        digests = {digest for cp in checkpoints for digest in cp.manifest.values()}
+        stored_size = sum(self._blobs.size(digest) for digest in digests)
         
         return {
             "execution_id": execution_id,
@@ -335,6 +466,7 @@ class CheckpointManager:
             "compressed_checkpoints": compressed_count,
             "total_size": total_size,
             "compressed_size": compressed_size,
+            "stored_size": stored_size,
             "compression_ratio": (1 - compressed_size / total_size) * 100 if total_size > 0 else 0,
             "oldest_checkpoint": min(cp.timestamp for cp in checkpoints),
             "newest_checkpoint": max(cp.timestamp for cp in checkpoints)
@@ -343,49 +475,46 @@ class CheckpointManager:
     def _generate_checkpoint_id(self, execution_id: str, phase_id: str) -> str:
         """Generate a unique checkpoint ID."""
         timestamp = int(datetime.utcnow().timestamp() * 1000)
-        return f"cp_{execution_id}_{phase_id}_{timestamp}"
+        checkpoint_id = f"cp_{execution_id}_{phase_id}_{timestamp}"
+        
+        suffix = 1
+        unique_id = checkpoint_id
+        while unique_id in self._index:
+            unique_id = f"{checkpoint_id}_{suffix}"
+            suffix += 1
+        return unique_id
     
-    def _copy_on_write(self, state: dict[str, Any]) -> dict[str, Any]:
+    def _serialize_entries(self, state: dict[str, Any]) -> dict[str, str]:
         """
-        Implement copy-on-write strategy for state.
+        Serialize each top-level state entry to canonical JSON.
         
-        Creates a deep copy of the state to prevent shared references.
+        Non-string keys are normalized the way JSON would store them.
         """
-        return json.loads(json.dumps(state))
+        if not all(isinstance(key, str) for key in state):
+            state = json.loads(json.dumps(state))
+        return {key: json.dumps(state[key], sort_keys=True) for key in state}
+    
+    def _join_entries(self, entries: dict[str, str]) -> str:
+        """Join serialized entries into json.dumps(state, sort_keys=True) form."""
+        return "{" + ", ".join(
+            f"{json.dumps(key)}: {entries[key]}" for key in sorted(entries)
+        ) + "}"
     
     def _find_checkpoint_by_id(self, checkpoint_id: str) -> Checkpoint | None:
         """Find a checkpoint by its ID across all executions."""
-        for checkpoints in self._checkpoints.values():
-            for checkpoint in checkpoints:
-                if checkpoint.checkpoint_id == checkpoint_id:
-                    return checkpoint
-        return None
+        return self._index.get(checkpoint_id)
     
-    def _verify_checksum(self, checkpoint: Checkpoint) -> bool:
-        """Verify the checksum of a checkpoint."""
-        state_str = json.dumps(checkpoint.state, sort_keys=True)
-        calculated_checksum = hashlib.sha256(state_str.encode()).hexdigest()
+    def _verify_checksum(self, checkpoint: Checkpoint, state_json: str) -> bool:
+        """Verify the checksum of a checkpoint's serialized state."""
+        calculated_checksum = hashlib.sha256(state_json.encode()).hexdigest()
         return calculated_checksum == checkpoint.checksum
     
-    def _decompress_checkpoint(self, checkpoint: Checkpoint) -> None:
-        """
-        Decompress a checkpoint state.
-        
-        In a production implementation with persistent storage, this would:
-        1. Read compressed data from storage
-        2. Decompress using gzip.decompress()
-        3. Deserialize JSON back to state dict
-        
-        For in-memory storage, state is already decompressed.
-        """
-        # For in-memory storage, state is already available
-        # In production with file storage, implement:
-        # 1. Read compressed file from self.storage_path
-        # 2. compressed_data = read_file(checkpoint_file)
-        # 3. decompressed = gzip.decompress(compressed_data)
-        # 4. checkpoint.state = json.loads(decompressed)
-        logger.debug("Decompressing checkpoint: %s", checkpoint.checkpoint_id)
-        checkpoint.compressed = False
+    def _discard(self, checkpoint: Checkpoint) -> None:
+        """Drop a checkpoint from the index and release its stored entries."""
+        self._index.pop(checkpoint.checkpoint_id, None)
+        for digest in checkpoint.manifest.values():
+            self._blobs.release(digest)
+        checkpoint.manifest = {}
     
     def delete_checkpoint(self, checkpoint_id: str) -> bool:
         """
@@ -397,14 +526,15 @@ class CheckpointManager:
         Returns:
             True if deleted, False if not found
         """
-        for execution_id, checkpoints in self._checkpoints.items():
-            for i, checkpoint in enumerate(checkpoints):
-                if checkpoint.checkpoint_id == checkpoint_id:
-                    checkpoint.status = CheckpointStatus.DELETED
-                    checkpoints.pop(i)
-                    logger.info("Deleted checkpoint: %s", checkpoint_id)
-                    return True
-        return False
+        checkpoint = self._index.get(checkpoint_id)
+        if checkpoint is None:
+            return False
+        
+        self._checkpoints[checkpoint.execution_id].remove(checkpoint)
+        self._discard(checkpoint)
+        checkpoint.status = CheckpointStatus.DELETED
+        logger.info("Deleted checkpoint: %s", checkpoint_id)
+        return True
     
     def cleanup_expired_checkpoints(self, max_age_days: int = 7) -> int:
         """
@@ -425,6 +555,7 @@ class CheckpointManager:
             for checkpoint in expired:
                 checkpoint.status = CheckpointStatus.EXPIRED
                 checkpoints.remove(checkpoint)
+                self._discard(checkpoint)
                 removed_count += 1
             
             # Remove empty execution entries
@@ -22,11 +22,16 @@ from enterprise.data.metrics import (
     MetricsCollector,
 )
 from enterprise.data.storage import (
+    CleanupProgress,
+    LocalStorageBackend,
     ObjectStorage,
     StorageLocation,
     StorageObject,
 )
+from enterprise.data.storage_metadata import SQLiteObjectMetadataStore
 from enterprise.data.tracing import (
+    BatchSpanExporter,
+    SamplingMode,
     Span,
     SpanContext,
     Tracer,
@@ -47,8 +52,13 @@ __all__ = [
     "ObjectStorage",
     "StorageObject",
     "StorageLocation",
+    "LocalStorageBackend",
+    "SQLiteObjectMetadataStore",
+    "CleanupProgress",
     # Tracing
     "Tracer",
     "Span",
     "SpanContext",
+    "BatchSpanExporter",
+    "SamplingMode",
 ]
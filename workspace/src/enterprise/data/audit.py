@@ -10,17 +10,42 @@ Records "who changed what when" for enterprise compliance:
 This is a HARD requirement for enterprise customers.
 """
 
+import csv
+import io
 import json
 import logging
+import zlib
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Any, Protocol
 from uuid import UUID, uuid4
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
 logger = logging.getLogger(__name__)
 
 
+# Formats and compressions understood by AuditLogger.stream_audit_log
+EXPORT_FORMATS = ("json", "ndjson", "csv", "parquet")
+EXPORT_COMPRESSIONS = ("none", "gzip", "zstd")
+
+
 class AuditAction(Enum):
     """Audit action categories"""
     # Authentication
@@ -227,6 +252,18 @@ class AuditStorage(Protocol):
         """Get a specific entry"""
         ...
 
+    async def query_after(
+        self,
+        query: AuditQuery,
+        after: tuple[datetime, UUID] | None = None,
+        limit: int = 1000,
+    ) -> list[AuditEntry]:
+        """
+        Keyset page: entries ordered by (timestamp, id) strictly after
+        the cursor (optional; exports fall back to offset paging)
+        """
+        ...
+
 
 class AuditExporter(Protocol):
     """Interface for exporting audit logs"""
@@ -240,6 +277,134 @@ class AuditExporter(Protocol):
         ...
 
 
+def _dumps(value: Any) -> bytes:
+    """Compact JSON encoding, using orjson when installed"""
+    if orjson is not None:
+        return orjson.dumps(value, default=str)
+    return json.dumps(value, default=str, separators=(",", ":")).encode("utf-8")
+
+
+class _ExportEncoder:
+    """Incremental encoder for one export format"""
+
+    def __init__(self, format: str):
+        self.format = format
+        self._started = False
+        self._columns: list[str] | None = None
+        self._parquet_sink: _ChunkSink | None = None
+        self._parquet_writer = None
+
+    def encode(self, rows: list[dict[str, Any]]) -> bytes:
+        """Encode a page of rows"""
+        if not rows:
+            return b""
+        if self.format == "ndjson":
+            return b"".join(_dumps(row) + b"\n" for row in rows)
+        if self.format == "json":
+            prefix = b"," if self._started else b"["
+            self._started = True
+            return prefix + b",".join(_dumps(row) for row in rows)
+        if self.format == "csv":
+            return self._encode_csv(rows)
+        return self._encode_parquet(rows)
+
+    def finish(self) -> bytes:
+        """Encode whatever closes the document"""
+        if self.format == "json":
+            return b"]" if self._started else b"[]"
+        if self.format == "parquet" and self._parquet_writer is not None:
+            self._parquet_writer.close()
+            return self._parquet_sink.drain()
+        return b""
+
+    def _encode_csv(self, rows: list[dict[str, Any]]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if self._columns is None:
+            self._columns = list(rows[0])
+            writer.writerow(self._columns)
+        for row in rows:
+            writer.writerow([
+                _dumps(value).decode("utf-8") if isinstance(value, (dict, list)) else value
+                for value in (row.get(column) for column in self._columns)
+            ])
+        return buffer.getvalue().encode("utf-8")
+
+    def _encode_parquet(self, rows: list[dict[str, Any]]) -> bytes:
+        # One row group per page. Every AuditEntry.to_dict value is a
+        # string or None once nested values are JSON-encoded, so the schema
+        # is fixed and never depends on which columns a page left empty.
+        if self._parquet_writer is None:
+            self._columns = list(rows[0])
+            self._parquet_sink = _ChunkSink()
+            self._parquet_writer = pyarrow.parquet.ParquetWriter(
+                self._parquet_sink,
+                pyarrow.schema([(name, pyarrow.string()) for name in self._columns]),
+            )
+
+        columns = {
+            name: [
+                _dumps(value).decode("utf-8") if isinstance(value, (dict, list))
+                else None if value is None else str(value)
+                for value in (row.get(name) for row in rows)
+            ]
+            for name in self._columns
+        }
+        self._parquet_writer.write_table(
+            pyarrow.table(columns, schema=self._parquet_writer.schema)
+        )
+        return self._parquet_sink.drain()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands written bytes back in chunks"""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        # Parquet records absolute offsets, so report bytes written so far
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _Compressor:
+    """Streaming compressor for one export compression"""
+
+    def __init__(self, compression: str):
+        if compression == "gzip":
+            self._compressor = zlib.compressobj(wbits=31)  # gzip container
+        elif compression == "zstd":
+            self._compressor = zstandard.ZstdCompressor().compressobj()
+        else:
+            self._compressor = None
+
+    def compress(self, data: bytes) -> bytes:
+        if self._compressor is None or not data:
+            return data
+        return self._compressor.compress(data)
+
+    def finish(self) -> bytes:
+        if self._compressor is None:
+            return b""
+        return self._compressor.flush()
+
+
 @dataclass
 class AuditLogger:
     """
@@ -269,6 +434,9 @@ class AuditLogger:
     # Retention
     retention_days: int = 365
 
+    # Export
+    export_page_size: int = 1000
+
     # ------------------------------------------------------------------
     # Logging Methods
     # ------------------------------------------------------------------
@@ -548,16 +716,14 @@ class AuditLogger:
             Exported data as bytes
         """
         if not self.exporter:
-            # Fallback to simple JSON export
-            query = AuditQuery(
-                org_id=org_id,
-                start_time=start_time,
-                end_time=end_time,
-            )
-            entries = await self.storage.query(query, limit=100000)
-
-            data = [e.to_dict() for e in entries]
-            return json.dumps(data, indent=2).encode("utf-8")
+            # Fallback: page through storage; use stream_audit_log to
+            # avoid holding large exports in memory
+            chunks = []
+            async for chunk in self.stream_audit_log(
+                org_id, start_time, end_time, format=format, compression="none",
+            ):
+                chunks.append(chunk)
+            return b"".join(chunks)
 
         query = AuditQuery(
             org_id=org_id,
@@ -566,6 +732,95 @@ class AuditLogger:
         )
         return await self.exporter.export(query, format)
 
+    async def stream_audit_log(
+        self,
+        org_id: UUID,
+        start_time: datetime,
+        end_time: datetime,
+        format: str = "ndjson",
+        compression: str = "gzip",
+        page_size: int | None = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream an audit log export as compressed bytes
+
+        Pages through storage (keyset-paginated when the storage supports
+        query_after), encoding and compressing one page at a time, so
+        memory is bounded by page_size regardless of export size.
+
+        Args:
+            org_id: Organization to export
+            start_time: Start of period
+            end_time: End of period
+            format: json, ndjson, csv or parquet (requires pyarrow)
+            compression: none, gzip or zstd (requires zstandard)
+            page_size: Entries per storage page
+
+        Yields:
+            Chunks of the encoded, compressed export
+        """
+        if format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format: {format}")
+        if compression not in EXPORT_COMPRESSIONS:
+            raise ValueError(f"Unsupported export compression: {compression}")
+        if format == "parquet" and pyarrow is None:
+            raise ValueError("Parquet export requires pyarrow")
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression requires zstandard")
+
+        query = AuditQuery(
+            org_id=org_id,
+            start_time=start_time,
+            end_time=end_time,
+        )
+        encoder = _ExportEncoder(format)
+        compressor = _Compressor(compression)
+        exported = 0
+
+        async for page in self._iter_pages(query, page_size or self.export_page_size):
+            exported += len(page)
+            chunk = compressor.compress(encoder.encode([e.to_dict() for e in page]))
+            if chunk:
+                yield chunk
+
+        chunk = compressor.compress(encoder.finish()) + compressor.finish()
+        if chunk:
+            yield chunk
+
+        logger.info(
+            f"Audit log exported: org={org_id} entries={exported} "
+            f"format={format} compression={compression}"
+        )
+
+    async def _iter_pages(
+        self,
+        query: AuditQuery,
+        page_size: int,
+    ) -> AsyncIterator[list[AuditEntry]]:
+        """Page through matching entries, by keyset cursor when supported"""
+        query_after = getattr(self.storage, "query_after", None)
+
+        if query_after is not None:
+            after = None
+            while True:
+                page = await query_after(query, after=after, limit=page_size)
+                if not page:
+                    return
+                yield page
+                if len(page) < page_size:
+                    return
+                after = (page[-1].timestamp, page[-1].id)
+
+        offset = 0
+        while True:
+            page = await self.storage.query(query, offset, page_size)
+            if not page:
+                return
+            yield page
+            if len(page) < page_size:
+                return
+            offset += len(page)
+
     # ------------------------------------------------------------------
     # Private Methods
     # ------------------------------------------------------------------
@@ -239,6 +239,7 @@ class MetricsCollector:
     queue_latency_seconds: Histogram = field(default=None)
     jobs_processed_total: Counter = field(default=None)
     jobs_failed_total: Counter = field(default=None)
+    job_duration_seconds: Histogram = field(default=None)
 
     # Provider API metrics
     provider_api_requests_total: Counter = field(default=None)
@@ -354,6 +355,14 @@ class MetricsCollector:
             _backend=self.backend,
         )
 
+        self.job_duration_seconds = Histogram(
+            name=f"{self.prefix}_job_duration_seconds",
+            description="Job handler execution duration",
+            labels=["queue", "job_type"],
+            buckets=[0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300, 600],
+            _backend=self.backend,
+        )
+
         # Provider API metrics
         self.provider_api_requests_total = Counter(
             name=f"{self.prefix}_provider_api_requests_total",
@@ -521,3 +530,29 @@ class MetricsCollector:
         """Update queue depth gauge"""
         labels = MetricLabels(queue=queue)
         self.queue_depth.set(float(depth), labels)
+
+    def record_job_processed(
+        self,
+        queue: str,
+        job_type: str,
+        status: str,
+        duration_seconds: float,
+        queue_latency_seconds: float | None = None,
+    ) -> None:
+        """Record a processed job with its handler and queue latency"""
+        if self.backend:
+            self.backend.counter_inc(
+                f"{self.prefix}_jobs_processed_total",
+                1,
+                {"queue": queue, "job_type": job_type, "status": status},
+            )
+            self.backend.histogram_observe(
+                f"{self.prefix}_job_duration_seconds",
+                duration_seconds,
+                {"queue": queue, "job_type": job_type},
+            )
+        if queue_latency_seconds is not None:
+            self.queue_latency_seconds.observe(
+                queue_latency_seconds,
+                MetricLabels(queue=queue),
+            )
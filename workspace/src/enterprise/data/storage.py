@@ -10,18 +10,33 @@ Stores reports, artifacts, and raw results:
 Uses S3/MinIO/GCS compatible storage.
 """
 
+import asyncio
 import hashlib
+import inspect
+import json
 import logging
 import mimetypes
+import os
+import shutil
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, Protocol
+from pathlib import Path
+from typing import Any, BinaryIO, Protocol
 from uuid import UUID, uuid4
 
 logger = logging.getLogger(__name__)
 
 
+# S3 DeleteObjects accepts at most 1000 keys per request
+MAX_BULK_DELETE_KEYS = 1000
+
+# Anything store_*_stream accepts: raw bytes, a (sync or async) file
+# object, or a (sync or async) iterable of byte chunks
+ByteSource = bytes | BinaryIO | AsyncIterable[bytes] | Iterable[bytes]
+
+
 class StorageClass(Enum):
     """Storage class for cost optimization"""
     STANDARD = "standard"              # Frequently accessed
@@ -106,6 +121,9 @@ class StorageObject:
     # Tags
     tags: dict[str, str] = field(default_factory=dict)
 
+    # Shared content-addressed blob (may be referenced by other objects)
+    content_addressed: bool = False
+
     def to_dict(self) -> dict[str, Any]:
         """Convert to dictionary"""
         return {
@@ -124,6 +142,7 @@ class StorageObject:
             "created_at": self.created_at.isoformat(),
             "expires_at": self.expires_at.isoformat() if self.expires_at else None,
             "tags": self.tags,
+            "content_addressed": self.content_addressed,
         }
 
 
@@ -195,6 +214,60 @@ class StorageBackend(Protocol):
         """Copy an object"""
         ...
 
+    # Bulk delete (optional; without it objects are deleted one by one)
+
+    async def delete_objects(
+        self,
+        bucket: str,
+        keys: list[str],
+    ) -> list[str]:
+        """Delete up to MAX_BULK_DELETE_KEYS objects; returns the keys deleted"""
+        ...
+
+    # Multipart upload (optional; without it streams are buffered and
+    # uploaded with put_object)
+
+    async def create_multipart_upload(
+        self,
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        metadata: dict[str, str] | None = None,
+        storage_class: str = "STANDARD",
+    ) -> str:
+        """Start a multipart upload and return its upload ID"""
+        ...
+
+    async def upload_part(
+        self,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        part_number: int,
+        data: bytes,
+    ) -> str:
+        """Upload one part and return its ETag"""
+        ...
+
+    async def complete_multipart_upload(
+        self,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        parts: list[dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Assemble uploaded parts ([{PartNumber, ETag}]) into the object"""
+        ...
+
+    async def abort_multipart_upload(
+        self,
+        bucket: str,
+        key: str,
+        upload_id: str,
+    ) -> None:
+        """Discard a multipart upload and its parts"""
+        ...
+
 
 class ObjectMetadataStore(Protocol):
     """Interface for storing object metadata"""
@@ -227,6 +300,115 @@ class ObjectMetadataStore(Protocol):
     async def delete(self, obj_id: UUID) -> bool:
         ...
 
+    # Optional: lets content-addressed blobs be deleted with their last reference
+    async def count_by_location(self, bucket: str, key: str) -> int:
+        ...
+
+    # Optional: bulk metadata deletion
+    async def delete_many(self, obj_ids: list[UUID]) -> int:
+        ...
+
+    # Optional: expiry index, ordered by (expires_at, id), paginated by
+    # passing the last (expires_at, id) seen as after
+    async def list_expired(
+        self,
+        before: datetime,
+        limit: int = 1000,
+        org_id: UUID | None = None,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[StorageObject]:
+        ...
+
+
+@dataclass
+class CleanupProgress:
+    """Live progress of an expiry cleanup pass"""
+    dry_run: bool = True
+    scanned: int = 0
+    deleted: int = 0
+    failed: int = 0
+    batches: int = 0
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: datetime | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.finished_at is not None
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to dictionary"""
+        return {
+            "dry_run": self.dry_run,
+            "scanned": self.scanned,
+            "deleted": self.deleted,
+            "failed": self.failed,
+            "batches": self.batches,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+@dataclass
+class _UploadResult:
+    """Where an upload ended up"""
+    key: str
+    size: int
+    checksum: str
+    version_id: str | None
+    deduplicated: bool = False
+
+
+async def _iter_source(source: ByteSource, read_size: int) -> AsyncIterator[bytes]:
+    """Yield byte chunks from any supported source"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield bytes(source)
+        return
+
+    read = getattr(source, "read", None)
+    if read is not None:
+        is_async = inspect.iscoroutinefunction(read)
+        while True:
+            chunk = await read(read_size) if is_async else await asyncio.to_thread(read, read_size)
+            if not chunk:
+                return
+            yield chunk
+
+    elif hasattr(source, "__aiter__"):
+        async for chunk in source:
+            yield chunk
+
+    else:
+        for chunk in source:
+            yield chunk
+
+
+async def _iter_parts(source: ByteSource, part_size: int) -> AsyncIterator[bytes]:
+    """Re-chunk a source into parts of exactly part_size (the last may be short)"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for offset in range(0, len(view), part_size):
+            yield bytes(view[offset:offset + part_size])
+        return
+
+    buffer = bytearray()
+    async for chunk in _iter_source(source, part_size):
+        buffer.extend(chunk)
+        while len(buffer) >= part_size:
+            yield bytes(buffer[:part_size])
+            del buffer[:part_size]
+    if buffer:
+        yield bytes(buffer)
+
+
+async def _chain_parts(
+    head: list[bytes],
+    rest: AsyncIterator[bytes],
+) -> AsyncIterator[bytes]:
+    for part in head:
+        yield part
+    async for part in rest:
+        yield part
+
 
 @dataclass
 class ObjectStorage:
@@ -256,6 +438,24 @@ class ObjectStorage:
     default_retention_days: int = 90
     report_retention_days: int = 365
 
+    # Streaming uploads: parts of part_size bytes, at most
+    # max_concurrent_parts in flight (S3 requires parts >= 5 MiB)
+    part_size: int = 8 * 1024 * 1024
+    max_concurrent_parts: int = 4
+
+    # Content-addressed deduplication: identical content within an org is
+    # stored once under its SHA-256, and metadata objects point at it
+    dedup: bool = False
+    cas_path_template: str = "orgs/{org_id}/cas/{checksum}"
+    staging_path_template: str = "orgs/{org_id}/staging/{upload_id}"
+
+    # Expiry cleanup
+    cleanup_batch_size: int = MAX_BULK_DELETE_KEYS
+    cleanup_max_objects_per_second: float = 500.0  # 0 disables pacing
+
+    cleanup_progress: CleanupProgress | None = field(default=None, init=False)
+    _cleanup_task: asyncio.Task | None = field(default=None, init=False, repr=False)
+
     # ------------------------------------------------------------------
     # Upload Operations
     # ------------------------------------------------------------------
@@ -283,6 +483,25 @@ class ObjectStorage:
         Returns:
             Stored object metadata
         """
+        return await self.store_artifact_stream(
+            org_id, run_id, filename, data, content_type=content_type, tags=tags,
+        )
+
+    async def store_artifact_stream(
+        self,
+        org_id: UUID,
+        run_id: UUID,
+        filename: str,
+        source: ByteSource,
+        content_type: str | None = None,
+        tags: dict[str, str] | None = None,
+    ) -> StorageObject:
+        """
+        Store a run artifact from a stream
+
+        The source is hashed incrementally and uploaded in parts, so
+        memory use is bounded by part_size * (max_concurrent_parts + 1).
+        """
         # Auto-detect content type
         if not content_type:
             content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
@@ -294,42 +513,42 @@ class ObjectStorage:
             filename=filename,
         )
 
-        # Calculate checksum
-        checksum = hashlib.sha256(data).hexdigest()
-
-        # Upload to backend
-        result = await self.backend.put_object(
+        upload = await self._upload(
+            org_id=org_id,
             bucket=self.default_bucket,
             key=key,
-            data=data,
+            source=source,
             content_type=content_type,
             metadata={
                 "org-id": str(org_id),
                 "run-id": str(run_id),
-                "checksum": checksum,
             },
         )
 
         # Create metadata object
         obj = StorageObject(
-            location=StorageLocation(bucket=self.default_bucket, key=key),
+            location=StorageLocation(bucket=self.default_bucket, key=upload.key),
             org_id=org_id,
             filename=filename,
             content_type=content_type,
-            size_bytes=len(data),
-            checksum=checksum,
+            size_bytes=upload.size,
+            checksum=upload.checksum,
             object_type="artifact",
             run_id=run_id,
-            version_id=result.get("VersionId"),
+            version_id=upload.version_id,
             expires_at=datetime.utcnow() + timedelta(days=self.default_retention_days),
             tags=tags or {},
+            content_addressed=self.dedup,
         )
 
         # Store metadata
         if self.metadata_store:
             obj = await self.metadata_store.save(obj)
 
-        logger.info(f"Artifact stored: {key} ({len(data)} bytes)")
+        logger.info(
+            f"Artifact stored: {upload.key} ({upload.size} bytes"
+            f"{', deduplicated' if upload.deduplicated else ''})"
+        )
 
         return obj
 
@@ -348,6 +567,22 @@ class ObjectStorage:
 
         Reports are stored in a separate bucket with longer retention.
         """
+        return await self.store_report_stream(
+            org_id, filename, data,
+            run_id=run_id, repo_id=repo_id, content_type=content_type, tags=tags,
+        )
+
+    async def store_report_stream(
+        self,
+        org_id: UUID,
+        filename: str,
+        source: ByteSource,
+        run_id: UUID | None = None,
+        repo_id: UUID | None = None,
+        content_type: str = "application/json",
+        tags: dict[str, str] | None = None,
+    ) -> StorageObject:
+        """Store a report from a stream"""
         now = datetime.utcnow()
 
         key = self.report_path_template.format(
@@ -357,12 +592,11 @@ class ObjectStorage:
             filename=filename,
         )
 
-        checksum = hashlib.sha256(data).hexdigest()
-
-        await self.backend.put_object(
+        upload = await self._upload(
+            org_id=org_id,
             bucket=self.report_bucket,
             key=key,
-            data=data,
+            source=source,
             content_type=content_type,
             metadata={
                 "org-id": str(org_id),
@@ -372,24 +606,25 @@ class ObjectStorage:
         )
 
         obj = StorageObject(
-            location=StorageLocation(bucket=self.report_bucket, key=key),
+            location=StorageLocation(bucket=self.report_bucket, key=upload.key),
             org_id=org_id,
             filename=filename,
             content_type=content_type,
-            size_bytes=len(data),
-            checksum=checksum,
+            size_bytes=upload.size,
+            checksum=upload.checksum,
             object_type="report",
             run_id=run_id,
             repo_id=repo_id,
             storage_class=StorageClass.STANDARD,
             expires_at=datetime.utcnow() + timedelta(days=self.report_retention_days),
             tags=tags or {},
+            content_addressed=self.dedup,
         )
 
         if self.metadata_store:
             obj = await self.metadata_store.save(obj)
 
-        logger.info(f"Report stored: {key}")
+        logger.info(f"Report stored: {upload.key}")
 
         return obj
 
@@ -406,27 +641,46 @@ class ObjectStorage:
 
         Exports have shorter retention and presigned URL access.
         """
+        return await self.store_export_stream(
+            org_id, filename, data,
+            content_type=content_type, expires_in_days=expires_in_days,
+        )
+
+    async def store_export_stream(
+        self,
+        org_id: UUID,
+        filename: str,
+        source: ByteSource,
+        content_type: str = "application/json",
+        expires_in_days: int = 7,
+    ) -> StorageObject:
+        """
+        Store an export file from a stream
+
+        Exports are never deduplicated: each gets its own key so its
+        presigned URL and expiry are independent.
+        """
         key = self.export_path_template.format(
             org_id=org_id,
             filename=filename,
         )
 
-        checksum = hashlib.sha256(data).hexdigest()
-
-        await self.backend.put_object(
+        upload = await self._upload(
+            org_id=org_id,
             bucket=self.default_bucket,
             key=key,
-            data=data,
+            source=source,
             content_type=content_type,
+            dedup=False,
         )
 
         obj = StorageObject(
-            location=StorageLocation(bucket=self.default_bucket, key=key),
+            location=StorageLocation(bucket=self.default_bucket, key=upload.key),
             org_id=org_id,
             filename=filename,
             content_type=content_type,
-            size_bytes=len(data),
-            checksum=checksum,
+            size_bytes=upload.size,
+            checksum=upload.checksum,
             object_type="export",
             expires_at=datetime.utcnow() + timedelta(days=expires_in_days),
         )
@@ -436,6 +690,150 @@ class ObjectStorage:
 
         return obj
 
+    # ------------------------------------------------------------------
+    # Streaming Upload Internals
+    # ------------------------------------------------------------------
+
+    async def _upload(
+        self,
+        org_id: UUID,
+        bucket: str,
+        key: str,
+        source: ByteSource,
+        content_type: str,
+        metadata: dict[str, str] | None = None,
+        dedup: bool | None = None,
+    ) -> _UploadResult:
+        """
+        Upload a source, deduplicating by checksum when enabled
+
+        Sources that fit in one part are hashed before upload, so a
+        duplicate is never sent. Larger sources are streamed to a staging
+        key (when deduplicating) and moved to their content address once
+        the checksum is known.
+        """
+        dedup = self.dedup if dedup is None else dedup
+        metadata = dict(metadata or {})
+        parts = _iter_parts(source, self.part_size)
+
+        first = await anext(parts, b"")
+        second = await anext(parts, None)
+
+        if second is None:
+            checksum = hashlib.sha256(first).hexdigest()
+            metadata["checksum"] = checksum
+
+            if dedup:
+                key = self.cas_path_template.format(org_id=org_id, checksum=checksum)
+                existing = await self.backend.head_object(bucket, key)
+                if existing is not None:
+                    return _UploadResult(key, len(first), checksum, None, deduplicated=True)
+
+            result = await self.backend.put_object(
+                bucket=bucket,
+                key=key,
+                data=first,
+                content_type=content_type,
+                metadata=metadata,
+            )
+            return _UploadResult(key, len(first), checksum, result.get("VersionId"))
+
+        target = key
+        if dedup:
+            target = self.staging_path_template.format(org_id=org_id, upload_id=uuid4().hex)
+
+        hasher = hashlib.sha256()
+        size, result = await self._upload_parts(
+            bucket, target, _chain_parts([first, second], parts),
+            content_type, metadata, hasher,
+        )
+        checksum = hasher.hexdigest()
+
+        if not dedup:
+            return _UploadResult(key, size, checksum, result.get("VersionId"))
+
+        key = self.cas_path_template.format(org_id=org_id, checksum=checksum)
+        try:
+            deduplicated = await self.backend.head_object(bucket, key) is not None
+            if not deduplicated:
+                await self.backend.copy_object(bucket, target, bucket, key)
+        finally:
+            await self.backend.delete_object(bucket, target)
+
+        return _UploadResult(key, size, checksum, None, deduplicated=deduplicated)
+
+    async def _upload_parts(
+        self,
+        bucket: str,
+        key: str,
+        parts: AsyncIterator[bytes],
+        content_type: str,
+        metadata: dict[str, str],
+        hasher: Any,
+    ) -> tuple[int, dict[str, Any]]:
+        """Multipart upload with bounded concurrency; returns (size, result)"""
+        size = 0
+
+        if not hasattr(self.backend, "create_multipart_upload"):
+            # Backend cannot stream; buffer and upload in one request
+            buffer = bytearray()
+            async for part in parts:
+                hasher.update(part)
+                buffer.extend(part)
+            result = await self.backend.put_object(
+                bucket=bucket,
+                key=key,
+                data=bytes(buffer),
+                content_type=content_type,
+                metadata=metadata,
+            )
+            return len(buffer), result
+
+        upload_id = await self.backend.create_multipart_upload(
+            bucket, key, content_type=content_type, metadata=metadata,
+        )
+        slots = asyncio.Semaphore(self.max_concurrent_parts)
+        tasks: list[asyncio.Task] = []
+
+        async def _send(part_number: int, data: bytes) -> dict[str, Any]:
+            try:
+                etag = await self.backend.upload_part(bucket, key, upload_id, part_number, data)
+                return {"PartNumber": part_number, "ETag": etag}
+            finally:
+                slots.release()
+
+        try:
+            part_number = 0
+            async for part in parts:
+                part_number += 1
+                hasher.update(part)
+                size += len(part)
+
+                # Reading the next part waits for a free slot
+                await slots.acquire()
+                tasks.append(asyncio.create_task(_send(part_number, part)))
+
+                failed = next((t for t in tasks if t.done() and t.exception()), None)
+                if failed is not None:
+                    raise failed.exception()
+
+            uploaded = await asyncio.gather(*tasks)
+            result = await self.backend.complete_multipart_upload(
+                bucket, key, upload_id, list(uploaded),
+            )
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            try:
+                await self.backend.abort_multipart_upload(bucket, key, upload_id)
+            except Exception as e:
+                logger.error(f"Failed to abort multipart upload {upload_id} for {key}: {e}")
+            raise
+
+        logger.debug(f"Multipart upload complete: {key} ({part_number} parts, {size} bytes)")
+        return size, result
+
     # ------------------------------------------------------------------
     # Retrieval Operations
     # ------------------------------------------------------------------
@@ -569,11 +967,8 @@ class ObjectStorage:
         if not obj:
             return False
 
-        # Delete from backend
-        await self.backend.delete_object(obj.location.bucket, obj.location.key)
-
-        # Delete metadata
-        await self.metadata_store.delete(obj_id)
+        if not await self._delete_objects([obj]):
+            return False
 
         logger.info(f"Object deleted: {obj.location.uri}")
 
@@ -586,21 +981,95 @@ class ObjectStorage:
     ) -> int:
         """Delete all artifacts for a run"""
         artifacts = await self.list_artifacts(org_id, run_id)
-        count = 0
-
-        for artifact in artifacts:
-            await self.backend.delete_object(
-                artifact.location.bucket,
-                artifact.location.key,
-            )
-            if self.metadata_store:
-                await self.metadata_store.delete(artifact.id)
-            count += 1
+        count = await self._delete_objects(artifacts)
 
         logger.info(f"Deleted {count} artifacts for run {run_id}")
 
         return count
 
+    async def _delete_objects(self, objects: list[StorageObject]) -> int:
+        """
+        Delete objects' content and metadata in bulk
+
+        Metadata is only removed for objects whose content was deleted,
+        so failures are retried by the next cleanup pass. Returns the
+        number of objects deleted.
+        """
+        if not objects:
+            return 0
+
+        deleted = await self._delete_contents(objects)
+        removed = [obj for obj in objects if obj.id in deleted]
+
+        if self.metadata_store and removed:
+            delete_many = getattr(self.metadata_store, "delete_many", None)
+            if delete_many is not None:
+                await delete_many([obj.id for obj in removed])
+            else:
+                for obj in removed:
+                    await self.metadata_store.delete(obj.id)
+
+        return len(removed)
+
+    async def _delete_contents(self, objects: list[StorageObject]) -> set[UUID]:
+        """
+        Delete objects' content from the backend
+
+        Keys are grouped per bucket and sent in batches of up to
+        MAX_BULK_DELETE_KEYS. Content-addressed blobs are only deleted with
+        their last reference; without a metadata store that can count
+        references they are kept. Returns the IDs whose content is gone.
+        """
+        done: set[UUID] = set()
+        by_bucket: dict[str, dict[str, list[UUID]]] = {}
+
+        shared: dict[tuple[str, str], list[StorageObject]] = {}
+        for obj in objects:
+            if obj.content_addressed:
+                shared.setdefault((obj.location.bucket, obj.location.key), []).append(obj)
+            else:
+                by_bucket.setdefault(obj.location.bucket, {}).setdefault(
+                    obj.location.key, []
+                ).append(obj.id)
+
+        count_by_location = getattr(self.metadata_store, "count_by_location", None)
+        for (bucket, key), refs in shared.items():
+            ids = [obj.id for obj in refs]
+            if count_by_location is None:
+                logger.debug(f"Keeping shared blob without reference counts: s3://{bucket}/{key}")
+                done.update(ids)
+            elif await count_by_location(bucket, key) > len(refs):
+                done.update(ids)
+            else:
+                by_bucket.setdefault(bucket, {}).setdefault(key, []).extend(ids)
+
+        delete_objects = getattr(self.backend, "delete_objects", None)
+
+        for bucket, keys in by_bucket.items():
+            key_list = list(keys)
+            for start in range(0, len(key_list), MAX_BULK_DELETE_KEYS):
+                batch = key_list[start:start + MAX_BULK_DELETE_KEYS]
+
+                if delete_objects is not None:
+                    try:
+                        removed = await delete_objects(bucket, batch)
+                    except Exception as e:
+                        logger.error(f"Bulk delete failed in {bucket} ({len(batch)} keys): {e}")
+                        continue
+                else:
+                    removed = []
+                    for key in batch:
+                        try:
+                            await self.backend.delete_object(bucket, key)
+                            removed.append(key)
+                        except Exception as e:
+                            logger.error(f"Failed to delete s3://{bucket}/{key}: {e}")
+
+                for key in removed:
+                    done.update(keys.get(key, ()))
+
+        return done
+
     # ------------------------------------------------------------------
     # Lifecycle Management
     # ------------------------------------------------------------------
@@ -609,13 +1078,19 @@ class ObjectStorage:
         self,
         org_id: UUID | None = None,
         dry_run: bool = True,
+        progress: CleanupProgress | None = None,
     ) -> int:
         """
         Clean up expired objects
 
+        Walks the metadata store's expiry index in batches of
+        cleanup_batch_size, deleting each batch in bulk and pacing itself
+        to cleanup_max_objects_per_second.
+
         Args:
             org_id: Optional org to limit cleanup
             dry_run: If True, only count without deleting
+            progress: Optional progress record, updated after each batch
 
         Returns:
             Number of objects cleaned up
@@ -624,21 +1099,396 @@ class ObjectStorage:
             logger.warning("Cannot cleanup without metadata store")
             return 0
 
-        # Get all objects for org (or all)
-        if org_id:
-            objects = await self.metadata_store.list_by_org(org_id, limit=10000)
-        else:
-            objects = []  # Would need different query
+        if progress is None:
+            progress = CleanupProgress(dry_run=dry_run)
 
         now = datetime.utcnow()
-        count = 0
 
-        for obj in objects:
-            if obj.expires_at and obj.expires_at < now:
+        try:
+            async for batch in self._expired_batches(org_id, now):
+                progress.scanned += len(batch)
+                progress.batches += 1
+
                 if not dry_run:
-                    await self.delete_object(obj.id)
-                count += 1
+                    deleted = await self._delete_objects(batch)
+                    progress.deleted += deleted
+                    progress.failed += len(batch) - deleted
 
-        logger.info(f"Expired object cleanup: {count} objects (dry_run={dry_run})")
+                logger.debug(f"Expired object cleanup progress: {progress.to_dict()}")
+
+                if self.cleanup_max_objects_per_second > 0:
+                    await asyncio.sleep(len(batch) / self.cleanup_max_objects_per_second)
+        finally:
+            progress.finished_at = datetime.utcnow()
+
+        count = progress.scanned if dry_run else progress.deleted
+        logger.info(
+            f"Expired object cleanup: {count} objects (dry_run={dry_run}, "
+            f"failed={progress.failed})"
+        )
 
         return count
+
+    def start_cleanup(
+        self,
+        org_id: UUID | None = None,
+        dry_run: bool = False,
+    ) -> CleanupProgress:
+        """
+        Run cleanup_expired as a background task
+
+        Returns the live progress record; a pass already running is
+        returned instead of starting a second one.
+        """
+        if self._cleanup_task is not None and not self._cleanup_task.done():
+            return self.cleanup_progress
+
+        self.cleanup_progress = CleanupProgress(dry_run=dry_run)
+        self._cleanup_task = asyncio.get_running_loop().create_task(
+            self.cleanup_expired(org_id, dry_run=dry_run, progress=self.cleanup_progress)
+        )
+        return self.cleanup_progress
+
+    async def wait_for_cleanup(self) -> CleanupProgress | None:
+        """Wait for the background cleanup pass, if any"""
+        if self._cleanup_task is not None:
+            await self._cleanup_task
+        return self.cleanup_progress
+
+    async def _expired_batches(
+        self,
+        org_id: UUID | None,
+        before: datetime,
+    ) -> AsyncIterator[list[StorageObject]]:
+        """Yield expired objects in batches, keyset-paginated over the expiry index"""
+        list_expired = getattr(self.metadata_store, "list_expired", None)
+
+        if list_expired is None:
+            # No expiry index: scan the org's objects
+            if not org_id:
+                return
+            objects = await self.metadata_store.list_by_org(org_id, limit=10000)
+            expired = [obj for obj in objects if obj.expires_at and obj.expires_at < before]
+            for start in range(0, len(expired), self.cleanup_batch_size):
+                yield expired[start:start + self.cleanup_batch_size]
+            return
+
+        after = None
+        while True:
+            batch = await list_expired(
+                before=before,
+                limit=self.cleanup_batch_size,
+                org_id=org_id,
+                after=after,
+            )
+            if not batch:
+                return
+            yield batch
+            if len(batch) < self.cleanup_batch_size:
+                return
+            after = (batch[-1].expires_at, batch[-1].id)
+
+
+# ------------------------------------------------------------------
+# Local Filesystem Backend
+# ------------------------------------------------------------------
+
+@dataclass
+class LocalStorageBackend:
+    """
+    StorageBackend on the local filesystem
+
+    Objects live at <root>/<bucket>/<key>, with metadata in a JSON
+    sidecar under <root>/.meta. Intended for tests and single-node
+    development; presigned URLs are file:// URIs.
+    """
+
+    root: Path
+
+    def __post_init__(self):
+        self.root = Path(self.root)
+
+    async def put_object(
+        self,
+        bucket: str,
+        key: str,
+        data: bytes,
+        content_type: str = "application/octet-stream",
+        metadata: dict[str, str] | None = None,
+        storage_class: str = "STANDARD",
+    ) -> dict[str, Any]:
+        """Upload an object"""
+        def _put() -> dict[str, Any]:
+            path = self._path(bucket, key)
+            self._write_atomic(path, data)
+            etag = hashlib.md5(data).hexdigest()
+            self._write_meta(bucket, key, content_type, metadata, etag, storage_class)
+            return {"ETag": etag}
+
+        return await asyncio.to_thread(_put)
+
+    async def get_object(
+        self,
+        bucket: str,
+        key: str,
+    ) -> bytes:
+        """Download an object"""
+        return await asyncio.to_thread(self._path(bucket, key).read_bytes)
+
+    async def delete_object(
+        self,
+        bucket: str,
+        key: str,
+    ) -> bool:
+        """Delete an object"""
+        def _delete() -> bool:
+            path = self._path(bucket, key)
+            self._meta_path(bucket, key).unlink(missing_ok=True)
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                return False
+            return True
+
+        return await asyncio.to_thread(_delete)
+
+    async def delete_objects(
+        self,
+        bucket: str,
+        keys: list[str],
+    ) -> list[str]:
+        """Delete objects in bulk; missing keys count as deleted, like S3"""
+        def _delete_many() -> list[str]:
+            for key in keys:
+                self._meta_path(bucket, key).unlink(missing_ok=True)
+                self._path(bucket, key).unlink(missing_ok=True)
+            return list(keys)
+
+        return await asyncio.to_thread(_delete_many)
+
+    async def head_object(
+        self,
+        bucket: str,
+        key: str,
+    ) -> dict[str, Any] | None:
+        """Get object metadata"""
+        def _head() -> dict[str, Any] | None:
+            path = self._path(bucket, key)
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                return None
+            meta = self._read_meta(bucket, key)
+            return {
+                "ContentLength": stat.st_size,
+                "ContentType": meta.get("content_type", "application/octet-stream"),
+                "Metadata": meta.get("metadata", {}),
+                "ETag": meta.get("etag", ""),
+                "StorageClass": meta.get("storage_class", "STANDARD"),
+                "LastModified": datetime.utcfromtimestamp(stat.st_mtime),
+            }
+
+        return await asyncio.to_thread(_head)
+
+    async def list_objects(
+        self,
+        bucket: str,
+        prefix: str = "",
+        max_keys: int = 1000,
+    ) -> list[dict[str, Any]]:
+        """List objects with prefix"""
+        def _list() -> list[dict[str, Any]]:
+            base = self.root / bucket
+            if not base.is_dir():
+                return []
+
+            items = []
+            for dirpath, _, filenames in os.walk(base):
+                for name in filenames:
+                    if name.startswith(".") and name.endswith(".tmp"):
+                        continue
+                    path = Path(dirpath) / name
+                    key = path.relative_to(base).as_posix()
+                    if key.startswith(prefix):
+                        items.append({"Key": key, "Size": path.stat().st_size})
+
+            items.sort(key=lambda item: item["Key"])
+            return items[:max_keys]
+
+        return await asyncio.to_thread(_list)
+
+    async def generate_presigned_url(
+        self,
+        bucket: str,
+        key: str,
+        expires_in: int = 3600,  # noqa: ARG002 - file:// URIs do not expire
+        method: str = "GET",  # noqa: ARG002 - file:// URIs are method-agnostic
+    ) -> str:
+        """Generate a presigned URL for temporary access"""
+        return self._path(bucket, key).resolve().as_uri()
+
+    async def copy_object(
+        self,
+        source_bucket: str,
+        source_key: str,
+        dest_bucket: str,
+        dest_key: str,
+    ) -> dict[str, Any]:
+        """Copy an object"""
+        def _copy() -> dict[str, Any]:
+            dest = self._path(dest_bucket, dest_key)
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(self._path(source_bucket, source_key), dest)
+
+            meta = self._read_meta(source_bucket, source_key)
+            self._write_meta(
+                dest_bucket, dest_key,
+                meta.get("content_type", "application/octet-stream"),
+                meta.get("metadata"),
+                meta.get("etag", ""),
+                meta.get("storage_class", "STANDARD"),
+            )
+            return {"ETag": meta.get("etag", "")}
+
+        return await asyncio.to_thread(_copy)
+
+    # ------------------------------------------------------------------
+    # Multipart Upload
+    # ------------------------------------------------------------------
+
+    async def create_multipart_upload(
+        self,
+        bucket: str,
+        key: str,
+        content_type: str = "application/octet-stream",
+        metadata: dict[str, str] | None = None,
+        storage_class: str = "STANDARD",
+    ) -> str:
+        """Start a multipart upload and return its upload ID"""
+        upload_id = uuid4().hex
+
+        def _create() -> None:
+            upload_dir = self._upload_dir(upload_id)
+            upload_dir.mkdir(parents=True)
+            (upload_dir / "upload.json").write_text(json.dumps({
+                "bucket": bucket,
+                "key": key,
+                "content_type": content_type,
+                "metadata": metadata or {},
+                "storage_class": storage_class,
+            }))
+
+        await asyncio.to_thread(_create)
+        return upload_id
+
+    async def upload_part(
+        self,
+        bucket: str,  # noqa: ARG002 - parts are keyed by upload_id alone
+        key: str,  # noqa: ARG002
+        upload_id: str,
+        part_number: int,
+        data: bytes,
+    ) -> str:
+        """Upload one part and return its ETag"""
+        def _upload() -> str:
+            self._write_atomic(self._upload_dir(upload_id) / f"{part_number:05d}.part", data)
+            return hashlib.md5(data).hexdigest()
+
+        return await asyncio.to_thread(_upload)
+
+    async def complete_multipart_upload(
+        self,
+        bucket: str,
+        key: str,
+        upload_id: str,
+        parts: list[dict[str, Any]],
+    ) -> dict[str, Any]:
+        """Assemble uploaded parts into the object"""
+        def _complete() -> dict[str, Any]:
+            upload_dir = self._upload_dir(upload_id)
+            upload = json.loads((upload_dir / "upload.json").read_text())
+
+            path = self._path(bucket, key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{upload_id}.tmp")
+
+            with open(tmp, "wb") as out:
+                for part in sorted(parts, key=lambda p: p["PartNumber"]):
+                    with open(upload_dir / f"{part['PartNumber']:05d}.part", "rb") as src:
+                        shutil.copyfileobj(src, out)
+            os.replace(tmp, path)
+
+            # S3-style multipart ETag: md5 of part digests plus part count
+            digest = hashlib.md5(
+                b"".join(bytes.fromhex(p["ETag"]) for p in parts)
+            ).hexdigest()
+            etag = f"{digest}-{len(parts)}"
+            self._write_meta(
+                bucket, key, upload["content_type"], upload["metadata"], etag,
+                upload.get("storage_class", "STANDARD"),
+            )
+
+            shutil.rmtree(upload_dir, ignore_errors=True)
+            return {"ETag": etag}
+
+        return await asyncio.to_thread(_complete)
+
+    async def abort_multipart_upload(
+        self,
+        bucket: str,  # noqa: ARG002 - parts are keyed by upload_id alone
+        key: str,  # noqa: ARG002
+        upload_id: str,
+    ) -> None:
+        """Discard a multipart upload and its parts"""
+        await asyncio.to_thread(shutil.rmtree, self._upload_dir(upload_id), True)
+
+    # ------------------------------------------------------------------
+    # Paths and Metadata
+    # ------------------------------------------------------------------
+
+    def _path(self, bucket: str, key: str) -> Path:
+        """Resolve an object path, refusing keys that escape the bucket"""
+        base = (self.root / bucket).resolve()
+        path = (base / key).resolve()
+        if base not in path.parents:
+            raise ValueError(f"Invalid object key: {key}")
+        return path
+
+    def _meta_path(self, bucket: str, key: str) -> Path:
+        relative = self._path(bucket, key).relative_to(self.root.resolve())
+        return self.root.resolve() / ".meta" / f"{relative}.json"
+
+    def _upload_dir(self, upload_id: str) -> Path:
+        return self.root / ".multipart" / upload_id
+
+    def _read_meta(self, bucket: str, key: str) -> dict[str, Any]:
+        try:
+            return json.loads(self._meta_path(bucket, key).read_text())
+        except FileNotFoundError:
+            return {}
+
+    def _write_meta(
+        self,
+        bucket: str,
+        key: str,
+        content_type: str,
+        metadata: dict[str, str] | None,
+        etag: str,
+        storage_class: str = "STANDARD",
+    ) -> None:
+        self._write_atomic(
+            self._meta_path(bucket, key),
+            json.dumps({
+                "content_type": content_type,
+                "metadata": metadata or {},
+                "etag": etag,
+                "storage_class": storage_class,
+            }).encode(),
+        )
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid4().hex}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
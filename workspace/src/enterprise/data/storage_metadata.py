@@ -0,0 +1,314 @@
+"""
+SQLite Object Metadata Store
+
+Reference implementation of the ObjectMetadataStore protocol on top of
+the standard-library sqlite3 module.
+
+Features:
+- Expiry index on (expires_at, id) for keyset-paginated cleanup
+- Bulk deletion and reference counts for content-addressed blobs
+- Timestamps stored as epoch seconds so range predicates can use indexes
+- Usable in-process (":memory:") for tests and single-node deployments
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from enterprise.data.storage import StorageClass, StorageLocation, StorageObject
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS storage_objects (
+    id TEXT PRIMARY KEY,
+    org_id TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    key TEXT NOT NULL,
+    region TEXT,
+    filename TEXT NOT NULL,
+    content_type TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    checksum TEXT NOT NULL,
+    checksum_algorithm TEXT NOT NULL,
+    object_type TEXT NOT NULL,
+    run_id TEXT,
+    repo_id TEXT,
+    storage_class TEXT NOT NULL,
+    version_id TEXT,
+    is_latest INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    last_accessed_at REAL,
+    tags TEXT NOT NULL,
+    content_addressed INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_storage_objects_location
+    ON storage_objects (bucket, key);
+
+CREATE INDEX IF NOT EXISTS idx_storage_objects_org
+    ON storage_objects (org_id, object_type, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_storage_objects_run
+    ON storage_objects (run_id) WHERE run_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_storage_objects_expiry
+    ON storage_objects (expires_at, id) WHERE expires_at IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_storage_objects_org_expiry
+    ON storage_objects (org_id, expires_at, id) WHERE expires_at IS NOT NULL;
+"""
+
+_COLUMNS = (
+    "id", "org_id", "bucket", "key", "region", "filename", "content_type",
+    "size_bytes", "checksum", "checksum_algorithm", "object_type", "run_id",
+    "repo_id", "storage_class", "version_id", "is_latest", "created_at",
+    "expires_at", "last_accessed_at", "tags", "content_addressed",
+)
+
+_SELECT_COLUMNS = ", ".join(_COLUMNS)
+
+
+def _to_ts(value: datetime | None) -> float | None:
+    """Convert a naive UTC datetime to epoch seconds"""
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _from_ts(value: float | None) -> datetime | None:
+    """Convert epoch seconds back to a naive UTC datetime"""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, tz=timezone.utc).replace(tzinfo=None)
+
+
+def _object_to_row(obj: StorageObject) -> tuple[Any, ...]:
+    """Serialize an object into a row tuple ordered like _COLUMNS"""
+    return (
+        str(obj.id),
+        str(obj.org_id),
+        obj.location.bucket,
+        obj.location.key,
+        obj.location.region,
+        obj.filename,
+        obj.content_type,
+        obj.size_bytes,
+        obj.checksum,
+        obj.checksum_algorithm,
+        obj.object_type,
+        str(obj.run_id) if obj.run_id else None,
+        str(obj.repo_id) if obj.repo_id else None,
+        obj.storage_class.value,
+        obj.version_id,
+        int(obj.is_latest),
+        _to_ts(obj.created_at),
+        _to_ts(obj.expires_at),
+        _to_ts(obj.last_accessed_at),
+        json.dumps(obj.tags),
+        int(obj.content_addressed),
+    )
+
+
+def _row_to_object(row: sqlite3.Row) -> StorageObject:
+    """Deserialize a row into an object"""
+    return StorageObject(
+        id=UUID(row["id"]),
+        location=StorageLocation(
+            bucket=row["bucket"],
+            key=row["key"],
+            region=row["region"],
+        ),
+        org_id=UUID(row["org_id"]),
+        filename=row["filename"],
+        content_type=row["content_type"],
+        size_bytes=row["size_bytes"],
+        checksum=row["checksum"],
+        checksum_algorithm=row["checksum_algorithm"],
+        object_type=row["object_type"],
+        run_id=UUID(row["run_id"]) if row["run_id"] else None,
+        repo_id=UUID(row["repo_id"]) if row["repo_id"] else None,
+        storage_class=StorageClass(row["storage_class"]),
+        version_id=row["version_id"],
+        is_latest=bool(row["is_latest"]),
+        created_at=_from_ts(row["created_at"]),
+        expires_at=_from_ts(row["expires_at"]),
+        last_accessed_at=_from_ts(row["last_accessed_at"]),
+        tags=json.loads(row["tags"]),
+        content_addressed=bool(row["content_addressed"]),
+    )
+
+
+@dataclass
+class SQLiteObjectMetadataStore:
+    """
+    SQLite-backed ObjectMetadataStore
+
+    All statements run in a worker thread behind a lock so the event loop
+    is never blocked on disk I/O.
+    """
+
+    path: str = ":memory:"
+
+    _conn: sqlite3.Connection = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        """Open the database and create the schema"""
+        self._conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,  # autocommit; each statement is atomic
+        )
+        self._conn.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _execute(self, sql: str, params: tuple[Any, ...] = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    async def _run(self, sql: str, params: tuple[Any, ...] = ()) -> list[sqlite3.Row]:
+        return await asyncio.to_thread(self._execute, sql, params)
+
+    # ------------------------------------------------------------------
+    # ObjectMetadataStore protocol
+    # ------------------------------------------------------------------
+
+    async def save(self, obj: StorageObject) -> StorageObject:
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        await self._run(
+            f"INSERT OR REPLACE INTO storage_objects ({_SELECT_COLUMNS}) "
+            f"VALUES ({placeholders})",
+            _object_to_row(obj),
+        )
+        return obj
+
+    async def get(self, obj_id: UUID) -> StorageObject | None:
+        rows = await self._run(
+            f"SELECT {_SELECT_COLUMNS} FROM storage_objects WHERE id = ?",
+            (str(obj_id),),
+        )
+        return _row_to_object(rows[0]) if rows else None
+
+    async def get_by_location(
+        self, bucket: str, key: str
+    ) -> StorageObject | None:
+        rows = await self._run(
+            f"SELECT {_SELECT_COLUMNS} FROM storage_objects "
+            "WHERE bucket = ? AND key = ? ORDER BY created_at DESC LIMIT 1",
+            (bucket, key),
+        )
+        return _row_to_object(rows[0]) if rows else None
+
+    async def list_by_org(
+        self,
+        org_id: UUID,
+        object_type: str | None = None,
+        limit: int = 100,
+    ) -> list[StorageObject]:
+        if object_type:
+            rows = await self._run(
+                f"SELECT {_SELECT_COLUMNS} FROM storage_objects "
+                "WHERE org_id = ? AND object_type = ? ORDER BY created_at DESC LIMIT ?",
+                (str(org_id), object_type, limit),
+            )
+        else:
+            rows = await self._run(
+                f"SELECT {_SELECT_COLUMNS} FROM storage_objects "
+                "WHERE org_id = ? ORDER BY created_at DESC LIMIT ?",
+                (str(org_id), limit),
+            )
+        return [_row_to_object(row) for row in rows]
+
+    async def list_by_run(
+        self,
+        run_id: UUID,
+    ) -> list[StorageObject]:
+        rows = await self._run(
+            f"SELECT {_SELECT_COLUMNS} FROM storage_objects WHERE run_id = ?",
+            (str(run_id),),
+        )
+        return [_row_to_object(row) for row in rows]
+
+    async def delete(self, obj_id: UUID) -> bool:
+        rows = await self._run(
+            "DELETE FROM storage_objects WHERE id = ? RETURNING id",
+            (str(obj_id),),
+        )
+        return bool(rows)
+
+    async def delete_many(self, obj_ids: list[UUID]) -> int:
+        """Delete many objects in one transaction"""
+        if not obj_ids:
+            return 0
+
+        def _delete() -> int:
+            with self._lock:
+                self._conn.execute("BEGIN")
+                try:
+                    cursor = self._conn.executemany(
+                        "DELETE FROM storage_objects WHERE id = ?",
+                        [(str(obj_id),) for obj_id in obj_ids],
+                    )
+                    self._conn.execute("COMMIT")
+                except BaseException:
+                    self._conn.execute("ROLLBACK")
+                    raise
+                return cursor.rowcount
+
+        return await asyncio.to_thread(_delete)
+
+    async def count_by_location(self, bucket: str, key: str) -> int:
+        """Number of objects referencing a location"""
+        rows = await self._run(
+            "SELECT COUNT(*) FROM storage_objects WHERE bucket = ? AND key = ?",
+            (bucket, key),
+        )
+        return rows[0][0]
+
+    async def list_expired(
+        self,
+        before: datetime,
+        limit: int = 1000,
+        org_id: UUID | None = None,
+        after: tuple[datetime, UUID] | None = None,
+    ) -> list[StorageObject]:
+        """Objects expiring before a time, in (expires_at, id) order"""
+        clauses = ["expires_at IS NOT NULL", "expires_at < ?"]
+        params: list[Any] = [_to_ts(before)]
+
+        if org_id is not None:
+            clauses.append("org_id = ?")
+            params.append(str(org_id))
+
+        if after is not None:
+            after_ts = _to_ts(after[0])
+            clauses.append("(expires_at > ? OR (expires_at = ? AND id > ?))")
+            params.extend([after_ts, after_ts, str(after[1])])
+
+        rows = await self._run(
+            f"SELECT {_SELECT_COLUMNS} FROM storage_objects "
+            f"WHERE {' AND '.join(clauses)} "
+            "ORDER BY expires_at, id LIMIT ?",
+            (*params, limit),
+        )
+        return [_row_to_object(row) for row in rows]
@@ -5,12 +5,17 @@ Provides request tracing across services:
 - Trace context propagation
 - Span creation and management
 - Integration with Jaeger/Zipkin/etc.
+- Batched background export with a bounded buffer
+- Head-based and tail-based sampling
 
 Essential for debugging distributed operations.
 """
 
+import asyncio
 import logging
+import random
 import time
+from collections import OrderedDict, deque
 from contextvars import ContextVar
 from dataclasses import dataclass, field
 from enum import Enum
@@ -39,6 +44,12 @@ class SpanStatus(Enum):
     ERROR = "error"
 
 
+class SamplingMode(Enum):
+    """When the sampling decision is made"""
+    HEAD = "head"   # At trace start; unsampled spans are never recorded
+    TAIL = "tail"   # After the local trace completes; errors and slow traces kept
+
+
 @dataclass
 class SpanContext:
     """
@@ -139,6 +150,9 @@ class Span:
     exception: str | None = None
     exception_stacktrace: str | None = None
 
+    # Span that was current when this one started; restored on end
+    _previous: Optional["Span"] = field(default=None, repr=False, compare=False)
+
     def __post_init__(self):
         if not self.start_time:
             self.start_time = time.time()
@@ -244,6 +258,134 @@ class TracingBackend(Protocol):
         ...
 
 
+@dataclass
+class BatchSpanExporter:
+    """
+    Background batch span exporter
+
+    Finished spans go into a bounded ring buffer and a background task
+    exports them every ``schedule_delay_seconds``, or as soon as a full
+    batch is buffered, so request paths never wait on the backend. When
+    the buffer is full the oldest span is overwritten and counted in
+    ``dropped_spans``.
+
+    Usage:
+        exporter = BatchSpanExporter(backend=jaeger)
+        exporter.submit(span)
+        ...
+        await exporter.shutdown()
+    """
+
+    backend: TracingBackend
+
+    max_queue_size: int = 2048
+    max_export_batch_size: int = 512
+    schedule_delay_seconds: float = 5.0
+    export_timeout_seconds: float = 30.0
+
+    # Counters
+    exported_spans: int = 0
+    dropped_spans: int = 0
+    failed_spans: int = 0
+
+    _buffer: deque = field(default=None, init=False, repr=False)
+    _task: asyncio.Task | None = field(default=None, init=False, repr=False)
+    _wakeup: asyncio.Event | None = field(default=None, init=False, repr=False)
+    _stopped: bool = field(default=False, init=False, repr=False)
+
+    def __post_init__(self):
+        self._buffer = deque(maxlen=self.max_queue_size)
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def submit(self, span: Span) -> None:
+        """Buffer a finished span; never blocks"""
+        if self._stopped:
+            self.dropped_spans += 1
+            return
+
+        if len(self._buffer) == self.max_queue_size:
+            self.dropped_spans += 1  # deque evicts the oldest span
+
+        self._buffer.append(span)
+        self._ensure_started()
+
+        if len(self._buffer) >= self.max_export_batch_size and self._wakeup:
+            self._wakeup.set()
+
+    def _ensure_started(self) -> None:
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop yet; started by the next submit from async code
+
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Export on a timer, or early when a full batch is buffered"""
+        while not self._stopped:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.schedule_delay_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self._export_buffered()
+
+    async def _export_buffered(self) -> None:
+        while self._buffer:
+            count = min(len(self._buffer), self.max_export_batch_size)
+            batch = [self._buffer.popleft() for _ in range(count)]
+            await self._export(batch)
+
+    async def _export(self, batch: list[Span]) -> None:
+        try:
+            await asyncio.wait_for(
+                self.backend.export_spans(batch),
+                timeout=self.export_timeout_seconds,
+            )
+            self.exported_spans += len(batch)
+        except Exception as e:
+            self.failed_spans += len(batch)
+            logger.error(f"Failed to export spans: count={len(batch)} error={e}")
+
+    async def force_flush(self) -> None:
+        """Export everything buffered now"""
+        await self._export_buffered()
+
+    async def shutdown(self) -> None:
+        """Stop the background task and flush remaining spans"""
+        self._stopped = True
+        if self._task is not None and not self._task.done():
+            self._wakeup.set()
+            try:
+                await self._task
+            except Exception as e:
+                logger.error(f"Span exporter task failed: {e}")
+        self._task = None
+        await self._export_buffered()
+
+    def get_stats(self) -> dict[str, int]:
+        """Get exporter statistics"""
+        return {
+            "pending": len(self._buffer),
+            "exported": self.exported_spans,
+            "dropped": self.dropped_spans,
+            "failed": self.failed_spans,
+        }
+
+
+@dataclass
+class _TraceBuffer:
+    """Spans of a trace held for a tail-sampling decision"""
+    open_spans: int = 0
+    spans: list[Span] = field(default_factory=list)
+
+
 @dataclass
 class Tracer:
     """
@@ -262,10 +404,31 @@ class Tracer:
 
     # Sampling
     sample_rate: float = 1.0  # 1.0 = 100% sampling
+    sampling_mode: SamplingMode = SamplingMode.HEAD
+    tail_latency_threshold_ms: float = 1000.0  # Tail: traces slower than this are kept
+    tail_max_traces: int = 10000               # Tail: open traces held in memory
+
+    # Batch export
+    exporter: BatchSpanExporter | None = None
+    max_queue_size: int = 2048
+    max_export_batch_size: int = 512
+    schedule_delay_seconds: float = 5.0
 
-    # Pending spans for batch export
-    _pending_spans: list[Span] = field(default_factory=list)
-    _batch_size: int = 100
+    # Open traces awaiting a tail-sampling decision
+    _open_traces: OrderedDict[str, _TraceBuffer] = field(default_factory=OrderedDict)
+
+    def __post_init__(self):
+        if self.exporter is None and self.backend is not None:
+            self.exporter = BatchSpanExporter(
+                backend=self.backend,
+                max_queue_size=self.max_queue_size,
+                max_export_batch_size=self.max_export_batch_size,
+                schedule_delay_seconds=self.schedule_delay_seconds,
+            )
+
+    @property
+    def _recording(self) -> bool:
+        return self.enabled and self.exporter is not None
 
     # ------------------------------------------------------------------
     # Span Creation
@@ -290,11 +453,11 @@ class Tracer:
         Returns:
             New span
         """
+        current = _current_span.get()
+
         # Get parent from context if not provided
-        if parent is None:
-            current = _current_span.get()
-            if current:
-                parent = current.context
+        if parent is None and current:
+            parent = current.context
 
         # Create new span
         span = Span(
@@ -305,10 +468,22 @@ class Tracer:
             service_version=self.service_version,
             attributes=attributes or {},
         )
+        span._previous = current
 
-        # Inherit trace ID from parent
+        # Inherit trace ID and sampling decision from parent
         if parent and parent.is_valid:
             span.context.trace_id = parent.trace_id
+            sampled = parent.is_sampled
+        else:
+            sampled = self._should_sample(span.context.trace_id)
+
+        if self.sampling_mode == SamplingMode.TAIL:
+            # Record everything; the decision is made when the trace completes
+            sampled = True
+            if self._recording:
+                self._track_start(span)
+
+        span.context.trace_flags = (span.context.trace_flags & ~0x01) | int(sampled)
 
         # Set as current span
         _current_span.set(span)
@@ -316,33 +491,98 @@ class Tracer:
         return span
 
     async def end_span(self, span: Span) -> None:
-        """End and export a span"""
+        """End a span and hand it to the exporter"""
         span.end()
 
-        # Restore parent as current
-        if span.parent_context:
-            # Would need to restore parent span
-            pass
-        else:
-            _current_span.set(None)
+        # Restore the span that was current when this one started
+        if _current_span.get() is span:
+            _current_span.set(span._previous)
+        span._previous = None
 
-        # Export
-        if self.enabled and self.backend:
-            self._pending_spans.append(span)
+        if not self._recording:
+            return
 
-            if len(self._pending_spans) >= self._batch_size:
-                await self._flush_spans()
+        if self.sampling_mode == SamplingMode.TAIL:
+            self._track_end(span)
+        elif span.context.is_sampled:
+            self.exporter.submit(span)
 
-    async def _flush_spans(self) -> None:
-        """Flush pending spans to backend"""
-        if self._pending_spans and self.backend:
-            spans = self._pending_spans.copy()
-            self._pending_spans.clear()
+    async def force_flush(self) -> None:
+        """Export all buffered spans now"""
+        if self.exporter:
+            await self.exporter.force_flush()
 
-            try:
-                await self.backend.export_spans(spans)
-            except Exception as e:
-                logger.error(f"Failed to export spans: {e}")
+    async def shutdown(self) -> None:
+        """Flush buffered spans and stop the exporter"""
+        if self.exporter is None:
+            return
+
+        # Traces still open are decided on the spans that did finish
+        while self._open_traces:
+            _, trace = self._open_traces.popitem(last=False)
+            if trace.spans:
+                self._finish_trace(trace.spans)
+
+        await self.exporter.shutdown()
+
+    # ------------------------------------------------------------------
+    # Sampling
+    # ------------------------------------------------------------------
+
+    def _should_sample(self, trace_id: str) -> bool:
+        """
+        Trace ID ratio sampling
+
+        Derived from the trace ID, so every service reaches the same
+        decision for a trace without coordination.
+        """
+        if self.sample_rate >= 1.0:
+            return True
+        if self.sample_rate <= 0.0:
+            return False
+        try:
+            return int(trace_id[-16:], 16) < self.sample_rate * 2**64
+        except ValueError:
+            return random.random() < self.sample_rate
+
+    def _track_start(self, span: Span) -> None:
+        trace = self._open_traces.get(span.context.trace_id)
+        if trace is None:
+            trace = self._open_traces[span.context.trace_id] = _TraceBuffer()
+            if len(self._open_traces) > self.tail_max_traces:
+                _, evicted = self._open_traces.popitem(last=False)
+                self.exporter.dropped_spans += len(evicted.spans)
+        trace.open_spans += 1
+
+    def _track_end(self, span: Span) -> None:
+        trace = self._open_traces.get(span.context.trace_id)
+        if trace is None:
+            # Evicted while open; decide on this span alone
+            self._finish_trace([span])
+            return
+
+        trace.open_spans -= 1
+        trace.spans.append(span)
+        if trace.open_spans <= 0:
+            del self._open_traces[span.context.trace_id]
+            self._finish_trace(trace.spans)
+
+    def _finish_trace(self, spans: list[Span]) -> None:
+        """Tail decision: keep errors and slow traces, sample the rest"""
+        keep = (
+            any(s.status == SpanStatus.ERROR for s in spans)
+            or any((s.duration_ms or 0.0) >= self.tail_latency_threshold_ms for s in spans)
+            or self._should_sample(spans[0].context.trace_id)
+        )
+        if keep:
+            for s in spans:
+                self.exporter.submit(s)
+
+    def get_stats(self) -> dict[str, int]:
+        """Get tracer statistics"""
+        stats = self.exporter.get_stats() if self.exporter else {}
+        stats["open_traces"] = len(self._open_traces)
+        return stats
 
     # ------------------------------------------------------------------
     # Context Propagation
@@ -10,14 +10,17 @@ This is the critical infrastructure for "strong gate + reporting":
 """
 
 from enterprise.events.event_log import (
+    EventChainNode,
     EventFilter,
     EventLog,
     StoredEvent,
 )
+from enterprise.events.event_store import SegmentedEventStorage
 from enterprise.events.idempotency import (
     IdempotencyKey,
     IdempotencyManager,
 )
+from enterprise.events.idempotency_store import ShardedIdempotencyStorage
 from enterprise.events.job_queue import (
     DeadLetterQueue,
     Job,
@@ -25,27 +28,40 @@ from enterprise.events.job_queue import (
     JobQueue,
     JobStatus,
 )
+from enterprise.events.job_storage import SQLiteJobStorage
+from enterprise.events.scheduler import DelayedJobScheduler
 from enterprise.events.state_machine import (
     Run,
     RunState,
     RunStateMachine,
     RunTransition,
 )
+from enterprise.events.worker_pool import (
+    JobWorkerPool,
+    QueueWorkerConfig,
+)
 
 __all__ = [
     # Event Log
     "EventLog",
     "StoredEvent",
     "EventFilter",
+    "EventChainNode",
+    "SegmentedEventStorage",
     # Job Queue
     "JobQueue",
     "Job",
     "JobPriority",
     "JobStatus",
     "DeadLetterQueue",
+    "SQLiteJobStorage",
+    "DelayedJobScheduler",
+    "JobWorkerPool",
+    "QueueWorkerConfig",
     # Idempotency
     "IdempotencyManager",
     "IdempotencyKey",
+    "ShardedIdempotencyStorage",
     # State Machine
     "RunStateMachine",
     "Run",
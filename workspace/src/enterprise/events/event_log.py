@@ -11,6 +11,8 @@ This is the CORE of event-driven architecture.
 """
 
 import logging
+from collections import OrderedDict
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
@@ -157,6 +159,10 @@ class EventStorage(Protocol):
     async def get(self, event_id: UUID) -> StoredEvent | None:
         ...
 
+    async def get_many(self, event_ids: list[UUID]) -> dict[UUID, StoredEvent]:
+        """Fetch several events in one call; missing IDs are omitted"""
+        ...
+
     async def update(self, event: StoredEvent) -> StoredEvent:
         ...
 
@@ -171,6 +177,131 @@ class EventStorage(Protocol):
     async def count(self, filter: EventFilter) -> int:
         ...
 
+    def stream(
+        self,
+        filter: EventFilter,
+        batch_size: int = 500,
+    ) -> AsyncIterator[StoredEvent]:
+        """Stream matching events, holding at most ``batch_size`` in memory"""
+        ...
+
+    async def delete_before(
+        self,
+        cutoff: datetime,
+        statuses: list[EventStatus],
+    ) -> int:
+        """
+        Delete events received before ``cutoff`` whose status is in ``statuses``
+
+        Implementations may delete at segment/partition granularity.
+        """
+        ...
+
+
+@dataclass
+class EventChainNode:
+    """Event with the events it caused"""
+    event: StoredEvent
+    children: list["EventChainNode"] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert to nested dictionary"""
+        return {
+            "event": self.event.to_dict(),
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+@dataclass
+class CausationIndex:
+    """
+    In-memory causation/correlation adjacency index
+
+    Maintained by EventLog.store_event so a causation chain resolves to a
+    list of IDs without touching storage. Bounded to ``max_entries``
+    events; the oldest entries are evicted first.
+    """
+
+    max_entries: int = 1_000_000
+
+    _parents: OrderedDict[UUID, UUID | None] = field(default_factory=OrderedDict, init=False, repr=False)
+    _children: dict[UUID, set[UUID]] = field(default_factory=dict, init=False, repr=False)
+    _correlation_of: dict[UUID, UUID] = field(default_factory=dict, init=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._parents)
+
+    def __contains__(self, event_id: UUID) -> bool:
+        return event_id in self._parents
+
+    def add(
+        self,
+        event_id: UUID,
+        correlation_id: UUID | None,
+        causation_id: UUID | None,
+    ) -> None:
+        """Record an event and its causation/correlation links"""
+        self._parents[event_id] = causation_id
+        if causation_id is not None:
+            self._children.setdefault(causation_id, set()).add(event_id)
+        if correlation_id is not None:
+            self._correlation_of[event_id] = correlation_id
+
+        while len(self._parents) > self.max_entries:
+            self._evict()
+
+    def correlation_of(self, event_id: UUID) -> UUID | None:
+        return self._correlation_of.get(event_id)
+
+    def ancestors(self, event_id: UUID) -> list[UUID]:
+        """
+        Causation chain ending at ``event_id``, root first
+
+        Stops at the first ancestor that is not indexed.
+        """
+        if event_id not in self._parents:
+            return []
+
+        chain = [event_id]
+        seen = {event_id}
+        parent = self._parents[event_id]
+        while parent is not None and parent not in seen:
+            chain.append(parent)
+            seen.add(parent)
+            parent = self._parents.get(parent)
+        chain.reverse()
+        return chain
+
+    def children(self, event_id: UUID) -> set[UUID]:
+        return set(self._children.get(event_id, ()))
+
+    def descendants(self, event_id: UUID) -> list[UUID]:
+        """IDs of every indexed event caused, directly or not, by ``event_id``"""
+        found = []
+        seen = {event_id}
+        frontier = [event_id]
+        while frontier:
+            next_frontier = []
+            for parent in frontier:
+                for child in self._children.get(parent, ()):
+                    if child not in seen:
+                        seen.add(child)
+                        next_frontier.append(child)
+            found.extend(next_frontier)
+            frontier = next_frontier
+        return found
+
+    def _evict(self) -> None:
+        event_id, parent = self._parents.popitem(last=False)
+        self._children.pop(event_id, None)
+        if parent is not None:
+            siblings = self._children.get(parent)
+            if siblings:
+                siblings.discard(event_id)
+                if not siblings:
+                    del self._children[parent]
+        self._correlation_of.pop(event_id, None)
+
 
 class EventPublisher(Protocol):
     """Interface for publishing events to processing queue"""
@@ -194,6 +325,9 @@ class EventLog:
     storage: EventStorage
     publisher: EventPublisher | None = None
 
+    # Causation/correlation links of recently stored events
+    causation_index: CausationIndex = field(default_factory=CausationIndex)
+
     # Retention settings
     retention_days: int = 90
     max_retry_count: int = 3
@@ -215,6 +349,7 @@ class EventLog:
         pr_number: int | None = None,
         ref: str | None = None,
         correlation_id: UUID | None = None,
+        causation_id: UUID | None = None,
     ) -> StoredEvent:
         """
         Store a new event (落盤)
@@ -233,11 +368,16 @@ class EventLog:
             head_sha: Commit SHA (for PR/push events)
             pr_number: PR number (for PR events)
             ref: Git ref (branch/tag)
-            correlation_id: Correlation ID for related events
+            correlation_id: Correlation ID for related events (inherited
+                from the causing event when omitted)
+            causation_id: ID of the event that caused this one
 
         Returns:
             Stored event
         """
+        if correlation_id is None and causation_id is not None:
+            correlation_id = self.causation_index.correlation_of(causation_id)
+
         event = StoredEvent(
             org_id=org_id,
             event_type=event_type,
@@ -250,11 +390,13 @@ class EventLog:
             pr_number=pr_number,
             ref=ref,
             correlation_id=correlation_id or uuid4(),
+            causation_id=causation_id,
             status=EventStatus.RECEIVED,
         )
 
         # Persist first (落盤)
         event = await self.storage.save(event)
+        self.causation_index.add(event.id, event.correlation_id, event.causation_id)
 
         logger.info(
             f"Event stored: id={event.id} type={event_type} "
@@ -280,6 +422,15 @@ class EventLog:
         """Query events with filter"""
         return await self.storage.query(filter, offset, limit)
 
+    async def stream_events(
+        self,
+        filter: EventFilter,
+        batch_size: int = 500,
+    ) -> AsyncIterator[StoredEvent]:
+        """Stream events matching filter with bounded memory"""
+        async for event in self.storage.stream(filter, batch_size):
+            yield event
+
     # ------------------------------------------------------------------
     # Event Processing
     # ------------------------------------------------------------------
@@ -378,6 +529,9 @@ class EventLog:
         if not event:
             raise ValueError(f"Event not found: {event_id}")
 
+        return await self._replay(event)
+
+    async def _replay(self, event: StoredEvent) -> StoredEvent:
         # Reset status
         event.status = EventStatus.RECEIVED
         event.processed_at = None
@@ -390,28 +544,30 @@ class EventLog:
         if self.publisher:
             await self.publisher.publish(event)
 
-        logger.info(f"Event replayed: id={event_id}")
+        logger.info(f"Event replayed: id={event.id}")
 
         return event
 
     async def replay_events(
         self,
         filter: EventFilter,
-        limit: int = 1000,
+        limit: int | None = 1000,
     ) -> int:
         """
         Replay multiple events matching filter
 
-        Use with caution - can cause load spikes.
+        Use with caution - can cause load spikes. Events are streamed, so
+        memory stays bounded regardless of ``limit`` (None = no limit).
 
         Returns:
             Number of events replayed
         """
-        events = await self.storage.query(filter, limit=limit)
         count = 0
 
-        for event in events:
-            await self.replay_event(event.id)
+        async for event in self.storage.stream(filter):
+            if limit is not None and count >= limit:
+                break
+            await self._replay(event)
             count += 1
 
         logger.info(f"Events replayed: count={count}")
@@ -429,12 +585,11 @@ class EventLog:
             status=EventStatus.FAILED,
         )
 
-        events = await self.storage.query(filter, limit=10000)
         count = 0
 
-        for event in events:
+        async for event in self.storage.stream(filter):
             if event.retry_count < max_retry:
-                await self.replay_event(event.id)
+                await self._replay(event)
                 count += 1
 
         logger.info(f"Failed events replayed: count={count}")
@@ -457,24 +612,65 @@ class EventLog:
         self,
         event_id: UUID,
     ) -> list[StoredEvent]:
-        """Get the causation chain for an event"""
-        event = await self.storage.get(event_id)
-        if not event:
+        """
+        Get the causation chain for an event
+
+        Indexed ancestors are fetched with one bulk call; the walk only
+        falls back to per-hop lookups beyond the indexed part of the chain.
+        """
+        ids = self.causation_index.ancestors(event_id) or [event_id]
+        events = await self.storage.get_many(ids)
+        if event_id not in events:
             return []
 
-        chain = [event]
+        chain = [events[i] for i in ids if i in events]
 
-        # Walk back through causation
-        current = event
-        while current.causation_id:
+        # Walk back through causation beyond the index
+        seen = {event.id for event in chain}
+        current = chain[0]
+        while current.causation_id and current.causation_id not in seen:
             parent = await self.storage.get(current.causation_id)
             if not parent:
                 break
             chain.insert(0, parent)
+            seen.add(parent.id)
             current = parent
 
         return chain
 
+    async def get_event_tree(
+        self,
+        event_id: UUID,
+    ) -> EventChainNode | None:
+        """
+        Get the causation tree containing an event
+
+        Returns the tree rooted at the chain root of ``event_id``. Its
+        descendants are resolved from the causation index and fetched with
+        one bulk call; a root that is not indexed falls back to streaming
+        its correlation group.
+        """
+        chain = await self.get_event_chain(event_id)
+        if not chain:
+            return None
+
+        root = chain[0]
+        events = {event.id: event for event in chain}
+        if root.id in self.causation_index:
+            descendants = [i for i in self.causation_index.descendants(root.id) if i not in events]
+            events.update(await self.storage.get_many(descendants))
+        elif root.correlation_id:
+            async for event in self.storage.stream(EventFilter(correlation_id=root.correlation_id)):
+                events.setdefault(event.id, event)
+
+        nodes = {eid: EventChainNode(event=event) for eid, event in events.items()}
+        for node in sorted(nodes.values(), key=lambda n: n.event.received_at):
+            parent_id = node.event.causation_id
+            if parent_id in nodes and node.event.id != root.id:
+                nodes[parent_id].children.append(node)
+
+        return nodes[root.id]
+
     # ------------------------------------------------------------------
     # Audit & Retention
     # ------------------------------------------------------------------
@@ -508,27 +704,46 @@ class EventLog:
 
         Only removes PROCESSED and SKIPPED events.
         FAILED events are kept for investigation.
+
+        Counts the org's eligible events from the storage index. Deletion
+        happens in enforce_retention, since storage drops whole segments
+        shared by all orgs.
         """
         days = older_than_days or self.retention_days
         cutoff = datetime.utcnow() - timedelta(days=days)
 
-        filter = EventFilter(
-            org_id=org_id,
-            received_before=cutoff,
-        )
-
-        events = await self.storage.query(filter, limit=10000)
         count = 0
-
-        for event in events:
-            if event.status in (EventStatus.PROCESSED, EventStatus.SKIPPED):
-                if not dry_run:
-                    # In production, soft delete or archive
-                    pass
-                count += 1
+        for status in (EventStatus.PROCESSED, EventStatus.SKIPPED):
+            count += await self.storage.count(EventFilter(
+                org_id=org_id,
+                status=status,
+                received_before=cutoff,
+            ))
 
         logger.info(
             f"Event cleanup: org={org_id} count={count} dry_run={dry_run}"
         )
 
         return count
+
+    async def enforce_retention(
+        self,
+        older_than_days: int | None = None,
+    ) -> int:
+        """
+        Delete PROCESSED and SKIPPED events older than the retention period
+
+        Returns:
+            Number of events deleted
+        """
+        days = older_than_days or self.retention_days
+        cutoff = datetime.utcnow() - timedelta(days=days)
+
+        deleted = await self.storage.delete_before(
+            cutoff,
+            [EventStatus.PROCESSED, EventStatus.SKIPPED],
+        )
+
+        logger.info(f"Event retention enforced: cutoff={cutoff.isoformat()} deleted={deleted}")
+
+        return deleted
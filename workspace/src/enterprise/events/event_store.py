@@ -0,0 +1,574 @@
+"""
+Segmented Event Store
+
+Append-only, file-backed EventStorage for the event log:
+- Events are appended as NDJSON records to fixed-size segment files
+- Updates append a new version; the latest version of an event wins
+- Each segment keeps a columnar index (id, org_id, status, event_type,
+  received_at, correlation_id, offset) so filters run without decoding
+  payloads; only matching records are read from disk
+- Posting lists on org_id, status, event_type and correlation_id let a
+  filter skip segments and visit only the rows carrying its values
+- Sealed segments persist their index in a sidecar file
+- Streaming queries read in bounded batches from a snapshot of the log
+- Retention drops whole segments, carrying forward the few live records
+  that must be kept
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+import threading
+from array import array
+from bisect import bisect_left
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from enterprise.events.event_log import (
+    EventFilter,
+    EventStatus,
+    StoredEvent,
+)
+
+logger = logging.getLogger(__name__)
+
+
+_STATUSES = list(EventStatus)
+_STATUS_CODES = {status: code for code, status in enumerate(_STATUSES)}
+
+_SEGMENT_SUFFIX = ".log"
+_INDEX_SUFFIX = ".idx.json"
+
+
+def _to_ts(value: datetime) -> float:
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+@dataclass
+class _Dictionary:
+    """Dictionary encoding for a low-cardinality column"""
+    values: list[Any] = field(default_factory=list)
+    codes: dict[Any, int] = field(default_factory=dict)
+
+    def encode(self, value: Any) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self.codes[value] = code
+        return code
+
+
+@dataclass
+class SegmentIndex:
+    """
+    Columnar index of one segment
+
+    One row per record (event version) in file order. Posting lists map
+    each org, status, event type and correlation ID to its rows in
+    ascending order; they are rebuilt from the columns on load.
+    """
+    segment_id: int
+    path: Path
+
+    ids: list[UUID] = field(default_factory=list)
+    org_codes: array = field(default_factory=lambda: array("i"))
+    status_codes: array = field(default_factory=lambda: array("b"))
+    type_codes: array = field(default_factory=lambda: array("i"))
+    received_at: array = field(default_factory=lambda: array("d"))
+    correlation_ids: list[UUID | None] = field(default_factory=list)
+    offsets: array = field(default_factory=lambda: array("q"))
+    lengths: array = field(default_factory=lambda: array("i"))
+
+    orgs: _Dictionary = field(default_factory=_Dictionary)
+    event_types: _Dictionary = field(default_factory=_Dictionary)
+
+    org_rows: dict[int, array] = field(default_factory=dict)
+    status_rows: dict[int, array] = field(default_factory=dict)
+    type_rows: dict[int, array] = field(default_factory=dict)
+    correlation_rows: dict[UUID, array] = field(default_factory=dict)
+
+    size: int = 0
+    sealed: bool = False
+    min_received_at: float = float("inf")
+    max_received_at: float = float("-inf")
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def append(self, data: dict[str, Any], offset: int, length: int) -> int:
+        """Index a record; returns its row number"""
+        received_at = _to_ts(datetime.fromisoformat(data["received_at"]))
+        self.ids.append(UUID(data["id"]))
+        self.org_codes.append(self.orgs.encode(UUID(data["org_id"])))
+        self.status_codes.append(_STATUS_CODES[EventStatus(data["status"])])
+        self.type_codes.append(self.event_types.encode(data.get("event_type", "")))
+        self.received_at.append(received_at)
+        self.correlation_ids.append(
+            UUID(data["correlation_id"]) if data.get("correlation_id") else None
+        )
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        self.size = offset + length
+        self.min_received_at = min(self.min_received_at, received_at)
+        self.max_received_at = max(self.max_received_at, received_at)
+
+        row = len(self.ids) - 1
+        self._post(row)
+        return row
+
+    def _post(self, row: int) -> None:
+        """Add a row to the posting lists"""
+        self.org_rows.setdefault(self.org_codes[row], array("i")).append(row)
+        self.status_rows.setdefault(self.status_codes[row], array("i")).append(row)
+        self.type_rows.setdefault(self.type_codes[row], array("i")).append(row)
+        correlation_id = self.correlation_ids[row]
+        if correlation_id is not None:
+            self.correlation_rows.setdefault(correlation_id, array("i")).append(row)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for the sidecar file"""
+        return {
+            "ids": [str(i) for i in self.ids],
+            "org_codes": self.org_codes.tolist(),
+            "status_codes": self.status_codes.tolist(),
+            "type_codes": self.type_codes.tolist(),
+            "received_at": self.received_at.tolist(),
+            "correlation_ids": [str(c) if c else None for c in self.correlation_ids],
+            "offsets": self.offsets.tolist(),
+            "lengths": self.lengths.tolist(),
+            "orgs": [str(o) for o in self.orgs.values],
+            "event_types": self.event_types.values,
+            "size": self.size,
+        }
+
+    @classmethod
+    def from_dict(cls, segment_id: int, path: Path, data: dict[str, Any]) -> "SegmentIndex":
+        """Load from the sidecar file"""
+        index = cls(segment_id=segment_id, path=path, sealed=True)
+        index.ids = [UUID(i) for i in data["ids"]]
+        index.org_codes = array("i", data["org_codes"])
+        index.status_codes = array("b", data["status_codes"])
+        index.type_codes = array("i", data["type_codes"])
+        index.received_at = array("d", data["received_at"])
+        index.correlation_ids = [UUID(c) if c else None for c in data["correlation_ids"]]
+        index.offsets = array("q", data["offsets"])
+        index.lengths = array("i", data["lengths"])
+        for org in data["orgs"]:
+            index.orgs.encode(UUID(org))
+        for event_type in data["event_types"]:
+            index.event_types.encode(event_type)
+        index.size = data["size"]
+        for row in range(len(index.ids)):
+            index._post(row)
+        if index.received_at:
+            index.min_received_at = min(index.received_at)
+            index.max_received_at = max(index.received_at)
+        return index
+
+
+@dataclass
+class SegmentedEventStorage:
+    """
+    Segment-file EventStorage
+
+    Usage:
+        storage = SegmentedEventStorage(directory="/var/lib/mno/events")
+        event_log = EventLog(storage=storage)
+    """
+
+    directory: str
+    segment_max_bytes: int = 64 * 1024 * 1024
+    fsync: bool = False
+
+    _root: Path = field(default=None, init=False, repr=False)
+    _segments: list[SegmentIndex] = field(default_factory=list, init=False, repr=False)
+    # event_id -> (segment_id, row) of its latest version
+    _latest: dict[UUID, tuple[int, int]] = field(default_factory=dict, init=False, repr=False)
+    _by_id: dict[int, SegmentIndex] = field(default_factory=dict, init=False, repr=False)
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)
+
+    def __post_init__(self):
+        """Open the directory and load or rebuild segment indexes"""
+        self._root = Path(self.directory)
+        self._root.mkdir(parents=True, exist_ok=True)
+
+        for path in sorted(self._root.glob(f"segment-*{_SEGMENT_SUFFIX}")):
+            segment_id = int(path.name[len("segment-"):-len(_SEGMENT_SUFFIX)])
+            index = self._load_index(segment_id, path)
+            self._register(index)
+            for row, event_id in enumerate(index.ids):
+                self._latest[event_id] = (segment_id, row)
+
+        # Segments left unsealed by a crash before rollover
+        for index in self._segments[:-1]:
+            if not index.sealed:
+                self._seal(index)
+
+        if not self._segments or self._segments[-1].sealed:
+            self._open_segment()
+
+    # ------------------------------------------------------------------
+    # Segment management
+    # ------------------------------------------------------------------
+
+    @property
+    def segment_count(self) -> int:
+        return len(self._segments)
+
+    def _segment_path(self, segment_id: int) -> Path:
+        return self._root / f"segment-{segment_id:010d}{_SEGMENT_SUFFIX}"
+
+    def _index_path(self, path: Path) -> Path:
+        return path.with_name(path.name[:-len(_SEGMENT_SUFFIX)] + _INDEX_SUFFIX)
+
+    def _register(self, index: SegmentIndex) -> None:
+        self._segments.append(index)
+        self._by_id[index.segment_id] = index
+
+    def _open_segment(self) -> SegmentIndex:
+        segment_id = self._segments[-1].segment_id + 1 if self._segments else 0
+        path = self._segment_path(segment_id)
+        path.touch()
+        index = SegmentIndex(segment_id=segment_id, path=path)
+        self._register(index)
+        return index
+
+    def _seal(self, index: SegmentIndex) -> None:
+        index.sealed = True
+        tmp = self._index_path(index.path).with_suffix(".tmp")
+        tmp.write_text(json.dumps(index.to_dict()))
+        os.replace(tmp, self._index_path(index.path))
+
+    def _load_index(self, segment_id: int, path: Path) -> SegmentIndex:
+        sidecar = self._index_path(path)
+        if sidecar.exists():
+            return SegmentIndex.from_dict(segment_id, path, json.loads(sidecar.read_text()))
+
+        # Active (or unsealed after a crash) segment: rebuild by scanning
+        index = SegmentIndex(segment_id=segment_id, path=path)
+        offset = 0
+        with open(path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # torn write at the tail
+                try:
+                    index.append(json.loads(line), offset, len(line))
+                except (ValueError, KeyError):
+                    logger.warning(f"Skipping corrupt event record: segment={segment_id} offset={offset}")
+                offset += len(line)
+        if offset != path.stat().st_size:
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+        index.size = offset
+        return index
+
+    def _append(self, event: StoredEvent) -> None:
+        data = event.to_dict()
+        line = (json.dumps(data, separators=(",", ":")) + "\n").encode()
+
+        active = self._segments[-1]
+        if active.size and active.size + len(line) > self.segment_max_bytes:
+            self._seal(active)
+            active = self._open_segment()
+
+        with open(active.path, "ab") as f:
+            f.write(line)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        row = active.append(data, active.size, len(line))
+        self._latest[event.id] = (active.segment_id, row)
+
+    def _read_rows(self, index: SegmentIndex, rows: list[int]) -> list[StoredEvent]:
+        events = []
+        with open(index.path, "rb") as f:
+            for row in rows:
+                f.seek(index.offsets[row])
+                events.append(StoredEvent.from_dict(json.loads(f.read(index.lengths[row]))))
+        return events
+
+    # ------------------------------------------------------------------
+    # Index scans
+    # ------------------------------------------------------------------
+
+    def _matching_rows(
+        self,
+        index: SegmentIndex,
+        filter: EventFilter,
+        start: int = 0,
+        end: int | None = None,
+        limit: int | None = None,
+    ) -> list[int]:
+        """Rows in [start, end) of live records matching the indexed filter columns"""
+        if filter.received_after and index.max_received_at < _to_ts(filter.received_after):
+            return []
+        if filter.received_before and index.min_received_at >= _to_ts(filter.received_before):
+            return []
+
+        # Posting lists for each equality filter; the shortest drives the scan
+        postings = []
+
+        org_code = None
+        if filter.org_id is not None:
+            org_code = index.orgs.codes.get(filter.org_id)
+            if org_code is None:
+                return []
+            postings.append(index.org_rows[org_code])
+
+        type_codes = None
+        if filter.event_types:
+            type_codes = {index.event_types.codes[t] for t in filter.event_types if t in index.event_types.codes}
+            if not type_codes:
+                return []
+            if len(type_codes) == 1:
+                postings.append(index.type_rows[next(iter(type_codes))])
+            else:
+                postings.append(list(heapq.merge(*(index.type_rows[c] for c in type_codes))))
+
+        status_code = None
+        if filter.status:
+            status_code = _STATUS_CODES[filter.status]
+            if status_code not in index.status_rows:
+                return []
+            postings.append(index.status_rows[status_code])
+
+        if filter.correlation_id is not None:
+            if filter.correlation_id not in index.correlation_rows:
+                return []
+            postings.append(index.correlation_rows[filter.correlation_id])
+
+        after = _to_ts(filter.received_after) if filter.received_after else None
+        before = _to_ts(filter.received_before) if filter.received_before else None
+        segment_id = index.segment_id
+        end = len(index) if end is None else end
+
+        if postings:
+            driver = min(postings, key=len)
+            candidates = islice(driver, bisect_left(driver, start), bisect_left(driver, end))
+        else:
+            candidates = range(start, end)
+
+        rows = []
+        for row in candidates:
+            if limit is not None and len(rows) >= limit:
+                break
+            if org_code is not None and index.org_codes[row] != org_code:
+                continue
+            if status_code is not None and index.status_codes[row] != status_code:
+                continue
+            if type_codes is not None and index.type_codes[row] not in type_codes:
+                continue
+            if after is not None and index.received_at[row] < after:
+                continue
+            if before is not None and index.received_at[row] >= before:
+                continue
+            if filter.correlation_id is not None and index.correlation_ids[row] != filter.correlation_id:
+                continue
+            if self._latest.get(index.ids[row]) != (segment_id, row):
+                continue
+            rows.append(row)
+        return rows
+
+    @staticmethod
+    def _needs_payload_filter(filter: EventFilter) -> bool:
+        return any(
+            value is not None
+            for value in (filter.source, filter.repo_id, filter.head_sha, filter.pr_number)
+        )
+
+    @staticmethod
+    def _matches_payload_filter(event: StoredEvent, filter: EventFilter) -> bool:
+        if filter.source is not None and event.source != filter.source:
+            return False
+        if filter.repo_id is not None and event.repo_id != filter.repo_id:
+            return False
+        if filter.head_sha is not None and event.head_sha != filter.head_sha:
+            return False
+        if filter.pr_number is not None and event.pr_number != filter.pr_number:
+            return False
+        return True
+
+    def _snapshot(self) -> list[tuple[SegmentIndex, int]]:
+        with self._lock:
+            return [(index, len(index)) for index in self._segments]
+
+    def _scan_batch(
+        self,
+        index: SegmentIndex,
+        row_limit: int,
+        filter: EventFilter,
+        start_row: int,
+        batch_size: int,
+    ) -> tuple[list[StoredEvent], int]:
+        """Read the next batch of matching events; returns (events, next_row)"""
+        with self._lock:
+            rows = self._matching_rows(index, filter, start_row, row_limit, batch_size)
+            if not rows:
+                return [], row_limit
+            events = self._read_rows(index, rows)
+        if self._needs_payload_filter(filter):
+            events = [e for e in events if self._matches_payload_filter(e, filter)]
+        # A short batch means the scan reached row_limit
+        return events, rows[-1] + 1 if len(rows) >= batch_size else row_limit
+
+    # ------------------------------------------------------------------
+    # EventStorage protocol
+    # ------------------------------------------------------------------
+
+    async def save(self, event: StoredEvent) -> StoredEvent:
+        await asyncio.to_thread(self._locked_append, event)
+        return event
+
+    async def update(self, event: StoredEvent) -> StoredEvent:
+        await asyncio.to_thread(self._locked_append, event)
+        return event
+
+    def _locked_append(self, event: StoredEvent) -> None:
+        with self._lock:
+            self._append(event)
+
+    async def get(self, event_id: UUID) -> StoredEvent | None:
+        return (await self.get_many([event_id])).get(event_id)
+
+    async def get_many(self, event_ids: list[UUID]) -> dict[UUID, StoredEvent]:
+        """Fetch the latest version of several events in one call"""
+        return await asyncio.to_thread(self._get_many, event_ids)
+
+    def _get_many(self, event_ids: list[UUID]) -> dict[UUID, StoredEvent]:
+        by_segment: dict[int, list[int]] = {}
+        with self._lock:
+            for event_id in event_ids:
+                location = self._latest.get(event_id)
+                if location:
+                    by_segment.setdefault(location[0], []).append(location[1])
+            events: dict[UUID, StoredEvent] = {}
+            for segment_id, rows in by_segment.items():
+                for event in self._read_rows(self._by_id[segment_id], sorted(rows)):
+                    events[event.id] = event
+        return events
+
+    async def stream(
+        self,
+        filter: EventFilter,
+        batch_size: int = 500,
+    ) -> AsyncIterator[StoredEvent]:
+        """
+        Stream matching events in log order
+
+        Holds at most ``batch_size`` decoded events at a time. The scan is
+        bounded by a snapshot taken at the start, so events appended while
+        streaming (e.g. replays) are not revisited.
+        """
+        for index, row_limit in self._snapshot():
+            row = 0
+            while row < row_limit:
+                events, row = await asyncio.to_thread(
+                    self._scan_batch, index, row_limit, filter, row, batch_size,
+                )
+                for event in events:
+                    yield event
+
+    async def query(
+        self,
+        filter: EventFilter,
+        offset: int = 0,
+        limit: int = 100,
+    ) -> list[StoredEvent]:
+        events = []
+        skipped = 0
+        async for event in self.stream(filter, batch_size=min(max(limit, 1), 500)):
+            if skipped < offset:
+                skipped += 1
+                continue
+            events.append(event)
+            if len(events) >= limit:
+                break
+        return events
+
+    async def count(self, filter: EventFilter) -> int:
+        if self._needs_payload_filter(filter):
+            total = 0
+            async for _ in self.stream(filter):
+                total += 1
+            return total
+
+        def _count() -> int:
+            with self._lock:
+                return sum(len(self._matching_rows(index, filter)) for index in self._segments)
+
+        return await asyncio.to_thread(_count)
+
+    async def delete_before(
+        self,
+        cutoff: datetime,
+        statuses: list[EventStatus],
+    ) -> int:
+        """
+        Drop whole sealed segments whose events were all received before
+        ``cutoff``
+
+        Live events in those segments whose status is not in ``statuses``
+        (e.g. FAILED, kept for investigation) are carried forward into the
+        active segment before the segment file is removed. A segment that
+        would delete an event with an older version in a retained segment
+        is left for a later run.
+
+        Returns the number of events deleted.
+        """
+        return await asyncio.to_thread(self._delete_before, _to_ts(cutoff), set(statuses))
+
+    def _delete_before(self, cutoff: float, statuses: set[EventStatus]) -> int:
+        deleted = 0
+        with self._lock:
+            # Segments left on disk, oldest first; they may hold older
+            # versions of events in the segments after them
+            retained: list[SegmentIndex] = []
+            for index in list(self._segments):
+                if not index.sealed or index.max_received_at >= cutoff:
+                    retained.append(index)
+                    continue
+
+                live_rows = [
+                    row for row, event_id in enumerate(index.ids)
+                    if self._latest.get(event_id) == (index.segment_id, row)
+                ]
+                keep = [row for row in live_rows if _STATUSES[index.status_codes[row]] not in statuses]
+                kept = set(keep)
+                dropped = {index.ids[row] for row in live_rows if row not in kept}
+
+                # Reopening rebuilds the latest versions from the files on
+                # disk, so deleting an event whose older version survives in
+                # a retained segment would bring that version back. Leave
+                # the segment until the older one has been dropped.
+                if dropped and any(not dropped.isdisjoint(other.ids) for other in retained):
+                    retained.append(index)
+                    logger.debug(f"Event segment deferred: segment={index.segment_id}")
+                    continue
+
+                for event in self._read_rows(index, keep):
+                    self._append(event)
+
+                for event_id in dropped:
+                    del self._latest[event_id]
+
+                deleted += len(dropped)
+                self._segments.remove(index)
+                del self._by_id[index.segment_id]
+                index.path.unlink(missing_ok=True)
+                self._index_path(index.path).unlink(missing_ok=True)
+
+                logger.info(
+                    f"Event segment dropped: segment={index.segment_id} "
+                    f"deleted={len(dropped)} carried={len(keep)}"
+                )
+
+        return deleted
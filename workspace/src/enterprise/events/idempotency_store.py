@@ -0,0 +1,291 @@
+"""
+Sharded In-Memory Idempotency Storage
+
+High-throughput local IdempotencyStorage for the duplicate-detection hot path:
+- Lock-striped shards so concurrent threads rarely contend
+- Bloom filter answering "definitely new" without a shard or remote lookup
+- TTL expiry driven by a timing wheel instead of full sweeps
+- Optional write-through in front of a durable IdempotencyStorage
+"""
+
+import hashlib
+import logging
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import timezone
+
+from enterprise.events.idempotency import (
+    IdempotencyRecord,
+    IdempotencyStatus,
+    IdempotencyStorage,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _hash_pair(key: str) -> tuple[int, int]:
+    """Two 64-bit hashes for double hashing; reuses hex SHA-256 key hashes"""
+    if len(key) >= 32:
+        try:
+            return int(key[:16], 16), int(key[16:32], 16) | 1
+        except ValueError:
+            pass
+    digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+    return int.from_bytes(digest[:8], "big"), int.from_bytes(digest[8:], "big") | 1
+
+
+@dataclass
+class BloomFilter:
+    """
+    Bloom filter over key hashes
+
+    No false negatives: ``key not in bloom`` means the key was never added.
+    """
+
+    capacity: int = 1_000_000
+    error_rate: float = 0.001
+
+    size_bits: int = field(default=0, init=False)
+    num_hashes: int = field(default=0, init=False)
+    count: int = field(default=0, init=False)
+    _bits: bytearray = field(default_factory=bytearray, init=False, repr=False)
+
+    def __post_init__(self):
+        self.size_bits = max(
+            8, int(-self.capacity * math.log(self.error_rate) / (math.log(2) ** 2))
+        )
+        self.num_hashes = max(1, round(self.size_bits / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        h1, h2 = _hash_pair(key)
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.size_bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+@dataclass
+class TimingWheel:
+    """
+    Hashed timing wheel for TTL expiry
+
+    Entries are bucketed by expiry tick; ``advance`` only visits the
+    buckets for ticks that have elapsed, so expiry cost is proportional
+    to the number of expiring entries rather than the number of keys.
+    """
+
+    tick_seconds: float = 1.0
+    num_slots: int = 3600
+
+    _slots: list[dict[str, int]] = field(default_factory=list, init=False, repr=False)
+    _current_tick: int | None = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._slots = [{} for _ in range(self.num_slots)]
+
+    def _tick(self, timestamp: float) -> int:
+        return int(timestamp // self.tick_seconds)
+
+    def schedule(self, key: str, expires_at: float) -> None:
+        tick = self._tick(expires_at)
+        self._slots[tick % self.num_slots][key] = tick
+
+    def advance(self, now: float) -> list[str]:
+        """Return keys whose expiry tick has passed"""
+        target = self._tick(now)
+        if self._current_tick is None:
+            self._current_tick = target - self.num_slots
+
+        expired: list[str] = []
+        # A full rotation visits every slot; no need to go round twice
+        start = max(self._current_tick + 1, target - self.num_slots + 1)
+        for tick in range(start, target + 1):
+            slot = self._slots[tick % self.num_slots]
+            if not slot:
+                continue
+            due = [key for key, expiry_tick in slot.items() if expiry_tick <= target]
+            for key in due:
+                del slot[key]
+            expired.extend(due)
+        self._current_tick = target
+        return expired
+
+
+@dataclass
+class _Shard:
+    records: dict[str, IdempotencyRecord] = field(default_factory=dict)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def _expiry_ts(record: IdempotencyRecord) -> float | None:
+    if record.expires_at is None:
+        return None
+    return record.expires_at.replace(tzinfo=timezone.utc).timestamp()
+
+
+@dataclass
+class ShardedIdempotencyStorage:
+    """
+    Sharded in-memory IdempotencyStorage
+
+    Without ``backing`` it is a complete local store and the bloom filter
+    answers misses directly. With ``backing`` it acts as a write-through
+    cache: writes go to the durable store first, and local misses are read
+    through. The bloom filter only short-circuits those read-throughs when
+    ``authoritative`` is set, i.e. this instance sees every write for its
+    keys (single node, or keys partitioned to this node). Otherwise only
+    completed records are served locally; in-progress and failed ones can
+    be changed by another node, so they are re-read from the backing store.
+    """
+
+    backing: IdempotencyStorage | None = None
+    authoritative: bool | None = None
+
+    num_shards: int = 64
+    bloom_capacity: int = 1_000_000
+    bloom_error_rate: float = 0.001
+    wheel_tick_seconds: float = 60.0
+    wheel_slots: int = 1440          # One rotation covers the default 24h TTL
+
+    _shards: list[_Shard] = field(default_factory=list, init=False, repr=False)
+    _bloom: BloomFilter = field(default=None, init=False, repr=False)
+    _wheel: TimingWheel = field(default=None, init=False, repr=False)
+    _maintenance_lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.authoritative is None:
+            self.authoritative = self.backing is None
+        self._shards = [_Shard() for _ in range(self.num_shards)]
+        self._bloom = BloomFilter(self.bloom_capacity, self.bloom_error_rate)
+        self._wheel = TimingWheel(self.wheel_tick_seconds, self.wheel_slots)
+
+    def __len__(self) -> int:
+        return sum(len(shard.records) for shard in self._shards)
+
+    def _shard(self, key_hash: str) -> _Shard:
+        return self._shards[_hash_pair(key_hash)[0] % self.num_shards]
+
+    def _store_local(self, record: IdempotencyRecord) -> None:
+        shard = self._shard(record.key_hash)
+        with shard.lock:
+            shard.records[record.key_hash] = record
+        with self._maintenance_lock:
+            self._bloom.add(record.key_hash)
+            expiry = _expiry_ts(record)
+            if expiry is not None:
+                self._wheel.schedule(record.key_hash, expiry)
+            if self._bloom.count > self._bloom.capacity:
+                self._rebuild_bloom()
+
+    def _rebuild_bloom(self) -> None:
+        """
+        Rebuild the filter from live keys once churn saturates it
+
+        The new filter is filled before being swapped in, so readers never
+        see a false negative. It grows if live keys exceed its capacity.
+        """
+        keys: list[str] = []
+        for shard in self._shards:
+            with shard.lock:
+                keys.extend(shard.records)
+
+        bloom = BloomFilter(max(self.bloom_capacity, 2 * len(keys)), self.bloom_error_rate)
+        for key in keys:
+            bloom.add(key)
+        self._bloom = bloom
+
+    def _drop_local(self, key_hash: str) -> bool:
+        shard = self._shard(key_hash)
+        with shard.lock:
+            return shard.records.pop(key_hash, None) is not None
+
+    # ------------------------------------------------------------------
+    # IdempotencyStorage protocol
+    # ------------------------------------------------------------------
+
+    def might_contain(self, key_hash: str) -> bool:
+        """Bloom pre-check; False means the key is definitely new locally"""
+        return key_hash in self._bloom
+
+    async def get_by_key(self, key_hash: str) -> IdempotencyRecord | None:
+        if key_hash in self._bloom:
+            shard = self._shard(key_hash)
+            with shard.lock:
+                record = shard.records.get(key_hash)
+            if record is not None and (
+                self.authoritative
+                or self.backing is None
+                or record.status == IdempotencyStatus.COMPLETED
+            ):
+                return record
+
+        if self.authoritative or self.backing is None:
+            return None
+
+        record = await self.backing.get_by_key(key_hash)
+        if record is None:
+            self._drop_local(key_hash)
+        else:
+            self._store_local(record)
+        return record
+
+    async def save(self, record: IdempotencyRecord) -> IdempotencyRecord:
+        if self.backing is not None:
+            record = await self.backing.save(record)
+        self._store_local(record)
+        return record
+
+    async def update(self, record: IdempotencyRecord) -> IdempotencyRecord:
+        if self.backing is not None:
+            record = await self.backing.update(record)
+        self._store_local(record)
+        return record
+
+    async def delete(self, key_hash: str) -> bool:
+        deleted = False
+        if self.backing is not None:
+            deleted = await self.backing.delete(key_hash)
+        return self._drop_local(key_hash) or deleted
+
+    async def cleanup_expired(self) -> int:
+        """Expire records whose TTL elapsed, visiting only due wheel slots"""
+        now = time.time()
+        with self._maintenance_lock:
+            candidates = self._wheel.advance(now)
+
+        expired = 0
+        for key_hash in candidates:
+            shard = self._shard(key_hash)
+            with shard.lock:
+                record = shard.records.get(key_hash)
+                expiry = _expiry_ts(record) if record else None
+                if expiry is not None and expiry <= now:
+                    del shard.records[key_hash]
+                    expired += 1
+
+        if self.backing is not None:
+            await self.backing.cleanup_expired()
+
+        if expired:
+            logger.debug(f"Idempotency records expired: count={expired}")
+
+        return expired
+
+    def get_stats(self) -> dict[str, int]:
+        """Get storage statistics"""
+        return {
+            "records": len(self),
+            "shards": self.num_shards,
+            "bloom_bits": self._bloom.size_bits,
+            "bloom_hashes": self._bloom.num_hashes,
+            "bloom_inserts": self._bloom.count,
+        }
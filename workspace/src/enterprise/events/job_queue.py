@@ -7,13 +7,17 @@ Separate queues for different priorities:
 
 Features:
 - Priority-based scheduling
+- Atomic batched claiming (fetch N jobs in one storage round-trip)
+- Delayed jobs and retry backoff held in a heap scheduler (no head-of-line blocking)
 - Retry with exponential backoff
 - Dead Letter Queue (DLQ) for failed jobs
-- Visibility timeout for crash recovery
+- Queue statistics from one grouped count plus an incrementally maintained cache
+- Visibility timeout for crash recovery (lease renewal + stale job reaper)
 """
 
 import asyncio
 import logging
+import time
 from collections.abc import Awaitable, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -21,6 +25,8 @@ from enum import Enum
 from typing import Any, Protocol
 from uuid import UUID, uuid4
 
+from enterprise.events.scheduler import DelayedJobScheduler
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,6 +41,7 @@ class JobPriority(Enum):
 
 class JobStatus(Enum):
     """Job status"""
+    SCHEDULED = "scheduled"       # Delayed, waiting for its due time
     PENDING = "pending"           # Waiting in queue
     PROCESSING = "processing"     # Being executed
     COMPLETED = "completed"       # Successfully completed
@@ -126,6 +133,7 @@ class Job:
             "next_retry_at": self.next_retry_at.isoformat() if self.next_retry_at else None,
             "visibility_timeout": self.visibility_timeout,
             "worker_id": self.worker_id,
+            "locked_until": self.locked_until.isoformat() if self.locked_until else None,
             "timeout_seconds": self.timeout_seconds,
             "idempotency_key": self.idempotency_key,
         }
@@ -165,6 +173,25 @@ class JobStorage(Protocol):
         """Get pending jobs ordered by priority and creation time"""
         ...
 
+    async def claim_pending_jobs(
+        self,
+        queue: QueueType,
+        worker_id: str,
+        limit: int,
+        now: datetime,
+    ) -> list[Job]:
+        """
+        Atomically claim up to ``limit`` due pending jobs for a worker
+
+        A job is due when it has no ``scheduled_at`` or ``scheduled_at <= now``.
+        In one atomic step, each claimed job is moved to PROCESSING with
+        ``worker_id``, ``started_at = now``,
+        ``locked_until = now + visibility_timeout`` and ``attempt`` incremented.
+        Two concurrent callers must never receive the same job. Returned jobs
+        are ordered by priority and creation time.
+        """
+        ...
+
     async def get_jobs_by_status(
         self,
         org_id: UUID,
@@ -173,6 +200,63 @@ class JobStorage(Protocol):
     ) -> list[Job]:
         ...
 
+    async def count_pending_jobs(
+        self,
+        queue: QueueType,
+    ) -> int:
+        """Count pending jobs in a queue across all orgs (queue depth)"""
+        ...
+
+    async def get_scheduled_jobs(
+        self,
+        limit: int = 10000,
+    ) -> list[Job]:
+        """Get SCHEDULED jobs ordered by scheduled_at"""
+        ...
+
+    async def promote_scheduled_jobs(
+        self,
+        job_ids: list[UUID],
+        now: datetime,
+    ) -> list[Job]:
+        """
+        Move SCHEDULED jobs with ``scheduled_at <= now`` to PENDING
+
+        Jobs in any other state are left untouched, so promoting the same
+        job twice (e.g. from two processes) is harmless. Returns the jobs
+        that were promoted.
+        """
+        ...
+
+    async def release_expired_jobs(
+        self,
+        queue: QueueType,
+        now: datetime,
+        limit: int = 100,
+    ) -> list[Job]:
+        """
+        Atomically release up to ``limit`` PROCESSING jobs whose lease expired
+
+        Selects jobs with ``locked_until < now`` (oldest lease first, served
+        by an index on ``locked_until``), clears ``worker_id`` and
+        ``locked_until``, and moves each job to PENDING, or to DEAD if
+        ``attempt >= max_attempts``. Returns the released jobs.
+        """
+        ...
+
+    async def extend_lease(
+        self,
+        job_id: UUID,
+        worker_id: str,
+        locked_until: datetime,
+    ) -> bool:
+        """
+        Extend the lease of a PROCESSING job held by ``worker_id``
+
+        Returns False if the job is no longer held by that worker.
+        """
+        ...
+
     async def count_jobs(
         self,
         org_id: UUID,
@@ -181,6 +265,17 @@ class JobStorage(Protocol):
     ) -> int:
         ...
 
+    async def count_jobs_grouped(
+        self,
+        org_ids: list[UUID],
+    ) -> dict[UUID, dict[tuple[QueueType, JobStatus], int]]:
+        """
+        Count jobs by (queue, status) for many orgs in a single query
+
+        Orgs without jobs may be omitted from the result.
+        """
+        ...
+
 
 class DLQStorage(Protocol):
     """Storage interface for Dead Letter Queue"""
@@ -205,6 +300,64 @@ class DLQStorage(Protocol):
 JobHandler = Callable[[Job], Awaitable[dict[str, Any]]]
 
 
+StatusCounts = dict[tuple[QueueType, JobStatus], int]
+
+
+@dataclass
+class QueueStatsCache:
+    """
+    In-memory job counters per org
+
+    Seeded from a grouped storage count, then kept current by applying
+    each status transition made through the JobQueue, so reads are O(1).
+    Entries expire after ``ttl_seconds`` to reconcile transitions made by
+    other processes.
+    """
+
+    ttl_seconds: float = 30.0
+
+    _counts: dict[UUID, StatusCounts] = field(default_factory=dict, init=False, repr=False)
+    _loaded_at: dict[UUID, float] = field(default_factory=dict, init=False, repr=False)
+
+    def is_fresh(self, org_id: UUID) -> bool:
+        loaded_at = self._loaded_at.get(org_id)
+        return loaded_at is not None and time.monotonic() - loaded_at < self.ttl_seconds
+
+    def load(self, org_id: UUID, counts: StatusCounts) -> None:
+        """Replace the counters for an org with authoritative counts"""
+        self._counts[org_id] = dict(counts)
+        self._loaded_at[org_id] = time.monotonic()
+
+    def transition(
+        self,
+        org_id: UUID,
+        queue: QueueType,
+        old: JobStatus | None,
+        new: JobStatus | None,
+        count: int = 1,
+    ) -> None:
+        """Apply a status change; ignored for orgs not currently cached"""
+        counts = self._counts.get(org_id)
+        if counts is None or old == new:
+            return
+        if old is not None:
+            counts[(queue, old)] = max(counts.get((queue, old), 0) - count, 0)
+        if new is not None:
+            counts[(queue, new)] = counts.get((queue, new), 0) + count
+
+    def get(self, org_id: UUID, queue: QueueType, status: JobStatus) -> int:
+        return self._counts.get(org_id, {}).get((queue, status), 0)
+
+    def invalidate(self, org_id: UUID | None = None) -> None:
+        """Drop cached counters for one org, or all orgs"""
+        if org_id is None:
+            self._counts.clear()
+            self._loaded_at.clear()
+        else:
+            self._counts.pop(org_id, None)
+            self._loaded_at.pop(org_id, None)
+
+
 @dataclass
 class JobQueue:
     """
@@ -220,6 +373,12 @@ class JobQueue:
     storage: JobStorage
     dlq_storage: DLQStorage | None = None
 
+    # Delayed jobs and retries waiting for their due time
+    scheduler: DelayedJobScheduler = field(default_factory=DelayedJobScheduler)
+
+    # Incrementally maintained counters backing get_queue_stats
+    stats_cache: QueueStatsCache = field(default_factory=QueueStatsCache)
+
     # Handler registry
     handlers: dict[str, JobHandler] = field(default_factory=dict)
 
@@ -283,7 +442,14 @@ class JobQueue:
             visibility_timeout=self.default_visibility_timeout,
         )
 
+        if scheduled_at and scheduled_at > datetime.utcnow():
+            job.status = JobStatus.SCHEDULED
+
         job = await self.storage.save(job)
+        self.stats_cache.transition(org_id, queue, None, job.status)
+
+        if job.status == JobStatus.SCHEDULED:
+            self.scheduler.schedule(job.id, scheduled_at)
 
         logger.info(
             f"Job enqueued: id={job.id} type={job_type} "
@@ -346,29 +512,48 @@ class JobQueue:
 
         Uses visibility timeout to prevent duplicate processing.
         """
-        jobs = await self.storage.get_pending_jobs(queue, limit=1)
+        jobs = await self.fetch_jobs(queue, worker_id, max_jobs=1)
+        return jobs[0] if jobs else None
 
-        if not jobs:
-            return None
+    async def fetch_jobs(
+        self,
+        queue: QueueType,
+        worker_id: str,
+        max_jobs: int = 10,
+    ) -> list[Job]:
+        """
+        Fetch up to ``max_jobs`` available jobs from a queue in one claim
 
-        job = jobs[0]
+        Jobs are selected and locked by a single atomic storage operation,
+        so competing workers never receive the same job and a poll costs one
+        storage round-trip regardless of batch size.
+        """
+        if max_jobs <= 0:
+            return []
 
-        # Check if scheduled for later
-        if job.scheduled_at and datetime.utcnow() < job.scheduled_at:
-            return None
+        now = datetime.utcnow()
 
-        # Lock the job
-        job.status = JobStatus.PROCESSING
-        job.worker_id = worker_id
-        job.started_at = datetime.utcnow()
-        job.locked_until = datetime.utcnow() + timedelta(seconds=job.visibility_timeout)
-        job.attempt += 1
+        # Delayed jobs and retries only become claimable once promoted
+        next_due = self.scheduler.next_due_at()
+        if next_due is not None and next_due <= now:
+            await self.promote_due_jobs()
 
-        job = await self.storage.update(job)
+        jobs = await self.storage.claim_pending_jobs(
+            queue,
+            worker_id,
+            limit=max_jobs,
+            now=now,
+        )
 
-        logger.debug(f"Job fetched: id={job.id} worker={worker_id}")
+        for job in jobs:
+            self.stats_cache.transition(job.org_id, queue, JobStatus.PENDING, JobStatus.PROCESSING)
 
-        return job
+        if jobs:
+            logger.debug(
+                f"Jobs fetched: count={len(jobs)} queue={queue.value} worker={worker_id}"
+            )
+
+        return jobs
 
     async def complete_job(
         self,
@@ -380,11 +565,13 @@ class JobQueue:
         if not job:
             raise ValueError(f"Job not found: {job_id}")
 
+        previous = job.status
         job.status = JobStatus.COMPLETED
         job.completed_at = datetime.utcnow()
         job.result = result
 
         job = await self.storage.update(job)
+        self.stats_cache.transition(job.org_id, job.queue, previous, job.status)
 
         logger.info(
             f"Job completed: id={job_id} "
@@ -407,38 +594,31 @@ class JobQueue:
         if not job:
             raise ValueError(f"Job not found: {job_id}")
 
+        previous = job.status
         job.error = error
 
         if job.attempt >= job.max_attempts:
             # Move to Dead Letter Queue
             job.status = JobStatus.DEAD
             job = await self.storage.update(job)
+            self.stats_cache.transition(job.org_id, job.queue, previous, job.status)
 
-            if self.dlq_storage:
-                dlq_job = DeadLetterJob(
-                    original_job=job,
-                    reason="max_attempts_exceeded",
-                    final_error=error,
-                    attempts_made=job.attempt,
-                )
-                await self.dlq_storage.save(dlq_job)
-
-            logger.warning(
-                f"Job moved to DLQ: id={job_id} attempts={job.attempt} error={error}"
-            )
+            await self._dead_letter(job, "max_attempts_exceeded", error)
         else:
             # Schedule retry with exponential backoff
             delay = min(
                 self.base_retry_delay * (2 ** (job.attempt - 1)),
                 self.max_retry_delay,
             )
-            job.status = JobStatus.PENDING
+            job.status = JobStatus.SCHEDULED
             job.next_retry_at = datetime.utcnow() + timedelta(seconds=delay)
             job.scheduled_at = job.next_retry_at
             job.worker_id = None
             job.locked_until = None
 
             job = await self.storage.update(job)
+            self.stats_cache.transition(job.org_id, job.queue, previous, job.status)
+            self.scheduler.schedule(job.id, job.scheduled_at)
 
             logger.info(
                 f"Job scheduled for retry: id={job_id} "
@@ -448,6 +628,26 @@ class JobQueue:
 
         return job
 
+    async def _dead_letter(
+        self,
+        job: Job,
+        reason: str,
+        error: str,
+    ) -> None:
+        """Record a DEAD job in the Dead Letter Queue"""
+        if self.dlq_storage:
+            dlq_job = DeadLetterJob(
+                original_job=job,
+                reason=reason,
+                final_error=error,
+                attempts_made=job.attempt,
+            )
+            await self.dlq_storage.save(dlq_job)
+
+        logger.warning(
+            f"Job moved to DLQ: id={job.id} attempts={job.attempt} error={error}"
+        )
+
     async def cancel_job(
         self,
         job_id: UUID,
@@ -458,19 +658,67 @@ class JobQueue:
         if not job:
             raise ValueError(f"Job not found: {job_id}")
 
-        if job.status not in (JobStatus.PENDING, JobStatus.PROCESSING):
+        if job.status not in (JobStatus.SCHEDULED, JobStatus.PENDING, JobStatus.PROCESSING):
             raise ValueError(f"Cannot cancel job in status: {job.status.value}")
 
+        previous = job.status
         job.status = JobStatus.CANCELLED
         job.error = reason
         job.completed_at = datetime.utcnow()
 
         job = await self.storage.update(job)
+        self.stats_cache.transition(job.org_id, job.queue, previous, job.status)
+        self.scheduler.unschedule(job_id)
 
         logger.info(f"Job cancelled: id={job_id} reason={reason}")
 
         return job
 
+    # ------------------------------------------------------------------
+    # Delayed Jobs
+    # ------------------------------------------------------------------
+
+    async def promote_due_jobs(
+        self,
+        batch_size: int = 500,
+    ) -> int:
+        """
+        Promote scheduled jobs whose due time has passed to PENDING
+
+        Called by the worker runtime whenever the earliest scheduled job
+        becomes due, and by fetch_jobs when a due job is still waiting.
+        """
+        promoted = 0
+        now = datetime.utcnow()
+
+        while True:
+            job_ids = self.scheduler.pop_due(now, limit=batch_size)
+            if not job_ids:
+                break
+            jobs = await self.storage.promote_scheduled_jobs(job_ids, now)
+            for job in jobs:
+                self.stats_cache.transition(job.org_id, job.queue, JobStatus.SCHEDULED, job.status)
+            promoted += len(jobs)
+
+        if promoted:
+            logger.debug(f"Scheduled jobs promoted: count={promoted}")
+
+        return promoted
+
+    async def load_scheduled_jobs(self) -> int:
+        """
+        Rebuild the scheduler from storage
+
+        Picks up jobs scheduled before a restart or by another process.
+        """
+        jobs = await self.storage.get_scheduled_jobs()
+
+        for job in jobs:
+            if job.id not in self.scheduler:
+                self.scheduler.schedule(job.id, job.scheduled_at or datetime.utcnow())
+
+        return len(jobs)
+
     # ------------------------------------------------------------------
     # Handler Registration
     # ------------------------------------------------------------------
@@ -517,20 +765,62 @@ class JobQueue:
     async def recover_stale_jobs(
         self,
         queue: QueueType,
+        batch_size: int = 100,
     ) -> int:
         """
         Recover jobs that exceeded visibility timeout
 
-        These are jobs where the worker crashed or timed out.
+        These are jobs where the worker crashed or timed out. Expired leases
+        are released in bulk: back to PENDING if attempts remain, otherwise
+        straight to DEAD and recorded in the DLQ.
+        """
+        recovered = 0
+
+        while True:
+            jobs = await self.storage.release_expired_jobs(
+                queue,
+                now=datetime.utcnow(),
+                limit=batch_size,
+            )
+
+            for job in jobs:
+                self.stats_cache.transition(job.org_id, queue, JobStatus.PROCESSING, job.status)
+                if job.status == JobStatus.DEAD:
+                    await self._dead_letter(job, "visibility_timeout_expired", job.error or "")
+
+            recovered += len(jobs)
+
+            if len(jobs) < batch_size:
+                break
+
+        if recovered:
+            logger.warning(f"Stale jobs recovered: queue={queue.value} count={recovered}")
+
+        return recovered
+
+    async def renew_lease(
+        self,
+        job: Job,
+        extend_seconds: int | None = None,
+    ) -> bool:
+        """
+        Extend the visibility timeout of a job being processed
+
+        Long-running handlers must renew before ``locked_until`` passes,
+        otherwise the job is recovered and may run twice.
         """
-        # This would query for jobs where:
-        # - status = PROCESSING
-        # - locked_until < now
-        # And reset them to PENDING
+        locked_until = datetime.utcnow() + timedelta(
+            seconds=extend_seconds or job.visibility_timeout
+        )
+
+        renewed = await self.storage.extend_lease(job.id, job.worker_id, locked_until)
+
+        if renewed:
+            job.locked_until = locked_until
+        else:
+            logger.warning(f"Lease lost: id={job.id} worker={job.worker_id}")
 
-        # Implementation depends on storage backend
-        logger.info(f"Recovering stale jobs for queue: {queue.value}")
-        return 0
+        return renewed
 
     # ------------------------------------------------------------------
     # DLQ Operations
@@ -587,18 +877,37 @@ class JobQueue:
         org_id: UUID,
     ) -> dict[str, Any]:
         """Get queue statistics"""
-        stats = {}
+        stats = await self.get_queue_stats_many([org_id])
+        return stats[org_id]
 
-        for queue in QueueType:
-            pending = await self.storage.count_jobs(org_id, queue, JobStatus.PENDING)
-            processing = await self.storage.count_jobs(org_id, queue, JobStatus.PROCESSING)
+    async def get_queue_stats_many(
+        self,
+        org_ids: list[UUID],
+    ) -> dict[UUID, dict[str, Any]]:
+        """
+        Get queue statistics for many orgs
 
-            stats[queue.value] = {
-                "pending": pending,
-                "processing": processing,
-            }
+        Served from the counter cache; orgs missing from it (or expired) are
+        loaded together with one grouped storage count.
+        """
+        stale = [org_id for org_id in org_ids if not self.stats_cache.is_fresh(org_id)]
 
-        return stats
+        if stale:
+            grouped = await self.storage.count_jobs_grouped(stale)
+            for org_id in stale:
+                self.stats_cache.load(org_id, grouped.get(org_id, {}))
+
+        return {
+            org_id: {
+                queue.value: {
+                    "scheduled": self.stats_cache.get(org_id, queue, JobStatus.SCHEDULED),
+                    "pending": self.stats_cache.get(org_id, queue, JobStatus.PENDING),
+                    "processing": self.stats_cache.get(org_id, queue, JobStatus.PROCESSING),
+                }
+                for queue in QueueType
+            }
+            for org_id in org_ids
+        }
 
 
 @dataclass
@@ -0,0 +1,395 @@
+"""
+SQLite Job Storage
+
+Reference implementation of the JobStorage protocol on top of the
+standard-library sqlite3 module.
+
+Features:
+- Atomic claim of N due jobs with a single UPDATE ... RETURNING
+- Timestamps stored as epoch seconds so range predicates can use indexes
+- Partial index on locked_until for expired-lease recovery
+- Usable in-process (":memory:") for tests and single-node deployments
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from enterprise.events.job_queue import (
+    Job,
+    JobPriority,
+    JobStatus,
+    QueueType,
+)
+
+logger = logging.getLogger(__name__)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    org_id TEXT NOT NULL,
+    job_type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    queue TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    event_id TEXT,
+    correlation_id TEXT,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    scheduled_at REAL,
+    started_at REAL,
+    completed_at REAL,
+    attempt INTEGER NOT NULL,
+    max_attempts INTEGER NOT NULL,
+    next_retry_at REAL,
+    visibility_timeout INTEGER NOT NULL,
+    worker_id TEXT,
+    locked_until REAL,
+    timeout_seconds INTEGER NOT NULL,
+    idempotency_key TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_claim
+    ON jobs (queue, status, priority, created_at);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_org_status
+    ON jobs (org_id, queue, status);
+
+CREATE INDEX IF NOT EXISTS idx_jobs_scheduled
+    ON jobs (scheduled_at) WHERE status = 'scheduled';
+
+CREATE INDEX IF NOT EXISTS idx_jobs_lease
+    ON jobs (queue, locked_until) WHERE status = 'processing';
+"""
+
+_COLUMNS = (
+    "id", "org_id", "job_type", "payload", "queue", "priority", "event_id",
+    "correlation_id", "status", "result", "error", "created_at",
+    "scheduled_at", "started_at", "completed_at", "attempt", "max_attempts",
+    "next_retry_at", "visibility_timeout", "worker_id", "locked_until",
+    "timeout_seconds", "idempotency_key",
+)
+
+_SELECT_COLUMNS = ", ".join(_COLUMNS)
+
+
+def _to_ts(value: datetime | None) -> float | None:
+    """Convert a naive UTC datetime to epoch seconds"""
+    if value is None:
+        return None
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _from_ts(value: float | None) -> datetime | None:
+    """Convert epoch seconds back to a naive UTC datetime"""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, tz=timezone.utc).replace(tzinfo=None)
+
+
+def _job_to_row(job: Job) -> tuple[Any, ...]:
+    """Serialize a job into a row tuple ordered like _COLUMNS"""
+    return (
+        str(job.id),
+        str(job.org_id),
+        job.job_type,
+        json.dumps(job.payload),
+        job.queue.value,
+        job.priority.value,
+        str(job.event_id) if job.event_id else None,
+        str(job.correlation_id) if job.correlation_id else None,
+        job.status.value,
+        json.dumps(job.result) if job.result is not None else None,
+        job.error,
+        _to_ts(job.created_at),
+        _to_ts(job.scheduled_at),
+        _to_ts(job.started_at),
+        _to_ts(job.completed_at),
+        job.attempt,
+        job.max_attempts,
+        _to_ts(job.next_retry_at),
+        job.visibility_timeout,
+        job.worker_id,
+        _to_ts(job.locked_until),
+        job.timeout_seconds,
+        job.idempotency_key,
+    )
+
+
+def _row_to_job(row: sqlite3.Row) -> Job:
+    """Deserialize a row into a job"""
+    return Job(
+        id=UUID(row["id"]),
+        org_id=UUID(row["org_id"]),
+        job_type=row["job_type"],
+        payload=json.loads(row["payload"]),
+        queue=QueueType(row["queue"]),
+        priority=JobPriority(row["priority"]),
+        event_id=UUID(row["event_id"]) if row["event_id"] else None,
+        correlation_id=UUID(row["correlation_id"]) if row["correlation_id"] else None,
+        status=JobStatus(row["status"]),
+        result=json.loads(row["result"]) if row["result"] is not None else None,
+        error=row["error"],
+        created_at=_from_ts(row["created_at"]),
+        scheduled_at=_from_ts(row["scheduled_at"]),
+        started_at=_from_ts(row["started_at"]),
+        completed_at=_from_ts(row["completed_at"]),
+        attempt=row["attempt"],
+        max_attempts=row["max_attempts"],
+        next_retry_at=_from_ts(row["next_retry_at"]),
+        visibility_timeout=row["visibility_timeout"],
+        worker_id=row["worker_id"],
+        locked_until=_from_ts(row["locked_until"]),
+        timeout_seconds=row["timeout_seconds"],
+        idempotency_key=row["idempotency_key"],
+    )
+
+
+@dataclass
+class SQLiteJobStorage:
+    """
+    SQLite-backed JobStorage
+
+    All statements run in a worker thread behind a lock so the event loop
+    is never blocked on disk I/O.
+    """
+
+    path: str = ":memory:"
+
+    _conn: sqlite3.Connection = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def __post_init__(self):
+        """Open the database and create the schema"""
+        self._conn = sqlite3.connect(
+            self.path,
+            check_same_thread=False,
+            isolation_level=None,  # autocommit; each statement is atomic
+        )
+        self._conn.row_factory = sqlite3.Row
+        if self.path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _execute(self, sql: str, params: tuple[Any, ...] = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    async def _run(self, sql: str, params: tuple[Any, ...] = ()) -> list[sqlite3.Row]:
+        return await asyncio.to_thread(self._execute, sql, params)
+
+    # ------------------------------------------------------------------
+    # JobStorage protocol
+    # ------------------------------------------------------------------
+
+    async def save(self, job: Job) -> Job:
+        placeholders = ", ".join("?" for _ in _COLUMNS)
+        await self._run(
+            f"INSERT INTO jobs ({_SELECT_COLUMNS}) VALUES ({placeholders})",
+            _job_to_row(job),
+        )
+        return job
+
+    async def get(self, job_id: UUID) -> Job | None:
+        rows = await self._run(
+            f"SELECT {_SELECT_COLUMNS} FROM jobs WHERE id = ?",
+            (str(job_id),),
+        )
+        return _row_to_job(rows[0]) if rows else None
+
+    async def update(self, job: Job) -> Job:
+        assignments = ", ".join(f"{column} = ?" for column in _COLUMNS[1:])
+        row = _job_to_row(job)
+        await self._run(
+            f"UPDATE jobs SET {assignments} WHERE id = ?",
+            row[1:] + (row[0],),
+        )
+        return job
+
+    async def delete(self, job_id: UUID) -> bool:
+        rows = await self._run(
+            "DELETE FROM jobs WHERE id = ? RETURNING id",
+            (str(job_id),),
+        )
+        return bool(rows)
+
+    async def get_pending_jobs(
+        self,
+        queue: QueueType,
+        limit: int = 10,
+    ) -> list[Job]:
+        rows = await self._run(
+            f"SELECT {_SELECT_COLUMNS} FROM jobs "
+            "WHERE queue = ? AND status = ? "
+            "ORDER BY priority, created_at LIMIT ?",
+            (queue.value, JobStatus.PENDING.value, limit),
+        )
+        return [_row_to_job(row) for row in rows]
+
+    async def claim_pending_jobs(
+        self,
+        queue: QueueType,
+        worker_id: str,
+        limit: int,
+        now: datetime,
+    ) -> list[Job]:
+        now_ts = _to_ts(now)
+        rows = await self._run(
+            "UPDATE jobs SET "
+            "status = ?, worker_id = ?, started_at = ?, "
+            "locked_until = ? + visibility_timeout, attempt = attempt + 1 "
+            "WHERE id IN ("
+            "  SELECT id FROM jobs "
+            "  WHERE queue = ? AND status = ? "
+            "  AND (scheduled_at IS NULL OR scheduled_at <= ?) "
+            "  ORDER BY priority, created_at LIMIT ?"
+            f") RETURNING {_SELECT_COLUMNS}",
+            (
+                JobStatus.PROCESSING.value, worker_id, now_ts, now_ts,
+                queue.value, JobStatus.PENDING.value, now_ts, limit,
+            ),
+        )
+        jobs = [_row_to_job(row) for row in rows]
+        # RETURNING does not preserve the subquery ordering
+        jobs.sort(key=lambda job: (job.priority.value, job.created_at))
+        return jobs
+
+    async def get_jobs_by_status(
+        self,
+        org_id: UUID,
+        status: JobStatus,
+        limit: int = 100,
+    ) -> list[Job]:
+        rows = await self._run(
+            f"SELECT {_SELECT_COLUMNS} FROM jobs "
+            "WHERE org_id = ? AND status = ? ORDER BY created_at LIMIT ?",
+            (str(org_id), status.value, limit),
+        )
+        return [_row_to_job(row) for row in rows]
+
+    async def count_pending_jobs(
+        self,
+        queue: QueueType,
+    ) -> int:
+        rows = await self._run(
+            "SELECT COUNT(*) FROM jobs WHERE queue = ? AND status = ?",
+            (queue.value, JobStatus.PENDING.value),
+        )
+        return rows[0][0]
+
+    async def get_scheduled_jobs(
+        self,
+        limit: int = 10000,
+    ) -> list[Job]:
+        rows = await self._run(
+            f"SELECT {_SELECT_COLUMNS} FROM jobs "
+            "WHERE status = 'scheduled' ORDER BY scheduled_at LIMIT ?",
+            (limit,),
+        )
+        return [_row_to_job(row) for row in rows]
+
+    async def promote_scheduled_jobs(
+        self,
+        job_ids: list[UUID],
+        now: datetime,
+    ) -> list[Job]:
+        if not job_ids:
+            return []
+        placeholders = ", ".join("?" for _ in job_ids)
+        rows = await self._run(
+            "UPDATE jobs SET status = ? "
+            f"WHERE id IN ({placeholders}) "
+            f"AND status = 'scheduled' AND scheduled_at <= ? RETURNING {_SELECT_COLUMNS}",
+            (JobStatus.PENDING.value, *[str(job_id) for job_id in job_ids], _to_ts(now)),
+        )
+        return [_row_to_job(row) for row in rows]
+
+    async def release_expired_jobs(
+        self,
+        queue: QueueType,
+        now: datetime,
+        limit: int = 100,
+    ) -> list[Job]:
+        # The status literal must match the partial index predicate
+        rows = await self._run(
+            "UPDATE jobs SET "
+            "status = CASE WHEN attempt >= max_attempts THEN ? ELSE ? END, "
+            "worker_id = NULL, locked_until = NULL, "
+            "error = 'Visibility timeout expired' "
+            "WHERE id IN ("
+            "  SELECT id FROM jobs "
+            "  WHERE queue = ? AND status = 'processing' AND locked_until < ? "
+            "  ORDER BY locked_until LIMIT ?"
+            f") RETURNING {_SELECT_COLUMNS}",
+            (
+                JobStatus.DEAD.value, JobStatus.PENDING.value,
+                queue.value, _to_ts(now), limit,
+            ),
+        )
+        return [_row_to_job(row) for row in rows]
+
+    async def extend_lease(
+        self,
+        job_id: UUID,
+        worker_id: str,
+        locked_until: datetime,
+    ) -> bool:
+        rows = await self._run(
+            "UPDATE jobs SET locked_until = ? "
+            "WHERE id = ? AND worker_id = ? AND status = ? RETURNING id",
+            (_to_ts(locked_until), str(job_id), worker_id, JobStatus.PROCESSING.value),
+        )
+        return bool(rows)
+
+    async def count_jobs(
+        self,
+        org_id: UUID,
+        queue: QueueType | None = None,
+        status: JobStatus | None = None,
+    ) -> int:
+        sql = "SELECT COUNT(*) FROM jobs WHERE org_id = ?"
+        params: list[Any] = [str(org_id)]
+        if queue is not None:
+            sql += " AND queue = ?"
+            params.append(queue.value)
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status.value)
+        rows = await self._run(sql, tuple(params))
+        return rows[0][0]
+
+    async def count_jobs_grouped(
+        self,
+        org_ids: list[UUID],
+    ) -> dict[UUID, dict[tuple[QueueType, JobStatus], int]]:
+        if not org_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in org_ids)
+        rows = await self._run(
+            "SELECT org_id, queue, status, COUNT(*) FROM jobs "
+            f"WHERE org_id IN ({placeholders}) "
+            "GROUP BY org_id, queue, status",
+            tuple(str(org_id) for org_id in org_ids),
+        )
+        counts: dict[UUID, dict[tuple[QueueType, JobStatus], int]] = {}
+        for org_id, queue, status, count in rows:
+            counts.setdefault(UUID(org_id), {})[(QueueType(queue), JobStatus(status))] = count
+        return counts
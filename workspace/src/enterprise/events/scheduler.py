@@ -0,0 +1,97 @@
+"""
+Delayed Job Scheduler
+
+Min-heap of delayed jobs keyed on their due time:
+- schedule(): O(log n)
+- pop_due(): O(k log n) for k due jobs
+- next_due_at(): O(1)
+
+Delayed jobs (``scheduled_at`` in the future, or retries waiting for their
+backoff) are held as SCHEDULED and are invisible to workers until the
+scheduler promotes them to PENDING. A far-future job therefore never sits
+at the head of a ready queue.
+"""
+
+import asyncio
+import heapq
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class DelayedJobScheduler:
+    """
+    Heap-based scheduler for delayed jobs
+
+    Rescheduling a job replaces its due time; superseded heap entries are
+    discarded lazily when they reach the top.
+    """
+
+    # (due_at, sequence, job_id); sequence keeps ordering stable for ties
+    _heap: list[tuple[datetime, int, UUID]] = field(default_factory=list, init=False, repr=False)
+    _due: dict[UUID, datetime] = field(default_factory=dict, init=False, repr=False)
+    _sequence: int = field(default=0, init=False, repr=False)
+    _changed: asyncio.Event | None = field(default=None, init=False, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, job_id: UUID) -> bool:
+        return job_id in self._due
+
+    def schedule(self, job_id: UUID, due_at: datetime) -> None:
+        """Schedule (or reschedule) a job to become ready at ``due_at``"""
+        self._due[job_id] = due_at
+        self._sequence += 1
+        heapq.heappush(self._heap, (due_at, self._sequence, job_id))
+
+        # Wake a waiting promoter if this job is now the earliest
+        if self._changed and self._heap[0][2] == job_id:
+            self._changed.set()
+
+    def unschedule(self, job_id: UUID) -> bool:
+        """Remove a job from the schedule (e.g. cancelled)"""
+        return self._due.pop(job_id, None) is not None
+
+    def next_due_at(self) -> datetime | None:
+        """Due time of the earliest scheduled job"""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime, limit: int | None = None) -> list[UUID]:
+        """Remove and return jobs due at or before ``now``, earliest first"""
+        due: list[UUID] = []
+
+        while self._heap and (limit is None or len(due) < limit):
+            due_at, _, job_id = self._heap[0]
+            if self._due.get(job_id) != due_at:
+                heapq.heappop(self._heap)
+                continue
+            if due_at > now:
+                break
+            heapq.heappop(self._heap)
+            del self._due[job_id]
+            due.append(job_id)
+
+        return due
+
+    async def wait_for_change(self, timeout: float) -> None:
+        """Wait up to ``timeout`` seconds or until an earlier job is scheduled"""
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        self._changed.clear()
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def _discard_stale(self) -> None:
+        while self._heap:
+            due_at, _, job_id = self._heap[0]
+            if self._due.get(job_id) == due_at:
+                return
+            heapq.heappop(self._heap)
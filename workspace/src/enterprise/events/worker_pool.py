@@ -0,0 +1,418 @@
+"""
+Job Worker Pool
+
+Long-running worker runtime for the JobQueue:
+- N asyncio consumers per QueueType, each queue with its own in-flight bound
+  so GATE jobs never wait behind REPORT jobs
+- Batched claiming through JobQueue.fetch_jobs
+- Adaptive poll backoff when a queue is empty (no busy-spinning)
+- Lease renewal for long handlers and a periodic stale-job reaper
+- Promotion of delayed jobs and retries when they become due
+- Graceful drain on shutdown
+- Optional process-pool offload for CPU-bound handlers
+- Queue depth and handler latency exported through MetricsCollector
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+from uuid import uuid4
+
+from enterprise.data.metrics import MetricsCollector
+from enterprise.events.job_queue import (
+    Job,
+    JobQueue,
+    QueueType,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Synchronous, picklable handler run in a worker process: payload -> result
+CPUJobHandler = Callable[[dict[str, Any]], dict[str, Any]]
+
+
+@dataclass
+class QueueWorkerConfig:
+    """Per-queue worker settings"""
+    consumers: int = 1          # Concurrent polling loops
+    max_in_flight: int = 10     # Max jobs being handled at once
+    batch_size: int = 5         # Max jobs claimed per poll
+
+
+def _default_queue_configs() -> dict[QueueType, QueueWorkerConfig]:
+    return {
+        QueueType.GATE: QueueWorkerConfig(consumers=2, max_in_flight=20, batch_size=10),
+        QueueType.REPORT: QueueWorkerConfig(consumers=1, max_in_flight=5, batch_size=5),
+        QueueType.INTEGRATION: QueueWorkerConfig(consumers=1, max_in_flight=10, batch_size=5),
+        QueueType.NOTIFICATION: QueueWorkerConfig(consumers=1, max_in_flight=10, batch_size=10),
+    }
+
+
+@dataclass
+class JobWorkerPool:
+    """
+    Job Worker Pool
+
+    Usage:
+        pool = JobWorkerPool(job_queue=queue, metrics=metrics)
+        await pool.start()
+        ...
+        await pool.stop()
+    """
+
+    job_queue: JobQueue
+    metrics: MetricsCollector | None = None
+
+    worker_id: str = field(default_factory=lambda: f"worker-{uuid4().hex[:8]}")
+    queues: dict[QueueType, QueueWorkerConfig] = field(default_factory=_default_queue_configs)
+
+    # Poll backoff (seconds)
+    min_poll_interval: float = 0.05
+    max_poll_interval: float = 5.0
+    backoff_multiplier: float = 2.0
+
+    # Shutdown
+    drain_timeout: float = 30.0
+
+    # Metrics export interval (seconds)
+    metrics_interval: float = 15.0
+
+    # Crash recovery
+    reap_interval: float = 30.0      # Stale-job reaper period (0 = disabled)
+    renew_leases: bool = True        # Heartbeat leases of running jobs
+
+    # Delayed jobs: how often to resync the scheduler with storage (seconds)
+    schedule_sync_interval: float = 60.0
+
+    # Process pool for CPU-bound handlers (0 = run them in a thread)
+    process_workers: int = 0
+
+    # Runtime state
+    _running: bool = field(default=False, init=False, repr=False)
+    _stopping: asyncio.Event | None = field(default=None, init=False, repr=False)
+    _semaphores: dict[QueueType, asyncio.Semaphore] = field(default_factory=dict, init=False, repr=False)
+    _consumers: list[asyncio.Task] = field(default_factory=list, init=False, repr=False)
+    _in_flight: set[asyncio.Task] = field(default_factory=set, init=False, repr=False)
+    _metrics_task: asyncio.Task | None = field(default=None, init=False, repr=False)
+    _reaper_task: asyncio.Task | None = field(default=None, init=False, repr=False)
+    _scheduler_task: asyncio.Task | None = field(default=None, init=False, repr=False)
+    _process_pool: ProcessPoolExecutor | None = field(default=None, init=False, repr=False)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def in_flight(self) -> int:
+        """Number of jobs currently being handled"""
+        return len(self._in_flight)
+
+    async def start(self) -> None:
+        """Start consumers for every configured queue"""
+        if self._running:
+            return
+
+        self._running = True
+        self._stopping = asyncio.Event()
+
+        if self.process_workers > 0 and self._process_pool is None:
+            self._process_pool = ProcessPoolExecutor(max_workers=self.process_workers)
+
+        for queue, config in self.queues.items():
+            self._semaphores[queue] = asyncio.Semaphore(config.max_in_flight)
+            for index in range(config.consumers):
+                task = asyncio.create_task(
+                    self._consume(queue, config, f"{self.worker_id}:{queue.value}:{index}"),
+                    name=f"job-consumer-{queue.value}-{index}",
+                )
+                self._consumers.append(task)
+
+        if self.metrics:
+            self._metrics_task = asyncio.create_task(
+                self._export_metrics(), name="job-pool-metrics",
+            )
+
+        self._scheduler_task = asyncio.create_task(
+            self._promote_delayed_jobs(), name="job-pool-scheduler",
+        )
+
+        if self.reap_interval > 0:
+            self._reaper_task = asyncio.create_task(
+                self._reap_stale_jobs(), name="job-pool-reaper",
+            )
+
+        logger.info(
+            f"Worker pool started: id={self.worker_id} "
+            f"consumers={len(self._consumers)}"
+        )
+
+    async def stop(self) -> None:
+        """
+        Stop the pool gracefully
+
+        Consumers stop claiming new jobs immediately, including those
+        waiting for an in-flight slot; jobs already claimed are given
+        ``drain_timeout`` seconds to finish before being cancelled.
+        Cancelled jobs stay PROCESSING until their visibility timeout expires.
+        """
+        if not self._running:
+            return
+
+        self._stopping.set()
+
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers.clear()
+
+        for task in (self._metrics_task, self._reaper_task, self._scheduler_task):
+            if task:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+        self._metrics_task = None
+        self._reaper_task = None
+        self._scheduler_task = None
+
+        if self._in_flight:
+            done, pending = await asyncio.wait(
+                set(self._in_flight), timeout=self.drain_timeout,
+            )
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+                logger.warning(
+                    f"Worker pool drain timed out: id={self.worker_id} "
+                    f"cancelled={len(pending)}"
+                )
+
+        if self._process_pool:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+        self._semaphores.clear()
+        self._running = False
+
+        logger.info(f"Worker pool stopped: id={self.worker_id}")
+
+    async def __aenter__(self) -> "JobWorkerPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    # ------------------------------------------------------------------
+    # Handler Registration
+    # ------------------------------------------------------------------
+
+    def register_cpu_handler(
+        self,
+        job_type: str,
+        func: CPUJobHandler,
+    ) -> None:
+        """
+        Register a CPU-bound handler
+
+        ``func`` receives the job payload and returns the result dict. It
+        runs in the process pool when ``process_workers > 0`` (so it must be
+        picklable, e.g. a module-level function), otherwise in a thread.
+        """
+        async def handler(job: Job) -> dict[str, Any]:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._process_pool, func, job.payload)
+
+        self.job_queue.register_handler(job_type, handler)
+
+    # ------------------------------------------------------------------
+    # Consumers
+    # ------------------------------------------------------------------
+
+    async def _consume(
+        self,
+        queue: QueueType,
+        config: QueueWorkerConfig,
+        consumer_id: str,
+    ) -> None:
+        semaphore = self._semaphores[queue]
+        delay = self.min_poll_interval
+
+        while not self._stopping.is_set():
+            # Wait for one free slot, then grab as many more as are free
+            if not await self._acquire(semaphore):
+                break
+            slots = 1
+            while slots < config.batch_size and not semaphore.locked():
+                await semaphore.acquire()
+                slots += 1
+
+            if self._stopping.is_set():
+                self._release(semaphore, slots)
+                break
+
+            try:
+                jobs = await self.job_queue.fetch_jobs(queue, consumer_id, max_jobs=slots)
+            except Exception as e:
+                logger.exception(f"Job fetch failed: queue={queue.value} error={e}")
+                jobs = []
+
+            self._release(semaphore, slots - len(jobs))
+
+            if not jobs:
+                await self._idle(delay)
+                delay = min(delay * self.backoff_multiplier, self.max_poll_interval)
+                continue
+
+            delay = self.min_poll_interval
+
+            for job in jobs:
+                task = asyncio.create_task(self._run_job(queue, job, semaphore))
+                self._in_flight.add(task)
+                task.add_done_callback(self._in_flight.discard)
+
+    async def _run_job(
+        self,
+        queue: QueueType,
+        job: Job,
+        semaphore: asyncio.Semaphore,
+    ) -> None:
+        start = time.monotonic()
+        heartbeat = None
+        if self.renew_leases:
+            heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            result = await self.job_queue.process_job(job)
+            if self.metrics:
+                waited = None
+                if job.started_at:
+                    waited = (job.started_at - (job.scheduled_at or job.created_at)).total_seconds()
+                self.metrics.record_job_processed(
+                    queue=queue.value,
+                    job_type=job.job_type,
+                    status=result.status.value,
+                    duration_seconds=time.monotonic() - start,
+                    queue_latency_seconds=max(waited, 0.0) if waited is not None else None,
+                )
+        except Exception as e:
+            logger.exception(f"Job processing crashed: id={job.id} error={e}")
+        finally:
+            if heartbeat:
+                heartbeat.cancel()
+            semaphore.release()
+
+    async def _heartbeat(self, job: Job) -> None:
+        """Renew the job lease at a third of its visibility timeout"""
+        interval = max(job.visibility_timeout / 3, 1.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await self.job_queue.renew_lease(job):
+                    return
+            except Exception as e:
+                logger.warning(f"Lease renewal failed: id={job.id} error={e}")
+
+    async def _acquire(self, semaphore: asyncio.Semaphore) -> bool:
+        """Acquire one slot, giving up on shutdown; returns True if acquired"""
+        if not semaphore.locked():
+            await semaphore.acquire()
+            return True
+
+        acquire = asyncio.ensure_future(semaphore.acquire())
+        stopping = asyncio.ensure_future(self._stopping.wait())
+        try:
+            await asyncio.wait({acquire, stopping}, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stopping.cancel()
+            if not acquire.done():
+                acquire.cancel()
+
+        try:
+            await acquire
+        except asyncio.CancelledError:
+            return False
+        if self._stopping.is_set():
+            semaphore.release()
+            return False
+        return True
+
+    async def _idle(self, delay: float) -> None:
+        """Sleep for ``delay`` seconds, waking early on shutdown"""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    @staticmethod
+    def _release(semaphore: asyncio.Semaphore, count: int) -> None:
+        for _ in range(count):
+            semaphore.release()
+
+    async def _promote_delayed_jobs(self) -> None:
+        """Sleep until the earliest delayed job is due, then promote it"""
+        scheduler = self.job_queue.scheduler
+        last_sync = 0.0
+
+        while not self._stopping.is_set():
+            try:
+                if time.monotonic() - last_sync >= self.schedule_sync_interval:
+                    await self.job_queue.load_scheduled_jobs()
+                    last_sync = time.monotonic()
+                await self.job_queue.promote_due_jobs()
+            except Exception as e:
+                logger.warning(f"Delayed job promotion failed: error={e}")
+
+            timeout = self.schedule_sync_interval
+            next_due = scheduler.next_due_at()
+            if next_due:
+                until_due = (next_due - datetime.utcnow()).total_seconds()
+                timeout = min(max(until_due, self.min_poll_interval), timeout)
+            await scheduler.wait_for_change(timeout)
+
+    async def _reap_stale_jobs(self) -> None:
+        while not self._stopping.is_set():
+            for queue in self.queues:
+                try:
+                    await self.job_queue.recover_stale_jobs(queue)
+                except Exception as e:
+                    logger.warning(f"Stale job recovery failed: queue={queue.value} error={e}")
+            await self._idle(self.reap_interval)
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    async def _export_metrics(self) -> None:
+        while not self._stopping.is_set():
+            for queue in self.queues:
+                try:
+                    depth = await self.job_queue.storage.count_pending_jobs(queue)
+                    self.metrics.update_queue_depth(queue.value, depth)
+                except Exception as e:
+                    logger.warning(f"Queue depth export failed: queue={queue.value} error={e}")
+            await self._idle(self.metrics_interval)
+
+    def get_status(self) -> dict[str, Any]:
+        """Get pool status"""
+        return {
+            "worker_id": self.worker_id,
+            "running": self._running,
+            "consumers": len(self._consumers),
+            "in_flight": len(self._in_flight),
+            "queues": {
+                queue.value: {
+                    "consumers": config.consumers,
+                    "max_in_flight": config.max_in_flight,
+                    "batch_size": config.batch_size,
+                }
+                for queue, config in self.queues.items()
+            },
+            "timestamp": datetime.utcnow().isoformat(),
+        }
@@ -16,9 +16,11 @@ from enterprise.execution.isolator import (
     IsolationPolicy,
 )
 from enterprise.execution.quota import (
+    ConcurrentSlotManager,
     QuotaExceededError,
     ResourceQuota,
     ResourceQuotaManager,
+    SlotLease,
 )
 from enterprise.execution.secrets import (
     Secret,
@@ -41,6 +43,8 @@ __all__ = [
     "ResourceQuotaManager",
     "ResourceQuota",
     "QuotaExceededError",
+    "ConcurrentSlotManager",
+    "SlotLease",
     # Secrets
     "SecretsManager",
     "Secret",
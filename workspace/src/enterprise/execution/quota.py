@@ -7,14 +7,25 @@ Manages resource quotas to prevent:
 - Platform instability from resource exhaustion
 
 Per-org quotas ensure fair resource distribution.
+
+Usage is counted locally per (org, resource, period) and written behind
+to QuotaStorage, so check_and_consume is a single atomic step with no
+storage round-trip on the hot path. Concurrent-run slots are expiring
+lease records in QuotaStorage, so the limit holds across processes and a
+crashed worker cannot leak a slot.
 """
 
+import asyncio
 import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import Protocol
-from uuid import UUID
+from uuid import UUID, uuid4
 
 logger = logging.getLogger(__name__)
 
@@ -138,6 +149,64 @@ class OrgQuotaConfig:
     custom_quotas: dict[str, int] = field(default_factory=dict)
 
 
+@dataclass
+class TokenBucket:
+    """
+    Token bucket for burst limits
+
+    Holds up to ``capacity`` tokens, refilled continuously at
+    ``refill_per_second``.
+    """
+    capacity: float
+    refill_per_second: float
+    tokens: float | None = None
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self):
+        if self.tokens is None:
+            self.tokens = self.capacity
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def try_consume(self, amount: float = 1) -> bool:
+        """Take ``amount`` tokens if available"""
+        self._refill()
+        if self.tokens < amount:
+            return False
+        self.tokens -= amount
+        return True
+
+    def retry_after(self, amount: float = 1) -> float:
+        """Seconds until ``amount`` tokens are available"""
+        self._refill()
+        if self.tokens >= amount or self.refill_per_second <= 0:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+
+@dataclass
+class _UsageCounter:
+    """
+    Local usage counter for one (org, resource, period) window
+
+    ``base`` is the last total seen in storage; ``pending`` is consumed
+    locally but not yet written; ``in_flight`` is being written.
+    """
+    period_start: datetime
+    base: int = 0
+    pending: int = 0
+    in_flight: int = 0
+    loaded: bool = False
+    load_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @property
+    def current(self) -> int:
+        return self.base + self.in_flight + self.pending
+
+
 class QuotaStorage(Protocol):
     """Storage interface for quota tracking"""
 
@@ -166,15 +235,46 @@ class QuotaStorage(Protocol):
         self,
         org_id: UUID,
     ) -> int:
-        """Get count of concurrent runs"""
+        """Get count of concurrent runs (unexpired slot leases)"""
+        ...
+
+    async def try_acquire_lease(
+        self,
+        org_id: UUID,
+        lease_id: UUID,
+        limit: int,
+        expires_at: datetime,
+    ) -> bool:
+        """
+        Record a slot lease if fewer than ``limit`` unexpired leases exist
+
+        The count and the insert must be one atomic step across processes.
+        Leases past their ``expires_at`` do not count against the limit.
+        """
+        ...
+
+    async def renew_lease(
+        self,
+        org_id: UUID,
+        lease_id: UUID,
+        expires_at: datetime,
+    ) -> bool:
+        """Extend a lease; False if it no longer exists or already expired"""
         ...
 
-    async def set_concurrent_count(
+    async def release_lease(
         self,
         org_id: UUID,
-        count: int,
+        lease_id: UUID,
     ) -> None:
-        """Set concurrent run count"""
+        """Delete a lease"""
+        ...
+
+    async def expire_leases(
+        self,
+        org_id: UUID,
+    ) -> int:
+        """Delete expired leases, return how many were deleted"""
         ...
 
 
@@ -186,6 +286,247 @@ class QuotaConfigProvider(Protocol):
         ...
 
 
+@dataclass
+class SlotLease:
+    """
+    Lease on a concurrent-run slot
+
+    Expires unless renewed; an expired lease no longer counts against the
+    org's limit and its record is deleted from storage by the slot manager.
+    """
+    org_id: UUID
+    holder: str = ""
+    id: UUID = field(default_factory=uuid4)
+    acquired_at: datetime = field(default_factory=datetime.utcnow)
+    expires_at: datetime = field(default_factory=datetime.utcnow)
+
+    @property
+    def is_expired(self) -> bool:
+        return datetime.utcnow() >= self.expires_at
+
+
+@dataclass
+class _OrgSlots:
+    limit: int
+    leases: dict[UUID, SlotLease] = field(default_factory=dict)
+    waiters: deque[tuple[asyncio.Future, str]] = field(default_factory=deque)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+@dataclass
+class ConcurrentSlotManager:
+    """
+    Per-org concurrent-run slots
+
+    Each slot is a lease record in QuotaStorage, granted by an atomic
+    conditional insert, so the limit holds across every process sharing
+    the storage. Callers that find the org at its limit queue locally and
+    are served in FIFO order as slots are released here, or found free in
+    storage every ``poll_interval_seconds``. Leases expire after
+    ``lease_seconds`` unless renewed, and a maintenance task deletes
+    expired leases from storage, including those of crashed processes.
+    """
+
+    storage: QuotaStorage
+    lease_seconds: float = 300.0
+    poll_interval_seconds: float = 1.0
+    reconcile_interval_seconds: float = 15.0
+
+    _orgs: dict[UUID, _OrgSlots] = field(default_factory=dict)
+    _task: asyncio.Task | None = None
+
+    def in_use(self, org_id: UUID) -> int:
+        """Number of leases held by this process"""
+        slots = self._orgs.get(org_id)
+        return len(slots.leases) if slots else 0
+
+    def waiting(self, org_id: UUID) -> int:
+        slots = self._orgs.get(org_id)
+        return sum(1 for fut, _ in slots.waiters if not fut.done()) if slots else 0
+
+    async def acquire(
+        self,
+        org_id: UUID,
+        limit: int,
+        holder: str = "",
+        timeout: float | None = None,
+    ) -> SlotLease:
+        """
+        Acquire a slot, waiting in FIFO order if none is free
+
+        Raises:
+            QuotaExceededError: If no slot became free within ``timeout``
+        """
+        slots = self._orgs.get(org_id)
+        if slots is None:
+            slots = self._orgs[org_id] = _OrgSlots(limit=limit)
+        slots.limit = limit
+        self._ensure_maintenance()
+
+        # Fast path: nobody queued ahead and storage grants a slot
+        async with slots.lock:
+            if not slots.waiters:
+                lease = await self._try_grant(org_id, slots, holder)
+                if lease is not None:
+                    return lease
+
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        slots.waiters.append((waiter, holder))
+        deadline = None if timeout is None else loop.time() + timeout
+        try:
+            while True:
+                wait = self.poll_interval_seconds
+                if deadline is not None:
+                    wait = min(wait, deadline - loop.time())
+                    if wait <= 0:
+                        raise TimeoutError
+                try:
+                    return await asyncio.wait_for(asyncio.shield(waiter), wait)
+                except TimeoutError:
+                    # Slots freed by other processes are only visible in storage
+                    await self._grant_waiters(org_id, slots)
+        except TimeoutError:
+            if waiter.done():
+                return waiter.result()
+            waiter.cancel()
+            raise QuotaExceededError(
+                resource_type=ResourceType.CONCURRENT_RUNS,
+                current=len(slots.leases),
+                limit=slots.limit,
+                period=QuotaPeriod.UNLIMITED,
+            ) from None
+        except asyncio.CancelledError:
+            # Granted just as we were cancelled: give the slot back
+            if waiter.done() and not waiter.cancelled():
+                await self.release(waiter.result())
+            waiter.cancel()
+            raise
+
+    async def release(self, lease: SlotLease) -> bool:
+        """Release a slot; returns False if the lease was already reclaimed"""
+        slots = self._orgs.get(lease.org_id)
+        if slots is None or slots.leases.pop(lease.id, None) is None:
+            return False
+
+        try:
+            await self.storage.release_lease(lease.org_id, lease.id)
+        except Exception as e:
+            # The record expires on its own
+            logger.error(f"Concurrent slot release failed: org={lease.org_id} error={e}")
+
+        logger.debug(f"Concurrent slot released: org={lease.org_id} count={len(slots.leases)}")
+        await self._grant_waiters(lease.org_id, slots)
+        return True
+
+    async def renew(self, lease: SlotLease) -> bool:
+        """Heartbeat: extend a lease; False if it already expired and was reclaimed"""
+        slots = self._orgs.get(lease.org_id)
+        if slots is None or lease.id not in slots.leases:
+            return False
+
+        expires_at = datetime.utcnow() + timedelta(seconds=self.lease_seconds)
+        if not await self.storage.renew_lease(lease.org_id, lease.id, expires_at):
+            del slots.leases[lease.id]
+            return False
+        lease.expires_at = expires_at
+        return True
+
+    async def reap_expired(self) -> int:
+        """Drop this process's expired leases and hand their slots to waiters"""
+        reaped = 0
+        for org_id, slots in list(self._orgs.items()):
+            expired = [lease for lease in slots.leases.values() if lease.is_expired]
+            for lease in expired:
+                del slots.leases[lease.id]
+                logger.warning(
+                    f"Concurrent slot lease expired: org={org_id} "
+                    f"holder={lease.holder} acquired_at={lease.acquired_at.isoformat()}"
+                )
+            if expired:
+                reaped += len(expired)
+                await self._grant_waiters(org_id, slots)
+        return reaped
+
+    async def reconcile(self) -> None:
+        """Delete expired leases from storage and retry queued acquirers"""
+        for org_id, slots in list(self._orgs.items()):
+            try:
+                expired = await self.storage.expire_leases(org_id)
+            except Exception as e:
+                logger.error(f"Concurrent slot reconcile failed: org={org_id} error={e}")
+                continue
+            if expired:
+                logger.info(f"Expired concurrent slot leases removed: org={org_id} count={expired}")
+            await self._grant_waiters(org_id, slots)
+
+        # Drop idle orgs
+        for org_id in [o for o, s in self._orgs.items() if not s.leases and not s.waiters]:
+            del self._orgs[org_id]
+
+    async def close(self) -> None:
+        """Stop maintenance"""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def _try_grant(self, org_id: UUID, slots: _OrgSlots, holder: str) -> SlotLease | None:
+        """Ask storage for a slot; call with ``slots.lock`` held"""
+        if len(slots.leases) >= slots.limit:
+            return None
+
+        lease = SlotLease(
+            org_id=org_id,
+            holder=holder,
+            expires_at=datetime.utcnow() + timedelta(seconds=self.lease_seconds),
+        )
+        if not await self.storage.try_acquire_lease(org_id, lease.id, slots.limit, lease.expires_at):
+            return None
+
+        slots.leases[lease.id] = lease
+        logger.debug(f"Concurrent slot acquired: org={org_id} count={len(slots.leases)}")
+        return lease
+
+    async def _grant_waiters(self, org_id: UUID, slots: _OrgSlots) -> None:
+        async with slots.lock:
+            while slots.waiters:
+                waiter, holder = slots.waiters[0]
+                if waiter.done():
+                    slots.waiters.popleft()
+                    continue
+
+                try:
+                    lease = await self._try_grant(org_id, slots, holder)
+                except Exception as e:
+                    logger.error(f"Concurrent slot grant failed: org={org_id} error={e}")
+                    return
+                if lease is None:
+                    return
+
+                slots.waiters.popleft()
+                if waiter.done():
+                    # Gave up while storage was granting
+                    slots.leases.pop(lease.id, None)
+                    try:
+                        await self.storage.release_lease(org_id, lease.id)
+                    except Exception as e:
+                        logger.error(f"Concurrent slot release failed: org={org_id} error={e}")
+                else:
+                    waiter.set_result(lease)
+
+    def _ensure_maintenance(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._maintain())
+
+    async def _maintain(self) -> None:
+        while True:
+            await asyncio.sleep(self.reconcile_interval_seconds)
+            await self.reap_expired()
+            await asyncio.shield(self.reconcile())
+
+
 @dataclass
 class ResourceQuotaManager:
     """
@@ -197,14 +538,84 @@ class ResourceQuotaManager:
     storage: QuotaStorage
     config_provider: QuotaConfigProvider
 
-    # Cache for quota configs
-    _config_cache: dict[str, tuple[OrgQuotaConfig, datetime]] = field(default_factory=dict)
+    # Cache for quota configs: org -> (config, quotas, cached_at)
+    _config_cache: dict[str, tuple[OrgQuotaConfig, dict[ResourceType, ResourceQuota], float]] = field(
+        default_factory=dict
+    )
     _cache_ttl_seconds: int = 300
 
+    # Write-behind of locally counted usage
+    flush_interval_seconds: float = 1.0
+    _counters: dict[tuple, _UsageCounter] = field(default_factory=dict)
+    _buckets: dict[tuple[UUID, ResourceType], TokenBucket] = field(default_factory=dict)
+    _flush_task: asyncio.Task | None = None
+    _flush_lock: asyncio.Lock | None = None
+
+    # Leased concurrent-run slots
+    slots: ConcurrentSlotManager | None = None
+
+    def __post_init__(self):
+        if self.slots is None:
+            self.slots = ConcurrentSlotManager(storage=self.storage)
+
     # ------------------------------------------------------------------
     # Quota Checking
     # ------------------------------------------------------------------
 
+    async def check_and_consume(
+        self,
+        org_id: UUID,
+        resource_type: ResourceType,
+        amount: int = 1,
+    ) -> QuotaUsage:
+        """
+        Atomically check quota and consume it
+
+        The check and the increment run without an intervening await, so
+        concurrent callers in this process can never overshoot the limit.
+        Usage is written to storage and other nodes' usage read back every
+        ``flush_interval_seconds``. Across processes, overshoot is bounded
+        by what other nodes consume within about two flush intervals.
+
+        Raises:
+            QuotaExceededError: If the period limit or burst limit would
+                be exceeded; nothing is consumed in that case
+        """
+        quota = await self._get_quota(org_id, resource_type)
+
+        if quota.period == QuotaPeriod.UNLIMITED:
+            return self._unlimited_usage(resource_type, quota)
+
+        counter = await self._get_counter(org_id, resource_type, quota)
+
+        # No awaits from here on: check and consume are atomic
+        current = counter.current
+        if current + amount > quota.limit:
+            raise QuotaExceededError(
+                resource_type=resource_type,
+                current=current,
+                limit=quota.limit,
+                period=quota.period,
+                resets_at=self._get_period_end(quota.period, counter.period_start),
+            )
+
+        if quota.burst_limit:
+            bucket = self._get_bucket(org_id, quota)
+            if not bucket.try_consume(amount):
+                raise QuotaExceededError(
+                    resource_type=resource_type,
+                    current=quota.burst_limit - int(bucket.tokens),
+                    limit=quota.burst_limit,
+                    period=quota.period,
+                    resets_at=datetime.utcnow() + timedelta(seconds=bucket.retry_after(amount)),
+                )
+
+        counter.pending += amount
+        self._ensure_flusher()
+
+        self._warn_soft_limit(org_id, quota, counter.current)
+        return self._usage(resource_type, quota, counter)
+
     async def check_quota(
         self,
         org_id: UUID,
@@ -214,6 +625,8 @@ class ResourceQuotaManager:
         """
         Check if an operation would exceed quota
 
+        Prefer check_and_consume; a separate check and consume can race.
+
         Args:
             org_id: Organization ID
             resource_type: Type of resource
@@ -222,16 +635,13 @@ class ResourceQuotaManager:
         Returns:
             True if within quota, raises QuotaExceededError if not
         """
-        config = await self._get_config(org_id)
-        quota = self._get_quota_for_resource(config, resource_type)
+        quota = await self._get_quota(org_id, resource_type)
 
         if quota.period == QuotaPeriod.UNLIMITED:
             return True
 
-        period_start = self._get_period_start(quota.period)
-        current_usage = await self.storage.get_usage(
-            org_id, resource_type, quota.period, period_start
-        )
+        counter = await self._get_counter(org_id, resource_type, quota)
+        current_usage = counter.current
 
         if current_usage + amount > quota.limit:
             raise QuotaExceededError(
@@ -239,17 +649,10 @@ class ResourceQuotaManager:
                 current=current_usage,
                 limit=quota.limit,
                 period=quota.period,
-                resets_at=self._get_period_end(quota.period, period_start),
-            )
-
-        # Check soft limit (warning)
-        if quota.soft_limit and current_usage + amount > quota.soft_limit:
-            logger.warning(
-                f"Quota soft limit exceeded: org={org_id} "
-                f"resource={resource_type.value} "
-                f"usage={current_usage + amount}/{quota.limit}"
+                resets_at=self._get_period_end(quota.period, counter.period_start),
             )
 
+        self._warn_soft_limit(org_id, quota, current_usage + amount)
         return True
 
     async def check_concurrent_limit(
@@ -288,64 +691,168 @@ class ResourceQuotaManager:
         """
         Consume quota (increment usage)
 
-        Should be called after check_quota succeeds.
+        Should be called after check_quota succeeds. Usage is counted
+        locally and written behind to storage.
         """
-        config = await self._get_config(org_id)
-        quota = self._get_quota_for_resource(config, resource_type)
+        quota = await self._get_quota(org_id, resource_type)
 
         if quota.period == QuotaPeriod.UNLIMITED:
-            return QuotaUsage(
-                resource_type=resource_type,
-                current=0,
-                limit=0,
-                period=quota.period,
-                period_start=datetime.utcnow(),
-            )
-
-        period_start = self._get_period_start(quota.period)
+            return self._unlimited_usage(resource_type, quota)
 
-        new_usage = await self.storage.increment_usage(
-            org_id, resource_type, quota.period, period_start, amount
-        )
+        counter = await self._get_counter(org_id, resource_type, quota)
+        counter.pending += amount
+        self._ensure_flusher()
 
         logger.debug(
             f"Quota consumed: org={org_id} resource={resource_type.value} "
-            f"amount={amount} new_usage={new_usage}/{quota.limit}"
+            f"amount={amount} new_usage={counter.current}/{quota.limit}"
         )
 
-        return QuotaUsage(
-            resource_type=resource_type,
-            current=new_usage,
-            limit=quota.limit,
-            period=quota.period,
-            period_start=period_start,
-            period_end=self._get_period_end(quota.period, period_start),
-        )
+        return self._usage(resource_type, quota, counter)
 
     async def acquire_concurrent_slot(
         self,
         org_id: UUID,
-    ) -> bool:
-        """Acquire a concurrent run slot"""
-        await self.check_concurrent_limit(org_id)
-
-        current = await self.storage.get_concurrent_count(org_id)
-        await self.storage.set_concurrent_count(org_id, current + 1)
+        holder: str = "",
+        timeout: float | None = None,
+    ) -> SlotLease:
+        """
+        Acquire a concurrent run slot
 
-        logger.debug(f"Concurrent slot acquired: org={org_id} count={current + 1}")
+        Waits in FIFO order while the org is at its limit. The lease must
+        be renewed (see renew_concurrent_slot) if the run outlives
+        ``slots.lease_seconds``.
 
-        return True
+        Raises:
+            QuotaExceededError: If no slot became free within ``timeout``
+        """
+        config = await self._get_config(org_id)
+        return await self.slots.acquire(org_id, config.max_concurrent_runs, holder, timeout)
 
     async def release_concurrent_slot(
         self,
         org_id: UUID,
+        lease: SlotLease,
     ) -> None:
-        """Release a concurrent run slot"""
-        current = await self.storage.get_concurrent_count(org_id)
-        new_count = max(0, current - 1)
-        await self.storage.set_concurrent_count(org_id, new_count)
+        """Release the concurrent run slot held by ``lease``"""
+        if lease.org_id != org_id:
+            raise ValueError(f"Lease {lease.id} belongs to org {lease.org_id}, not {org_id}")
+        await self.slots.release(lease)
+
+    async def renew_concurrent_slot(self, lease: SlotLease) -> bool:
+        """Heartbeat a slot lease; False if it expired and was reclaimed"""
+        return await self.slots.renew(lease)
+
+    @asynccontextmanager
+    async def concurrent_slot(
+        self,
+        org_id: UUID,
+        holder: str = "",
+        timeout: float | None = None,
+    ) -> AsyncIterator[SlotLease]:
+        """
+        Hold a concurrent run slot for the duration of a block
+
+        The lease is renewed in the background and released on exit.
+
+        Usage:
+            async with quota_manager.concurrent_slot(org_id, holder=run_id):
+                await run_analysis()
+        """
+        lease = await self.acquire_concurrent_slot(org_id, holder, timeout)
+
+        async def heartbeat():
+            while True:
+                await asyncio.sleep(self.slots.lease_seconds / 3)
+                try:
+                    if not await self.slots.renew(lease):
+                        return
+                except Exception as e:
+                    logger.warning(f"Concurrent slot renewal failed: org={org_id} error={e}")
+
+        heartbeat_task = asyncio.create_task(heartbeat())
+        try:
+            yield lease
+        finally:
+            heartbeat_task.cancel()
+            await self.slots.release(lease)
+
+    # ------------------------------------------------------------------
+    # Write-behind
+    # ------------------------------------------------------------------
+
+    def _ensure_flusher(self) -> None:
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        self._flush_task = asyncio.get_running_loop().create_task(self._flush_loop())
 
-        logger.debug(f"Concurrent slot released: org={org_id} count={new_count}")
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            # Shielded so stopping the loop never abandons a write midway
+            await asyncio.shield(self.flush())
+
+    async def flush(self) -> int:
+        """
+        Write locally counted usage to storage
+
+        Every counter's base is refreshed from storage, either from the
+        total an increment returns or by reading it when nothing is
+        pending, which picks up usage consumed by other nodes. Counters
+        from past periods are dropped once written.
+
+        Returns the number of counters written.
+        """
+        if self._flush_lock is None:
+            self._flush_lock = asyncio.Lock()
+
+        written = 0
+        async with self._flush_lock:
+            for key, counter in list(self._counters.items()):
+                org_id, resource_type, period, period_start = key
+
+                if counter.pending:
+                    delta = counter.pending
+                    counter.pending -= delta
+                    counter.in_flight += delta
+                    try:
+                        counter.base = await self.storage.increment_usage(
+                            org_id, resource_type, period, period_start, delta
+                        )
+                        written += 1
+                    except Exception as e:
+                        counter.pending += delta
+                        logger.error(
+                            f"Quota usage flush failed: org={org_id} "
+                            f"resource={resource_type.value} error={e}"
+                        )
+                    finally:
+                        counter.in_flight -= delta
+                elif counter.loaded:
+                    try:
+                        counter.base = await self.storage.get_usage(
+                            org_id, resource_type, period, period_start
+                        )
+                    except Exception as e:
+                        logger.warning(
+                            f"Quota usage refresh failed: org={org_id} "
+                            f"resource={resource_type.value} error={e}"
+                        )
+
+                if not counter.pending and period_start != self._get_period_start(period):
+                    del self._counters[key]
+
+        return written
+
+    async def close(self) -> None:
+        """Stop background tasks and flush remaining usage"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._flush_task
+            self._flush_task = None
+        await self.flush()
+        await self.slots.close()
 
     # ------------------------------------------------------------------
     # Quota Queries
@@ -357,31 +864,13 @@ class ResourceQuotaManager:
         resource_type: ResourceType,
     ) -> QuotaUsage:
         """Get current usage for a resource"""
-        config = await self._get_config(org_id)
-        quota = self._get_quota_for_resource(config, resource_type)
+        quota = await self._get_quota(org_id, resource_type)
 
         if quota.period == QuotaPeriod.UNLIMITED:
-            return QuotaUsage(
-                resource_type=resource_type,
-                current=0,
-                limit=0,
-                period=quota.period,
-                period_start=datetime.utcnow(),
-            )
-
-        period_start = self._get_period_start(quota.period)
-        current = await self.storage.get_usage(
-            org_id, resource_type, quota.period, period_start
-        )
+            return self._unlimited_usage(resource_type, quota)
 
-        return QuotaUsage(
-            resource_type=resource_type,
-            current=current,
-            limit=quota.limit,
-            period=quota.period,
-            period_start=period_start,
-            period_end=self._get_period_end(quota.period, period_start),
-        )
+        counter = await self._get_counter(org_id, resource_type, quota)
+        return self._usage(resource_type, quota, counter)
 
     async def get_all_usage(
         self,
@@ -414,26 +903,113 @@ class ResourceQuotaManager:
 
     async def _get_config(self, org_id: UUID) -> OrgQuotaConfig:
         """Get quota config with caching"""
+        return (await self._get_cached(org_id))[0]
+
+    async def _get_quota(self, org_id: UUID, resource_type: ResourceType) -> ResourceQuota:
+        """Get the cached quota definition for a resource type"""
+        quotas = (await self._get_cached(org_id))[1]
+        quota = quotas.get(resource_type)
+        if quota is None:
+            quota = ResourceQuota(resource_type=resource_type, limit=0, period=QuotaPeriod.UNLIMITED)
+        return quota
+
+    async def _get_cached(
+        self, org_id: UUID
+    ) -> tuple[OrgQuotaConfig, dict[ResourceType, ResourceQuota], float]:
         cache_key = str(org_id)
-        now = datetime.utcnow()
+        now = time.monotonic()
 
-        if cache_key in self._config_cache:
-            config, cached_at = self._config_cache[cache_key]
-            if (now - cached_at).total_seconds() < self._cache_ttl_seconds:
-                return config
+        cached = self._config_cache.get(cache_key)
+        if cached and now - cached[2] < self._cache_ttl_seconds:
+            return cached
 
         config = await self.config_provider.get_config(org_id)
-        self._config_cache[cache_key] = (config, now)
+        cached = (config, self._build_quotas(config), now)
+        self._config_cache[cache_key] = cached
 
-        return config
+        return cached
 
-    def _get_quota_for_resource(
+    def invalidate_config(self, org_id: UUID | None = None) -> None:
+        """Drop cached quota config, e.g. after a plan change"""
+        if org_id is None:
+            self._config_cache.clear()
+            self._buckets.clear()
+            return
+
+        self._config_cache.pop(str(org_id), None)
+        for key in [key for key in self._buckets if key[0] == org_id]:
+            del self._buckets[key]
+
+    async def _get_counter(
         self,
-        config: OrgQuotaConfig,
+        org_id: UUID,
         resource_type: ResourceType,
-    ) -> ResourceQuota:
-        """Get quota definition for a resource type"""
-        quotas = {
+        quota: ResourceQuota,
+    ) -> _UsageCounter:
+        """Get the local counter for the current period; the flusher keeps it current"""
+        period_start = self._get_period_start(quota.period)
+        key = (org_id, resource_type, quota.period, period_start)
+
+        counter = self._counters.get(key)
+        if counter is None:
+            counter = self._counters[key] = _UsageCounter(period_start=period_start)
+
+        if not counter.loaded:
+            async with counter.load_lock:
+                if not counter.loaded:
+                    counter.base = await self.storage.get_usage(
+                        org_id, resource_type, quota.period, period_start
+                    )
+                    counter.loaded = True
+            self._ensure_flusher()
+
+        return counter
+
+    def _get_bucket(self, org_id: UUID, quota: ResourceQuota) -> TokenBucket:
+        key = (org_id, quota.resource_type)
+        bucket = self._buckets.get(key)
+        if bucket is None or bucket.capacity != quota.burst_limit:
+            bucket = self._buckets[key] = TokenBucket(
+                capacity=quota.burst_limit,
+                refill_per_second=quota.burst_limit / quota.burst_window_seconds,
+            )
+        return bucket
+
+    def _warn_soft_limit(self, org_id: UUID, quota: ResourceQuota, usage: int) -> None:
+        if quota.soft_limit and usage > quota.soft_limit:
+            logger.warning(
+                f"Quota soft limit exceeded: org={org_id} "
+                f"resource={quota.resource_type.value} "
+                f"usage={usage}/{quota.limit}"
+            )
+
+    def _usage(
+        self,
+        resource_type: ResourceType,
+        quota: ResourceQuota,
+        counter: _UsageCounter,
+    ) -> QuotaUsage:
+        return QuotaUsage(
+            resource_type=resource_type,
+            current=counter.current,
+            limit=quota.limit,
+            period=quota.period,
+            period_start=counter.period_start,
+            period_end=self._get_period_end(quota.period, counter.period_start),
+        )
+
+    def _unlimited_usage(self, resource_type: ResourceType, quota: ResourceQuota) -> QuotaUsage:
+        return QuotaUsage(
+            resource_type=resource_type,
+            current=0,
+            limit=0,
+            period=quota.period,
+            period_start=datetime.utcnow(),
+        )
+
+    def _build_quotas(self, config: OrgQuotaConfig) -> dict[ResourceType, ResourceQuota]:
+        """Build quota definitions for every limited resource type"""
+        return {
             ResourceType.ANALYSIS_COUNT: ResourceQuota(
                 resource_type=ResourceType.ANALYSIS_COUNT,
                 limit=config.max_analysis_per_month,
@@ -459,6 +1035,8 @@ class ResourceQuotaManager:
                 resource_type=ResourceType.API_CALLS,
                 limit=config.api_calls_per_hour,
                 period=QuotaPeriod.HOURLY,
+                burst_limit=config.api_calls_per_minute,
+                burst_window_seconds=60,
             ),
             ResourceType.NETWORK_EGRESS_BYTES: ResourceQuota(
                 resource_type=ResourceType.NETWORK_EGRESS_BYTES,
@@ -467,15 +1045,6 @@ class ResourceQuotaManager:
             ),
         }
 
-        return quotas.get(
-            resource_type,
-            ResourceQuota(
-                resource_type=resource_type,
-                limit=0,
-                period=QuotaPeriod.UNLIMITED,
-            ),
-        )
-
     def _get_period_start(self, period: QuotaPeriod) -> datetime:
         """Get start of current period"""
         now = datetime.utcnow()
@@ -23,7 +23,7 @@ from enterprise.iam.models import (
     TokenScope,
     User,
 )
-from enterprise.iam.rbac import RBACManager
+from enterprise.iam.rbac import PermissionCache, RBACManager
 from enterprise.iam.sso import SSOManager
 from enterprise.iam.tenant_manager import TenantManager
 from enterprise.iam.token_manager import TokenManager
@@ -44,6 +44,7 @@ __all__ = [
     # Managers
     "TenantManager",
     "RBACManager",
+    "PermissionCache",
     "TokenManager",
     "SSOManager",
 ]
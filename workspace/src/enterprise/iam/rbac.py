@@ -3,10 +3,15 @@ RBAC (Role-Based Access Control) Manager
 
 Enforces permission checks for all operations.
 Any "setting change" MUST check permissions before proceeding.
+
+Resolved permissions are cached per (org, user) as bitmasks, so a check
+is a dictionary lookup plus an AND instead of a repository read.
 """
 
 import logging
-from dataclasses import dataclass
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Protocol
 from uuid import UUID
@@ -21,6 +26,25 @@ from enterprise.iam.models import (
 logger = logging.getLogger(__name__)
 
 
+# One bit per permission; role masks are precomputed from ROLE_PERMISSIONS
+PERMISSION_BITS: dict[Permission, int] = {
+    permission: 1 << i for i, permission in enumerate(Permission)
+}
+
+
+def permission_mask(permissions) -> int:
+    """Combine permissions into a bitmask"""
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS[permission]
+    return mask
+
+
+ROLE_PERMISSION_MASKS: dict[Role, int] = {
+    role: permission_mask(permissions) for role, permissions in ROLE_PERMISSIONS.items()
+}
+
+
 class MembershipRepository(Protocol):
     """Repository interface for membership data"""
 
@@ -80,6 +104,78 @@ class PermissionDeniedError(Exception):
         super().__init__(self.message)
 
 
+@dataclass
+class PermissionCache:
+    """
+    Per-(org, user) cache of resolved roles and permission masks
+
+    Entries expire after ``ttl_seconds`` as a backstop; membership changes
+    made through RBACManager invalidate them immediately. Missing or
+    inactive memberships are cached too (role None, mask 0).
+    """
+
+    ttl_seconds: float = 60.0
+    max_entries: int = 100_000
+
+    # (org_id, user_id) -> (role, mask, expires_at)
+    _entries: OrderedDict[tuple[UUID, UUID], tuple[Role | None, int, float]] = field(
+        default_factory=OrderedDict, repr=False,
+    )
+    # Bumped on every invalidation; a lookup that started before an
+    # invalidation must not store its (possibly stale) result
+    _epoch: int = field(default=0, repr=False)
+
+    hits: int = 0
+    misses: int = 0
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+    def get(self, org_id: UUID, user_id: UUID) -> tuple[Role | None, int] | None:
+        """Get (role, mask) if cached and fresh"""
+        entry = self._entries.get((org_id, user_id))
+        if entry is None or entry[2] <= time.monotonic():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0], entry[1]
+
+    def put(
+        self,
+        org_id: UUID,
+        user_id: UUID,
+        role: Role | None,
+        epoch: int,
+    ) -> int:
+        """Cache a resolved role; returns its permission mask"""
+        mask = ROLE_PERMISSION_MASKS.get(role, 0) if role else 0
+        if epoch != self._epoch:
+            return mask
+
+        key = (org_id, user_id)
+        self._entries[key] = (role, mask, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return mask
+
+    def invalidate(self, org_id: UUID, user_id: UUID) -> None:
+        """Drop the entry for one member"""
+        self._epoch += 1
+        self._entries.pop((org_id, user_id), None)
+
+    def invalidate_org(self, org_id: UUID) -> None:
+        """Drop all entries for an organization"""
+        self._epoch += 1
+        for key in [key for key in self._entries if key[0] == org_id]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._epoch += 1
+        self._entries.clear()
+
+
 @dataclass
 class RBACManager:
     """
@@ -91,11 +187,33 @@ class RBACManager:
 
     membership_repository: MembershipRepository
     audit_logger: AuditLogger | None = None
+    permission_cache: PermissionCache = field(default_factory=PermissionCache)
 
     # ------------------------------------------------------------------
     # Permission Checking
     # ------------------------------------------------------------------
 
+    async def _resolve(self, org_id: UUID, user_id: UUID) -> tuple[Role | None, int]:
+        """Get the active role and permission mask of a member"""
+        cached = self.permission_cache.get(org_id, user_id)
+        if cached is not None:
+            return cached
+
+        epoch = self.permission_cache.epoch
+        membership = await self.membership_repository.get_membership(org_id, user_id)
+        role = membership.role if membership and membership.is_active else None
+        return role, self.permission_cache.put(org_id, user_id, role, epoch)
+
+    def invalidate_permissions(self, org_id: UUID, user_id: UUID | None = None) -> None:
+        """
+        Drop cached permissions after a membership change made outside
+        this manager (e.g. SSO provisioning); user_id=None drops the org
+        """
+        if user_id is None:
+            self.permission_cache.invalidate_org(org_id)
+        else:
+            self.permission_cache.invalidate(org_id, user_id)
+
     async def check_permission(
         self,
         org_id: UUID,
@@ -118,16 +236,9 @@ class RBACManager:
         Raises:
             PermissionDeniedError: If permission denied and raise_on_deny=True
         """
-        membership = await self.membership_repository.get_membership(org_id, user_id)
-
-        if not membership or not membership.is_active:
-            if raise_on_deny:
-                raise PermissionDeniedError(org_id, user_id, permission)
-            return False
-
-        user_permissions = ROLE_PERMISSIONS.get(membership.role, set())
+        _, mask = await self._resolve(org_id, user_id)
 
-        if permission not in user_permissions:
+        if not mask & PERMISSION_BITS[permission]:
             if raise_on_deny:
                 raise PermissionDeniedError(org_id, user_id, permission)
             return False
@@ -153,19 +264,19 @@ class RBACManager:
         Returns:
             True if check passes
         """
-        membership = await self.membership_repository.get_membership(org_id, user_id)
+        role, mask = await self._resolve(org_id, user_id)
 
-        if not membership or not membership.is_active:
+        if role is None:
             raise PermissionDeniedError(org_id, user_id, permissions[0])
 
-        user_permissions = ROLE_PERMISSIONS.get(membership.role, set())
+        required = permission_mask(permissions)
 
         if require_all:
-            if not all(p in user_permissions for p in permissions):
-                missing = [p for p in permissions if p not in user_permissions]
+            if mask & required != required:
+                missing = [p for p in permissions if not mask & PERMISSION_BITS[p]]
                 raise PermissionDeniedError(org_id, user_id, missing[0])
         else:
-            if not any(p in user_permissions for p in permissions):
+            if not mask & required:
                 raise PermissionDeniedError(org_id, user_id, permissions[0])
 
         return True
@@ -174,8 +285,8 @@ class RBACManager:
         self, org_id: UUID, user_id: UUID
     ) -> Role | None:
         """Get user's role in an organization"""
-        membership = await self.membership_repository.get_membership(org_id, user_id)
-        return membership.role if membership and membership.is_active else None
+        role, _ = await self._resolve(org_id, user_id)
+        return role
 
     async def get_user_permissions(
         self, org_id: UUID, user_id: UUID
@@ -242,6 +353,7 @@ class RBACManager:
         )
 
         membership = await self.membership_repository.save_membership(membership)
+        self.permission_cache.invalidate(org_id, user_id)
 
         # Audit log
         if self.audit_logger:
@@ -298,6 +410,7 @@ class RBACManager:
         membership.updated_at = datetime.utcnow()
 
         membership = await self.membership_repository.save_membership(membership)
+        self.permission_cache.invalidate(org_id, user_id)
 
         if self.audit_logger:
             await self.audit_logger.log(
@@ -345,6 +458,7 @@ class RBACManager:
                 raise ValueError("Only owners can remove other owners")
 
         result = await self.membership_repository.delete_membership(org_id, user_id)
+        self.permission_cache.invalidate(org_id, user_id)
 
         if self.audit_logger:
             await self.audit_logger.log(
@@ -382,6 +496,7 @@ class RBACManager:
                 )
 
         result = await self.membership_repository.delete_membership(org_id, user_id)
+        self.permission_cache.invalidate(org_id, user_id)
 
         if self.audit_logger:
             await self.audit_logger.log(
@@ -7,8 +7,15 @@ Provides stable integration with GitHub/GitLab including:
 - Rate limiting and backpressure
 - Provider App/OAuth installation management
 - Check Run / Status / Comment write-back
+- Rate-limit aware provider HTTP client
 """
 
+from enterprise.integrations.provider_http import (
+    HTTPResponse,
+    ProviderHTTPClient,
+    ProviderHTTPError,
+    RateLimitExceededError,
+)
 from enterprise.integrations.providers import (
     GitProvider,
     GitProviderManager,
@@ -16,16 +23,24 @@ from enterprise.integrations.providers import (
     ProviderInstallation,
 )
 from enterprise.integrations.webhook import (
+    WebhookDelivery,
     WebhookEvent,
     WebhookReceiver,
     WebhookValidationError,
 )
+from enterprise.integrations.webhook_stores import (
+    GCRARateLimiter,
+    LRUNonceStore,
+    SharedMemoryNonceStore,
+    SharedMemoryRateLimiter,
+)
 from enterprise.integrations.writeback import (
     CheckRunConclusion,
     CheckRunStatus,
     CheckRunWriter,
     CommentWriter,
     StatusWriter,
+    WritebackQueue,
 )
 
 __all__ = [
@@ -33,15 +48,27 @@ __all__ = [
     "WebhookReceiver",
     "WebhookEvent",
     "WebhookValidationError",
+    "WebhookDelivery",
+    # Webhook stores
+    "GCRARateLimiter",
+    "LRUNonceStore",
+    "SharedMemoryRateLimiter",
+    "SharedMemoryNonceStore",
     # Providers
     "GitProviderManager",
     "GitProvider",
     "ProviderInstallation",
     "ProviderAuth",
+    # Provider HTTP
+    "ProviderHTTPClient",
+    "HTTPResponse",
+    "ProviderHTTPError",
+    "RateLimitExceededError",
     # Write-back
     "CheckRunWriter",
     "CheckRunStatus",
     "CheckRunConclusion",
     "StatusWriter",
     "CommentWriter",
+    "WritebackQueue",
 ]
@@ -0,0 +1,462 @@
+"""
+Provider HTTP Layer
+
+Shared HTTP client for Git provider APIs:
+- Per-host connection limits
+- Conditional GETs (ETag / If-None-Match, Last-Modified)
+- Rate-limit aware scheduling from X-RateLimit-* headers
+- Retry-After handling and jittered retries
+
+ProviderHTTPClient exposes the same get/post/patch methods as the
+HTTPClient protocols in providers.py and writeback.py, so it can be
+dropped in wherever a bare client is used today.
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+# Status codes worth retrying after a backoff
+RETRYABLE_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class ProviderHTTPError(Exception):
+    """Raised when a provider request fails with a non-retryable status"""
+    def __init__(
+        self,
+        status: int,
+        url: str,
+        body: Any = None,
+        retry_after: float | None = None,
+    ):
+        self.status = status
+        self.url = url
+        self.body = body
+        self.retry_after = retry_after
+
+        super().__init__(f"Provider request failed: {status} {url}")
+
+
+class RateLimitExceededError(ProviderHTTPError):
+    """Raised when a request would have to wait too long for rate limit reset"""
+    pass
+
+
+@dataclass
+class HTTPResponse:
+    """Raw provider response"""
+    status: int = 200
+    headers: dict[str, str] = field(default_factory=dict)
+    body: Any = None
+
+    def header(self, name: str) -> str | None:
+        """Case-insensitive header lookup"""
+        value = self.headers.get(name)
+        if value is not None:
+            return value
+        lowered = name.lower()
+        for key, value in self.headers.items():
+            if key.lower() == lowered:
+                return value
+        return None
+
+
+class HTTPTransport(Protocol):
+    """
+    Underlying HTTP transport
+
+    Implementations should keep a pooled session per process (e.g. an
+    aiohttp ClientSession). Transports that only offer the legacy
+    get/post/patch methods returning a decoded body are also accepted;
+    they are treated as always returning 200 without headers.
+    """
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        data: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> HTTPResponse:
+        ...
+
+
+@dataclass
+class RateLimitState:
+    """Last known rate limit for one credential"""
+    limit: int = 5000
+    remaining: int | None = None
+    reset_at: float = 0.0           # epoch seconds
+    blocked_until: float = 0.0      # epoch seconds, from Retry-After
+    updated_at: float = 0.0
+
+    def wait_time(self, now: float, reserve: int) -> float:
+        """Seconds to wait before spending one more request"""
+        wait = max(0.0, self.blocked_until - now)
+        if self.remaining is None or self.reset_at <= now:
+            return wait
+        if self.remaining <= reserve:
+            return max(wait, self.reset_at - now)
+        return wait
+
+    def pace(self, now: float, reserve: int, threshold: int) -> float:
+        """Spread the remaining budget evenly until reset once it runs low"""
+        if self.remaining is None or self.reset_at <= now:
+            return 0.0
+        budget = self.remaining - reserve
+        if budget <= 0 or self.remaining > threshold:
+            return 0.0
+        return (self.reset_at - now) / budget
+
+
+@dataclass
+class _CachedResponse:
+    """Cached GET body with its validators"""
+    etag: str | None
+    last_modified: str | None
+    body: Any
+
+
+@dataclass
+class ProviderHTTPClient:
+    """
+    Provider-aware HTTP client
+
+    Wraps a transport with per-host concurrency limits, an ETag cache for
+    reads and rate-limit scheduling keyed by credential. Writes keep
+    write_reserve requests in hand so reads never starve them, and are
+    paced across the remaining window once the budget runs low.
+    """
+
+    transport: HTTPTransport
+
+    # Connection pooling
+    max_connections_per_host: int = 10
+
+    # Conditional request cache
+    cache_max_entries: int = 2048
+
+    # Rate limit scheduling
+    read_reserve: int = 100
+    write_reserve: int = 20
+    pace_threshold: int = 500
+    max_wait_seconds: float = 300.0
+
+    # Retry configuration
+    max_retries: int = 3
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+
+    # Writers check this to skip their own retry loop
+    handles_retries: bool = True
+
+    _host_limits: dict[str, asyncio.Semaphore] = field(default_factory=dict)
+    _cache: OrderedDict[tuple[str, str], _CachedResponse] = field(default_factory=OrderedDict)
+    _rate_limits: dict[str, RateLimitState] = field(default_factory=dict)
+    _stats: dict[str, int] = field(default_factory=lambda: {
+        "requests": 0,
+        "not_modified": 0,
+        "throttled": 0,
+        "retries": 0,
+    })
+
+    # ------------------------------------------------------------------
+    # HTTPClient interface
+    # ------------------------------------------------------------------
+
+    async def get(
+        self,
+        url: str,
+        headers: dict[str, str] = None,
+    ) -> dict[str, Any]:
+        """GET with conditional-request caching"""
+        return await self.request("GET", url, headers=headers)
+
+    async def post(
+        self,
+        url: str,
+        data: dict[str, Any] = None,
+        headers: dict[str, str] = None,
+    ) -> dict[str, Any]:
+        return await self.request("POST", url, data=data, headers=headers)
+
+    async def patch(
+        self,
+        url: str,
+        data: dict[str, Any] = None,
+        headers: dict[str, str] = None,
+    ) -> dict[str, Any]:
+        return await self.request("PATCH", url, data=data, headers=headers)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        data: dict[str, Any] | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Any:
+        """
+        Send a request and return the decoded body
+
+        GETs are revalidated against the cache; a 304 returns the cached
+        body. 429 and rate-limited 403 responses wait for Retry-After (or
+        the reset time) before retrying; 5xx and transport errors back off
+        with jitter.
+        """
+        method = method.upper()
+        headers = dict(headers or {})
+        credential = self._credential_key(headers)
+        cache_key = (url, credential)
+        is_write = method != "GET"
+
+        cached = None
+        if not is_write:
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self._cache.move_to_end(cache_key)
+                if cached.etag:
+                    headers["If-None-Match"] = cached.etag
+                if cached.last_modified:
+                    headers["If-Modified-Since"] = cached.last_modified
+
+        last_error: Exception | None = None
+
+        for attempt in range(self.max_retries):
+            await self._schedule(credential, url, is_write)
+
+            try:
+                response = await self._send(method, url, data, headers)
+            except ProviderHTTPError:
+                raise
+            except Exception as e:
+                last_error = e
+                delay = self._backoff(attempt)
+                logger.warning(
+                    f"{method} {url} failed (attempt {attempt + 1}/{self.max_retries}): "
+                    f"{e}. Retrying in {delay:.1f}s"
+                )
+                if attempt < self.max_retries - 1:
+                    self._stats["retries"] += 1
+                    await asyncio.sleep(delay)
+                continue
+
+            state = self._update_rate_limit(credential, response)
+
+            if response.status == 304 and cached is not None:
+                self._stats["not_modified"] += 1
+                return cached.body
+
+            if self._is_rate_limited(response, state):
+                wait = self._retry_after(response, state)
+                last_error = ProviderHTTPError(
+                    response.status, url, response.body, retry_after=wait,
+                )
+                state.blocked_until = max(state.blocked_until, time.time() + wait)
+                logger.warning(
+                    f"Rate limited on {method} {url} ({response.status}); "
+                    f"retry after {wait:.1f}s"
+                )
+                if attempt < self.max_retries - 1:
+                    self._stats["retries"] += 1
+                continue
+
+            if response.status in RETRYABLE_STATUSES:
+                last_error = ProviderHTTPError(response.status, url, response.body)
+                if attempt < self.max_retries - 1:
+                    self._stats["retries"] += 1
+                    await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            if response.status >= 400:
+                raise ProviderHTTPError(response.status, url, response.body)
+
+            if is_write:
+                self._invalidate(url)
+            else:
+                self._store(cache_key, response)
+
+            return response.body
+
+        if last_error is not None:
+            raise last_error
+        raise RuntimeError(
+            f"Request failed without a captured exception after {self.max_retries} retries"
+        )
+
+    # ------------------------------------------------------------------
+    # Rate Limit Scheduling
+    # ------------------------------------------------------------------
+
+    def rate_limit_state(self, headers: dict[str, str]) -> RateLimitState | None:
+        """Last known rate limit for the credential in headers"""
+        return self._rate_limits.get(self._credential_key(headers))
+
+    async def wait_for_capacity(
+        self,
+        headers: dict[str, str],
+        required_requests: int = 1,
+    ) -> bool | None:
+        """
+        Wait until the credential has required_requests available
+
+        Returns None if nothing is known about the credential yet, False if
+        the wait would exceed max_wait_seconds, True once it is safe to
+        proceed.
+        """
+        state = self.rate_limit_state(headers)
+        if state is None or state.remaining is None:
+            return None
+
+        now = time.time()
+        wait = state.wait_time(now, required_requests - 1)
+        if wait > self.max_wait_seconds:
+            return False
+        if wait > 0:
+            self._stats["throttled"] += 1
+            await asyncio.sleep(wait)
+        return True
+
+    async def _schedule(self, credential: str, url: str, is_write: bool) -> None:
+        """Delay a request until the credential's budget allows it"""
+        state = self._rate_limits.get(credential)
+        if state is None:
+            return
+
+        reserve = 0 if is_write else self.read_reserve
+        now = time.time()
+        wait = state.wait_time(now, reserve)
+        if is_write:
+            wait = max(wait, state.pace(now, self.write_reserve, self.pace_threshold))
+
+        if wait > self.max_wait_seconds:
+            raise RateLimitExceededError(429, url, retry_after=wait)
+
+        if wait > 0:
+            self._stats["throttled"] += 1
+            logger.info(f"Throttling {'write' if is_write else 'read'} for {wait:.1f}s")
+            await asyncio.sleep(wait)
+
+        # Spend optimistically; the response headers correct it
+        if state.remaining is not None and state.remaining > 0:
+            state.remaining -= 1
+
+    def _update_rate_limit(self, credential: str, response: HTTPResponse) -> RateLimitState:
+        """Refresh rate limit state from X-RateLimit-* headers"""
+        state = self._rate_limits.get(credential)
+        if state is None:
+            state = RateLimitState()
+            self._rate_limits[credential] = state
+
+        remaining = response.header("X-RateLimit-Remaining")
+        if remaining is not None:
+            try:
+                state.remaining = int(remaining)
+                state.limit = int(response.header("X-RateLimit-Limit") or state.limit)
+                state.reset_at = float(response.header("X-RateLimit-Reset") or 0)
+                state.updated_at = time.time()
+            except ValueError:
+                logger.debug(f"Ignoring malformed rate limit headers: {response.headers}")
+
+        return state
+
+    def _is_rate_limited(self, response: HTTPResponse, state: RateLimitState) -> bool:
+        if response.status == 429:
+            return True
+        if response.status != 403:
+            return False
+        return response.header("Retry-After") is not None or state.remaining == 0
+
+    def _retry_after(self, response: HTTPResponse, state: RateLimitState) -> float:
+        """Seconds to wait before retrying a rate-limited request"""
+        retry_after = response.header("Retry-After")
+        if retry_after is not None:
+            try:
+                return max(0.0, float(retry_after))
+            except ValueError:
+                pass
+        if state.remaining == 0 and state.reset_at:
+            return max(0.0, state.reset_at - time.time())
+        # Secondary limits without a hint: GitHub recommends at least a minute
+        return 60.0
+
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        return random.uniform(0, min(self.base_delay * (2 ** attempt), self.max_delay))
+
+    # ------------------------------------------------------------------
+    # Transport
+    # ------------------------------------------------------------------
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        data: dict[str, Any] | None,
+        headers: dict[str, str],
+    ) -> HTTPResponse:
+        """Dispatch through the transport under the host's connection limit"""
+        host = urlsplit(url).netloc
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = asyncio.Semaphore(self.max_connections_per_host)
+            self._host_limits[host] = limit
+
+        async with limit:
+            self._stats["requests"] += 1
+            request = getattr(self.transport, "request", None)
+            if request is not None:
+                return await request(method, url, data=data, headers=headers)
+
+            # Legacy transports return a decoded body only
+            if method == "GET":
+                body = await self.transport.get(url, headers=headers)
+            else:
+                send = getattr(self.transport, method.lower())
+                body = await send(url, data=data, headers=headers)
+            return HTTPResponse(status=200, body=body)
+
+    # ------------------------------------------------------------------
+    # Conditional Request Cache
+    # ------------------------------------------------------------------
+
+    def _store(self, cache_key: tuple[str, str], response: HTTPResponse) -> None:
+        etag = response.header("ETag")
+        last_modified = response.header("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        self._cache[cache_key] = _CachedResponse(etag, last_modified, response.body)
+        self._cache.move_to_end(cache_key)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    def _invalidate(self, url: str) -> None:
+        """Drop cached reads of a resource after writing to it"""
+        stale = [key for key in self._cache if key[0] == url]
+        for key in stale:
+            del self._cache[key]
+
+    @staticmethod
+    def _credential_key(headers: dict[str, str]) -> str:
+        """Rate limits are per credential; never keep raw tokens as keys"""
+        auth = headers.get("Authorization", "")
+        if not auth:
+            return "anonymous"
+        return hashlib.blake2b(auth.encode(), digest_size=8).hexdigest()
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get client statistics"""
+        return {
+            **self._stats,
+            "cached_responses": len(self._cache),
+            "tracked_credentials": len(self._rate_limits),
+        }
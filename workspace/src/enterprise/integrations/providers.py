@@ -8,10 +8,11 @@ Manages Git provider integrations including:
 - Authorization state tracking
 """
 
+import asyncio
 import logging
 import time
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Any, Protocol
 from uuid import UUID, uuid4
@@ -207,9 +208,21 @@ class GitProviderManager:
     github_app_id: str | None = None
     github_app_private_key: str | None = None
 
+    # Token cache: tokens are refreshed in the background once inside
+    # token_refresh_ahead_seconds of expiry, and synchronously (single
+    # flight) once inside token_refresh_margin_seconds
+    token_refresh_ahead_seconds: float = 600.0
+    token_refresh_margin_seconds: float = 300.0
+    jwt_lifetime_seconds: int = 600
+
     # Rate limit tracking
     _rate_limits: dict[str, dict[str, Any]] = field(default_factory=dict)
 
+    # (org_id, installation_id) -> (token, expires_at epoch seconds)
+    _token_cache: dict[tuple[UUID, str], tuple[str, float]] = field(default_factory=dict)
+    _token_refreshes: dict[tuple[UUID, str], asyncio.Task] = field(default_factory=dict)
+    _jwt: tuple[str, float] | None = None
+
     # ------------------------------------------------------------------
     # Installation Management
     # ------------------------------------------------------------------
@@ -317,6 +330,7 @@ class GitProviderManager:
         installation.updated_at = datetime.utcnow()
 
         installation = await self.repository.update_installation(installation)
+        self.invalidate_installation_token(org_id, installation_id)
 
         logger.warning(
             f"Installation suspended: installation={installation_id} reason={reason}"
@@ -343,6 +357,7 @@ class GitProviderManager:
         installation.suspended_at = datetime.utcnow()
         installation.suspension_reason = "uninstalled"
         await self.repository.update_installation(installation)
+        self.invalidate_installation_token(org_id, installation_id)
 
         logger.info(f"Installation deleted: installation={installation_id}")
         return True
@@ -359,21 +374,76 @@ class GitProviderManager:
         """
         Get a valid installation access token
 
-        Handles token refresh if expired.
+        Served from the token cache while it is comfortably valid. Near
+        expiry, concurrent callers share a single refresh.
         """
+        key = (org_id, installation_id)
+        cached = self._token_cache.get(key)
+
+        if cached is not None:
+            token, expires_at = cached
+            remaining = expires_at - time.time()
+            if remaining > self.token_refresh_margin_seconds:
+                if remaining <= self.token_refresh_ahead_seconds:
+                    self._start_token_refresh(key)
+                return token
+
+        # Shield so a cancelled caller does not cancel the shared refresh
+        return await asyncio.shield(self._start_token_refresh(key))
+
+    def invalidate_installation_token(self, org_id: UUID, installation_id: str) -> None:
+        """Drop a cached token so the next call reloads it"""
+        self._token_cache.pop((org_id, installation_id), None)
+
+    def _start_token_refresh(self, key: tuple[UUID, str]) -> asyncio.Task:
+        """Return the in-flight refresh for key, starting one if needed"""
+        task = self._token_refreshes.get(key)
+        if task is not None:
+            return task
+
+        task = asyncio.get_running_loop().create_task(self._load_installation_token(*key))
+        self._token_refreshes[key] = task
+
+        def _done(finished: asyncio.Task) -> None:
+            if self._token_refreshes.get(key) is finished:
+                del self._token_refreshes[key]
+            if not finished.cancelled() and finished.exception() is not None:
+                logger.warning(
+                    f"Installation token refresh failed for {key[1]}: {finished.exception()}"
+                )
+
+        task.add_done_callback(_done)
+        return task
+
+    async def _load_installation_token(self, org_id: UUID, installation_id: str) -> str:
+        """Load the stored token, refreshing it if it is close to expiry"""
         auth = await self.repository.get_auth_by_installation(org_id, installation_id)
         if not auth:
             raise ValueError(f"No auth found for installation: {installation_id}")
 
         if not auth.is_active:
+            self.invalidate_installation_token(org_id, installation_id)
             raise ValueError(f"Installation is not active: {installation_id}")
 
-        # Check if token needs refresh
-        if auth.is_token_expired or not auth.access_token_encrypted:
+        # Another worker may already have refreshed it in storage
+        expires_at = self._token_expiry(auth)
+        if (
+            not auth.access_token_encrypted
+            or expires_at - time.time() <= self.token_refresh_ahead_seconds
+        ):
             auth = await self._refresh_github_token(auth)
+            expires_at = self._token_expiry(auth)
+
+        token = await self.secrets_manager.decrypt(auth.access_token_encrypted)
+        self._token_cache[(org_id, installation_id)] = (token, expires_at)
+        return token
 
-        # Decrypt and return
-        return await self.secrets_manager.decrypt(auth.access_token_encrypted)
+    @staticmethod
+    def _token_expiry(auth: ProviderAuth) -> float:
+        """Token expiry as epoch seconds (stored datetimes are naive UTC)"""
+        if not auth.token_expires_at:
+            return float("inf")
+        return auth.token_expires_at.replace(tzinfo=timezone.utc).timestamp()
 
     async def _refresh_github_token(self, auth: ProviderAuth) -> ProviderAuth:
         """
@@ -409,7 +479,9 @@ class GitProviderManager:
         auth.access_token_encrypted = await self.secrets_manager.encrypt(token)
         auth.token_expires_at = datetime.fromisoformat(
             expires_at.replace("Z", "+00:00")
-        ) if expires_at else datetime.utcnow() + timedelta(hours=1)
+        ).astimezone(timezone.utc).replace(tzinfo=None) if expires_at else (
+            datetime.utcnow() + timedelta(hours=1)
+        )
         auth.last_refreshed_at = datetime.utcnow()
         auth.updated_at = datetime.utcnow()
 
@@ -420,22 +492,32 @@ class GitProviderManager:
         return auth
 
     def _generate_github_jwt(self) -> str:
-        """Generate a JWT for GitHub App API authentication"""
-        import jwt as pyjwt
+        """
+        Generate a JWT for GitHub App API authentication
 
+        The signed JWT is reused until a minute before it expires.
+        """
         now = int(time.time())
+        if self._jwt is not None and now < self._jwt[1] - 60:
+            return self._jwt[0]
+
+        import jwt as pyjwt
+
+        expires_at = now + self.jwt_lifetime_seconds  # GitHub allows at most 10 minutes
 
         payload = {
             "iat": now - 60,  # Issued 1 minute ago (clock skew)
-            "exp": now + 600,  # Valid for 10 minutes
+            "exp": expires_at,
             "iss": self.github_app_id,
         }
 
-        return pyjwt.encode(
+        token = pyjwt.encode(
             payload,
             self.github_app_private_key,
             algorithm="RS256",
         )
+        self._jwt = (token, expires_at)
+        return token
 
     # ------------------------------------------------------------------
     # Rate Limit Handling
@@ -488,7 +570,20 @@ class GitProviderManager:
         Wait for rate limit to reset if necessary
 
         Returns True if we can proceed, False if we should abort.
+        When the HTTP client tracks X-RateLimit-* headers, its last known
+        state is used instead of querying /rate_limit.
         """
+        wait_for_capacity = getattr(self.http_client, "wait_for_capacity", None)
+        if wait_for_capacity is not None:
+            token = await self.get_installation_token(org_id, installation_id)
+            ready = await wait_for_capacity(
+                {"Authorization": f"token {token}"}, required_requests,
+            )
+            if ready is not None:
+                if not ready:
+                    logger.warning(f"Rate limit reset too far for {installation_id}")
+                return ready
+
         status = await self.check_rate_limit(org_id, installation_id)
 
         if status["remaining"] >= required_requests:
@@ -510,7 +605,6 @@ class GitProviderManager:
             logger.info(
                 f"Waiting {wait_seconds}s for rate limit reset: {installation_id}"
             )
-            import asyncio
             await asyncio.sleep(wait_seconds)
 
         return True
@@ -525,7 +619,7 @@ class GitProviderManager:
         installation_id: str,
         repo_full_name: str,
     ) -> dict[str, Any]:
-        """Get repository information from GitHub"""
+        """Get repository information from GitHub (revalidated via ETag when supported)"""
         token = await self.get_installation_token(org_id, installation_id)
 
         response = await self.http_client.get(
@@ -545,7 +639,7 @@ class GitProviderManager:
         page: int = 1,
         per_page: int = 100,
     ) -> list[dict[str, Any]]:
-        """List repositories accessible by the installation"""
+        """List repositories accessible by the installation (revalidated via ETag when supported)"""
         token = await self.get_installation_token(org_id, installation_id)
 
         response = await self.http_client.get(
@@ -5,21 +5,41 @@ Handles incoming webhooks from Git providers with:
 - Signature verification (HMAC or App public key)
 - Anti-replay protection (timestamp/nonce)
 - Rate limiting and backpressure
+- Batched ingestion for delivery storms
 """
 
+import asyncio
 import hashlib
 import hmac
+import json
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any, Protocol
 from uuid import UUID, uuid4
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
 
+def _decode_json(body: bytes) -> Any:
+    """Decode a JSON payload, using orjson when installed"""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError
+_JSON_ERRORS = (ValueError, UnicodeDecodeError)
+
+
 class WebhookEventType(Enum):
     """Standard webhook event types across providers"""
     # Pull Request events
@@ -105,6 +125,15 @@ class WebhookEvent:
     verification_method: str | None = None  # hmac, app_signature
 
 
+@dataclass
+class WebhookDelivery:
+    """A raw webhook delivery awaiting validation"""
+    provider: str
+    headers: dict[str, str]
+    body: bytes
+    secret: str | None = None
+
+
 class NonceStore(Protocol):
     """Interface for nonce storage (anti-replay)"""
 
@@ -116,6 +145,18 @@ class NonceStore(Protocol):
         """
         ...
 
+    async def check_and_store_many(
+        self,
+        nonces: list[str],
+        ttl_seconds: int = 300,
+    ) -> list[bool]:
+        """
+        check_and_store for several nonces in one call, in order
+
+        A nonce repeated within the batch is new only the first time.
+        """
+        ...
+
     async def cleanup_expired(self) -> int:
         """Clean up expired nonces, return count removed"""
         ...
@@ -137,6 +178,15 @@ class RateLimiter(Protocol):
         """
         ...
 
+    async def check_rate_limit_many(
+        self,
+        keys: list[str],
+        limit: int,
+        window_seconds: int,
+    ) -> list[tuple[bool, int]]:
+        """check_rate_limit for several requests in one call, in order"""
+        ...
+
 
 class EventPublisher(Protocol):
     """Interface for publishing validated events"""
@@ -145,6 +195,10 @@ class EventPublisher(Protocol):
         """Publish event to the event log/queue"""
         ...
 
+    async def publish_many(self, events: list[WebhookEvent]) -> None:
+        """Publish several events in one call"""
+        ...
+
 
 @dataclass
 class WebhookReceiver:
@@ -174,6 +228,11 @@ class WebhookReceiver:
     # Secrets (should come from secrets manager)
     webhook_secrets: dict[str, str] = field(default_factory=dict)  # repo_id -> secret
 
+    # Batched ingestion
+    verify_workers: int = 4
+    verify_chunk_size: int = 64
+    _executor: ThreadPoolExecutor | None = None
+
     # ------------------------------------------------------------------
     # Webhook Reception
     # ------------------------------------------------------------------
@@ -207,14 +266,7 @@ class WebhookReceiver:
             )
 
         # Verify signature
-        if provider == "github":
-            await self._verify_github_signature(headers, body, secret)
-        elif provider == "gitlab":
-            await self._verify_gitlab_signature(headers, body, secret)
-        elif provider == "bitbucket":
-            await self._verify_bitbucket_signature(headers, body, secret)
-        else:
-            raise WebhookValidationError(f"Unknown provider: {provider}")
+        self._verify_signature(provider, headers, body, secret)
 
         # Anti-replay check
         delivery_id = self._get_delivery_id(provider, headers)
@@ -255,11 +307,187 @@ class WebhookReceiver:
 
         return event
 
+    async def receive_batch(
+        self,
+        deliveries: list[WebhookDelivery],
+    ) -> list[WebhookEvent | WebhookValidationError]:
+        """
+        Receive and validate a batch of webhooks
+
+        Applies the same checks as receive(), pipelined for throughput:
+        signatures are verified and payloads decoded in a thread pool,
+        nonce and rate-limit checks are made in one batched call each,
+        and accepted events are published in one batch.
+
+        Returns:
+            One result per delivery, in order: the event, or the
+            WebhookValidationError that rejected it
+        """
+        results: list[WebhookEvent | WebhookValidationError | None] = [None] * len(deliveries)
+
+        # Size check, signature verification and JSON decoding off the loop
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        size = self.verify_chunk_size
+        chunks = await asyncio.gather(*[
+            loop.run_in_executor(executor, self._verify_and_decode, deliveries[i:i + size])
+            for i in range(0, len(deliveries), size)
+        ])
+        decoded = [item for chunk in chunks for item in chunk]
+
+        pending = []
+        for i, (_payload, error) in enumerate(decoded):
+            if isinstance(error, WebhookValidationError):
+                results[i] = error
+            else:
+                pending.append(i)
+
+        # Anti-replay check
+        delivery_ids = {
+            i: self._get_delivery_id(deliveries[i].provider, deliveries[i].headers)
+            for i in pending
+        }
+        with_ids = [i for i in pending if delivery_ids[i]]
+        fresh = await self._check_nonces([delivery_ids[i] for i in with_ids])
+        for i, is_new in zip(with_ids, fresh, strict=True):
+            if not is_new:
+                results[i] = WebhookValidationError(
+                    f"Replay detected: delivery_id={delivery_ids[i]}"
+                )
+        pending = [i for i in pending if results[i] is None]
+
+        # Rate limit check
+        if self.rate_limiter and pending:
+            keys = [
+                self._get_rate_limit_key(d.provider, d.headers, d.body)
+                for d in (deliveries[i] for i in pending)
+            ]
+            allowed = await self._check_rate_limits(keys)
+            for i, key, (ok, _) in zip(pending, keys, allowed, strict=True):
+                if not ok:
+                    results[i] = WebhookValidationError(f"Rate limit exceeded for {key}")
+            pending = [i for i in pending if results[i] is None]
+
+        # Normalize
+        events = []
+        for i in pending:
+            payload, error = decoded[i]
+            if error is not None:
+                results[i] = WebhookValidationError(f"Invalid JSON payload: {error}")
+                continue
+            delivery = deliveries[i]
+            try:
+                event = self._normalize_event(delivery.provider, delivery.headers, payload)
+            except WebhookValidationError as e:
+                results[i] = e
+                continue
+            except Exception as e:
+                # A malformed payload must not fail the rest of the batch,
+                # whose nonces are already stored
+                results[i] = WebhookValidationError(f"Invalid payload: {e}")
+                continue
+            event.is_verified = True
+            event.delivery_id = delivery_ids[i] or ""
+            results[i] = event
+            events.append(event)
+
+        # Publish to event log
+        if self.event_publisher and events:
+            publish_many = getattr(self.event_publisher, "publish_many", None)
+            if publish_many:
+                await publish_many(events)
+            else:
+                for event in events:
+                    await self.event_publisher.publish(event)
+
+        logger.info(
+            f"Webhook batch received: deliveries={len(deliveries)} "
+            f"accepted={len(events)} rejected={len(deliveries) - len(events)}"
+        )
+
+        return results
+
+    def _verify_and_decode(
+        self,
+        deliveries: list[WebhookDelivery],
+    ) -> list[tuple[Any, Exception | None]]:
+        """
+        Thread-pool stage: verify signatures and decode payloads
+
+        A validation error rejects the delivery outright. A decode error is
+        only reported once the delivery passes the replay and rate checks,
+        matching the order of receive().
+        """
+        results = []
+        for delivery in deliveries:
+            try:
+                if len(delivery.body) > self.max_payload_size:
+                    raise WebhookValidationError(
+                        f"Payload too large: {len(delivery.body)} bytes"
+                    )
+                self._verify_signature(
+                    delivery.provider, delivery.headers, delivery.body, delivery.secret,
+                )
+            except WebhookValidationError as e:
+                results.append((None, e))
+                continue
+
+            try:
+                results.append((_decode_json(delivery.body), None))
+            except _JSON_ERRORS as e:
+                results.append((None, e))
+        return results
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.verify_workers,
+                thread_name_prefix="webhook-verify",
+            )
+        return self._executor
+
+    def close(self) -> None:
+        """Shut down the verification thread pool"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    async def _check_rate_limits(self, keys: list[str]) -> list[tuple[bool, int]]:
+        check_many = getattr(self.rate_limiter, "check_rate_limit_many", None)
+        if check_many:
+            return await check_many(keys, self.rate_limit_per_minute, 60)
+        return [
+            await self.rate_limiter.check_rate_limit(key, self.rate_limit_per_minute, 60)
+            for key in keys
+        ]
+
     # ------------------------------------------------------------------
     # Signature Verification
     # ------------------------------------------------------------------
 
-    async def _verify_github_signature(
+    def _verify_signature(
+        self,
+        provider: str,
+        headers: dict[str, str],
+        body: bytes,
+        secret: str | None,
+    ) -> None:
+        """
+        Verify a delivery's signature for its provider
+
+        Synchronous and free of shared state, so batches can run it in a
+        thread pool; hashlib releases the GIL while hashing large bodies.
+        """
+        if provider == "github":
+            self._verify_github_signature(headers, body, secret)
+        elif provider == "gitlab":
+            self._verify_gitlab_signature(headers, body, secret)
+        elif provider == "bitbucket":
+            self._verify_bitbucket_signature(headers, body, secret)
+        else:
+            raise WebhookValidationError(f"Unknown provider: {provider}")
+
+    def _verify_github_signature(
         self,
         headers: dict[str, str],
         body: bytes,
@@ -277,14 +505,14 @@ class WebhookReceiver:
             # Also check old SHA1 signature
             signature_header = headers.get("X-Hub-Signature") or headers.get("x-hub-signature")
             if signature_header:
-                await self._verify_hmac(body, secret, signature_header, "sha1")
+                self._verify_hmac(body, secret, signature_header, "sha1")
                 return
 
             raise WebhookValidationError("Missing signature header")
 
-        await self._verify_hmac(body, secret, signature_header, "sha256")
+        self._verify_hmac(body, secret, signature_header, "sha256")
 
-    async def _verify_gitlab_signature(
+    def _verify_gitlab_signature(
         self,
         headers: dict[str, str],
         body: bytes,
@@ -306,7 +534,7 @@ class WebhookReceiver:
         if not hmac.compare_digest(token_header, secret):
             raise WebhookValidationError("Invalid GitLab token")
 
-    async def _verify_bitbucket_signature(
+    def _verify_bitbucket_signature(
         self,
         headers: dict[str, str],
         body: bytes,
@@ -322,9 +550,9 @@ class WebhookReceiver:
         if not signature_header:
             raise WebhookValidationError("Missing Bitbucket signature header")
 
-        await self._verify_hmac(body, secret, signature_header, "sha256")
+        self._verify_hmac(body, secret, signature_header, "sha256")
 
-    async def _verify_hmac(
+    def _verify_hmac(
         self,
         body: bytes,
         secret: str | None,
@@ -379,17 +607,26 @@ class WebhookReceiver:
 
         # In-memory fallback (for MVP)
         now = time.time()
+        self._expire_nonces(now)
+        return self._store_nonce(nonce, now)
 
-        # Clean old nonces
-        expired = [
-            n for n, ts in self._nonce_timestamps.items()
-            if now - ts > self.replay_window_seconds
-        ]
+    def _expire_nonces(self, now: float) -> None:
+        """
+        Drop nonces outside the replay window
+
+        Timestamps are stored in insertion order, so only the expired
+        prefix is visited.
+        """
+        expired = []
+        for n, ts in self._nonce_timestamps.items():
+            if now - ts <= self.replay_window_seconds:
+                break
+            expired.append(n)
         for n in expired:
             self._nonces.discard(n)
             del self._nonce_timestamps[n]
 
-        # Check and store
+    def _store_nonce(self, nonce: str, now: float) -> bool:
         if nonce in self._nonces:
             return False
 
@@ -397,6 +634,21 @@ class WebhookReceiver:
         self._nonce_timestamps[nonce] = now
         return True
 
+    async def _check_nonces(self, nonces: list[str]) -> list[bool]:
+        """Batched _check_nonce; a nonce repeated in the batch is a replay"""
+        if not nonces:
+            return []
+
+        if self.nonce_store:
+            check_many = getattr(self.nonce_store, "check_and_store_many", None)
+            if check_many:
+                return await check_many(nonces, self.replay_window_seconds)
+            return [await self._check_nonce(nonce) for nonce in nonces]
+
+        now = time.time()
+        self._expire_nonces(now)
+        return [self._store_nonce(nonce, now) for nonce in nonces]
+
     def _get_delivery_id(self, provider: str, headers: dict[str, str]) -> str | None:
         """Get delivery ID from headers based on provider"""
         if provider == "github":
@@ -431,13 +683,20 @@ class WebhookReceiver:
         body: bytes,
     ) -> WebhookEvent:
         """Parse and normalize webhook payload"""
-        import json
-
         try:
-            payload = json.loads(body)
-        except json.JSONDecodeError as e:
+            payload = _decode_json(body)
+        except _JSON_ERRORS as e:
             raise WebhookValidationError(f"Invalid JSON payload: {e}")
 
+        return self._normalize_event(provider, headers, payload)
+
+    def _normalize_event(
+        self,
+        provider: str,
+        headers: dict[str, str],
+        payload: Any,
+    ) -> WebhookEvent:
+        """Normalize a decoded payload into a WebhookEvent"""
         if provider == "github":
             return self._parse_github_event(headers, payload)
         elif provider == "gitlab":
@@ -0,0 +1,431 @@
+"""
+In-Process Webhook Stores
+
+RateLimiter and NonceStore implementations that avoid a network hop per
+webhook:
+- GCRARateLimiter: generic cell rate algorithm, one float per key
+- LRUNonceStore: LRU + TTL nonce set with amortised expiry
+- SharedMemoryRateLimiter / SharedMemoryNonceStore: the same state in a
+  shared-memory hash table, so worker processes on one host share limits
+  and replay protection without a network service
+"""
+
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from dataclasses import dataclass, field
+from multiprocessing import resource_tracker, shared_memory
+
+logger = logging.getLogger(__name__)
+
+
+def _gcra(
+    tat: float | None,
+    now: float,
+    limit: int,
+    window_seconds: float,
+) -> tuple[bool, int, float | None]:
+    """
+    One GCRA step
+
+    ``tat`` is the key's theoretical arrival time. Each request pushes it
+    forward by window/limit; a request is allowed while the TAT stays
+    within one window of now, which permits bursts of up to ``limit``.
+
+    Returns (allowed, remaining, new_tat).
+    """
+    if limit <= 0:
+        return False, 0, tat
+
+    interval = window_seconds / limit
+    tat = now if tat is None or tat < now else tat
+    new_tat = tat + interval
+
+    if new_tat - now > window_seconds:
+        return False, 0, tat
+
+    remaining = int((window_seconds - (new_tat - now)) / interval + 1e-9)
+    return True, remaining, new_tat
+
+
+# ------------------------------------------------------------------
+# In-process stores
+# ------------------------------------------------------------------
+
+@dataclass
+class GCRARateLimiter:
+    """
+    In-memory GCRA RateLimiter
+
+    Stores one TAT per key. Keys whose TAT has passed behave exactly like
+    unseen keys, so they are pruned in bulk once the table grows past
+    ``max_keys``.
+    """
+
+    max_keys: int = 100_000
+
+    _tats: dict[str, float] = field(default_factory=dict, repr=False)
+    _prune_at: int = field(default=0, repr=False)
+
+    def __post_init__(self):
+        self._prune_at = self.max_keys
+
+    async def check_rate_limit(
+        self,
+        key: str,
+        limit: int,
+        window_seconds: int,
+    ) -> tuple[bool, int]:
+        return self._check(key, limit, window_seconds, time.monotonic())
+
+    async def check_rate_limit_many(
+        self,
+        keys: list[str],
+        limit: int,
+        window_seconds: int,
+    ) -> list[tuple[bool, int]]:
+        now = time.monotonic()
+        return [self._check(key, limit, window_seconds, now) for key in keys]
+
+    def _check(self, key: str, limit: int, window_seconds: int, now: float) -> tuple[bool, int]:
+        allowed, remaining, tat = _gcra(self._tats.get(key), now, limit, window_seconds)
+        if allowed:
+            self._tats[key] = tat
+            if len(self._tats) > self._prune_at:
+                self._prune(now)
+        return allowed, remaining
+
+    def _prune(self, now: float) -> None:
+        self._tats = {key: tat for key, tat in self._tats.items() if tat > now}
+        self._prune_at = max(self.max_keys, 2 * len(self._tats))
+
+
+@dataclass
+class LRUNonceStore:
+    """
+    In-memory NonceStore with LRU eviction and TTL expiry
+
+    Each call drops a bounded number of expired nonces from the oldest
+    end, so expiry cost is spread across calls. At ``max_entries`` the
+    least recently seen nonce is evicted (counted in ``evictions``);
+    size it above the expected deliveries per replay window.
+    """
+
+    max_entries: int = 1_000_000
+    expire_batch: int = 16
+
+    evictions: int = 0
+
+    # nonce -> expires_at (time.monotonic())
+    _expiry: OrderedDict[str, float] = field(default_factory=OrderedDict, repr=False)
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    async def check_and_store(self, nonce: str, ttl_seconds: int = 300) -> bool:
+        now = time.monotonic()
+        self._expire_oldest(now)
+        return self._check_and_store(nonce, ttl_seconds, now)
+
+    async def check_and_store_many(
+        self,
+        nonces: list[str],
+        ttl_seconds: int = 300,
+    ) -> list[bool]:
+        now = time.monotonic()
+        self._expire_oldest(now)
+        return [self._check_and_store(nonce, ttl_seconds, now) for nonce in nonces]
+
+    async def cleanup_expired(self) -> int:
+        """Drop every expired nonce"""
+        now = time.monotonic()
+        expired = [nonce for nonce, expires_at in self._expiry.items() if expires_at <= now]
+        for nonce in expired:
+            del self._expiry[nonce]
+        return len(expired)
+
+    def _check_and_store(self, nonce: str, ttl_seconds: int, now: float) -> bool:
+        expires_at = self._expiry.get(nonce)
+        if expires_at is not None and expires_at > now:
+            self._expiry.move_to_end(nonce)
+            return False
+
+        self._expiry[nonce] = now + ttl_seconds
+        self._expiry.move_to_end(nonce)
+
+        if len(self._expiry) > self.max_entries:
+            self._expiry.popitem(last=False)
+            self.evictions += 1
+
+        return True
+
+    def _expire_oldest(self, now: float) -> None:
+        for _ in range(self.expire_batch):
+            if not self._expiry:
+                return
+            nonce, expires_at = next(iter(self._expiry.items()))
+            if expires_at > now:
+                return
+            del self._expiry[nonce]
+
+
+# ------------------------------------------------------------------
+# Shared-memory stores
+# ------------------------------------------------------------------
+
+_MAGIC = b"MNOWHST1"
+_HEADER = struct.Struct("<8sQ")    # magic, slot count
+_SLOT = struct.Struct("<16sd")     # key digest, deadline
+_EMPTY = bytes(16)
+_MAX_PROBE = 32
+
+
+def _digest(key: str) -> bytes:
+    digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+    return digest if digest != _EMPTY else b"\x01" + digest[1:]
+
+
+class _SharedTable:
+    """
+    Fixed-size open-addressing hash table in shared memory
+
+    Slots hold a 16-byte key digest and a float64 deadline (a nonce's
+    expiry or a GCRA TAT) on time.monotonic(), which is system-wide on
+    Linux and macOS. A slot whose deadline has passed is dead and is
+    reused by inserts; when a probe run has no free slot, the entry with
+    the earliest deadline is evicted.
+
+    Access is serialised across processes with flock on a lock file and
+    across threads with a threading lock.
+    """
+
+    def __init__(self, name: str, slots: int):
+        # POSIX only; imported here so the in-process stores still load
+        # on platforms without fcntl
+        import fcntl
+
+        self.name = name
+        self.evictions = 0
+        self._fcntl = fcntl
+
+        lock_path = os.path.join(tempfile.gettempdir(), f"{name}.lock")
+        self._lock_fd = os.open(lock_path, os.O_CREAT | os.O_RDWR, 0o600)
+        self._thread_lock = threading.Lock()
+
+        with self.locked():
+            try:
+                self._shm = shared_memory.SharedMemory(
+                    name=name, create=True, size=_HEADER.size + slots * _SLOT.size,
+                )
+                _HEADER.pack_into(self._shm.buf, 0, _MAGIC, slots)
+            except FileExistsError:
+                self._shm = shared_memory.SharedMemory(name=name)
+                magic, slots = _HEADER.unpack_from(self._shm.buf, 0)
+                if magic != _MAGIC:
+                    self._shm.close()
+                    raise ValueError(
+                        f"Shared memory segment {name} is not a webhook store"
+                    ) from None
+
+            # The segment outlives any one process; without this the
+            # resource tracker unlinks it when this process exits
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+
+        self.slots = slots
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        with self._thread_lock:
+            self._fcntl.flock(self._lock_fd, self._fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                self._fcntl.flock(self._lock_fd, self._fcntl.LOCK_UN)
+
+    def find(self, digest: bytes, now: float) -> tuple[int, float | None]:
+        """
+        Locate ``digest``; call while locked
+
+        Returns (offset, live deadline or None). The offset is where the
+        key lives, or else the slot an insert should use.
+        """
+        buf = self._shm.buf
+        start = int.from_bytes(digest[:8], "little") % self.slots
+        reusable = None
+        oldest, oldest_deadline = None, float("inf")
+
+        for i in range(min(_MAX_PROBE, self.slots)):
+            offset = _HEADER.size + ((start + i) % self.slots) * _SLOT.size
+            key, deadline = _SLOT.unpack_from(buf, offset)
+            if key == digest:
+                return offset, deadline if deadline > now else None
+            if key == _EMPTY:
+                return (reusable if reusable is not None else offset), None
+            if deadline <= now:
+                if reusable is None:
+                    reusable = offset
+            elif deadline < oldest_deadline:
+                oldest, oldest_deadline = offset, deadline
+
+        if reusable is not None:
+            return reusable, None
+
+        self.evictions += 1
+        return oldest, None
+
+    def write(self, offset: int, digest: bytes, deadline: float) -> None:
+        """Store an entry; call while locked"""
+        _SLOT.pack_into(self._shm.buf, offset, digest, deadline)
+
+    def compact(self, now: float) -> int:
+        """Rebuild without dead entries; returns the number removed"""
+        with self.locked():
+            buf = self._shm.buf
+            live = []
+            removed = 0
+            for i in range(self.slots):
+                offset = _HEADER.size + i * _SLOT.size
+                key, deadline = _SLOT.unpack_from(buf, offset)
+                if key == _EMPTY:
+                    continue
+                if deadline > now:
+                    live.append((key, deadline))
+                else:
+                    removed += 1
+                _SLOT.pack_into(buf, offset, _EMPTY, 0.0)
+
+            for key, deadline in live:
+                offset, _ = self.find(key, now)
+                self.write(offset, key, deadline)
+
+        return removed
+
+    def close(self) -> None:
+        self._shm.close()
+        os.close(self._lock_fd)
+
+    def unlink(self) -> None:
+        """Remove the segment; only once every process is done with it"""
+        # SharedMemory.unlink() unregisters from the tracker; match it
+        resource_tracker.register(self._shm._name, "shared_memory")
+        self._shm.unlink()
+        with suppress(FileNotFoundError):
+            os.unlink(os.path.join(tempfile.gettempdir(), f"{self.name}.lock"))
+
+
+@dataclass
+class SharedMemoryRateLimiter:
+    """
+    GCRA RateLimiter shared by processes on one host
+
+    Every process constructed with the same ``name`` shares limits.
+
+    Usage:
+        limiter = SharedMemoryRateLimiter(name="mno-webhook-ratelimit")
+        receiver = WebhookReceiver(rate_limiter=limiter)
+    """
+
+    name: str = "mno-webhook-ratelimit"
+    slots: int = 65536
+
+    _table: _SharedTable = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._table = _SharedTable(self.name, self.slots)
+
+    async def check_rate_limit(
+        self,
+        key: str,
+        limit: int,
+        window_seconds: int,
+    ) -> tuple[bool, int]:
+        return (await self.check_rate_limit_many([key], limit, window_seconds))[0]
+
+    async def check_rate_limit_many(
+        self,
+        keys: list[str],
+        limit: int,
+        window_seconds: int,
+    ) -> list[tuple[bool, int]]:
+        digests = [_digest(key) for key in keys]
+        results = []
+
+        with self._table.locked():
+            now = time.monotonic()
+            for digest in digests:
+                offset, tat = self._table.find(digest, now)
+                allowed, remaining, new_tat = _gcra(tat, now, limit, window_seconds)
+                if allowed:
+                    self._table.write(offset, digest, new_tat)
+                results.append((allowed, remaining))
+
+        return results
+
+    def close(self) -> None:
+        self._table.close()
+
+    def unlink(self) -> None:
+        self._table.unlink()
+
+
+@dataclass
+class SharedMemoryNonceStore:
+    """
+    NonceStore shared by processes on one host
+
+    Every process constructed with the same ``name`` shares replay
+    protection. Size ``slots`` well above the deliveries expected per
+    replay window; evictions are counted on the table.
+    """
+
+    name: str = "mno-webhook-nonces"
+    slots: int = 1 << 20
+
+    _table: _SharedTable = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        self._table = _SharedTable(self.name, self.slots)
+
+    @property
+    def evictions(self) -> int:
+        return self._table.evictions
+
+    async def check_and_store(self, nonce: str, ttl_seconds: int = 300) -> bool:
+        return (await self.check_and_store_many([nonce], ttl_seconds))[0]
+
+    async def check_and_store_many(
+        self,
+        nonces: list[str],
+        ttl_seconds: int = 300,
+    ) -> list[bool]:
+        digests = [_digest(nonce) for nonce in nonces]
+        results = []
+
+        with self._table.locked():
+            now = time.monotonic()
+            for digest in digests:
+                offset, expires_at = self._table.find(digest, now)
+                if expires_at is not None:
+                    results.append(False)
+                    continue
+                self._table.write(offset, digest, now + ttl_seconds)
+                results.append(True)
+
+        return results
+
+    async def cleanup_expired(self) -> int:
+        """Compact the table; dead slots are otherwise reused in place"""
+        return self._table.compact(time.monotonic())
+
+    def close(self) -> None:
+        self._table.close()
+
+    def unlink(self) -> None:
+        self._table.unlink()
@@ -10,6 +10,7 @@ Handles:
 - Provider API rate limits
 - Retries with exponential backoff
 - Idempotent writes
+- Coalescing of bursty updates per commit
 """
 
 import asyncio
@@ -364,7 +365,10 @@ class CheckRunWriter:
 
         last_error = None
 
-        for attempt in range(self.max_retries):
+        # A provider-aware client retries with Retry-After itself
+        attempts = 1 if getattr(self.http_client, "handles_retries", False) else self.max_retries
+
+        for attempt in range(attempts):
             try:
                 if method == "post":
                     return await self.http_client.post(url, data=payload, headers=headers)
@@ -378,17 +382,17 @@ class CheckRunWriter:
                 delay = min(self.base_delay * (2 ** attempt), self.max_delay)
 
                 logger.warning(
-                    f"Request failed (attempt {attempt + 1}/{self.max_retries}): "
+                    f"Request failed (attempt {attempt + 1}/{attempts}): "
                     f"{e}. Retrying in {delay}s"
                 )
 
-                if attempt < self.max_retries - 1:
+                if attempt < attempts - 1:
                     await asyncio.sleep(delay)
 
         if last_error is not None:
             raise last_error
         raise RuntimeError(
-            f"Request failed without a captured exception after {self.max_retries} retries"
+            f"Request failed without a captured exception after {attempts} retries"
         )
 
 
@@ -481,6 +485,8 @@ class CommentWriter:
 
     # Track created comments for updates
     _created_comments: dict[str, int] = field(default_factory=dict)
+    # Last body written per comment, to skip no-op edits
+    _comment_bodies: dict[str, str] = field(default_factory=dict)
 
     async def create_or_update_comment(
         self,
@@ -521,6 +527,10 @@ class CommentWriter:
         cache_key = f"{repo_full_name}:{pr_number}:{comment_key}"
         existing_id = self._created_comments.get(cache_key)
 
+        if existing_id and self._comment_bodies.get(cache_key) == full_body:
+            logger.debug(f"Comment unchanged, skipping edit: {cache_key}")
+            return CommentResult(comment_id=existing_id)
+
         if existing_id:
             # Update existing comment
             response = await self.http_client.patch(
@@ -529,6 +539,7 @@ class CommentWriter:
                 headers=headers,
             )
 
+            self._comment_bodies[cache_key] = full_body
             logger.info(f"Comment updated: repo={repo_full_name} pr={pr_number} id={existing_id}")
 
             return CommentResult(
@@ -545,6 +556,7 @@ class CommentWriter:
 
         comment_id = response.get("id", 0)
         self._created_comments[cache_key] = comment_id
+        self._comment_bodies[cache_key] = full_body
 
         logger.info(
             f"Comment created: repo={repo_full_name} pr={pr_number} id={comment_id}"
@@ -581,6 +593,334 @@ class CommentWriter:
             return False
 
 
+# ------------------------------------------------------------------
+# Coalescing Write-back Queue
+# ------------------------------------------------------------------
+
+# GitHub accepts at most 50 annotations per check run request
+MAX_ANNOTATIONS_PER_REQUEST = 50
+
+
+@dataclass
+class _PendingCheckRun:
+    """Merged updates for one check run"""
+    org_id: UUID
+    installation_id: str
+    check_run_id: int
+    status: CheckRunStatus | None = None
+    conclusion: CheckRunConclusion | None = None
+    details_url: str | None = None
+    output: CheckRunOutput | None = None
+    annotations: list[dict[str, Any]] = field(default_factory=list)
+    futures: list[asyncio.Future] = field(default_factory=list)
+
+
+@dataclass
+class _PendingComment:
+    """Latest body for one PR comment"""
+    org_id: UUID
+    installation_id: str
+    pr_number: int
+    comment_key: str
+    body: str
+    futures: list[asyncio.Future] = field(default_factory=list)
+
+
+@dataclass
+class _PendingWriteback:
+    """Everything queued for one (repo, sha)"""
+    first_queued_at: float
+    deadline: float
+    check_runs: dict[int, _PendingCheckRun] = field(default_factory=dict)
+    comments: dict[tuple[int, str], _PendingComment] = field(default_factory=dict)
+    task: asyncio.Task | None = None
+
+
+@dataclass
+class WritebackQueue:
+    """
+    Per-(repo, sha) write-back queue
+
+    Updates are held for debounce_seconds after the last one (but never
+    longer than max_delay_seconds) and then sent together:
+    - Check run updates are merged; the latest status, conclusion and
+      output win and annotations accumulate
+    - Annotations are chunked at the API limit, with the status change
+      sent on the last chunk
+    - Comment edits keep only the latest body per comment
+
+    Each enqueue returns a future resolved with the result of the
+    request that carried the update.
+    """
+
+    check_run_writer: CheckRunWriter
+    comment_writer: CommentWriter | None = None
+
+    debounce_seconds: float = 0.5
+    max_delay_seconds: float = 5.0
+
+    _pending: dict[tuple[str, str], _PendingWriteback] = field(default_factory=dict)
+    _locks: dict[tuple[str, str], asyncio.Lock] = field(default_factory=dict)
+    _stats: dict[str, int] = field(default_factory=lambda: {
+        "enqueued": 0,
+        "requests": 0,
+        "flushes": 0,
+        "failed_flushes": 0,
+    })
+
+    def update_check_run(
+        self,
+        org_id: UUID,
+        installation_id: str,
+        repo_full_name: str,
+        head_sha: str,
+        check_run_id: int,
+        status: CheckRunStatus | None = None,
+        conclusion: CheckRunConclusion | None = None,
+        output: CheckRunOutput | None = None,
+        details_url: str | None = None,
+    ) -> asyncio.Future:
+        """Queue a check run update, merging it with pending ones"""
+        batch = self._batch(repo_full_name, head_sha)
+
+        pending = batch.check_runs.get(check_run_id)
+        if pending is None:
+            pending = _PendingCheckRun(org_id, installation_id, check_run_id)
+            batch.check_runs[check_run_id] = pending
+
+        if status:
+            pending.status = status
+        if conclusion:
+            pending.conclusion = conclusion
+        if details_url:
+            pending.details_url = details_url
+        if output:
+            pending.output = output
+            pending.annotations.extend(output.annotations)
+
+        return self._track(pending.futures)
+
+    def add_annotations(
+        self,
+        org_id: UUID,
+        installation_id: str,
+        repo_full_name: str,
+        head_sha: str,
+        check_run_id: int,
+        annotations: list[dict[str, Any]],
+        output_title: str = "Analysis Results",
+        output_summary: str = "",
+    ) -> asyncio.Future:
+        """Queue annotations; the pending output title/summary is kept if set"""
+        batch = self._batch(repo_full_name, head_sha)
+        pending = batch.check_runs.get(check_run_id)
+        if pending is not None and pending.output is not None:
+            pending.annotations.extend(annotations)
+            return self._track(pending.futures)
+
+        return self.update_check_run(
+            org_id=org_id,
+            installation_id=installation_id,
+            repo_full_name=repo_full_name,
+            head_sha=head_sha,
+            check_run_id=check_run_id,
+            output=CheckRunOutput(
+                title=output_title,
+                summary=output_summary,
+                annotations=annotations,
+            ),
+        )
+
+    def create_or_update_comment(
+        self,
+        org_id: UUID,
+        installation_id: str,
+        repo_full_name: str,
+        head_sha: str,
+        pr_number: int,
+        body: str,
+        comment_key: str = "",
+    ) -> asyncio.Future:
+        """Queue a comment edit; only the latest body per comment is sent"""
+        if self.comment_writer is None:
+            raise ValueError("WritebackQueue has no comment_writer")
+
+        batch = self._batch(repo_full_name, head_sha)
+        key = (pr_number, comment_key)
+
+        pending = batch.comments.get(key)
+        if pending is None:
+            pending = _PendingComment(org_id, installation_id, pr_number, comment_key, body)
+            batch.comments[key] = pending
+        else:
+            pending.body = body
+
+        return self._track(pending.futures)
+
+    async def flush(self) -> None:
+        """Send everything pending now"""
+        for key in list(self._pending):
+            await self._flush_key(key)
+
+    async def close(self) -> None:
+        """Flush pending updates and stop debounce timers"""
+        tasks = [b.task for b in self._pending.values() if b.task is not None]
+        await self.flush()
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Get queue statistics"""
+        return {
+            **self._stats,
+            "pending_batches": len(self._pending),
+        }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _batch(self, repo_full_name: str, head_sha: str) -> _PendingWriteback:
+        """Get the pending batch for a key and push back its debounce deadline"""
+        key = (repo_full_name, head_sha)
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingWriteback(first_queued_at=now, deadline=now)
+            self._pending[key] = batch
+
+        batch.deadline = min(
+            now + self.debounce_seconds,
+            batch.first_queued_at + self.max_delay_seconds,
+        )
+        if batch.task is None:
+            batch.task = loop.create_task(self._flush_later(key, batch))
+
+        self._stats["enqueued"] += 1
+        return batch
+
+    @staticmethod
+    def _track(futures: list[asyncio.Future]) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        futures.append(future)
+        return future
+
+    async def _flush_later(self, key: tuple[str, str], batch: _PendingWriteback) -> None:
+        """Sleep until the batch's (moving) deadline, then flush it"""
+        loop = asyncio.get_running_loop()
+        while True:
+            delay = batch.deadline - loop.time()
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+
+        if self._pending.get(key) is batch:
+            # Shield so close() cannot cancel a half-sent batch
+            await asyncio.shield(self._flush_key(key))
+
+    async def _flush_key(self, key: tuple[str, str]) -> None:
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            batch = self._pending.pop(key, None)
+            if batch is None:
+                return
+
+            self._stats["flushes"] += 1
+            repo_full_name = key[0]
+
+            for pending in batch.check_runs.values():
+                await self._send_check_run(repo_full_name, pending)
+
+            for pending in batch.comments.values():
+                await self._send_comment(repo_full_name, pending)
+
+            if key not in self._pending:
+                self._locks.pop(key, None)
+
+    async def _send_check_run(self, repo_full_name: str, pending: _PendingCheckRun) -> None:
+        output = pending.output
+        annotations = pending.annotations
+        chunks = [
+            annotations[i:i + MAX_ANNOTATIONS_PER_REQUEST]
+            for i in range(0, len(annotations), MAX_ANNOTATIONS_PER_REQUEST)
+        ] or [[]]
+
+        try:
+            result = None
+            for index, chunk in enumerate(chunks):
+                last = index == len(chunks) - 1
+                chunk_output = None
+                if output is not None:
+                    chunk_output = CheckRunOutput(
+                        title=output.title,
+                        summary=output.summary,
+                        text=output.text,
+                        annotations=chunk,
+                    )
+
+                result = await self.check_run_writer.update_check_run(
+                    org_id=pending.org_id,
+                    installation_id=pending.installation_id,
+                    repo_full_name=repo_full_name,
+                    check_run_id=pending.check_run_id,
+                    status=pending.status if last else None,
+                    conclusion=pending.conclusion if last else None,
+                    output=chunk_output,
+                    details_url=pending.details_url if last else None,
+                )
+                self._stats["requests"] += 1
+        except Exception as e:
+            self._stats["failed_flushes"] += 1
+            logger.error(
+                f"Check run write-back failed: repo={repo_full_name} "
+                f"id={pending.check_run_id}: {e}"
+            )
+            self._resolve(pending.futures, error=e)
+            return
+
+        self._resolve(pending.futures, result=result)
+
+    async def _send_comment(self, repo_full_name: str, pending: _PendingComment) -> None:
+        try:
+            result = await self.comment_writer.create_or_update_comment(
+                org_id=pending.org_id,
+                installation_id=pending.installation_id,
+                repo_full_name=repo_full_name,
+                pr_number=pending.pr_number,
+                body=pending.body,
+                comment_key=pending.comment_key,
+            )
+            self._stats["requests"] += 1
+        except Exception as e:
+            self._stats["failed_flushes"] += 1
+            logger.error(
+                f"Comment write-back failed: repo={repo_full_name} "
+                f"pr={pending.pr_number}: {e}"
+            )
+            self._resolve(pending.futures, error=e)
+            return
+
+        self._resolve(pending.futures, result=result)
+
+    @staticmethod
+    def _resolve(
+        futures: list[asyncio.Future],
+        result: Any = None,
+        error: Exception | None = None,
+    ) -> None:
+        for future in futures:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+
 # ------------------------------------------------------------------
 # Gate Result Write-back Helper
 # ------------------------------------------------------------------
@@ -591,11 +931,16 @@ class GateWriteback:
     Convenience class for gate result write-back
 
     Combines CheckRunWriter and StatusWriter for gate operations.
+    With a WritebackQueue, completions for the same commit are coalesced.
     """
 
     check_run_writer: CheckRunWriter
     status_writer: StatusWriter
     comment_writer: CommentWriter
+    queue: WritebackQueue | None = None
+
+    # check_run_id -> head_sha, for queue keys
+    _check_run_shas: dict[int, str] = field(default_factory=dict)
 
     async def report_gate_started(
         self,
@@ -607,7 +952,7 @@ class GateWriteback:
         details_url: str = "",
     ) -> CheckRunResult:
         """Report that gate analysis has started"""
-        return await self.check_run_writer.create_check_run(
+        result = await self.check_run_writer.create_check_run(
             org_id=org_id,
             installation_id=installation_id,
             repo_full_name=repo_full_name,
@@ -621,6 +966,8 @@ class GateWriteback:
                 summary="Running security and quality checks...",
             ),
         )
+        self._check_run_shas[result.check_run_id] = head_sha
+        return result
 
     async def report_gate_success(
         self,
@@ -638,7 +985,7 @@ class GateWriteback:
             annotations=annotations or [],
         )
 
-        return await self.check_run_writer.complete_check_run(
+        return await self._complete(
             org_id=org_id,
             installation_id=installation_id,
             repo_full_name=repo_full_name,
@@ -663,7 +1010,7 @@ class GateWriteback:
             annotations=annotations or [],
         )
 
-        return await self.check_run_writer.complete_check_run(
+        return await self._complete(
             org_id=org_id,
             installation_id=installation_id,
             repo_full_name=repo_full_name,
@@ -686,7 +1033,7 @@ class GateWriteback:
             summary=summary or "Some warnings were found but no blocking issues.",
         )
 
-        return await self.check_run_writer.complete_check_run(
+        return await self._complete(
             org_id=org_id,
             installation_id=installation_id,
             repo_full_name=repo_full_name,
@@ -694,3 +1041,34 @@ class GateWriteback:
             conclusion=CheckRunConclusion.NEUTRAL,
             output=output,
         )
+
+    async def _complete(
+        self,
+        org_id: UUID,
+        installation_id: str,
+        repo_full_name: str,
+        check_run_id: int,
+        conclusion: CheckRunConclusion,
+        output: CheckRunOutput,
+    ) -> CheckRunResult:
+        """Complete directly, or through the queue when one is configured"""
+        if self.queue is None:
+            return await self.check_run_writer.complete_check_run(
+                org_id=org_id,
+                installation_id=installation_id,
+                repo_full_name=repo_full_name,
+                check_run_id=check_run_id,
+                conclusion=conclusion,
+                output=output,
+            )
+
+        head_sha = self._check_run_shas.pop(check_run_id, str(check_run_id))
+        return await self.queue.update_check_run(
+            org_id=org_id,
+            installation_id=installation_id,
+            repo_full_name=repo_full_name,
+            head_sha=head_sha,
+            check_run_id=check_run_id,
+            conclusion=conclusion,
+            output=output,
+        )
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Anomaly Detector Test Suite
+
+Tests the ring-buffer metric window and batch recording, covering:
+- Rolling statistics match exact recomputation after wrap-around
+- Timestamp window queries
+- Batch recording against the pre-batch baseline
+"""
+
+import random
+import statistics
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from core.safety.anomaly_detector import (
+    AnomalyDetector,
+    AnomalyType,
+    DetectionStrategy,
+    MetricWindow,
+)
+
+
+class TestMetricWindow:
+    """Tests for the ring-buffer MetricWindow"""
+
+    def test_rolling_stats_after_wrap(self):
+        """Incremental mean and std dev track the retained values"""
+        rng = random.Random(7)
+        window = MetricWindow(max_size=50)
+        for _ in range(1234):
+            window.add(rng.gauss(100, 15))
+
+        values = window.values
+        assert len(window) == 50
+        assert window.mean == pytest.approx(statistics.mean(values))
+        assert window.std_dev == pytest.approx(statistics.stdev(values))
+        assert window.latest == values[-1]
+
+    def test_get_recent_uses_timestamps(self):
+        """Only values inside the time window are returned"""
+        now = datetime.now()
+        window = MetricWindow(max_size=10)
+        for i in range(15):
+            window.add(float(i), now - timedelta(seconds=14 - i))
+
+        assert window.get_recent(3.5) == [11.0, 12.0, 13.0, 14.0]
+        assert window.count_recent(3.5) == 4
+
+    def test_out_of_order_timestamps(self):
+        """Out-of-order timestamps still produce correct window queries"""
+        now = datetime.now()
+        window = MetricWindow(max_size=10)
+        window.add(1.0, now)
+        window.add(2.0, now - timedelta(seconds=60))
+        window.add(3.0, now)
+
+        assert sorted(window.get_recent(10)) == [1.0, 3.0]
+
+    def test_extend_matches_add(self):
+        """Bulk extend leaves the same window as repeated add"""
+        now = datetime.now()
+        times = [now - timedelta(seconds=30 - i) for i in range(30)]
+        values = [float(i * i % 17) for i in range(30)]
+
+        single = MetricWindow(max_size=20)
+        for value, ts in zip(values, times):
+            single.add(value, ts)
+        bulk = MetricWindow(max_size=20)
+        bulk.extend(values[:5], times[:5])
+        bulk.extend(values[5:], times[5:])
+
+        assert bulk.values == single.values
+        assert bulk.std_dev == pytest.approx(single.std_dev)
+        assert bulk.count_recent(5.5) == single.count_recent(5.5)
+
+
+class TestRecordMany:
+    """Tests for AnomalyDetector.record_many"""
+
+    @pytest.mark.asyncio
+    async def test_flags_only_outliers(self):
+        """Outliers against the pre-batch baseline raise alerts"""
+        detector = AnomalyDetector()
+        detector.add_metric("latency", std_dev_factor=3.0)
+        await detector.record_many("latency", [10.0, 11.0, 9.0, 10.5, 9.5] * 4)
+
+        alerts = await detector.record_many("latency", [10.0, 50.0, 9.8, 10.2])
+
+        assert [a.details["value"] for a in alerts] == [50.0]
+        assert detector.get_metrics_summary()["latency"]["count"] == 24
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_checked_once(self):
+        """A batch exceeding the rate limit raises one rate alert"""
+        detector = AnomalyDetector()
+        detector.add_metric(
+            "requests",
+            rate_limit=(5, 60),
+            detection_strategy=DetectionStrategy.RATE_LIMIT,
+        )
+
+        alerts = await detector.record_many("requests", [1.0] * 8)
+
+        assert len(alerts) == 1
+        assert alerts[0].type == AnomalyType.RATE_ANOMALY
+        assert alerts[0].details["rate_count"] == 8
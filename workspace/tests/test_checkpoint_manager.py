@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Manager Test Suite
+
+Tests compressed, shared checkpoint storage, covering:
+- Checkpoints keep no resident state and restore fresh copies
+- Unchanged entries are shared between checkpoints
+- Spilling to storage_path and releasing removed checkpoints
+- Corruption is detected on restore
+"""
+
+import hashlib
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from core.safety.checkpoint_manager import CheckpointManager, CheckpointStatus
+
+
+def phase_state(i: int) -> dict:
+    """State of a long execution: large unchanged history plus a moving cursor"""
+    return {
+        "history": [{"step": n, "output": "ok" * 50} for n in range(200)],
+        "config": {"retries": 3, "region": "eu"},
+        "cursor": i,
+    }
+
+
+class TestCheckpointStorage:
+    """Tests for checkpoint storage and restoration"""
+
+    def test_restore_round_trips_without_resident_state(self):
+        """State is rebuilt from compressed entries and matches the checksum"""
+        manager = CheckpointManager()
+        state = phase_state(1)
+        checkpoint_id = manager.create_checkpoint("exec", "build", state)
+
+        checkpoint = manager.list_checkpoints("exec")[0]
+        assert checkpoint.state is None
+        assert checkpoint.status == CheckpointStatus.COMPRESSED
+        expected = json.dumps(state, sort_keys=True)
+        assert checkpoint.checksum == hashlib.sha256(expected.encode()).hexdigest()
+
+        restored = manager.restore_checkpoint(checkpoint_id)
+        assert restored == state
+        restored["cursor"] = 99
+        assert manager.restore_checkpoint(checkpoint_id)["cursor"] == 1
+
+    def test_unchanged_entries_are_shared(self):
+        """Successive checkpoints store only the entries that changed"""
+        manager = CheckpointManager(retention_count=10)
+        ids = [manager.create_checkpoint("exec", f"p{i}", phase_state(i)) for i in range(5)]
+
+        stats = manager.get_checkpoint_stats("exec")
+        first = manager.list_checkpoints("exec")[-1]
+        assert stats["stored_size"] < first.compressed_size * 1.5
+        assert manager.restore_checkpoint(ids[2])["cursor"] == 2
+
+    def test_spill_to_storage_path(self, tmp_path):
+        """Entries spill to disk and are removed with their last checkpoint"""
+        manager = CheckpointManager(storage_path=tmp_path, retention_count=2)
+        ids = [manager.create_checkpoint("exec", f"p{i}", phase_state(i)) for i in range(4)]
+        blobs = tmp_path / "blobs"
+
+        # history, config and the cursors of the two retained checkpoints
+        assert len(list(blobs.iterdir())) == 4
+        assert manager.restore_checkpoint(ids[-1]) == phase_state(3)
+        with pytest.raises(ValueError):
+            manager.restore_checkpoint(ids[0])
+
+        for checkpoint_id in ids[-2:]:
+            assert manager.delete_checkpoint(checkpoint_id)
+        assert list(blobs.iterdir()) == []
+
+    def test_corruption_detected(self, tmp_path):
+        """A modified blob fails verification on restore"""
+        manager = CheckpointManager(storage_path=tmp_path, compression_enabled=False)
+        checkpoint_id = manager.create_checkpoint("exec", "p", {"a": 1})
+
+        blob = next((tmp_path / "blobs").iterdir())
+        blob.write_bytes(b"2")
+
+        with pytest.raises(ValueError):
+            manager.restore_checkpoint(checkpoint_id)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+DAG Engine Test Suite
+
+Tests the ready-queue DAG scheduler, covering:
+- Successors start without waiting for slow siblings
+- Concurrency cap
+- Per-node timeouts and retries
+- Failure skips only downstream nodes
+- Cycle detection
+- Result caching and incremental re-execution
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from core.engine import DAGEngine, DAGNode, NodeStatus, ResultCache
+from core.engine.result_cache import hash_result
+
+
+def sleeper(delay: float, value=None, log=None, name=None):
+    """Create an async task that sleeps and returns a value"""
+    async def task():
+        if log is not None:
+            log.append(("start", name))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", name))
+        return value
+    return task
+
+
+class TestScheduling:
+    """Tests for ready-queue scheduling"""
+
+    @pytest.mark.asyncio
+    async def test_successor_not_blocked_by_slow_sibling(self):
+        """A node starts once its own dependencies finish"""
+        log = []
+        engine = DAGEngine()
+        engine.add_node(DAGNode("fast", sleeper(0.01, log=log, name="fast")))
+        engine.add_node(DAGNode("slow", sleeper(0.2, log=log, name="slow")))
+        engine.add_node(DAGNode("next", sleeper(0, "done", log, "next"), ["fast"]))
+
+        results = await engine.execute()
+
+        assert results["next"] == "done"
+        assert log.index(("end", "next")) < log.index(("end", "slow"))
+        assert engine.topological_sort() == [["fast", "slow"], ["next"]]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        """No more than max_concurrency nodes run at once"""
+        active = 0
+        peak = 0
+
+        async def task():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        engine = DAGEngine(max_concurrency=2)
+        for i in range(6):
+            engine.add_node(DAGNode(f"n{i}", task))
+
+        await engine.execute()
+
+        assert peak == 2
+        assert engine.get_execution_summary()["status_counts"] == {"completed": 6}
+
+
+class TestFailureHandling:
+    """Tests for timeouts, retries and skipping"""
+
+    @pytest.mark.asyncio
+    async def test_timeout_then_retry_succeeds(self):
+        """A timed-out attempt is retried"""
+        calls = 0
+
+        async def flaky():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.sleep(1)
+            return "ok"
+
+        engine = DAGEngine(default_timeout=0.05)
+        node = DAGNode("flaky", flaky, retries=1)
+        engine.add_node(node)
+
+        results = await engine.execute()
+
+        assert results["flaky"] == "ok"
+        assert node.attempts == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_skips_only_downstream(self):
+        """Independent branches still run when a node fails"""
+        async def boom():
+            raise RuntimeError("boom")
+
+        engine = DAGEngine()
+        engine.add_node(DAGNode("bad", boom))
+        engine.add_node(DAGNode("child", sleeper(0), ["bad"]))
+        engine.add_node(DAGNode("grandchild", sleeper(0), ["child"]))
+        engine.add_node(DAGNode("other", sleeper(0.01, 1)))
+        engine.add_node(DAGNode("other_child", sleeper(0, 2), ["other"]))
+
+        results = await engine.execute()
+
+        assert isinstance(results["bad"], RuntimeError)
+        assert engine.nodes["child"].status == NodeStatus.SKIPPED
+        assert engine.nodes["grandchild"].status == NodeStatus.SKIPPED
+        assert results["other_child"] == 2
+
+    def test_cycle_detected(self):
+        """Cycles raise ValueError"""
+        engine = DAGEngine()
+        engine.add_node(DAGNode("a", sleeper(0), ["b"]))
+        engine.add_node(DAGNode("b", sleeper(0), ["a"]))
+
+        with pytest.raises(ValueError):
+            engine.topological_sort()
+        assert engine._detect_cycle()
+
+
+class TestIncrementalExecution:
+    """Tests for memoized and incremental re-execution"""
+
+    def build(self, cache, calls, source):
+        """Build source -> parse -> report with call counting"""
+        def counted(name, fn):
+            async def task():
+                calls.append(name)
+                return fn()
+            return task
+
+        engine = DAGEngine(result_cache=cache)
+        engine.add_node(DAGNode("source", counted("source", lambda: source["text"]), fingerprint="source-v1"))
+        engine.add_node(DAGNode(
+            "parse",
+            counted("parse", lambda: engine.nodes["source"].result.split()),
+            ["source"],
+            fingerprint="parse-v1",
+        ))
+        engine.add_node(DAGNode(
+            "report",
+            counted("report", lambda: len(engine.nodes["parse"].result)),
+            ["parse"],
+            fingerprint="report-v1",
+        ))
+        engine.add_node(DAGNode("unrelated", counted("unrelated", lambda: 0)))
+        return engine
+
+    @pytest.mark.asyncio
+    async def test_cache_survives_new_engine_on_disk(self, tmp_path):
+        """A fresh engine with the same cache directory reruns nothing"""
+        source = {"text": "a b c"}
+        calls = []
+
+        first = self.build(ResultCache(cache_dir=str(tmp_path)), calls, source)
+        assert (await first.execute())["report"] == 3
+
+        calls.clear()
+        second = self.build(ResultCache(cache_dir=str(tmp_path)), calls, source)
+        results = await second.execute()
+
+        assert results["report"] == 3
+        assert calls == ["unrelated"]
+        assert second.get_execution_summary()["cached_nodes"] == 3
+
+    @pytest.mark.asyncio
+    async def test_invalidate_reruns_only_downstream(self):
+        """Invalidating a node reruns it and its dependents only"""
+        source = {"text": "a b c"}
+        calls = []
+        engine = self.build(ResultCache(), calls, source)
+        await engine.execute()
+
+        source["text"] = "a b c d"
+        calls.clear()
+        assert engine.invalidate(["source"]) == ["source", "parse", "report"]
+        results = await engine.execute(incremental=True)
+
+        assert calls == ["source", "parse", "report"]
+        assert results["report"] == 4
+        assert results["unrelated"] == 0
+
+    @pytest.mark.asyncio
+    async def test_unchanged_rerun_cuts_off_downstream(self):
+        """Dependents hit the cache when an invalidated node reproduces its result"""
+        calls = []
+        engine = self.build(ResultCache(), calls, {"text": "a b"})
+        await engine.execute()
+
+        calls.clear()
+        engine.invalidate(["source"])
+        await engine.execute(incremental=True)
+
+        assert calls == ["source"]
+
+
+def test_disk_lru_eviction(tmp_path):
+    """The on-disk store evicts least recently used entries"""
+    cache = ResultCache(cache_dir=str(tmp_path), max_entries=1, max_disk_bytes=250)
+    cache.put("aa1", b"x" * 100)
+    cache.put("bb2", b"y" * 100)
+    assert cache.get("aa1")[0]
+    cache.put("cc3", b"z" * 100)
+
+    reopened = ResultCache(cache_dir=str(tmp_path), max_entries=1, max_disk_bytes=250)
+    assert reopened.get("aa1") == (True, b"x" * 100)
+    assert reopened.get("bb2") == (False, None)
+    assert reopened.get("cc3")[0]
+
+
+def test_result_hash_ignores_ordering():
+    """Equal results hash equally whatever their dict or set ordering"""
+    forward = {"files": {"a.py", "b.py", "c.py"}, "count": 3, "meta": {"x": 1, "y": 2}}
+    backward = {"meta": {"y": 2, "x": 1}, "count": 3, "files": {"c.py", "b.py", "a.py"}}
+
+    assert hash_result(forward) == hash_result(backward)
+    assert hash_result(forward) != hash_result({**forward, "count": 4})
+    assert hash_result(NodeStatus.COMPLETED) == hash_result(NodeStatus.COMPLETED)
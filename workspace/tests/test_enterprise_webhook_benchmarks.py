@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Webhook Store Benchmark Suite
+
+Measures operations per second for the in-process webhook stores:
+1. GCRA rate limiter (single and batched checks)
+2. LRU + TTL nonce store (single and batched checks)
+3. Shared-memory rate limiter and nonce store
+
+Targets (reported, not asserted, since throughput depends on the host):
+- In-process stores: > 100k ops/s
+- Shared-memory stores: > 20k ops/s
+"""
+
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.integrations.webhook_stores import (
+    GCRARateLimiter,
+    LRUNonceStore,
+    SharedMemoryNonceStore,
+    SharedMemoryRateLimiter,
+)
+
+OPERATIONS = 50_000
+BATCH_SIZE = 500
+
+
+async def measure(name, operation, count=OPERATIONS):
+    """Run ``operation(i)`` ``count`` times; returns ops/s"""
+    start = time.perf_counter()
+    for i in range(count):
+        await operation(i)
+    ops = count / (time.perf_counter() - start)
+    print(f"\n{name}: {ops:,.0f} ops/s")
+    return ops
+
+
+async def measure_batched(name, operation, count=OPERATIONS, batch_size=BATCH_SIZE):
+    """Run ``operation(batch)`` over ``count`` items in batches; returns ops/s"""
+    start = time.perf_counter()
+    for offset in range(0, count, batch_size):
+        await operation(range(offset, min(offset + batch_size, count)))
+    ops = count / (time.perf_counter() - start)
+    print(f"\n{name}: {ops:,.0f} ops/s")
+    return ops
+
+
+@pytest.fixture
+def shared_name():
+    """Unique shared-memory segment name"""
+    return f"mno-bench-{uuid4().hex[:12]}"
+
+
+class TestInProcessStoreThroughput:
+    """In-process store throughput"""
+
+    @pytest.mark.asyncio
+    async def test_gcra_rate_limiter(self):
+        limiter = GCRARateLimiter()
+        keys = [f"github:{i % 1000}" for i in range(OPERATIONS)]
+
+        single = await measure(
+            "GCRARateLimiter.check_rate_limit",
+            lambda i: limiter.check_rate_limit(keys[i], 1000, 60),
+        )
+        batched = await measure_batched(
+            "GCRARateLimiter.check_rate_limit_many",
+            lambda batch: limiter.check_rate_limit_many([keys[i] for i in batch], 1000, 60),
+        )
+
+        print(f"\nGCRARateLimiter batch speedup: {batched / single:.1f}x")
+
+    @pytest.mark.asyncio
+    async def test_lru_nonce_store(self):
+        store = LRUNonceStore()
+
+        single = await measure(
+            "LRUNonceStore.check_and_store",
+            lambda i: store.check_and_store(f"single-{i}"),
+        )
+        batched = await measure_batched(
+            "LRUNonceStore.check_and_store_many",
+            lambda batch: store.check_and_store_many([f"batch-{i}" for i in batch]),
+        )
+
+        print(f"\nLRUNonceStore batch speedup: {batched / single:.1f}x")
+        assert not await store.check_and_store("single-0")
+
+
+class TestSharedMemoryStoreThroughput:
+    """Shared-memory store throughput"""
+
+    @pytest.mark.asyncio
+    async def test_shared_rate_limiter(self, shared_name):
+        limiter = SharedMemoryRateLimiter(name=shared_name)
+        keys = [f"github:{i % 1000}" for i in range(OPERATIONS)]
+        try:
+            single = await measure(
+                "SharedMemoryRateLimiter.check_rate_limit",
+                lambda i: limiter.check_rate_limit(keys[i], 1000, 60),
+            )
+            batched = await measure_batched(
+                "SharedMemoryRateLimiter.check_rate_limit_many",
+                lambda batch: limiter.check_rate_limit_many([keys[i] for i in batch], 1000, 60),
+            )
+        finally:
+            limiter.unlink()
+            limiter.close()
+
+        print(f"\nSharedMemoryRateLimiter batch speedup: {batched / single:.1f}x")
+
+    @pytest.mark.asyncio
+    async def test_shared_nonce_store(self, shared_name):
+        store = SharedMemoryNonceStore(name=shared_name)
+        try:
+            single = await measure(
+                "SharedMemoryNonceStore.check_and_store",
+                lambda i: store.check_and_store(f"single-{i}"),
+            )
+            batched = await measure_batched(
+                "SharedMemoryNonceStore.check_and_store_many",
+                lambda batch: store.check_and_store_many([f"batch-{i}" for i in batch]),
+            )
+            assert not await store.check_and_store("single-0")
+        finally:
+            store.unlink()
+            store.close()
+
+        print(f"\nSharedMemoryNonceStore batch speedup: {batched / single:.1f}x")
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Smart Anomaly Detector Test Suite
+
+Tests batch detection across many series, covering:
+- Z-score, threshold, rate-change and seasonal methods
+- Only flagged cells are returned
+- NumPy and pure-Python paths agree
+"""
+
+import math
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from core.monitoring import smart_anomaly_detector as sad
+from core.monitoring.smart_anomaly_detector import (
+    AnomalyDetectionStrategy,
+    SmartAnomalyDetector,
+)
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    """Run each test with and without NumPy"""
+    if request.param == "numpy" and sad.np is None:
+        pytest.skip("numpy not installed")
+    if request.param == "python":
+        monkeypatch.setattr(sad, "np", None)
+    return request.param
+
+
+def noisy_rows(n_series, n_times, seed=3):
+    """Rows of gaussian noise around 100"""
+    rng = random.Random(seed)
+    return [[rng.gauss(100, 1) for _ in range(n_times)] for _ in range(n_series)]
+
+
+class TestDetectBatch:
+    """Tests for SmartAnomalyDetector.detect_batch"""
+
+    def test_zscore_flags_only_spikes(self, backend):
+        """Spikes are returned; normal cells are not"""
+        detector = SmartAnomalyDetector(sensitivity=4.0)
+        rows = noisy_rows(50, 40)
+        rows[7][12] = 150.0
+        rows[31][39] = 40.0
+
+        anomalies = detector.detect_batch([f"svc{i}.latency" for i in range(50)], rows)
+
+        cells = sorted((a.context['series_index'], a.context['time_index']) for a in anomalies)
+        assert cells == [(7, 12), (31, 39)]
+        assert anomalies[0].strategy_used == AnomalyDetectionStrategy.STATISTICAL
+
+    def test_threshold_and_rate(self, backend):
+        """Learned min/max and jumps between samples are flagged"""
+        detector = SmartAnomalyDetector(default_strategy=AnomalyDetectionStrategy.HYBRID)
+        detector.set_baseline("cpu", mean=50, stdev=0, min_val=10, max_val=90)
+        start = datetime(2024, 1, 1)
+        times = [start + timedelta(minutes=t) for t in range(4)]
+
+        anomalies = detector.detect_batch(
+            ["cpu", "requests"],
+            [[50, 95, 50, 50], [100, 100, 300, 300]],
+            timestamps=times,
+            learn=False,
+        )
+
+        found = {(a.metric_name, a.context['method'], a.timestamp) for a in anomalies}
+        assert found == {("cpu", "threshold", times[1]), ("requests", "rate", times[2])}
+
+    def test_seasonal_baseline(self, backend):
+        """A value unusual for its phase is flagged even if normal overall"""
+        detector = SmartAnomalyDetector(default_strategy=AnomalyDetectionStrategy.PATTERN, sensitivity=3.0)
+        season = [10.0, 50.0, 90.0, 50.0]
+        row = [v + 0.1 * ((t * 7) % 5) for t, v in enumerate(season * 6)]
+        row[9] = 10.0  # phase 1 normally ~50
+
+        anomalies = detector.detect_batch(["traffic"], [row], season_length=4)
+
+        assert [a.context['time_index'] for a in anomalies] == [9]
+        assert anomalies[0].expected_value == pytest.approx(50.2, abs=0.2)
+
+    def test_learn_updates_baseline(self, backend):
+        """Batch samples feed history and the learned baseline"""
+        detector = SmartAnomalyDetector()
+        detector.detect_batch(["m"], [[1.0, 2.0, 3.0] * 4])
+
+        assert detector._baselines["m"]["mean"] == pytest.approx(2.0)
+        assert len(detector._history["m"]) == 12
+
+
+def run_both(monkeypatch, rows, season_length, strategy=AnomalyDetectionStrategy.HYBRID):
+    """Detect with and without NumPy; returns both sorted cell lists"""
+    names = [f"s{i}" for i in range(len(rows))]
+
+    def run():
+        detector = SmartAnomalyDetector(default_strategy=strategy)
+        anomalies = detector.detect_batch(names, rows, season_length=season_length, learn=False)
+        return sorted(
+            (a.context['series_index'], a.context['time_index'], a.context['method'], a.deviation)
+            for a in anomalies
+        )
+
+    with_numpy = run()
+    monkeypatch.setattr(sad, "np", None)
+    without_numpy = run()
+    monkeypatch.undo()
+    return with_numpy, without_numpy
+
+
+def test_numpy_matches_python(monkeypatch):
+    """Both paths flag the same cells with the same scores"""
+    if sad.np is None:
+        pytest.skip("numpy not installed")
+
+    rows = noisy_rows(30, 48, seed=11)
+    for i in range(0, 30, 4):
+        rows[i][i + 5] *= 1.2
+
+    with_numpy, without_numpy = run_both(monkeypatch, rows, season_length=12)
+
+    assert [c[:3] for c in with_numpy] == [c[:3] for c in without_numpy]
+    assert all(math.isclose(a[3], b[3], rel_tol=1e-9) for a, b in zip(with_numpy, without_numpy, strict=True))
+
+
+def test_numpy_matches_python_on_flat_phases(monkeypatch):
+    """Phases whose other seasons are all equal flag nothing on either path"""
+    if sad.np is None:
+        pytest.skip("numpy not installed")
+
+    rng = random.Random(5)
+    rows = []
+    for _ in range(40):
+        row = [rng.choice([0.0, 0.1, 0.3, 7.7]) for _ in range(4)] * 5
+        row[rng.randrange(len(row))] += rng.choice([0.0, 1e-3, 5.0])
+        rows.append(row)
+
+    with_numpy, without_numpy = run_both(
+        monkeypatch, rows, season_length=4, strategy=AnomalyDetectionStrategy.PATTERN,
+    )
+
+    assert with_numpy == without_numpy == []
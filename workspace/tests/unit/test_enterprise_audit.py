@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Enterprise Audit Export Test Suite
+
+Tests streaming audit log export, covering:
+- Keyset-paginated NDJSON export with gzip
+- CSV export through offset paging
+- Untruncated JSON fallback in export_audit_log
+- Rejection of unavailable formats and compressions
+"""
+
+import csv
+import gzip
+import io
+import json
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.data import audit
+from enterprise.data.audit import AuditAction, AuditEntry, AuditLogger
+
+
+class OffsetAuditStorage:
+    """Audit storage supporting only offset queries"""
+
+    def __init__(self, entries):
+        self.entries = sorted(entries, key=lambda e: (e.timestamp, e.id))
+        self.calls = 0
+
+    def _matching(self, query):
+        return [
+            e for e in self.entries
+            if e.org_id == query.org_id
+            and query.start_time <= e.timestamp <= query.end_time
+        ]
+
+    async def query(self, query, offset=0, limit=100):
+        self.calls += 1
+        return self._matching(query)[offset:offset + limit]
+
+
+class KeysetAuditStorage(OffsetAuditStorage):
+    """Audit storage supporting keyset pages"""
+
+    async def query_after(self, query, after=None, limit=1000):
+        self.calls += 1
+        rows = self._matching(query)
+        if after is not None:
+            rows = [e for e in rows if (e.timestamp, e.id) > after]
+        return rows[:limit]
+
+
+@pytest.fixture
+def org_id():
+    """Create organization ID"""
+    return uuid4()
+
+
+@pytest.fixture
+def entries(org_id):
+    """Create 2500 audit entries, several sharing each timestamp"""
+    base = datetime(2024, 1, 1)
+    return [
+        AuditEntry(
+            action=AuditAction.POLICY_UPDATED,
+            org_id=org_id,
+            resource_type="policy",
+            resource_id=str(i),
+            details={"index": i},
+            timestamp=base + timedelta(seconds=i // 3),
+        )
+        for i in range(2500)
+    ]
+
+
+async def collect(stream) -> bytes:
+    return b"".join([chunk async for chunk in stream])
+
+
+class TestStreamingExport:
+    """Tests for AuditLogger.stream_audit_log"""
+
+    @pytest.mark.asyncio
+    async def test_ndjson_gzip_keyset(self, org_id, entries):
+        """Every entry is exported once across keyset pages"""
+        storage = KeysetAuditStorage(entries)
+        logger = AuditLogger(storage=storage, export_page_size=1000)
+
+        data = await collect(logger.stream_audit_log(
+            org_id, datetime(2023, 1, 1), datetime(2025, 1, 1),
+        ))
+
+        lines = gzip.decompress(data).splitlines()
+        exported = [json.loads(line)["resource_id"] for line in lines]
+        assert sorted(exported, key=int) == [str(i) for i in range(2500)]
+        assert storage.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_csv_with_offset_paging(self, org_id, entries):
+        """Storages without query_after are paged by offset"""
+        logger = AuditLogger(storage=OffsetAuditStorage(entries), export_page_size=700)
+
+        data = await collect(logger.stream_audit_log(
+            org_id, datetime(2023, 1, 1), datetime(2025, 1, 1),
+            format="csv", compression="none",
+        ))
+
+        rows = list(csv.DictReader(io.StringIO(data.decode())))
+        assert len(rows) == 2500
+        row = next(r for r in rows if r["resource_id"] == "42")
+        assert json.loads(row["details"]) == {"index": 42}
+
+    @pytest.mark.asyncio
+    async def test_export_audit_log_is_not_truncated(self, org_id, entries):
+        """The JSON fallback returns every entry as one array"""
+        logger = AuditLogger(storage=KeysetAuditStorage(entries))
+
+        data = await logger.export_audit_log(org_id, datetime(2023, 1, 1), datetime(2025, 1, 1))
+
+        assert len(json.loads(data)) == 2500
+
+    @pytest.mark.asyncio
+    async def test_rejects_unavailable_options(self, org_id, monkeypatch):
+        """Unknown formats and missing optional codecs raise ValueError"""
+        logger = AuditLogger(storage=KeysetAuditStorage([]))
+        monkeypatch.setattr(audit, "zstandard", None)
+
+        with pytest.raises(ValueError):
+            await collect(logger.stream_audit_log(
+                org_id, datetime(2023, 1, 1), datetime(2025, 1, 1), format="xml",
+            ))
+        with pytest.raises(ValueError):
+            await collect(logger.stream_audit_log(
+                org_id, datetime(2023, 1, 1), datetime(2025, 1, 1), compression="zstd",
+            ))
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Enterprise Event Log Test Suite
+
+Tests the event log against the segmented file store, covering:
+- Indexed queries and counts
+- Streaming replay of failed events
+- Reopening a store from its segment files
+- Segment-level retention
+- Causation chains and trees
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.events.event_log import (
+    CausationIndex,
+    EventFilter,
+    EventLog,
+    EventStatus,
+    StoredEvent,
+)
+from enterprise.events.event_store import SegmentedEventStorage
+
+
+@pytest.fixture
+def storage(tmp_path):
+    """Segmented event storage with small segments"""
+    return SegmentedEventStorage(directory=str(tmp_path), segment_max_bytes=4096)
+
+
+@pytest.fixture
+def event_log(storage):
+    """Event log backed by the segmented storage"""
+    return EventLog(storage=storage)
+
+
+@pytest.fixture
+def org_id():
+    """Test organization ID"""
+    return uuid4()
+
+
+async def store_events(event_log, org_id, count, event_type="push"):
+    """Store ``count`` events and return them"""
+    return [
+        await event_log.store_event(
+            org_id=org_id,
+            event_type=event_type,
+            source="github",
+            source_id=str(uuid4()),
+            payload={"n": i},
+        )
+        for i in range(count)
+    ]
+
+
+class TestSegmentedStorage:
+    """Tests for SegmentedEventStorage"""
+
+    @pytest.mark.asyncio
+    async def test_query_uses_latest_version(self, event_log, storage, org_id):
+        """Updated events are returned once, with their latest status"""
+        events = await store_events(event_log, org_id, 40)
+        for event in events[:15]:
+            await event_log.mark_processed(event.id)
+
+        assert storage.segment_count > 1
+        assert await storage.count(EventFilter(org_id=org_id)) == 40
+        processed = await event_log.query_events(
+            EventFilter(org_id=org_id, status=EventStatus.PROCESSED), limit=100,
+        )
+        assert {e.id for e in processed} == {e.id for e in events[:15]}
+
+    @pytest.mark.asyncio
+    async def test_filters_by_type_and_org(self, event_log, storage, org_id):
+        """Index columns filter by event type and org"""
+        await store_events(event_log, org_id, 5, event_type="push")
+        await store_events(event_log, org_id, 3, event_type="pull_request.opened")
+        await store_events(event_log, uuid4(), 4, event_type="push")
+
+        count = await storage.count(EventFilter(org_id=org_id, event_types=["push"]))
+
+        assert count == 5
+
+    @pytest.mark.asyncio
+    async def test_correlation_and_status_use_posting_lists(self, event_log, tmp_path, org_id):
+        """Correlation and status lookups visit only rows carrying the value"""
+        await store_events(event_log, org_id, 60)
+        root = await event_log.store_event(org_id, "push", "github", "root", {})
+        related = [
+            await event_log.store_event(org_id, "job", "internal", str(i), {}, causation_id=root.id)
+            for i in range(3)
+        ]
+        await event_log.mark_failed(related[1].id, "boom")
+
+        storage = SegmentedEventStorage(directory=str(tmp_path), segment_max_bytes=4096)
+        records = [
+            line for path in tmp_path.glob("segment-*.log")
+            for line in path.read_text().splitlines()
+        ]
+        visited = 0
+
+        class CountingColumn(list):
+            def __getitem__(self, row):
+                nonlocal visited
+                visited += 1
+                return super().__getitem__(row)
+
+        for index in storage._segments:
+            index.correlation_ids = CountingColumn(index.correlation_ids)
+            index.status_codes = CountingColumn(index.status_codes)
+
+        correlated = await storage.query(EventFilter(correlation_id=root.correlation_id))
+        assert {e.id for e in correlated} == {root.id} | {e.id for e in related}
+        assert storage.segment_count > 1
+        assert visited == sum(str(root.correlation_id) in line for line in records)
+
+        visited = 0
+        failed = await storage.query(EventFilter(org_id=org_id, status=EventStatus.FAILED))
+        assert [e.id for e in failed] == [related[1].id]
+        assert visited == sum('"status":"failed"' in line for line in records)
+
+    @pytest.mark.asyncio
+    async def test_replay_failed_streams_events(self, event_log, storage, org_id):
+        """Failed events are replayed once each"""
+        events = await store_events(event_log, org_id, 20)
+        for event in events[:6]:
+            await event_log.mark_failed(event.id, "tool crashed")
+
+        replayed = await event_log.replay_failed(org_id)
+
+        assert replayed == 6
+        assert await storage.count(EventFilter(org_id=org_id, status=EventStatus.FAILED)) == 0
+
+    @pytest.mark.asyncio
+    async def test_reopen_restores_index(self, event_log, tmp_path, org_id):
+        """A new instance rebuilds the index from segment files"""
+        events = await store_events(event_log, org_id, 30)
+        await event_log.mark_processed(events[0].id)
+
+        reopened = SegmentedEventStorage(directory=str(tmp_path), segment_max_bytes=4096)
+
+        assert await reopened.count(EventFilter(org_id=org_id)) == 30
+        assert (await reopened.get(events[0].id)).status == EventStatus.PROCESSED
+
+    @pytest.mark.asyncio
+    async def test_retention_keeps_failed_events(self, event_log, storage, org_id):
+        """Dropped segments carry forward events that must be kept"""
+        events = await store_events(event_log, org_id, 40)
+        for event in events[:30]:
+            await event_log.mark_processed(event.id)
+        await event_log.mark_failed(events[35].id, "boom")
+
+        deleted = await storage.delete_before(
+            datetime.utcnow() + timedelta(days=1),
+            [EventStatus.PROCESSED, EventStatus.SKIPPED],
+        )
+
+        assert deleted > 0
+        assert (await storage.get(events[35].id)).status == EventStatus.FAILED
+        assert await storage.count(EventFilter(org_id=org_id)) == 40 - deleted
+
+    @pytest.mark.asyncio
+    async def test_retention_does_not_resurrect_old_versions(self, tmp_path, org_id):
+        """A deleted event's older version in a retained segment stays hidden after reopening"""
+        storage = SegmentedEventStorage(directory=str(tmp_path), segment_max_bytes=4096)
+        event = StoredEvent(org_id=org_id, received_at=datetime.utcnow() - timedelta(days=30))
+        await storage.save(event)
+        await storage.save(StoredEvent(org_id=org_id))  # keeps the first segment recent
+
+        event.status = EventStatus.PROCESSED
+        event.payload = {"log": "x" * 4096}
+        await storage.update(event)                      # alone in the next segment
+        await storage.save(StoredEvent(org_id=org_id))   # seals it
+
+        assert await storage.delete_before(
+            datetime.utcnow() - timedelta(days=1), [EventStatus.PROCESSED],
+        ) == 0
+        reopened = SegmentedEventStorage(directory=str(tmp_path), segment_max_bytes=4096)
+        assert (await reopened.get(event.id)).status == EventStatus.PROCESSED
+
+        assert await reopened.delete_before(
+            datetime.utcnow() + timedelta(days=1), [EventStatus.PROCESSED],
+        ) == 1
+        reopened = SegmentedEventStorage(directory=str(tmp_path), segment_max_bytes=4096)
+        assert await reopened.get(event.id) is None
+        assert await reopened.count(EventFilter(org_id=org_id)) == 2
+
+
+class TestEventChains:
+    """Tests for causation chain resolution"""
+
+    @pytest.mark.asyncio
+    async def test_chain_resolves_with_one_bulk_fetch(self, event_log, storage, org_id):
+        """Indexed chains are fetched without per-hop lookups"""
+        parent = None
+        events = []
+        for i in range(60):
+            parent = await event_log.store_event(
+                org_id=org_id,
+                event_type="check_run",
+                source="internal",
+                source_id=str(i),
+                payload={},
+                causation_id=parent.id if parent else None,
+            )
+            events.append(parent)
+
+        single_gets = 0
+        get = storage.get
+
+        async def counting_get(event_id):
+            nonlocal single_gets
+            single_gets += 1
+            return await get(event_id)
+
+        storage.get = counting_get
+        chain = await event_log.get_event_chain(events[-1].id)
+
+        assert [e.id for e in chain] == [e.id for e in events]
+        assert single_gets == 0
+        assert len({e.correlation_id for e in chain}) == 1
+
+    @pytest.mark.asyncio
+    async def test_event_tree(self, event_log, org_id):
+        """The tree groups events under the event that caused them"""
+        root = await event_log.store_event(org_id, "push", "github", "1", {})
+        left = await event_log.store_event(org_id, "job", "internal", "2", {}, causation_id=root.id)
+        right = await event_log.store_event(org_id, "job", "internal", "3", {}, causation_id=root.id)
+        leaf = await event_log.store_event(org_id, "result", "internal", "4", {}, causation_id=left.id)
+
+        tree = await event_log.get_event_tree(leaf.id)
+
+        assert tree.event.id == root.id
+        assert [child.event.id for child in tree.children] == [left.id, right.id]
+        assert [child.event.id for child in tree.children[0].children] == [leaf.id]
+
+    @pytest.mark.asyncio
+    async def test_large_tree_across_correlations(self, event_log, storage, org_id):
+        """Trees are not truncated and follow causation across correlation IDs"""
+        root = await event_log.store_event(org_id, "push", "github", "root", {})
+        children = [
+            await event_log.store_event(org_id, "job", "internal", str(i), {}, causation_id=root.id)
+            for i in range(1100)
+        ]
+        other = await event_log.store_event(
+            org_id, "job", "internal", "other", {},
+            correlation_id=uuid4(), causation_id=children[0].id,
+        )
+
+        async def no_query(*args, **kwargs):
+            raise AssertionError("tree should not query storage")
+
+        storage.query = no_query
+        tree = await event_log.get_event_tree(root.id)
+
+        assert len(tree.children) == 1100
+        assert [c.event.id for c in tree.children[0].children] == [other.id]
+
+    def test_index_eviction_drops_child_links(self):
+        """Evicting a parent drops its children entry"""
+        index = CausationIndex(max_entries=2)
+        parent, child, other = uuid4(), uuid4(), uuid4()
+        index.add(parent, None, None)
+        index.add(child, None, parent)
+        index.add(other, None, None)
+
+        assert parent not in index
+        assert index.children(parent) == set()
+        assert index.descendants(parent) == []
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Enterprise IAM RBAC Test Suite
+
+Tests cached permission resolution in the RBAC manager, covering:
+- Repeated checks served from the permission cache
+- Multi-permission checks against role bitmasks
+- Invalidation on role change and removal
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.iam.models import Membership, Permission, Role
+from enterprise.iam.rbac import (
+    MembershipRepository,
+    PermissionDeniedError,
+    RBACManager,
+)
+
+
+@pytest.fixture
+def org_id():
+    """Test organization ID"""
+    return uuid4()
+
+
+@pytest.fixture
+def owner_id():
+    """Organization owner"""
+    return uuid4()
+
+
+@pytest.fixture
+def user_id():
+    """Organization member"""
+    return uuid4()
+
+
+@pytest.fixture
+def memberships(org_id, owner_id, user_id):
+    """Membership table keyed by (org_id, user_id)"""
+    return {
+        (org_id, owner_id): Membership(org_id=org_id, user_id=owner_id, role=Role.OWNER),
+        (org_id, user_id): Membership(org_id=org_id, user_id=user_id, role=Role.MEMBER),
+    }
+
+
+@pytest.fixture
+def mock_membership_repository(memberships):
+    """Mock membership repository backed by the membership table"""
+    repo = AsyncMock(spec=MembershipRepository)
+
+    async def get_membership(org_id, user_id):
+        return memberships.get((org_id, user_id))
+
+    async def save_membership(membership):
+        memberships[(membership.org_id, membership.user_id)] = membership
+        return membership
+
+    async def delete_membership(org_id, user_id):
+        return memberships.pop((org_id, user_id), None) is not None
+
+    repo.get_membership.side_effect = get_membership
+    repo.save_membership.side_effect = save_membership
+    repo.delete_membership.side_effect = delete_membership
+    return repo
+
+
+@pytest.fixture
+def rbac(mock_membership_repository):
+    """RBAC manager with a mocked repository"""
+    return RBACManager(membership_repository=mock_membership_repository)
+
+
+class TestPermissionCache:
+    """Tests for cached permission resolution"""
+
+    @pytest.mark.asyncio
+    async def test_repeated_checks_hit_cache(self, rbac, mock_membership_repository, org_id, user_id):
+        """Only the first check reads the repository"""
+        for _ in range(5):
+            assert await rbac.check_permission(org_id, user_id, Permission.RUN_CREATE)
+        await rbac.check_permissions(org_id, user_id, [Permission.RUN_READ, Permission.REPO_READ])
+
+        assert mock_membership_repository.get_membership.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_check_permissions_reports_missing(self, rbac, org_id, user_id):
+        """require_all names the first missing permission"""
+        with pytest.raises(PermissionDeniedError) as exc_info:
+            await rbac.check_permissions(
+                org_id, user_id, [Permission.RUN_READ, Permission.POLICY_UPDATE],
+            )
+
+        assert exc_info.value.required_permission == Permission.POLICY_UPDATE
+        assert await rbac.check_permissions(
+            org_id, user_id, [Permission.POLICY_UPDATE, Permission.RUN_READ], require_all=False,
+        )
+
+    @pytest.mark.asyncio
+    async def test_role_change_invalidates(self, rbac, org_id, owner_id, user_id):
+        """A promoted member gains permissions immediately"""
+        assert not await rbac.check_permission(
+            org_id, user_id, Permission.POLICY_UPDATE, raise_on_deny=False,
+        )
+
+        await rbac.update_member_role(org_id, user_id, Role.ADMIN, updated_by=owner_id)
+
+        assert await rbac.check_permission(org_id, user_id, Permission.POLICY_UPDATE)
+
+    @pytest.mark.asyncio
+    async def test_removal_invalidates(self, rbac, org_id, owner_id, user_id):
+        """A removed member loses access immediately"""
+        assert await rbac.check_permission(org_id, user_id, Permission.ORG_READ)
+
+        await rbac.remove_member(org_id, user_id, removed_by=owner_id)
+
+        assert await rbac.get_user_role(org_id, user_id) is None
+        with pytest.raises(PermissionDeniedError):
+            await rbac.check_permission(org_id, user_id, Permission.ORG_READ)
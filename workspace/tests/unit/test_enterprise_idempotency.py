@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Enterprise Idempotency Test Suite
+
+Tests the idempotency manager against the sharded in-memory storage, covering:
+- Duplicate detection with cached results
+- Timing-wheel TTL expiry
+- Write-through to a durable backing store
+"""
+
+import sys
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.events.idempotency import (
+    IdempotencyKey,
+    IdempotencyManager,
+    IdempotencyRecord,
+)
+from enterprise.events.idempotency_store import ShardedIdempotencyStorage
+
+
+class RemoteStorage(ShardedIdempotencyStorage):
+    """Backing store that hands out copies, like a database would"""
+
+    async def get_by_key(self, key_hash):
+        record = await super().get_by_key(key_hash)
+        return replace(record) if record is not None else None
+
+    async def save(self, record):
+        return replace(await super().save(replace(record)))
+
+    async def update(self, record):
+        return replace(await super().update(replace(record)))
+
+
+@pytest.fixture
+def storage():
+    """Local sharded storage"""
+    return ShardedIdempotencyStorage(num_shards=8, bloom_capacity=1000)
+
+
+@pytest.fixture
+def key():
+    """Test idempotency key"""
+    return IdempotencyKey(
+        org_id=uuid4(),
+        operation_type="pr_analysis",
+        repo_full_name="acme/widgets",
+        head_sha="abc123",
+        pr_number=7,
+    )
+
+
+class TestShardedIdempotencyStorage:
+    """Tests for ShardedIdempotencyStorage"""
+
+    @pytest.mark.asyncio
+    async def test_duplicate_returns_cached_result(self, storage, key):
+        """Second check of a completed key is a duplicate"""
+        manager = IdempotencyManager(storage=storage)
+
+        first = await manager.check(key)
+        await manager.complete(key, {"run_id": "r1"})
+        second = await manager.check(key)
+
+        assert not first.is_duplicate
+        assert second.is_duplicate
+        assert second.cached_result == {"run_id": "r1"}
+
+    @pytest.mark.asyncio
+    async def test_unknown_key_is_definitely_new(self, storage, key):
+        """The bloom filter rejects keys that were never stored"""
+        assert not storage.might_contain(key.hash)
+        assert await storage.get_by_key(key.hash) is None
+
+    @pytest.mark.asyncio
+    async def test_cleanup_expires_only_due_records(self, storage):
+        """Expired records are removed; live ones stay"""
+        await storage.save(IdempotencyRecord(
+            key_hash="a" * 64,
+            expires_at=datetime.utcnow() - timedelta(seconds=1),
+        ))
+        await storage.save(IdempotencyRecord(
+            key_hash="b" * 64,
+            expires_at=datetime.utcnow() + timedelta(hours=1),
+        ))
+
+        assert await storage.cleanup_expired() == 1
+        assert await storage.get_by_key("a" * 64) is None
+        assert await storage.get_by_key("b" * 64) is not None
+
+    @pytest.mark.asyncio
+    async def test_write_through_and_read_through(self, key):
+        """Writes reach the backing store; local misses read through"""
+        backing = ShardedIdempotencyStorage()
+        cache = ShardedIdempotencyStorage(backing=backing)
+
+        await cache.save(IdempotencyRecord(key_hash=key.hash))
+        assert await backing.get_by_key(key.hash) is not None
+
+        other = ShardedIdempotencyStorage(backing=backing)
+        assert await other.get_by_key(key.hash) is not None
+
+    @pytest.mark.asyncio
+    async def test_non_authoritative_node_sees_remote_completion(self, key):
+        """An in-progress record cached by one node is re-read once another completes it"""
+        backing = RemoteStorage()
+        node_a = IdempotencyManager(storage=ShardedIdempotencyStorage(backing=backing))
+        node_b = IdempotencyManager(storage=ShardedIdempotencyStorage(backing=backing))
+
+        assert not (await node_a.check(key)).is_duplicate
+        in_flight = await node_b.check(key)
+        assert in_flight.is_duplicate
+        assert in_flight.cached_result is None
+
+        await node_a.complete(key, {"run_id": "r1"})
+        result = await node_b.check(key)
+
+        assert result.is_duplicate
+        assert result.cached_result == {"run_id": "r1"}
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Enterprise Job Queue Test Suite
+
+Tests the job queue against the SQLite reference storage, covering:
+- Atomic batched claiming
+- Priority ordering of claimed jobs
+- Delayed jobs are not claimed before they are due
+- Worker pool processing, in-flight bounds and bounded drain
+- Stale job recovery and delayed job scheduling
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.events.job_queue import (
+    JobPriority,
+    JobQueue,
+    JobStatus,
+    QueueType,
+)
+from enterprise.events.job_storage import SQLiteJobStorage
+from enterprise.events.scheduler import DelayedJobScheduler
+from enterprise.events.worker_pool import JobWorkerPool, QueueWorkerConfig
+
+
+@pytest.fixture
+def storage():
+    """In-memory SQLite job storage"""
+    store = SQLiteJobStorage()
+    yield store
+    store.close()
+
+
+@pytest.fixture
+def job_queue(storage):
+    """Job queue backed by the SQLite storage"""
+    return JobQueue(storage=storage)
+
+
+@pytest.fixture
+def org_id():
+    """Test organization ID"""
+    return uuid4()
+
+
+class TestBatchedClaiming:
+    """Tests for JobQueue.fetch_jobs"""
+
+    @pytest.mark.asyncio
+    async def test_fetch_jobs_claims_batch(self, job_queue, org_id):
+        """A single fetch claims several jobs and locks them"""
+        for i in range(5):
+            await job_queue.enqueue(org_id, "analyze_pr", {"n": i})
+
+        jobs = await job_queue.fetch_jobs(QueueType.GATE, "worker-1", max_jobs=3)
+
+        assert len(jobs) == 3
+        for job in jobs:
+            assert job.status == JobStatus.PROCESSING
+            assert job.worker_id == "worker-1"
+            assert job.attempt == 1
+            assert job.locked_until > job.started_at
+
+    @pytest.mark.asyncio
+    async def test_concurrent_workers_never_share_jobs(self, job_queue, org_id):
+        """Competing workers receive disjoint sets of jobs"""
+        for i in range(20):
+            await job_queue.enqueue(org_id, "analyze_pr", {"n": i})
+
+        batches = await asyncio.gather(*[
+            job_queue.fetch_jobs(QueueType.GATE, f"worker-{w}", max_jobs=4)
+            for w in range(8)
+        ])
+
+        claimed = [job.id for batch in batches for job in batch]
+        assert len(claimed) == 20
+        assert len(set(claimed)) == 20
+
+    @pytest.mark.asyncio
+    async def test_claim_respects_priority(self, job_queue, org_id):
+        """Higher priority jobs are claimed first"""
+        await job_queue.enqueue(org_id, "report", {}, priority=JobPriority.LOW)
+        await job_queue.enqueue(org_id, "gate", {}, priority=JobPriority.CRITICAL)
+
+        job = await job_queue.fetch_job(QueueType.GATE, "worker-1")
+
+        assert job.job_type == "gate"
+
+    @pytest.mark.asyncio
+    async def test_delayed_job_not_claimed_early(self, job_queue, org_id):
+        """Jobs scheduled in the future do not block due jobs"""
+        await job_queue.enqueue(
+            org_id, "later", {},
+            priority=JobPriority.CRITICAL,
+            scheduled_at=datetime.utcnow() + timedelta(hours=1),
+        )
+        await job_queue.enqueue(org_id, "now", {})
+
+        jobs = await job_queue.fetch_jobs(QueueType.GATE, "worker-1", max_jobs=10)
+
+        assert [job.job_type for job in jobs] == ["now"]
+
+
+class TestWorkerPool:
+    """Tests for JobWorkerPool"""
+
+    @pytest.mark.asyncio
+    async def test_pool_processes_jobs_and_drains(self, job_queue, storage, org_id):
+        """The pool runs handlers for queued jobs and stops cleanly"""
+        handled = []
+
+        async def handler(job):
+            handled.append(job.payload["n"])
+            return {"ok": True}
+
+        job_queue.register_handler("analyze_pr", handler)
+        for i in range(10):
+            await job_queue.enqueue(org_id, "analyze_pr", {"n": i})
+
+        pool = JobWorkerPool(
+            job_queue=job_queue,
+            queues={QueueType.GATE: QueueWorkerConfig(consumers=2, max_in_flight=4, batch_size=3)},
+            min_poll_interval=0.01,
+            max_poll_interval=0.05,
+        )
+        async with pool:
+            for _ in range(100):
+                if len(handled) == 10:
+                    break
+                await asyncio.sleep(0.02)
+
+        assert sorted(handled) == list(range(10))
+        assert await storage.count_jobs(org_id, status=JobStatus.COMPLETED) == 10
+        assert not pool.running
+        assert pool.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_pool_bounds_in_flight_jobs(self, job_queue, org_id):
+        """No more than max_in_flight handlers run at once"""
+        active = 0
+        peak = 0
+
+        async def handler(job):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return {}
+
+        job_queue.register_handler("slow", handler)
+        for _ in range(12):
+            await job_queue.enqueue(org_id, "slow", {})
+
+        pool = JobWorkerPool(
+            job_queue=job_queue,
+            queues={QueueType.GATE: QueueWorkerConfig(consumers=3, max_in_flight=2, batch_size=5)},
+            min_poll_interval=0.01,
+            max_poll_interval=0.02,
+        )
+        async with pool:
+            await asyncio.sleep(0.5)
+
+        assert peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_stop_is_bounded_by_drain_timeout(self, job_queue, org_id):
+        """Consumers waiting for a slot do not hold stop() past drain_timeout"""
+        started = asyncio.Event()
+
+        async def handler(job):
+            started.set()
+            await asyncio.sleep(10)
+            return {}
+
+        job_queue.register_handler("stuck", handler)
+        for _ in range(3):
+            await job_queue.enqueue(org_id, "stuck", {})
+
+        pool = JobWorkerPool(
+            job_queue=job_queue,
+            queues={QueueType.GATE: QueueWorkerConfig(consumers=2, max_in_flight=1, batch_size=1)},
+            min_poll_interval=0.01,
+            drain_timeout=0.2,
+        )
+        await pool.start()
+        await asyncio.wait_for(started.wait(), timeout=2)
+
+        await asyncio.wait_for(pool.stop(), timeout=2)
+
+        assert not pool.running
+        assert pool.in_flight == 0
+
+
+class TestStaleJobRecovery:
+    """Tests for lease expiry and renewal"""
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_requeued(self, job_queue, org_id):
+        """Jobs held past their lease go back to PENDING"""
+        job = await job_queue.enqueue(org_id, "analyze_pr", {})
+        claimed = await job_queue.fetch_job(QueueType.GATE, "crashed-worker")
+        claimed.locked_until = datetime.utcnow() - timedelta(seconds=1)
+        await job_queue.storage.update(claimed)
+
+        recovered = await job_queue.recover_stale_jobs(QueueType.GATE)
+
+        stored = await job_queue.storage.get(job.id)
+        assert recovered == 1
+        assert stored.status == JobStatus.PENDING
+        assert stored.worker_id is None
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_on_last_attempt_is_dead(self, job_queue, org_id):
+        """Jobs that used their last attempt are not requeued"""
+        job = await job_queue.enqueue(org_id, "analyze_pr", {}, max_attempts=1)
+        claimed = await job_queue.fetch_job(QueueType.GATE, "crashed-worker")
+        claimed.locked_until = datetime.utcnow() - timedelta(seconds=1)
+        await job_queue.storage.update(claimed)
+
+        await job_queue.recover_stale_jobs(QueueType.GATE)
+
+        stored = await job_queue.storage.get(job.id)
+        assert stored.status == JobStatus.DEAD
+
+    @pytest.mark.asyncio
+    async def test_renewed_lease_is_not_recovered(self, job_queue, org_id):
+        """Renewing a lease keeps the job with its worker"""
+        await job_queue.enqueue(org_id, "analyze_pr", {})
+        claimed = await job_queue.fetch_job(QueueType.GATE, "worker-1")
+
+        assert await job_queue.renew_lease(claimed, extend_seconds=600)
+        assert await job_queue.recover_stale_jobs(QueueType.GATE) == 0
+
+
+class TestDelayedJobs:
+    """Tests for the delayed job scheduler"""
+
+    def test_scheduler_pops_in_due_order(self):
+        """Due jobs come out earliest first; future jobs stay"""
+        scheduler = DelayedJobScheduler()
+        now = datetime.utcnow()
+        first, second, later = uuid4(), uuid4(), uuid4()
+        scheduler.schedule(second, now - timedelta(seconds=1))
+        scheduler.schedule(later, now + timedelta(hours=1))
+        scheduler.schedule(first, now - timedelta(seconds=5))
+
+        assert scheduler.pop_due(now) == [first, second]
+        assert scheduler.next_due_at() == now + timedelta(hours=1)
+        assert len(scheduler) == 1
+
+    def test_reschedule_replaces_due_time(self):
+        """Rescheduling a job supersedes its earlier entry"""
+        scheduler = DelayedJobScheduler()
+        now = datetime.utcnow()
+        job_id = uuid4()
+        scheduler.schedule(job_id, now - timedelta(seconds=1))
+        scheduler.schedule(job_id, now + timedelta(minutes=5))
+
+        assert scheduler.pop_due(now) == []
+        assert len(scheduler) == 1
+
+    @pytest.mark.asyncio
+    async def test_due_job_is_promoted(self, job_queue, org_id):
+        """A scheduled job becomes claimable once promoted"""
+        job = await job_queue.enqueue(
+            org_id, "later", {},
+            scheduled_at=datetime.utcnow() + timedelta(milliseconds=50),
+        )
+        assert job.status == JobStatus.SCHEDULED
+
+        await asyncio.sleep(0.06)
+        assert await job_queue.promote_due_jobs() == 1
+
+        claimed = await job_queue.fetch_job(QueueType.GATE, "worker-1")
+        assert claimed.id == job.id
+
+    @pytest.mark.asyncio
+    async def test_failed_job_retry_is_scheduled(self, job_queue, org_id):
+        """fail_job schedules the retry through the scheduler"""
+        await job_queue.enqueue(org_id, "analyze_pr", {})
+        claimed = await job_queue.fetch_job(QueueType.GATE, "worker-1")
+
+        failed = await job_queue.fail_job(claimed.id, "boom")
+
+        assert failed.status == JobStatus.SCHEDULED
+        assert claimed.id in job_queue.scheduler
+        assert await job_queue.fetch_job(QueueType.GATE, "worker-1") is None
+
+    @pytest.mark.asyncio
+    async def test_due_retry_is_fetched_without_worker_pool(self, job_queue, org_id):
+        """A plain fetch_job promotes and claims a retry once it is due"""
+        job_queue.base_retry_delay = 0.05
+        await job_queue.enqueue(org_id, "analyze_pr", {})
+        claimed = await job_queue.fetch_job(QueueType.GATE, "worker-1")
+        await job_queue.fail_job(claimed.id, "boom")
+
+        await asyncio.sleep(0.06)
+        retried = await job_queue.fetch_job(QueueType.GATE, "worker-2")
+
+        assert retried.id == claimed.id
+        assert retried.attempt == 2
+
+
+class TestQueueStats:
+    """Tests for grouped queue statistics"""
+
+    @pytest.mark.asyncio
+    async def test_stats_match_storage_counts(self, job_queue, org_id):
+        """Cached counters follow enqueue, fetch and complete"""
+        for _ in range(3):
+            await job_queue.enqueue(org_id, "analyze_pr", {})
+        await job_queue.enqueue_report_job(org_id, "report", {})
+
+        stats = await job_queue.get_queue_stats(org_id)
+        assert stats[QueueType.GATE.value]["pending"] == 3
+        assert stats[QueueType.REPORT.value]["pending"] == 1
+
+        job = await job_queue.fetch_job(QueueType.GATE, "worker-1")
+        stats = await job_queue.get_queue_stats(org_id)
+        assert stats[QueueType.GATE.value]["pending"] == 2
+        assert stats[QueueType.GATE.value]["processing"] == 1
+
+        await job_queue.complete_job(job.id, {})
+        await job_queue.enqueue(org_id, "analyze_pr", {})
+        stats = await job_queue.get_queue_stats(org_id)
+        assert stats[QueueType.GATE.value] == {"scheduled": 0, "pending": 3, "processing": 0}
+
+        job_queue.stats_cache.invalidate()
+        assert await job_queue.get_queue_stats(org_id) == stats
+
+    @pytest.mark.asyncio
+    async def test_stats_for_many_orgs_in_one_query(self, job_queue, storage):
+        """Uncached orgs are loaded with a single grouped count"""
+        orgs = [uuid4() for _ in range(5)]
+        for i, org in enumerate(orgs):
+            for _ in range(i):
+                await job_queue.enqueue(org, "analyze_pr", {})
+
+        calls = 0
+        grouped = storage.count_jobs_grouped
+
+        async def counting(org_ids):
+            nonlocal calls
+            calls += 1
+            return await grouped(org_ids)
+
+        storage.count_jobs_grouped = counting
+        stats = await job_queue.get_queue_stats_many(orgs)
+
+        assert calls == 1
+        assert [stats[org][QueueType.GATE.value]["pending"] for org in orgs] == [0, 1, 2, 3, 4]
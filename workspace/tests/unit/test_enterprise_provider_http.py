@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Enterprise Provider HTTP Client Test Suite
+
+Tests the shared provider HTTP layer, covering:
+- ETag revalidation of repeated reads
+- Retry-After handling on secondary rate limits
+- Proactive throttling from X-RateLimit-* headers
+- Per-host connection limits
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.integrations.provider_http import (
+    HTTPResponse,
+    ProviderHTTPClient,
+    ProviderHTTPError,
+    RateLimitExceededError,
+)
+
+AUTH = {"Authorization": "token abc"}
+REPO_URL = "https://api.github.com/repos/acme/widgets"
+
+
+class ScriptedTransport:
+    """Transport that replays queued responses and records requests"""
+
+    def __init__(self, responses=None, delay: float = 0.0):
+        self.responses = list(responses or [])
+        self.requests: list[tuple[str, str, dict]] = []
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+
+    async def request(self, method, url, data=None, headers=None):
+        self.requests.append((method, url, dict(headers or {})))
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if self.responses:
+                return self.responses.pop(0)
+            return HTTPResponse(status=200, body={"ok": True})
+        finally:
+            self.active -= 1
+
+
+def limits(remaining: int, reset_in: float = 3600) -> dict[str, str]:
+    return {
+        "X-RateLimit-Limit": "5000",
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(int(time.time() + reset_in)),
+    }
+
+
+class TestConditionalRequests:
+    """Tests for ETag caching"""
+
+    @pytest.mark.asyncio
+    async def test_not_modified_returns_cached_body(self):
+        """A 304 serves the cached body and sends If-None-Match"""
+        transport = ScriptedTransport([
+            HTTPResponse(200, {"ETag": '"v1"', **limits(4000)}, {"name": "widgets"}),
+            HTTPResponse(304, limits(4000)),
+        ])
+        client = ProviderHTTPClient(transport=transport)
+
+        first = await client.get(REPO_URL, headers=AUTH)
+        second = await client.get(REPO_URL, headers=AUTH)
+
+        assert first == second == {"name": "widgets"}
+        assert transport.requests[1][2]["If-None-Match"] == '"v1"'
+        assert client.get_stats()["not_modified"] == 1
+
+    @pytest.mark.asyncio
+    async def test_cache_is_scoped_to_credential(self):
+        """Another token never revalidates against a different tenant's entry"""
+        transport = ScriptedTransport([
+            HTTPResponse(200, {"ETag": '"v1"'}, {"name": "widgets"}),
+            HTTPResponse(200, {"ETag": '"v2"'}, {"name": "other"}),
+        ])
+        client = ProviderHTTPClient(transport=transport)
+
+        await client.get(REPO_URL, headers=AUTH)
+        await client.get(REPO_URL, headers={"Authorization": "token other"})
+
+        assert "If-None-Match" not in transport.requests[1][2]
+
+
+class TestRateLimits:
+    """Tests for rate limit scheduling"""
+
+    @pytest.mark.asyncio
+    async def test_honours_retry_after(self):
+        """A secondary-limit 403 waits Retry-After, then retries"""
+        transport = ScriptedTransport([
+            HTTPResponse(403, {"Retry-After": "0.05"}, {"message": "secondary"}),
+            HTTPResponse(201, limits(4000), {"id": 7}),
+        ])
+        client = ProviderHTTPClient(transport=transport)
+
+        start = time.monotonic()
+        result = await client.post(REPO_URL + "/check-runs", data={}, headers=AUTH)
+
+        assert result == {"id": 7}
+        assert time.monotonic() - start >= 0.05
+        assert len(transport.requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_reads_keep_reserve_for_writes(self):
+        """Reads stop at read_reserve; writes may still spend it"""
+        transport = ScriptedTransport([HTTPResponse(200, limits(50, reset_in=3600), {})])
+        client = ProviderHTTPClient(transport=transport, read_reserve=100, pace_threshold=0)
+
+        await client.get(REPO_URL, headers=AUTH)
+
+        with pytest.raises(RateLimitExceededError):
+            await client.get(REPO_URL + "/pulls", headers=AUTH)
+
+        assert await client.post(REPO_URL + "/statuses/abc", data={}, headers=AUTH) == {"ok": True}
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        """A 404 raises immediately"""
+        transport = ScriptedTransport([HTTPResponse(404, {}, {"message": "Not Found"})])
+        client = ProviderHTTPClient(transport=transport)
+
+        with pytest.raises(ProviderHTTPError) as exc:
+            await client.get(REPO_URL, headers=AUTH)
+
+        assert exc.value.status == 404
+        assert len(transport.requests) == 1
+
+
+class TestConnectionPooling:
+    """Tests for per-host connection limits"""
+
+    @pytest.mark.asyncio
+    async def test_limits_concurrency_per_host(self):
+        """No more than max_connections_per_host requests are in flight"""
+        transport = ScriptedTransport(delay=0.01)
+        client = ProviderHTTPClient(transport=transport, max_connections_per_host=3)
+
+        await asyncio.gather(*(
+            client.post(f"{REPO_URL}/statuses/{i}", data={}, headers=AUTH)
+            for i in range(12)
+        ))
+
+        assert transport.peak == 3
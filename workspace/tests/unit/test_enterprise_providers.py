@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Enterprise Git Provider Manager Test Suite
+
+Tests installation token management, covering:
+- Token caching between calls
+- Single-flight refresh under concurrency
+- Early background refresh before expiry
+- JWT reuse within its validity window
+"""
+
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.integrations.providers import GitProviderManager, ProviderAuth
+
+
+class InMemoryProviderRepository:
+    """Provider repository keeping auth records in memory"""
+
+    def __init__(self):
+        self.auths: dict[str, ProviderAuth] = {}
+        self.reads = 0
+
+    async def get_auth_by_installation(self, org_id, installation_id):
+        self.reads += 1
+        return self.auths.get(installation_id)
+
+    async def update_auth(self, auth):
+        self.auths[auth.installation_id] = auth
+        return auth
+
+
+class PlainSecretsManager:
+    """Secrets manager that stores values unencrypted"""
+
+    async def encrypt(self, value):
+        return f"enc:{value}"
+
+    async def decrypt(self, encrypted):
+        return encrypted.removeprefix("enc:")
+
+
+class TokenIssuingHTTPClient:
+    """Fake GitHub API issuing numbered installation tokens"""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.issued = 0
+
+    async def post(self, url, data=None, headers=None):
+        await asyncio.sleep(self.delay)
+        self.issued += 1
+        expires = datetime.utcnow() + timedelta(hours=1)
+        return {"token": f"ghs_{self.issued}", "expires_at": expires.isoformat() + "Z"}
+
+
+@pytest.fixture
+def repository():
+    """Create repository with one installation whose token has expired"""
+    repo = InMemoryProviderRepository()
+    repo.auths["42"] = ProviderAuth(
+        installation_id="42",
+        access_token_encrypted="enc:ghs_old",
+        token_expires_at=datetime.utcnow() - timedelta(minutes=1),
+    )
+    return repo
+
+
+@pytest.fixture
+def manager(repository):
+    """Create provider manager with a cached JWT"""
+    manager = GitProviderManager(
+        repository=repository,
+        secrets_manager=PlainSecretsManager(),
+        http_client=TokenIssuingHTTPClient(),
+        github_app_id="1",
+        github_app_private_key="key",
+    )
+    manager._jwt = ("jwt-token", time.time() + 600)
+    return manager
+
+
+class TestInstallationTokens:
+    """Tests for installation token cache"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_refresh(self, manager):
+        """An expired token is refreshed once for all concurrent callers"""
+        org_id = uuid4()
+
+        tokens = await asyncio.gather(*(
+            manager.get_installation_token(org_id, "42") for _ in range(20)
+        ))
+
+        assert set(tokens) == {"ghs_1"}
+        assert manager.http_client.issued == 1
+
+    @pytest.mark.asyncio
+    async def test_cached_token_skips_repository(self, manager, repository):
+        """A valid cached token is returned without storage reads"""
+        org_id = uuid4()
+        await manager.get_installation_token(org_id, "42")
+        reads = repository.reads
+
+        assert await manager.get_installation_token(org_id, "42") == "ghs_1"
+        assert repository.reads == reads
+
+    @pytest.mark.asyncio
+    async def test_early_refresh_returns_current_token(self, manager):
+        """Inside the refresh-ahead window the old token is served while refreshing"""
+        org_id = uuid4()
+        manager._token_cache[(org_id, "42")] = ("ghs_cached", time.time() + 400)
+
+        assert await manager.get_installation_token(org_id, "42") == "ghs_cached"
+        await asyncio.sleep(0.05)
+
+        assert await manager.get_installation_token(org_id, "42") == "ghs_1"
+        assert manager.http_client.issued == 1
+
+    def test_jwt_reused_within_validity(self, manager):
+        """A JWT with more than a minute left is not re-signed"""
+        assert manager._generate_github_jwt() == "jwt-token"
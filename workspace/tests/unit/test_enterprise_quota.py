@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""
+Enterprise Resource Quota Test Suite
+
+Tests the resource quota manager, covering:
+- Atomic check-and-consume under concurrent load
+- Write-behind of usage to quota storage
+- Burst limits and config cache invalidation
+- Concurrent-run slot leases shared through storage
+"""
+
+import asyncio
+import sys
+from datetime import datetime
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.execution.quota import (
+    OrgQuotaConfig,
+    QuotaExceededError,
+    ResourceQuotaManager,
+    ResourceType,
+)
+
+
+class InMemoryQuotaStorage:
+    """Quota storage that yields to the event loop like a remote store"""
+
+    def __init__(self):
+        self.usage = {}
+        self.leases = {}  # org_id -> {lease_id: expires_at}
+        self.calls = 0
+
+    async def get_usage(self, org_id, resource_type, period, period_start):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.usage.get((org_id, resource_type, period, period_start), 0)
+
+    async def increment_usage(self, org_id, resource_type, period, period_start, amount):
+        self.calls += 1
+        await asyncio.sleep(0)
+        key = (org_id, resource_type, period, period_start)
+        self.usage[key] = self.usage.get(key, 0) + amount
+        return self.usage[key]
+
+    def _live(self, org_id):
+        now = datetime.utcnow()
+        return {k: v for k, v in self.leases.get(org_id, {}).items() if v > now}
+
+    async def get_concurrent_count(self, org_id):
+        await asyncio.sleep(0)
+        return len(self._live(org_id))
+
+    async def try_acquire_lease(self, org_id, lease_id, limit, expires_at):
+        await asyncio.sleep(0)
+        if len(self._live(org_id)) >= limit:
+            return False
+        self.leases.setdefault(org_id, {})[lease_id] = expires_at
+        return True
+
+    async def renew_lease(self, org_id, lease_id, expires_at):
+        await asyncio.sleep(0)
+        if lease_id not in self._live(org_id):
+            return False
+        self.leases[org_id][lease_id] = expires_at
+        return True
+
+    async def release_lease(self, org_id, lease_id):
+        await asyncio.sleep(0)
+        self.leases.get(org_id, {}).pop(lease_id, None)
+
+    async def expire_leases(self, org_id):
+        await asyncio.sleep(0)
+        live = self._live(org_id)
+        expired = len(self.leases.get(org_id, {})) - len(live)
+        self.leases[org_id] = live
+        return expired
+
+
+class StaticConfigProvider:
+    """Config provider returning a mutable per-test config"""
+
+    def __init__(self, **overrides):
+        self.overrides = overrides
+        self.calls = 0
+
+    async def get_config(self, org_id):
+        self.calls += 1
+        return OrgQuotaConfig(org_id=org_id, **self.overrides)
+
+
+@pytest.fixture
+def storage():
+    """In-memory quota storage"""
+    return InMemoryQuotaStorage()
+
+
+@pytest.fixture
+def config_provider():
+    """Config provider with a small analysis quota"""
+    return StaticConfigProvider(max_analysis_per_month=20, api_calls_per_minute=5)
+
+
+@pytest.fixture
+def quota_manager(storage, config_provider):
+    """Quota manager with a short write-behind interval"""
+    return ResourceQuotaManager(
+        storage=storage,
+        config_provider=config_provider,
+        flush_interval_seconds=0.01,
+    )
+
+
+@pytest.fixture
+def org_id():
+    """Test organization ID"""
+    return uuid4()
+
+
+class TestCheckAndConsume:
+    """Tests for atomic quota consumption"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_storm_never_overshoots(self, quota_manager, storage, org_id):
+        """Concurrent callers get exactly the limit"""
+        async def attempt():
+            try:
+                await quota_manager.check_and_consume(org_id, ResourceType.ANALYSIS_COUNT)
+                return True
+            except QuotaExceededError:
+                return False
+
+        results = await asyncio.gather(*[attempt() for _ in range(100)])
+        await quota_manager.close()
+
+        assert sum(results) == 20
+        assert list(storage.usage.values()) == [20]
+
+    @pytest.mark.asyncio
+    async def test_usage_is_written_behind(self, quota_manager, storage, org_id):
+        """Consumption does not touch storage until the flush"""
+        for _ in range(5):
+            await quota_manager.check_and_consume(org_id, ResourceType.ANALYSIS_COUNT)
+
+        assert storage.calls == 1  # initial load only
+        assert storage.usage == {}
+
+        await quota_manager.flush()
+
+        assert list(storage.usage.values()) == [5]
+        usage = await quota_manager.get_usage(org_id, ResourceType.ANALYSIS_COUNT)
+        assert usage.current == 5
+        await quota_manager.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_node_sees_other_nodes_usage(self, storage, config_provider, org_id):
+        """A node that only reads picks up usage flushed by another node"""
+        node_a, node_b = [
+            ResourceQuotaManager(
+                storage=storage,
+                config_provider=config_provider,
+                flush_interval_seconds=0.01,
+            )
+            for _ in range(2)
+        ]
+        usage = await node_b.get_usage(org_id, ResourceType.ANALYSIS_COUNT)
+        assert usage.current == 0
+
+        for _ in range(15):
+            await node_a.check_and_consume(org_id, ResourceType.ANALYSIS_COUNT)
+        await node_a.flush()
+        await asyncio.sleep(0.05)
+
+        usage = await node_b.get_usage(org_id, ResourceType.ANALYSIS_COUNT)
+        assert usage.current == 15
+        with pytest.raises(QuotaExceededError):
+            await node_b.check_and_consume(org_id, ResourceType.ANALYSIS_COUNT, amount=6)
+
+        await node_a.close()
+        await node_b.close()
+
+    @pytest.mark.asyncio
+    async def test_burst_limit(self, quota_manager, org_id):
+        """API calls are limited per minute within the hourly quota"""
+        for _ in range(5):
+            await quota_manager.check_and_consume(org_id, ResourceType.API_CALLS)
+
+        with pytest.raises(QuotaExceededError) as exc_info:
+            await quota_manager.check_and_consume(org_id, ResourceType.API_CALLS)
+
+        assert exc_info.value.limit == 5
+        await quota_manager.close()
+
+    @pytest.mark.asyncio
+    async def test_invalidate_config(self, quota_manager, config_provider, org_id):
+        """Invalidated configs are reloaded on next use"""
+        await quota_manager.get_usage(org_id, ResourceType.ANALYSIS_COUNT)
+        await quota_manager.get_usage(org_id, ResourceType.ANALYSIS_COUNT)
+        assert config_provider.calls == 1
+
+        config_provider.overrides["max_analysis_per_month"] = 50
+        quota_manager.invalidate_config(org_id)
+
+        usage = await quota_manager.get_usage(org_id, ResourceType.ANALYSIS_COUNT)
+        assert usage.limit == 50
+        await quota_manager.close()
+
+
+class TestConcurrentSlots:
+    """Tests for leased concurrent-run slots"""
+
+    @pytest.mark.asyncio
+    async def test_waiters_are_served_fifo(self, quota_manager, org_id):
+        """Queued acquirers get slots in arrival order"""
+        first = await quota_manager.acquire_concurrent_slot(org_id, holder="a")
+        second = await quota_manager.acquire_concurrent_slot(org_id, holder="b")
+
+        order = []
+
+        async def wait_for_slot(holder):
+            lease = await quota_manager.acquire_concurrent_slot(org_id, holder=holder)
+            order.append(lease.holder)
+
+        waiters = [asyncio.create_task(wait_for_slot(h)) for h in ("c", "d")]
+        await asyncio.sleep(0)
+        assert quota_manager.slots.waiting(org_id) == 2
+
+        await quota_manager.release_concurrent_slot(org_id, second)
+        await quota_manager.release_concurrent_slot(org_id, first)
+        await asyncio.gather(*waiters)
+
+        assert order == ["c", "d"]
+        await quota_manager.close()
+
+    @pytest.mark.asyncio
+    async def test_timeout_raises(self, quota_manager, org_id):
+        """A bounded wait fails with QuotaExceededError"""
+        for _ in range(2):
+            await quota_manager.acquire_concurrent_slot(org_id)
+
+        with pytest.raises(QuotaExceededError):
+            await quota_manager.acquire_concurrent_slot(org_id, timeout=0.01)
+
+        assert quota_manager.slots.waiting(org_id) == 0
+        await quota_manager.close()
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_reclaimed(self, quota_manager, storage, org_id):
+        """A crashed holder's slot goes to the next waiter"""
+        quota_manager.slots.lease_seconds = 0.01
+        await quota_manager.acquire_concurrent_slot(org_id, holder="crashed")
+        await quota_manager.acquire_concurrent_slot(org_id, holder="crashed")
+
+        quota_manager.slots.lease_seconds = 300
+        waiter = asyncio.create_task(quota_manager.acquire_concurrent_slot(org_id, holder="next"))
+        await asyncio.sleep(0.02)
+
+        assert await quota_manager.slots.reap_expired() == 2
+        lease = await waiter
+        assert lease.holder == "next"
+
+        await quota_manager.slots.reconcile()
+        assert list(storage.leases[org_id]) == [lease.id]
+        assert await storage.get_concurrent_count(org_id) == 1
+        await quota_manager.close()
+
+    @pytest.mark.asyncio
+    async def test_limit_holds_across_managers(self, storage, config_provider, org_id):
+        """Managers sharing storage share the org's slots"""
+        managers = [
+            ResourceQuotaManager(storage=storage, config_provider=config_provider)
+            for _ in range(2)
+        ]
+        for manager in managers:
+            manager.slots.poll_interval_seconds = 0.01
+
+        first = await managers[0].acquire_concurrent_slot(org_id, holder="a")
+        await managers[1].acquire_concurrent_slot(org_id, holder="b")
+
+        with pytest.raises(QuotaExceededError):
+            await managers[1].acquire_concurrent_slot(org_id, timeout=0.05)
+        with pytest.raises(QuotaExceededError):
+            await managers[1].check_concurrent_limit(org_id)
+
+        waiter = asyncio.create_task(managers[1].acquire_concurrent_slot(org_id, holder="c"))
+        await asyncio.sleep(0.02)
+        assert not waiter.done()
+
+        await managers[0].release_concurrent_slot(org_id, first)
+        lease = await asyncio.wait_for(waiter, timeout=1)
+
+        assert lease.holder == "c"
+        assert await storage.get_concurrent_count(org_id) == 2
+        for manager in managers:
+            await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_release_frees_only_the_given_lease(self, quota_manager, storage, org_id):
+        """Releasing a lease never frees another holder's slot"""
+        first = await quota_manager.acquire_concurrent_slot(org_id, holder="a")
+        second = await quota_manager.acquire_concurrent_slot(org_id, holder="b")
+
+        await quota_manager.release_concurrent_slot(org_id, second)
+        assert list(storage.leases[org_id]) == [first.id]
+
+        with pytest.raises(ValueError):
+            await quota_manager.release_concurrent_slot(uuid4(), first)
+        assert list(storage.leases[org_id]) == [first.id]
+        await quota_manager.close()
+
+    @pytest.mark.asyncio
+    async def test_context_manager_releases(self, quota_manager, org_id):
+        """concurrent_slot releases its lease on exit"""
+        async with quota_manager.concurrent_slot(org_id, holder="run") as lease:
+            assert quota_manager.slots.in_use(org_id) == 1
+            assert not lease.is_expired
+
+        assert quota_manager.slots.in_use(org_id) == 0
+        await quota_manager.close()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Enterprise Object Storage Test Suite
+
+Tests streaming uploads to object storage, covering:
+- Multipart upload of async streams and file objects
+- Bounded part concurrency
+- Content-addressed deduplication
+- Local filesystem backend round-trips
+- Bulk deletion and indexed expiry cleanup
+"""
+
+import asyncio
+import hashlib
+import io
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.data.storage import (
+    LocalStorageBackend,
+    ObjectStorage,
+    StorageLocation,
+    StorageObject,
+)
+from enterprise.data.storage_metadata import SQLiteObjectMetadataStore
+
+
+class CountingBackend(LocalStorageBackend):
+    """Local backend that records part concurrency and puts"""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.active_parts = 0
+        self.peak_parts = 0
+        self.puts = 0
+        self.bulk_deletes: list[int] = []
+
+    async def put_object(self, *args, **kwargs):
+        self.puts += 1
+        return await super().put_object(*args, **kwargs)
+
+    async def delete_objects(self, bucket, keys):
+        self.bulk_deletes.append(len(keys))
+        return await super().delete_objects(bucket, keys)
+
+    async def upload_part(self, *args, **kwargs):
+        self.active_parts += 1
+        self.peak_parts = max(self.peak_parts, self.active_parts)
+        try:
+            await asyncio.sleep(0.005)
+            return await super().upload_part(*args, **kwargs)
+        finally:
+            self.active_parts -= 1
+
+
+@pytest.fixture
+def backend(tmp_path):
+    """Create counting local backend"""
+    return CountingBackend(tmp_path)
+
+
+@pytest.fixture
+def storage(backend):
+    """Create object storage with small parts"""
+    return ObjectStorage(backend=backend, part_size=1024, max_concurrent_parts=2)
+
+
+async def chunks(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+class TestStreamingUpload:
+    """Tests for streaming multipart upload"""
+
+    @pytest.mark.asyncio
+    async def test_async_stream_round_trips(self, storage, backend):
+        """An async stream is uploaded in parts and hashed incrementally"""
+        data = bytes(range(256)) * 40  # 10 KiB -> 10 parts
+        obj = await storage.store_artifact_stream(
+            uuid4(), uuid4(), "results.sarif", chunks(data, 700),
+        )
+
+        assert obj.size_bytes == len(data)
+        assert obj.checksum == hashlib.sha256(data).hexdigest()
+        assert await storage.get_object(obj.location) == data
+        assert backend.puts == 0
+        assert backend.peak_parts <= 2
+
+    @pytest.mark.asyncio
+    async def test_file_object_round_trips(self, storage):
+        """A file object is read part by part"""
+        data = b"log line\n" * 500
+        obj = await storage.store_report_stream(uuid4(), "build.log", io.BytesIO(data))
+
+        assert await storage.get_object(obj.location) == data
+
+    @pytest.mark.asyncio
+    async def test_failed_part_aborts_upload(self, storage, backend, tmp_path):
+        """A failing part aborts the multipart upload and leaves nothing behind"""
+        async def broken():
+            yield b"x" * 2048
+            raise OSError("disk went away")
+
+        with pytest.raises(OSError):
+            await storage.store_artifact_stream(uuid4(), uuid4(), "a.bin", broken())
+
+        assert not any((tmp_path / ".multipart").iterdir())
+
+
+class TestDeduplication:
+    """Tests for content-addressed deduplication"""
+
+    @pytest.mark.asyncio
+    async def test_identical_artifacts_stored_once(self, storage, backend):
+        """Small duplicates skip upload; large duplicates share one blob"""
+        storage.dedup = True
+        org_id = uuid4()
+
+        small_a = await storage.store_artifact(org_id, uuid4(), "s.json", b"{}")
+        small_b = await storage.store_artifact(org_id, uuid4(), "s.json", b"{}")
+        assert small_a.location == small_b.location
+        assert backend.puts == 1
+
+        data = b"z" * 5000
+        large_a = await storage.store_artifact_stream(org_id, uuid4(), "l.bin", chunks(data, 999))
+        large_b = await storage.store_artifact_stream(org_id, uuid4(), "l.bin", chunks(data, 999))
+        assert large_a.location == large_b.location
+        assert large_a.content_addressed
+
+        keys = [item["Key"] for item in await backend.list_objects(storage.default_bucket)]
+        assert sorted(keys) == sorted({small_a.location.key, large_a.location.key})
+
+    @pytest.mark.asyncio
+    async def test_local_backend_rejects_escaping_keys(self, backend):
+        """Keys cannot escape the bucket directory"""
+        with pytest.raises(ValueError):
+            await backend.put_object("bucket", "../../etc/passwd", b"x")
+
+    @pytest.mark.asyncio
+    async def test_local_backend_records_storage_class(self, backend):
+        """The storage class survives put, multipart upload and copy"""
+        await backend.put_object("bucket", "put", b"x", storage_class="GLACIER")
+        upload_id = await backend.create_multipart_upload("bucket", "mpu", storage_class="STANDARD_IA")
+        etag = await backend.upload_part("bucket", "mpu", upload_id, 1, b"y")
+        await backend.complete_multipart_upload("bucket", "mpu", upload_id, [{"PartNumber": 1, "ETag": etag}])
+        await backend.copy_object("bucket", "put", "bucket", "copy")
+
+        assert (await backend.head_object("bucket", "put"))["StorageClass"] == "GLACIER"
+        assert (await backend.head_object("bucket", "mpu"))["StorageClass"] == "STANDARD_IA"
+        assert (await backend.head_object("bucket", "copy"))["StorageClass"] == "GLACIER"
+
+
+class TestExpiryCleanup:
+    """Tests for bulk deletion and indexed expiry cleanup"""
+
+    @pytest.mark.asyncio
+    async def test_cleanup_walks_expiry_index_in_bulk(self, backend):
+        """Expired objects are deleted in batches of 1000; live ones are kept"""
+        metadata_store = SQLiteObjectMetadataStore()
+        storage = ObjectStorage(
+            backend=backend,
+            metadata_store=metadata_store,
+            cleanup_max_objects_per_second=0,
+        )
+        org_id = uuid4()
+        now = datetime.utcnow()
+
+        for i in range(2100):
+            await metadata_store.save(StorageObject(
+                location=StorageLocation(bucket=storage.default_bucket, key=f"k/{i}"),
+                org_id=org_id,
+                expires_at=now - timedelta(minutes=i % 50 + 1),
+            ))
+        live = await metadata_store.save(StorageObject(
+            location=StorageLocation(bucket=storage.default_bucket, key="live"),
+            org_id=org_id,
+            expires_at=now + timedelta(days=1),
+        ))
+
+        assert await storage.cleanup_expired(dry_run=True) == 2100
+        assert backend.bulk_deletes == []
+
+        progress = storage.start_cleanup()
+        await storage.wait_for_cleanup()
+
+        assert progress.done and progress.deleted == 2100 and progress.failed == 0
+        assert backend.bulk_deletes == [1000, 1000, 100]
+        assert await metadata_store.list_by_org(org_id) == [live]
+
+    @pytest.mark.asyncio
+    async def test_shared_blob_survives_until_last_reference(self, backend):
+        """Deleting one run keeps a deduplicated blob other runs still use"""
+        storage = ObjectStorage(
+            backend=backend,
+            metadata_store=SQLiteObjectMetadataStore(),
+            dedup=True,
+        )
+        org_id = uuid4()
+        run_a, run_b = uuid4(), uuid4()
+        obj = await storage.store_artifact(org_id, run_a, "a.json", b"{}")
+        await storage.store_artifact(org_id, run_b, "a.json", b"{}")
+
+        assert await storage.delete_run_artifacts(org_id, run_a) == 1
+        assert await backend.head_object(obj.location.bucket, obj.location.key) is not None
+
+        assert await storage.delete_run_artifacts(org_id, run_b) == 1
+        assert await backend.head_object(obj.location.bucket, obj.location.key) is None
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Enterprise Tracing Test Suite
+
+Tests the tracer and its batch exporter, covering:
+- Parent span restoration
+- Background batch export and flush on shutdown
+- Drop accounting when the buffer is full
+- Head-based and tail-based sampling
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.data.tracing import (
+    BatchSpanExporter,
+    SamplingMode,
+    Span,
+    SpanStatus,
+    Tracer,
+)
+
+
+class RecordingBackend:
+    """Tracing backend that records exported batches"""
+
+    def __init__(self):
+        self.batches: list[list[Span]] = []
+
+    async def export_span(self, span: Span) -> None:
+        self.batches.append([span])
+
+    async def export_spans(self, spans: list[Span]) -> None:
+        self.batches.append(list(spans))
+
+    @property
+    def spans(self) -> list[Span]:
+        return [span for batch in self.batches for span in batch]
+
+
+@pytest.fixture
+def backend():
+    """Recording tracing backend"""
+    return RecordingBackend()
+
+
+class TestSpanContext:
+    """Tests for current span handling"""
+
+    @pytest.mark.asyncio
+    async def test_end_span_restores_parent(self, backend):
+        """Ending a child makes its parent current again"""
+        tracer = Tracer(backend=backend)
+
+        async with tracer.trace("parent") as parent:
+            async with tracer.trace("child") as child:
+                assert tracer.get_current_span() is child
+                assert child.context.trace_id == parent.context.trace_id
+            assert tracer.get_current_span() is parent
+
+        assert tracer.get_current_span() is None
+        await tracer.shutdown()
+
+
+class TestBatchSpanExporter:
+    """Tests for BatchSpanExporter"""
+
+    @pytest.mark.asyncio
+    async def test_full_batch_exports_in_background(self, backend):
+        """A full batch is exported without the caller awaiting it"""
+        exporter = BatchSpanExporter(
+            backend=backend, max_export_batch_size=10, schedule_delay_seconds=60,
+        )
+
+        for i in range(10):
+            exporter.submit(Span(name=f"s{i}").end())
+        assert backend.batches == []
+
+        await asyncio.sleep(0.01)
+
+        assert len(backend.spans) == 10
+        await exporter.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_flushes_partial_batch(self, backend):
+        """Spans below the batch size are exported on shutdown"""
+        tracer = Tracer(backend=backend, schedule_delay_seconds=60)
+
+        for i in range(3):
+            await tracer.end_span(tracer.start_span(f"s{i}"))
+        await tracer.shutdown()
+
+        assert len(backend.spans) == 3
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_counts_drops(self, backend):
+        """Overflowing the ring buffer drops the oldest spans"""
+        exporter = BatchSpanExporter(
+            backend=backend, max_queue_size=5, max_export_batch_size=100,
+            schedule_delay_seconds=60,
+        )
+
+        for i in range(8):
+            exporter.submit(Span(name=f"s{i}").end())
+        await exporter.shutdown()
+
+        assert exporter.dropped_spans == 3
+        assert [s.name for s in backend.spans] == ["s3", "s4", "s5", "s6", "s7"]
+
+
+class TestSampling:
+    """Tests for head and tail sampling"""
+
+    @pytest.mark.asyncio
+    async def test_head_sampling_follows_root_decision(self, backend):
+        """Children of an unsampled root are not exported"""
+        tracer = Tracer(backend=backend, sample_rate=0.0)
+
+        async with tracer.trace("root") as root:
+            async with tracer.trace("child"):
+                pass
+        await tracer.shutdown()
+
+        assert not root.context.is_sampled
+        assert backend.spans == []
+
+    @pytest.mark.asyncio
+    async def test_tail_sampling_keeps_error_traces(self, backend):
+        """Tail sampling exports whole traces that contain an error"""
+        tracer = Tracer(backend=backend, sample_rate=0.0, sampling_mode=SamplingMode.TAIL)
+
+        async with tracer.trace("ok-root"):
+            async with tracer.trace("ok-child"):
+                pass
+
+        with pytest.raises(ValueError):
+            async with tracer.trace("bad-root"):
+                async with tracer.trace("bad-child") as child:
+                    raise ValueError("boom")
+        await tracer.shutdown()
+
+        assert child.status == SpanStatus.ERROR
+        assert sorted(s.name for s in backend.spans) == ["bad-child", "bad-root"]
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Enterprise Webhook Receiver Test Suite
+
+Tests batched webhook ingestion, covering:
+- Signature verification per delivery
+- Replay detection within and across batches
+- Batched publishing of accepted events
+"""
+
+import hashlib
+import hmac
+import json
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.integrations.webhook import (
+    WebhookDelivery,
+    WebhookEvent,
+    WebhookEventType,
+    WebhookReceiver,
+    WebhookValidationError,
+)
+
+SECRET = "s3cret"
+
+
+class RecordingPublisher:
+    """Event publisher that records batches"""
+
+    def __init__(self):
+        self.batches: list[list[WebhookEvent]] = []
+
+    async def publish(self, event: WebhookEvent) -> None:
+        self.batches.append([event])
+
+    async def publish_many(self, events: list[WebhookEvent]) -> None:
+        self.batches.append(list(events))
+
+
+def github_delivery(delivery_id=None, secret=SECRET, body=None):
+    """Build a signed GitHub push delivery"""
+    if body is None:
+        body = json.dumps({
+            "ref": "refs/heads/main",
+            "after": "abc123",
+            "before": "000000",
+            "repository": {"full_name": "acme/widgets", "id": 1},
+            "sender": {"login": "octocat", "id": 2},
+        }).encode()
+    signature = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return WebhookDelivery(
+        provider="github",
+        headers={
+            "X-GitHub-Event": "push",
+            "X-GitHub-Delivery": delivery_id or str(uuid4()),
+            "X-Hub-Signature-256": f"sha256={signature}",
+        },
+        body=body,
+        secret=SECRET,
+    )
+
+
+@pytest.fixture
+def publisher():
+    """Recording event publisher"""
+    return RecordingPublisher()
+
+
+@pytest.fixture
+def receiver(publisher):
+    """Webhook receiver with small verification chunks"""
+    receiver = WebhookReceiver(event_publisher=publisher, verify_chunk_size=4)
+    yield receiver
+    receiver.close()
+
+
+class TestReceiveBatch:
+    """Tests for WebhookReceiver.receive_batch"""
+
+    @pytest.mark.asyncio
+    async def test_valid_batch_is_published_once(self, receiver, publisher):
+        """Accepted events are normalized and published in one batch"""
+        deliveries = [github_delivery() for _ in range(10)]
+
+        results = await receiver.receive_batch(deliveries)
+
+        assert all(isinstance(r, WebhookEvent) for r in results)
+        assert all(r.event_type == WebhookEventType.PUSH for r in results)
+        assert [r.delivery_id for r in results] == [
+            d.headers["X-GitHub-Delivery"] for d in deliveries
+        ]
+        assert len(publisher.batches) == 1
+        assert len(publisher.batches[0]) == 10
+
+    @pytest.mark.asyncio
+    async def test_rejections_are_per_delivery(self, receiver, publisher):
+        """Bad signatures, replays and bad JSON reject only their delivery"""
+        replayed = github_delivery()
+        deliveries = [
+            github_delivery(),
+            github_delivery(secret="wrong"),
+            replayed,
+            github_delivery(delivery_id=replayed.headers["X-GitHub-Delivery"]),
+            github_delivery(body=b"{not json"),
+        ]
+
+        results = await receiver.receive_batch(deliveries)
+
+        assert isinstance(results[0], WebhookEvent)
+        assert "signature" in str(results[1])
+        assert isinstance(results[2], WebhookEvent)
+        assert "Replay" in str(results[3])
+        assert "Invalid JSON" in str(results[4])
+        assert len(publisher.batches[0]) == 2
+
+    @pytest.mark.asyncio
+    async def test_malformed_payload_rejects_only_its_delivery(self, receiver, publisher):
+        """A signed non-object body does not fail the rest of the batch"""
+        deliveries = [github_delivery(), github_delivery(body=b"[1, 2]"), github_delivery()]
+
+        results = await receiver.receive_batch(deliveries)
+
+        assert isinstance(results[0], WebhookEvent)
+        assert isinstance(results[1], WebhookValidationError)
+        assert isinstance(results[2], WebhookEvent)
+        assert len(publisher.batches[0]) == 2
+
+    @pytest.mark.asyncio
+    async def test_replay_across_serial_and_batch_paths(self, receiver):
+        """A delivery received serially is a replay in a later batch"""
+        delivery = github_delivery()
+        await receiver.receive(delivery.provider, delivery.headers, delivery.body, SECRET)
+
+        results = await receiver.receive_batch([delivery])
+
+        assert isinstance(results[0], WebhookValidationError)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Enterprise Webhook Store Test Suite
+
+Tests the in-process RateLimiter and NonceStore implementations, covering:
+- GCRA burst and refill behaviour
+- Nonce replay detection, TTL expiry and LRU eviction
+- Shared-memory state across worker processes
+"""
+
+import asyncio
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.integrations.webhook_stores import (
+    GCRARateLimiter,
+    LRUNonceStore,
+    SharedMemoryNonceStore,
+    SharedMemoryRateLimiter,
+)
+
+
+@pytest.fixture
+def shared_name():
+    """Unique shared-memory segment name"""
+    return f"mno-test-{uuid4().hex[:12]}"
+
+
+@pytest.fixture
+def shared_nonces(shared_name):
+    """Shared-memory nonce store, unlinked after the test"""
+    store = SharedMemoryNonceStore(name=shared_name, slots=4096)
+    yield store
+    store.unlink()
+    store.close()
+
+
+def _claim_nonces(name, nonces, results):
+    """Worker process: claim nonces from a shared store"""
+    store = SharedMemoryNonceStore(name=name)
+    fresh = asyncio.run(store.check_and_store_many(nonces))
+    results.put(sum(fresh))
+    store.close()
+
+
+class TestGCRARateLimiter:
+    """Tests for GCRARateLimiter"""
+
+    @pytest.mark.asyncio
+    async def test_allows_burst_up_to_limit(self):
+        """A full window's worth is allowed at once, then denied"""
+        limiter = GCRARateLimiter()
+
+        results = await limiter.check_rate_limit_many(["org"] * 6, limit=5, window_seconds=60)
+
+        assert [allowed for allowed, _ in results] == [True] * 5 + [False]
+        assert [remaining for _, remaining in results[:5]] == [4, 3, 2, 1, 0]
+
+    @pytest.mark.asyncio
+    async def test_refills_over_time(self):
+        """Capacity returns at limit/window per second"""
+        limiter = GCRARateLimiter()
+        for _ in range(10):
+            await limiter.check_rate_limit("org", limit=10, window_seconds=1)
+
+        assert not (await limiter.check_rate_limit("org", limit=10, window_seconds=1))[0]
+        time.sleep(0.11)
+        assert (await limiter.check_rate_limit("org", limit=10, window_seconds=1))[0]
+
+
+class TestLRUNonceStore:
+    """Tests for LRUNonceStore"""
+
+    @pytest.mark.asyncio
+    async def test_replay_within_batch_and_across_calls(self):
+        """A nonce is new only the first time it is seen"""
+        store = LRUNonceStore()
+
+        assert await store.check_and_store_many(["a", "b", "a"]) == [True, True, False]
+        assert not await store.check_and_store("b")
+
+    @pytest.mark.asyncio
+    async def test_expired_nonces_are_new_again(self):
+        """Expired nonces are dropped and may be stored again"""
+        store = LRUNonceStore()
+        await store.check_and_store("a", ttl_seconds=0)
+
+        assert await store.cleanup_expired() == 1
+        assert await store.check_and_store("a")
+
+    @pytest.mark.asyncio
+    async def test_evicts_least_recent(self):
+        """At capacity the least recently seen nonce is evicted"""
+        store = LRUNonceStore(max_entries=2)
+        await store.check_and_store_many(["a", "b"])
+        await store.check_and_store("a")  # refresh a
+        await store.check_and_store("c")
+
+        assert store.evictions == 1
+        assert await store.check_and_store("b")
+
+
+class TestSharedMemoryStores:
+    """Tests for the shared-memory stores"""
+
+    @pytest.mark.asyncio
+    async def test_nonce_replay_across_instances(self, shared_nonces, shared_name):
+        """A second attachment sees nonces stored by the first"""
+        other = SharedMemoryNonceStore(name=shared_name)
+
+        assert await shared_nonces.check_and_store("delivery-1")
+        assert not await other.check_and_store("delivery-1")
+        other.close()
+
+    def test_nonces_shared_across_processes(self, shared_nonces, shared_name):
+        """Concurrent processes claim each nonce exactly once"""
+        nonces = [f"delivery-{i}" for i in range(500)]
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+        workers = [
+            ctx.Process(target=_claim_nonces, args=(shared_name, nonces, results))
+            for _ in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(timeout=30)
+
+        assert sum(results.get() for _ in workers) == len(nonces)
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_shared_across_instances(self, shared_name):
+        """Limits apply across attachments"""
+        first = SharedMemoryRateLimiter(name=shared_name, slots=1024)
+        second = SharedMemoryRateLimiter(name=shared_name)
+        try:
+            await first.check_rate_limit_many(["org"] * 3, limit=5, window_seconds=60)
+            results = await second.check_rate_limit_many(["org"] * 3, limit=5, window_seconds=60)
+
+            assert [allowed for allowed, _ in results] == [True, True, False]
+        finally:
+            second.close()
+            first.unlink()
+            first.close()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_compacts(self, shared_nonces):
+        """Expired entries are removed by cleanup"""
+        await shared_nonces.check_and_store_many(["a", "b"], ttl_seconds=0)
+        await shared_nonces.check_and_store("c", ttl_seconds=300)
+
+        assert await shared_nonces.cleanup_expired() == 2
+        assert not await shared_nonces.check_and_store("c")
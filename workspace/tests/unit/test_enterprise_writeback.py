@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Enterprise Write-back Queue Test Suite
+
+Tests coalesced write-back to Git providers, covering:
+- Merging superseded check run updates
+- Chunking annotations at the API limit
+- Deduplicating comment edits
+- GateWriteback routing through the queue
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+from uuid import uuid4
+
+import pytest
+
+# Add src to path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root / 'src'))
+
+from enterprise.integrations.writeback import (
+    CheckRunConclusion,
+    CheckRunOutput,
+    CheckRunStatus,
+    CheckRunWriter,
+    CommentWriter,
+    GateWriteback,
+    StatusWriter,
+    WritebackQueue,
+)
+
+REPO = "acme/widgets"
+SHA = "abc123def456"
+
+
+class RecordingHTTPClient:
+    """HTTP client that records every call"""
+
+    def __init__(self):
+        self.calls: list[tuple[str, str, dict]] = []
+
+    async def post(self, url, data=None, headers=None):
+        self.calls.append(("post", url, data))
+        return {"id": len(self.calls), "html_url": url}
+
+    async def patch(self, url, data=None, headers=None):
+        self.calls.append(("patch", url, data))
+        return {"id": len(self.calls), "html_url": url}
+
+
+class StaticTokenProvider:
+    """Token provider returning a fixed token"""
+
+    async def get_token(self, org_id, installation_id):
+        return "token"
+
+
+@pytest.fixture
+def http_client():
+    """Create recording HTTP client"""
+    return RecordingHTTPClient()
+
+
+@pytest.fixture
+def queue(http_client):
+    """Create write-back queue with a short debounce"""
+    tokens = StaticTokenProvider()
+    return WritebackQueue(
+        check_run_writer=CheckRunWriter(http_client=http_client, token_provider=tokens),
+        comment_writer=CommentWriter(http_client=http_client, token_provider=tokens),
+        debounce_seconds=0.01,
+    )
+
+
+def annotation(i: int) -> dict:
+    return {
+        "path": "app.py",
+        "start_line": i,
+        "end_line": i,
+        "annotation_level": "warning",
+        "message": f"issue {i}",
+    }
+
+
+class TestWritebackQueue:
+    """Tests for WritebackQueue"""
+
+    @pytest.mark.asyncio
+    async def test_superseded_updates_are_merged(self, queue, http_client):
+        """Several updates to one check run become one request"""
+        org_id = uuid4()
+        futures = [
+            queue.update_check_run(org_id, "1", REPO, SHA, 42, status=CheckRunStatus.IN_PROGRESS),
+            queue.update_check_run(
+                org_id, "1", REPO, SHA, 42,
+                output=CheckRunOutput(title="Scanning", summary="50%"),
+            ),
+            queue.update_check_run(
+                org_id, "1", REPO, SHA, 42,
+                conclusion=CheckRunConclusion.SUCCESS,
+                output=CheckRunOutput(title="Done", summary="ok"),
+            ),
+        ]
+
+        results = await asyncio.gather(*futures)
+
+        assert len(http_client.calls) == 1
+        payload = http_client.calls[0][2]
+        assert payload["conclusion"] == "success"
+        assert payload["output"]["title"] == "Done"
+        assert all(r.check_run_id == 42 for r in results)
+
+    @pytest.mark.asyncio
+    async def test_annotations_chunked_with_conclusion_last(self, queue, http_client):
+        """120 annotations are sent in 3 requests; only the last completes the run"""
+        org_id = uuid4()
+        queue.add_annotations(org_id, "1", REPO, SHA, 7, [annotation(i) for i in range(70)])
+        future = queue.update_check_run(
+            org_id, "1", REPO, SHA, 7,
+            conclusion=CheckRunConclusion.FAILURE,
+            output=CheckRunOutput(
+                title="Checks Failed",
+                summary="",
+                annotations=[annotation(i) for i in range(70, 120)],
+            ),
+        )
+
+        await future
+
+        sizes = [len(call[2]["output"]["annotations"]) for call in http_client.calls]
+        assert sizes == [50, 50, 20]
+        assert "conclusion" not in http_client.calls[0][2]
+        assert http_client.calls[-1][2]["conclusion"] == "failure"
+
+    @pytest.mark.asyncio
+    async def test_comment_edits_keep_latest_and_skip_unchanged(self, queue, http_client):
+        """Only the latest body is sent, and re-sending it is a no-op"""
+        org_id = uuid4()
+        queue.create_or_update_comment(org_id, "1", REPO, SHA, 5, "first", "summary")
+        await queue.create_or_update_comment(org_id, "1", REPO, SHA, 5, "second", "summary")
+
+        await queue.create_or_update_comment(org_id, "1", REPO, SHA, 5, "second", "summary")
+
+        assert len(http_client.calls) == 1
+        assert http_client.calls[0][2]["body"].endswith("second")
+
+
+class TestGateWritebackQueue:
+    """Tests for GateWriteback with a queue"""
+
+    @pytest.mark.asyncio
+    async def test_gate_completion_goes_through_queue(self, queue, http_client):
+        """All annotations are delivered instead of truncating at 50"""
+        tokens = StaticTokenProvider()
+        gate = GateWriteback(
+            check_run_writer=queue.check_run_writer,
+            status_writer=StatusWriter(http_client=http_client, token_provider=tokens),
+            comment_writer=queue.comment_writer,
+            queue=queue,
+        )
+        org_id = uuid4()
+
+        started = await gate.report_gate_started(org_id, "1", REPO, SHA, "run-1")
+        result = await gate.report_gate_failure(
+            org_id, "1", REPO, started.check_run_id,
+            annotations=[annotation(i) for i in range(60)],
+        )
+
+        assert result.conclusion == CheckRunConclusion.FAILURE
+        patches = [call for call in http_client.calls if call[0] == "patch"]
+        assert sum(len(call[2]["output"]["annotations"]) for call in patches) == 60